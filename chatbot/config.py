@@ -11,19 +11,94 @@ class AppConfig:
         self.db_name = os.environ['DB_NAME']
         self.db_user = os.environ['DB_USER']
         self.db_password = os.environ['DB_PASSWORD']
+        self.db_pool_minconn = int(os.environ.get("DB_POOL_MINCONN", "1"))
+        self.db_pool_maxconn = int(os.environ.get("DB_POOL_MAXCONN", "10"))
+        # 커넥션 풀 수명 관리 (초): 최대 수명 / 유휴 후 축소 / 이 시간 이상 놀았던 연결만 대여 전 pre-ping / 대여 대기 한도
+        self.db_pool_max_lifetime_seconds = float(os.environ.get("DB_POOL_MAX_LIFETIME_SECONDS", "1800"))
+        self.db_pool_max_idle_seconds = float(os.environ.get("DB_POOL_MAX_IDLE_SECONDS", "300"))
+        self.db_pool_check_idle_seconds = float(os.environ.get("DB_POOL_CHECK_IDLE_SECONDS", "30"))
+        self.db_pool_timeout_seconds = float(os.environ.get("DB_POOL_TIMEOUT_SECONDS", "10"))
+        self.db_tcp_keepalives_idle = int(os.environ.get("DB_TCP_KEEPALIVES_IDLE", "30"))
+        # RDS Proxy / pgbouncer(transaction 모드) 경유 시 true: 세션 상태(prepared statement 등)를 만들지 않음
+        self.db_proxy_mode = os.environ.get("DB_PROXY_MODE", "false").lower() == "true"
 
         # AI 서비스 설정
         self.anthropic_api_key = os.environ.get('ANTHROPIC_API_KEY')
         self.gcp_ssm_param_name = os.environ.get('GCP_SSM_PARAM_NAME')
+        # SSM에서 가져온 GCP 인증 정보의 /tmp 캐시 유지 시간(초, 0이면 캐시 안 함)
+        self.gcp_credentials_cache_ttl_seconds = float(os.environ.get("GCP_CREDENTIALS_CACHE_TTL_SECONDS", "3600"))
 
         # Gemma 3 설정 (Hugging Face)
         self.hf_endpoint_url = os.environ.get("HF_ENDPOINT_URL", "")
         self.hf_api_token = os.environ.get("HF_API_TOKEN", "")
 
+        # 부하 테스트용 LLM 대역 서버 (loadtest/standin_server.py, 운영 환경 사용 금지)
+        # 설정 시 Bedrock / Vertex AI / vLLM 호출을 모두 이 주소로 보냄
+        self.llm_standin_url = os.environ.get("LLM_STANDIN_URL", "").rstrip("/")
+        if self.llm_standin_url:
+            self.hf_endpoint_url = self.llm_standin_url
+            self.hf_api_token = self.hf_api_token or "standin"
+            logger.warning(f"LLM 대역 서버 사용: {self.llm_standin_url} (실제 LLM/임베딩 호출 없음)")
+
+        # 임베딩 캐시 설정 (In-process LRU + Postgres embedding_cache 테이블)
+        self.embedding_cache_max_entries = int(os.environ.get("EMBEDDING_CACHE_MAX_ENTRIES", "2048"))
+        self.embedding_cache_db_enabled = os.environ.get("EMBEDDING_CACHE_DB_ENABLED", "true").lower() == "true"
+
+        # 일괄 임베딩 동시성 (BEDROCK_MAX_POOL_CONNECTIONS 이하 권장)
+        self.embedding_max_workers = int(os.environ.get("EMBEDDING_MAX_WORKERS", "8"))
+
+        # Warm-up 이벤트 시 Postgres embedding_cache에서 LRU로 미리 적재할 최근 임베딩 수 (0이면 생략)
+        self.warmup_embedding_prime_limit = int(os.environ.get("WARMUP_EMBEDDING_PRIME_LIMIT", "256"))
+
+        # /chatbot/query 의미 기반 응답 캐시
+        self.semantic_cache_enabled = os.environ.get("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+        self.semantic_cache_threshold = float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+        self.semantic_cache_ttl_seconds = float(os.environ.get("SEMANTIC_CACHE_TTL_SECONDS", "3600"))
+        self.semantic_cache_max_entries = int(os.environ.get("SEMANTIC_CACHE_MAX_ENTRIES", "256"))
+        # vector_search_modes 테이블(테이블별 벡터 검색 모드)을 다시 읽는 주기 (초)
+        self.vector_search_mode_ttl_seconds = float(os.environ.get("VECTOR_SEARCH_MODE_TTL_SECONDS", "300"))
+
+        # Vertex AI 컨텍스트 캐시 (정적 프롬프트 프리픽스 재사용, 최소 토큰 수 미달 시 자동으로 일반 호출)
+        self.vertex_context_cache_enabled = os.environ.get("VERTEX_CONTEXT_CACHE_ENABLED", "false").lower() == "true"
+        self.vertex_context_cache_ttl_seconds = int(os.environ.get("VERTEX_CONTEXT_CACHE_TTL_SECONDS", "3600"))
+
+        # LLM 클라이언트 커넥션 풀 설정 (ClientRegistry 공유 httpx / botocore 풀)
+        self.llm_http_max_connections = int(os.environ.get("LLM_HTTP_MAX_CONNECTIONS", "20"))
+        self.llm_http_keepalive_expiry = float(os.environ.get("LLM_HTTP_KEEPALIVE_EXPIRY", "120"))
+        self.llm_http_timeout = float(os.environ.get("LLM_HTTP_TIMEOUT", "60"))
+        self.bedrock_max_pool_connections = int(os.environ.get("BEDROCK_MAX_POOL_CONNECTIONS", "16"))
+
+        # LLM Hedging 정책 (JSON, 엔드포인트별 opt-in)
+        # 예: {"reframing": {"secondary": "bedrock", "percentile": 95}, "search": {"secondary": "bedrock"}}
+        self.llm_hedge_policies = os.environ.get("LLM_HEDGE_POLICIES", "")
+        # 동기 Hedging 스레드 수 (요청 스레드 풀 크기에 맞춤, anyio 기본 40). 모두 사용 중이면 Hedge 하지 않음
+        self.llm_hedge_max_workers = int(os.environ.get("LLM_HEDGE_MAX_WORKERS", "40"))
+
+        # LLM 프로바이더 서킷 브레이커 (연속 실패 N회 -> 일정 시간 우회 후 Half-open 시험 호출)
+        self.llm_circuit_failure_threshold = int(os.environ.get("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+        self.llm_circuit_recovery_seconds = float(os.environ.get("LLM_CIRCUIT_RECOVERY_SECONDS", "30"))
+
+        # LLM 호출 지표 (CloudWatch Embedded Metric Format 로그)
+        self.llm_metrics_enabled = os.environ.get("LLM_METRICS_ENABLED", "true").lower() == "true"
+        self.llm_metrics_namespace = os.environ.get("LLM_METRICS_NAMESPACE", "Sapori/Chatbot/LLM")
+
         # SQS 설정
         self.cbt_log_sqs_url = os.environ.get('CBT_LOG_SQS_URL')
         self.diary_to_chatbot_sqs_url = os.environ.get('DIARY_TO_CHATBOT_SQS_URL')
 
+        # 상담 세션 누적 요약 (최근 N턴 원문 + 그 이전 대화 요약, SQS 워커에서 비동기 갱신)
+        self.session_history_turns = int(os.environ.get("SESSION_HISTORY_TURNS", "5"))
+        self.history_token_budget = int(os.environ.get("HISTORY_TOKEN_BUDGET", "1500"))
+        self.session_summary_enabled = os.environ.get("SESSION_SUMMARY_ENABLED", "true").lower() == "true"
+        self.session_summary_sqs_url = os.environ.get("SESSION_SUMMARY_SQS_URL") or self.cbt_log_sqs_url
+        self.session_summary_max_chars = int(os.environ.get("SESSION_SUMMARY_MAX_CHARS", "800"))
+        self.session_summary_max_turns_per_update = int(os.environ.get("SESSION_SUMMARY_MAX_TURNS_PER_UPDATE", "20"))
+
+        # 상담 로그 임베딩 백필 (임베딩 실패 / 지연으로 NULL 저장된 cbt_logs 행 채우기)
+        self.embedding_backfill_batch_size = int(os.environ.get("EMBEDDING_BACKFILL_BATCH_SIZE", "64"))
+        self.embedding_backfill_max_batches = int(os.environ.get("EMBEDDING_BACKFILL_MAX_BATCHES", "10"))
+        self.embedding_backfill_max_attempts = int(os.environ.get("EMBEDDING_BACKFILL_MAX_ATTEMPTS", "5"))
+
         # 필수값 검증
         if not all([self.db_host, self.db_name, self.db_user, self.db_password]):
             msg = "데이터베이스 환경 변수가 하나 이상 누락되었습니다."
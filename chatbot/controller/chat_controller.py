@@ -1,10 +1,14 @@
 import logging
+from typing import Optional
 from fastapi import APIRouter, Query, Depends
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from schema.reframing import ReframingRequest, ReframingResponse, VoiceReframingRequest
 from schema.history import SessionListResponse, ChatHistoryResponse
 from domain.reframing_logic import ReframingService, get_reframing_service
 from domain.chat_logic import ChatService, get_chat_service
 from schema.common import COMMON_RESPONSES
+from util.sse import encode_events
 
 logger = logging.getLogger()
 router = APIRouter(tags=["CBT Reframing"])
@@ -39,7 +43,7 @@ router = APIRouter(tags=["CBT Reframing"])
     """,
     responses=COMMON_RESPONSES
 )
-def reframing_endpoint(
+async def reframing_endpoint(
         request: ReframingRequest,
         service: ReframingService = Depends(get_reframing_service)
 ):
@@ -48,7 +52,7 @@ def reframing_endpoint(
         f"리프레이밍 요청 시작 - user_id: {request.user_id}, session_id: {request.session_id}"
     )
     try:
-        result = service.execute_reframing(request)
+        result = await service.execute_reframing_async(request)
         logger.info(f"리프레이밍 요청 완료 - user_id: {request.user_id}, session_id: {request.session_id}")
         return result
     except Exception as e:
@@ -65,7 +69,7 @@ def reframing_endpoint(
     summary="음성 기반 상담 (감정 데이터 포함)",
     description="caring-back에서 분석된 음성 감정 데이터를 포함하여 상담을 진행합니다."
 )
-def voice_reframing_endpoint(
+async def voice_reframing_endpoint(
         request: VoiceReframingRequest,
         service: ReframingService = Depends(get_reframing_service)
 ):
@@ -75,7 +79,7 @@ def voice_reframing_endpoint(
         f"session_id: {request.session_id}, emotion: {request.emotion.get('top_emotion', 'N/A')}"
     )
     try:
-        result = service.execute_voice_reframing(request)
+        result = await service.execute_voice_reframing_async(request)
         logger.info(f"음성 리프레이밍 요청 완료 - user_id: {request.user_id}, session_id: {request.session_id}")
         return result
     except Exception as e:
@@ -86,21 +90,77 @@ def voice_reframing_endpoint(
         )
         raise
 
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"  # 프록시 버퍼링 비활성화 (청크 즉시 전달)
+}
+
+SSE_DESCRIPTION_SUFFIX = """
+    ---
+    ### 📡 스트리밍 응답 형식 (text/event-stream)
+    - `event: field` / `data: {"field": "empathy", "value": "..."}` : 필드가 완성될 때마다 전송
+    - `event: done` / `data: {ReframingResponse}` : 최종 응답 (응답 종료 후 서버에서 로그 저장, done 직후 연결을 끊어도 저장됨)
+    - `event: error` / `data: {"message": "...", "detail": "..."}` : 스트리밍 도중 오류
+    """
+
+@router.post(
+    "/chatbot/reframing/stream",
+    response_class=StreamingResponse,
+    summary="CBT 리프레이밍 상담 (SSE 스트리밍)",
+    description="`/chatbot/reframing`과 동일한 입력을 받아, 답변 필드를 완성되는 대로 Server-Sent Events로 전송합니다." + SSE_DESCRIPTION_SUFFIX,
+    responses=COMMON_RESPONSES
+)
+def reframing_stream_endpoint(
+        request: ReframingRequest,
+        service: ReframingService = Depends(get_reframing_service)
+):
+    """텍스트 기반 상담 스트리밍 엔드포인트"""
+    logger.info(
+        f"리프레이밍 스트리밍 요청 시작 - user_id: {request.user_id}, session_id: {request.session_id}"
+    )
+    events, save_turn = service.stream_reframing(request)
+    return StreamingResponse(
+        encode_events(events), media_type="text/event-stream", headers=SSE_HEADERS, background=BackgroundTask(save_turn)
+    )
+
+@router.post(
+    "/chatbot/voice-reframing/stream",
+    response_class=StreamingResponse,
+    summary="음성 기반 상담 (SSE 스트리밍)",
+    description="`/chatbot/voice-reframing`과 동일한 입력을 받아, 답변 필드를 완성되는 대로 Server-Sent Events로 전송합니다." + SSE_DESCRIPTION_SUFFIX,
+    responses=COMMON_RESPONSES
+)
+def voice_reframing_stream_endpoint(
+        request: VoiceReframingRequest,
+        service: ReframingService = Depends(get_reframing_service)
+):
+    """음성 기반 상담 스트리밍 엔드포인트"""
+    logger.info(
+        f"음성 리프레이밍 스트리밍 요청 시작 - user_id: {request.user_id}, "
+        f"session_id: {request.session_id}, emotion: {request.emotion.get('top_emotion', 'N/A')}"
+    )
+    events, save_turn = service.stream_voice_reframing(request)
+    return StreamingResponse(
+        encode_events(events), media_type="text/event-stream", headers=SSE_HEADERS, background=BackgroundTask(save_turn)
+    )
+
 @router.get(
     "/chatbot/sessions",
     response_model=SessionListResponse,
     summary="채팅방 목록 조회",
-    description="사용자의 과거 상담 채팅방 목록을 최신순으로 반환합니다.",
+    description="사용자의 과거 상담 채팅방 목록을 최신순으로 반환합니다. 다음 페이지는 응답의 `next_cursor`를 `cursor`로 전달하여 조회합니다.",
     responses=COMMON_RESPONSES
 )
 def get_sessions(
         user_id: str,
+        cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (첫 페이지는 생략)"),
+        size: int = Query(20, ge=1, le=100),
         service: ChatService = Depends(get_chat_service)
 ):
     """채팅방 목록 조회 엔드포인트"""
-    logger.info(f"채팅방 목록 조회 요청 - user_id: {user_id}")
+    logger.info(f"채팅방 목록 조회 요청 - user_id: {user_id}, cursor: {cursor}")
     try:
-        result = service.get_user_sessions(user_id)
+        result = service.get_user_sessions(user_id, cursor=cursor, size=size)
         logger.info(f"채팅방 목록 조회 완료 - user_id: {user_id}, count: {len(result.sessions)}")
         return result
     except Exception as e:
@@ -111,18 +171,19 @@ def get_sessions(
     "/chatbot/history/{session_id}",
     response_model=ChatHistoryResponse,
     summary="채팅 상세 조회",
-    description="특정 세션의 대화 내용을 페이징하여 반환합니다.",
+    description="특정 세션의 대화 내용을 페이징하여 반환합니다. 무한 스크롤은 응답의 `next_cursor`를 `cursor`로 전달하여 더 오래된 대화를 조회합니다. (`cursor`가 있으면 `page`는 무시하며 응답의 `current_page` / `total_page`는 null)",
     responses=COMMON_RESPONSES
 )
 def get_history(
         session_id: str,
         page: int = Query(1, ge=1),
+        cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
         service: ChatService = Depends(get_chat_service)
 ):
     """채팅 상세 조회 엔드포인트"""
-    logger.info(f"채팅 상세 조회 요청 - session_id: {session_id}, page: {page}")
+    logger.info(f"채팅 상세 조회 요청 - session_id: {session_id}, page: {page}, cursor: {cursor}")
     try:
-        result = service.get_session_history(session_id, page)
+        result = service.get_session_history(session_id, page, cursor=cursor)
         logger.info(f"채팅 상세 조회 완료 - session_id: {session_id}, messages: {len(result.messages)}")
         return result
     except Exception as e:
@@ -10,7 +10,10 @@ from config import config
 from schema.test import MindDiaryTestRequest, BatchWeeklyReportRequest, BatchWeeklyReportResponse, DevReframingRequest
 from schema.reframing import ReframingRequest, ReframingResponse
 from service.llm_service import LLMService, get_llm_service
-from prompts.reframing import REFRAMING_PROMPT_TEMPLATE
+from service.semantic_cache import get_semantic_cache
+from prompts.reframing import get_reframing_prompt
+from schema.llm_output import ReframingOutput
+from util.structured_output import parse_structured
 from domain.report_logic import ReportService, get_report_service
 
 logger = logging.getLogger()
@@ -114,23 +117,20 @@ def dev_reframing_dynamic(
         f"model_type: {request.model_type}, model_name: {request.model_name or 'N/A'}"
     )
     
-    full_prompt = REFRAMING_PROMPT_TEMPLATE.format(
-        history_text="(없음. 대화 시작)",
-        user_input=request.user_input
-    )
+    # 운영 API와 같은 프롬프트 (히스토리 없음, 첫 턴)
+    full_prompt = get_reframing_prompt(request.user_input, history=[], turn_count=1)
 
     # 동적 모델 호출
     raw_response = service.get_dynamic_model_response(
         prompt=full_prompt,
         model_type=request.model_type,
         model_name=request.model_name,
-        hf_endpoint_url=request.hf_endpoint_url
+        hf_endpoint_url=request.hf_endpoint_url,
+        schema=ReframingOutput
     )
 
     try:
-        # 마크다운 코드블록 제거 (```json ... ```)
-        cleaned_json = raw_response.replace("```json", "").replace("```", "").strip()
-        data = json.loads(cleaned_json)
+        data = parse_structured(raw_response, ReframingOutput)
 
         logger.info(f"동적 리프레이밍 요청 완료 - user_id: {request.user_id}, model_type: {request.model_type}")
         
@@ -142,7 +142,7 @@ def dev_reframing_dynamic(
             alternative_thought=data.get("alternative_thought", "대안을 찾지 못했습니다."),
             emotion=data.get("top_emotion", None) # 감정 필드 추가
         )
-    except json.JSONDecodeError:
+    except ValueError:
         logger.error(f"JSON 파싱 실패. 원본 응답: {raw_response}")
         return ReframingResponse(
             empathy=f"[JSON 파싱 실패] 모델 응답: {raw_response}",
@@ -207,3 +207,28 @@ def batch_weekly_report(
     except Exception as e:
         logger.error(f"배치 주간 리포트 생성 실패 - target_date: {request.target_date}, error: {e}", exc_info=True)
         raise
+
+@router.get(
+    "/chatbot/dev/cache-stats",
+    summary="[DEV] 캐시 / LLM 라우팅 통계",
+    description="""
+    현재 Lambda 인스턴스(Warm 컨테이너) 기준의 통계를 반환합니다.
+    - **semantic_cache**: `/chatbot/query` 의미 캐시 적중률 (비활성화 시 null)
+    - **embedding_cache**: 임베딩 캐시 LRU/DB 적중 수
+    - **llm_router**: 프로바이더별 서킷 상태, 오류율, p50 지연
+    - **llm_hedging**: 엔드포인트별 Hedging 승자 집계
+    """
+)
+def cache_stats(service: LLMService = Depends(get_llm_service)):
+    semantic_cache = get_semantic_cache()
+    embedding_cache = service.embedding_cache
+    return {
+        "semantic_cache": semantic_cache.stats() if semantic_cache else None,
+        "embedding_cache": {
+            "hits": embedding_cache.hits,
+            "db_hits": embedding_cache.db_hits,
+            "misses": embedding_cache.misses
+        },
+        "llm_router": service.router.snapshot(),
+        "llm_hedging": service.hedge_stats.snapshot()
+    }
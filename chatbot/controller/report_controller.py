@@ -15,14 +15,14 @@ router = APIRouter(tags=["Report"])
     description="한 주간의 대화 기록을 분석하여 심리 분석 소설(리포트)을 생성합니다.",
     responses=COMMON_RESPONSES
 )
-def create_weekly_report(
+async def create_weekly_report(
         request: WeeklyReportRequest,
         service: ReportService = Depends(get_report_service)
 ):
     """주간 리포트 생성 엔드포인트"""
     logger.info(f"주간 리포트 생성 요청 시작 - user_id: {request.user_id}, target_date: {request.target_date}")
     try:
-        result = service.generate_weekly_report(request.user_id, request.target_date)
+        result = await service.generate_weekly_report_async(request.user_id, request.target_date)
         logger.info(f"주간 리포트 생성 완료 - user_id: {request.user_id}, report_id: {result.report_id}")
         return result
     except Exception as e:
@@ -15,14 +15,14 @@ router = APIRouter(tags=["Welfare Search"])
     description="사용자의 질문과 개인 정보(선택)를 입력받아, 관련된 복지 정책이나 채용 공고를 검색하고 답변을 생성합니다.",
     responses=COMMON_RESPONSES
 )
-def search_endpoint(
+async def search_endpoint(
         request: SearchRequest,
         service: SearchService = Depends(get_search_service)
 ):
     """복지/구인 정보 검색 엔드포인트"""
     logger.info(f"검색 요청 시작 - query2: {request.query2[:50]}..., bedrock: {request.bedrock}")
     try:
-        result = service.execute_search(
+        result = await service.execute_search_async(
             user_chat=request.query2,
             user_info=request.query1,
             use_bedrock=request.bedrock
@@ -1,51 +1,119 @@
 # chatbot/dependency.py
 import logging
-import psycopg2
-from psycopg2 import pool
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from typing import Generator
+from psycopg import pq
+from psycopg_pool import ConnectionPool
 from config import config
+from repository.vector import register_vector
 
 logger = logging.getLogger()
 
 # 전역 변수로 커넥션 풀 관리 (Lambda 컨테이너가 살아있는 동안 재사용됨)
+# psycopg_pool.ConnectionPool은 스레드 안전하므로 sync 엔드포인트(스레드 풀)에서 동시에 빌려도 안전
 _db_pool = None
+_pool_lock = threading.Lock()
 
-def _init_db_pool():
+# 연결별 마지막 반납 시각 (오래 놀았던 연결만 pre-ping) / 풀 전체의 마지막 사용 시각 (Lambda thaw 감지)
+_last_returned = weakref.WeakKeyDictionary()
+_last_activity = 0.0
+
+def _connection_kwargs() -> dict:
+    kwargs = {
+        "host": config.db_host,
+        "dbname": config.db_name,
+        "user": config.db_user,
+        "password": config.db_password,
+        "connect_timeout": 5,
+        # Lambda freeze / NAT 유휴 타임아웃으로 끊긴 연결을 OS 수준에서도 빨리 감지
+        "keepalives": 1,
+        "keepalives_idle": config.db_tcp_keepalives_idle,
+        "keepalives_interval": 10,
+        "keepalives_count": 3,
+        "application_name": "sapori-chatbot",
+    }
+    if config.db_proxy_mode:
+        # RDS Proxy / pgbouncer(transaction 모드): 서버 측 prepared statement를 만들지 않음
+        # (세션 상태가 생기면 RDS Proxy는 연결을 고정(pinning)하고, pgbouncer는 다른 백엔드에서 실패함)
+        kwargs["prepare_threshold"] = None
+    return kwargs
+
+def _configure_connection(conn):
+    """새 연결마다 1회: pgvector 바이너리 어댑터 등록 (타입 조회 트랜잭션은 풀에 넣기 전에 종료)"""
+    register_vector(conn)
+    conn.commit()
+
+def _check_connection(conn):
+    """대여 직전 검증: 일정 시간 이상 놀았던 연결만 빈 쿼리로 pre-ping (실패 시 풀이 폐기 후 다른 연결을 줌)"""
+    returned_at = _last_returned.get(conn)
+    if returned_at is not None and time.monotonic() - returned_at < config.db_pool_check_idle_seconds:
+        return
+    ConnectionPool.check_connection(conn)
+
+def _init_db_pool() -> ConnectionPool:
     """커넥션 풀 초기화 (Lazy Initialization)"""
     global _db_pool
     if _db_pool is None:
-        try:
-            logger.info("DB 커넥션 풀 초기화 시도...")
-            _db_pool = psycopg2.pool.SimpleConnectionPool(
-                minconn=1,
-                maxconn=10,
-                host=config.db_host,
-                database=config.db_name,
-                user=config.db_user,
-                password=config.db_password,
-                connect_timeout=5
-            )
-            logger.info("DB 커넥션 풀 생성 완료.")
-        except Exception as e:
-            logger.error(f"DB 커넥션 풀 생성 실패: {e}")
-            raise e
+        with _pool_lock:
+            if _db_pool is None:
+                try:
+                    logger.info("DB 커넥션 풀 초기화 시도...")
+                    _db_pool = ConnectionPool(
+                        kwargs=_connection_kwargs(),
+                        min_size=config.db_pool_minconn,
+                        max_size=config.db_pool_maxconn,
+                        configure=_configure_connection,
+                        check=_check_connection,
+                        max_lifetime=config.db_pool_max_lifetime_seconds,
+                        max_idle=config.db_pool_max_idle_seconds,
+                        timeout=config.db_pool_timeout_seconds,
+                        name="chatbot",
+                        open=True,
+                    )
+                    logger.info("DB 커넥션 풀 생성 완료.")
+                except Exception as e:
+                    logger.error(f"DB 커넥션 풀 생성 실패: {e}")
+                    raise e
+    return _db_pool
+
+def _reap_after_thaw(db_pool: ConnectionPool):
+    """
+    풀 전체가 DB_POOL_MAX_IDLE_SECONDS 이상 쓰이지 않았다면 (Lambda freeze 후 thaw 등)
+    유휴 연결을 한꺼번에 검증하여 끊긴 연결을 정리하고 최소 연결 수를 다시 채웁니다.
+    """
+    global _last_activity
+    now = time.monotonic()
+    idle = now - _last_activity if _last_activity else 0.0
+    _last_activity = now
+    if idle >= config.db_pool_max_idle_seconds:
+        logger.info(f"DB 커넥션 풀 {idle:.0f}초 유휴 후 재사용: 유휴 연결 검증")
+        db_pool.check()
 
 def get_db_conn() -> Generator:
     """
     FastAPI Dependency: 커넥션 풀에서 연결을 빌려오고, 사용 후 반납(putconn)합니다.
     """
-    global _db_pool
-
-    # 풀이 없으면 생성
-    if _db_pool is None:
-        _init_db_pool()
+    db_pool = _init_db_pool()
+    _reap_after_thaw(db_pool)
 
     conn = None
     try:
-        # 연결 빌리기
-        conn = _db_pool.getconn()
+        # 연결 빌리기 (검증 실패한 연결은 풀이 폐기하고 다른 연결을 반환)
+        conn = db_pool.getconn()
         yield conn
     finally:
-        # 연결 반납하기
+        # 연결 반납하기 (조회만 하고 끝난 트랜잭션은 여기서 닫아 프록시의 연결 고정을 막음)
         if conn:
-            _db_pool.putconn(conn)
+            if conn.info.transaction_status in (pq.TransactionStatus.INTRANS, pq.TransactionStatus.INERROR):
+                try:
+                    conn.rollback()
+                except Exception as e:
+                    logger.warning(f"DB 연결 반납 전 롤백 실패: {e}")
+            _last_returned[conn] = time.monotonic()
+            db_pool.putconn(conn)
+
+# FastAPI 밖(싱글톤 서비스, 워커 등)에서 with 문으로 커넥션을 빌려 쓰기 위한 헬퍼
+borrow_db_conn = contextmanager(get_db_conn)
@@ -6,6 +6,7 @@ from fastapi import Depends
 from exception import AppError
 from schema.history import SessionListResponse, ChatHistoryResponse, ChatSessionItem, ChatMessage
 from repository.chat_repository import ChatRepository, get_chat_repository
+from util.cursor import encode_cursor, decode_cursor
 
 logger = logging.getLogger()
 
@@ -13,33 +14,26 @@ class ChatService:
     def __init__(self, chat_repo: ChatRepository):
         self.chat_repo = chat_repo
 
-    def get_user_sessions(self, user_id: str) -> SessionListResponse:
+    def get_user_sessions(self, user_id: str, cursor: str = None, size: int = 20) -> SessionListResponse:
+        after = decode_cursor(cursor)
         try:
-            rows = self.chat_repo.get_user_sessions(user_id)
+            rows = self.chat_repo.get_user_sessions(user_id, limit=size, after=after)
             sessions = []
             for r in rows:
-                # r: (session_id, user_input, created_at, bot_response_json)
-                bot_res = r[3]
-                if isinstance(bot_res, str):
-                    try:
-                        bot_res = json.loads(bot_res)
-                    except:
-                        bot_res = {}
-                elif not isinstance(bot_res, dict):
-                    bot_res = {}
-
-                distortion = bot_res.get("detected_distortion")
+                # r: (session_id, last_message, last_updated, last_emotion, last_distortion)
+                distortion = r[4]
                 tags = [distortion] if distortion and distortion != "분석 불가" else []
-                emotion = bot_res.get("emotion")
 
                 sessions.append(ChatSessionItem(
                     session_id=r[0],
-                    last_message=r[1],
+                    last_message=r[1] or "",
                     last_updated=r[2],
                     distortion_tags=tags,
-                    emotion=emotion
+                    emotion=r[3]
                 ))
-            return SessionListResponse(sessions=sessions)
+            # 한 페이지가 가득 찼을 때만 다음 커서 제공 (마지막 행의 last_updated, session_id)
+            next_cursor = encode_cursor(rows[-1][2], rows[-1][0]) if len(rows) == size else None
+            return SessionListResponse(sessions=sessions, next_cursor=next_cursor)
 
         except Exception as e:
             logger.error(f"채팅방 목록 조회 중 오류 발생: {e}", exc_info=True)
@@ -49,20 +43,32 @@ class ChatService:
                 detail=str(e)
             )
 
-    def get_session_history(self, session_id: str, page: int) -> ChatHistoryResponse:
+    def get_session_history(self, session_id: str, page: int = 1, cursor: str = None) -> ChatHistoryResponse:
+        """
+        세션 대화 상세 조회
+        - cursor(이전 응답의 next_cursor)가 있으면 키셋 페이지네이션 (무한 스크롤, 페이지 깊이와 무관한 비용)
+        - 없으면 page 기반 조회 (기존 클라이언트 호환, 1페이지는 두 방식이 동일)
+        """
+        before = decode_cursor(cursor)
         try:
             size = 20
-            offset = (page - 1) * size
+            offset = 0 if before else (page - 1) * size
+
+            # DB에서 최신순(DESC)으로 한 행 더 가져와 다음 페이지 존재 여부 판단
+            rows, total_cnt = self.chat_repo.get_session_messages(session_id, size + 1, offset=offset, before=before)
 
-            # DB에서 최신순(DESC)으로 limit만큼 가져옴
-            rows, total_cnt = self.chat_repo.get_session_messages(session_id, size, offset)
+            next_cursor = None
+            if len(rows) > size:
+                rows = rows[:size]
+                # 이번 페이지에서 가장 오래된 행의 (created_at, id)
+                next_cursor = encode_cursor(rows[-1][2], rows[-1][4])
 
             if rows:
                 rows = rows[::-1]
 
             messages = []
             for r in rows:
-                # r: (user_input, bot_response, created_at, s3_url)
+                # r: (user_input, bot_response, created_at, s3_url, id)
                 raw_bot_res = r[1]
                 if isinstance(raw_bot_res, str):
                     try:
@@ -97,11 +103,16 @@ class ChatService:
                     emotion=bot_res.get("emotion")
                 ))
 
+            if before:
+                # 키셋 페이지네이션: 페이지 번호 대신 next_cursor로만 다음 페이지를 안내
+                return ChatHistoryResponse(session_id=session_id, messages=messages, next_cursor=next_cursor)
+
             return ChatHistoryResponse(
                 session_id=session_id,
                 messages=messages,
                 total_page=(total_cnt // size) + 1 if total_cnt > 0 else 1,
-                current_page=page
+                current_page=page,
+                next_cursor=next_cursor
             )
 
         except Exception as e:
@@ -1,14 +1,22 @@
 # chatbot/domain/reframing_logic.py
 import logging
+from typing import Any, Callable, Iterator, Tuple
 from fastapi import Depends
 
 from exception import AppError
-# from config import config  # SQS 설정 제거로 인해 불필요
+try:
+    from config import config
+except ImportError:
+    from ..config import config
 from prompts.reframing import get_reframing_prompt, get_voice_reframing_prompt
 from schema.reframing import ReframingRequest, VoiceReframingRequest
 from repository.chat_repository import ChatRepository, get_chat_repository
 from service.llm_service import LLMService, get_llm_service
-from util.json_parser import parse_llm_json
+from service.session_summary import request_summary_update
+from util.concurrency import run_blocking
+from schema.llm_output import ReframingOutput, VoiceReframingOutput
+from util.json_parser import iter_completed_fields
+from util.structured_output import parse_structured
 
 logger = logging.getLogger()
 
@@ -22,22 +30,19 @@ class ReframingService:
         """텍스트 기반 상담: LLM이 감정까지 추론"""
         try:
             # [기억]
-            history = self.chat_repo.get_chat_history(request.session_id, limit=5)
-            turn_count = self.chat_repo.get_session_turn_count(request.session_id)
+            history, turn_count, summary = self._load_context(request.session_id)
 
             # [생각]
-            prompt = get_reframing_prompt(request.user_input, history, turn_count)
+            prompt = get_reframing_prompt(
+                request.user_input, history, turn_count,
+                summary=summary, token_budget=config.history_token_budget
+            )
 
             # [LLM]
-            llm_raw_response = self.llm_service.get_llm_response(prompt, use_bedrock=False)
+            llm_raw_response = self.llm_service.get_llm_response(prompt, use_bedrock=False, endpoint="reframing", schema=ReframingOutput)
 
             # JSON 파싱 로직
-            bot_response_dict = {}
-            try:
-                bot_response_dict = parse_llm_json(llm_raw_response)
-            except ValueError:
-                logger.warning("LLM 응답 파싱 실패 -> Fallback 사용")
-                bot_response_dict = self._create_fallback_response(llm_raw_response)
+            bot_response_dict = self._parse_llm_response(llm_raw_response, "LLM 응답 파싱 실패 -> Fallback 사용")
 
             # [감정 데이터 처리]
             top_emotion = bot_response_dict.pop("top_emotion", "neutral")
@@ -49,7 +54,8 @@ class ReframingService:
                 session_id=request.session_id,
                 user_input=request.user_input,
                 bot_response=bot_response_dict,
-                s3_url=None
+                s3_url=None,
+                turn_count=turn_count
             )
 
             return bot_response_dict
@@ -62,8 +68,7 @@ class ReframingService:
         """음성 기반 상담: 외부 분석 감정 데이터 활용"""
         try:
             # [기억]
-            history = self.chat_repo.get_chat_history(request.session_id, limit=5)
-            turn_count = self.chat_repo.get_session_turn_count(request.session_id)
+            history, turn_count, summary = self._load_context(request.session_id)
 
             # [생각]
             prompt = get_voice_reframing_prompt(
@@ -71,19 +76,16 @@ class ReframingService:
                 history=history,
                 emotion=request.emotion,
                 user_name=request.user_name or "내담자",
-                turn_count=turn_count
+                turn_count=turn_count,
+                summary=summary,
+                token_budget=config.history_token_budget
             )
 
             # [LLM]
-            llm_raw_response = self.llm_service.get_llm_response(prompt, use_bedrock=False)
+            llm_raw_response = self.llm_service.get_llm_response(prompt, use_bedrock=False, endpoint="voice_reframing", schema=VoiceReframingOutput)
 
             # [파싱]
-            bot_response_dict = {}
-            try:
-                bot_response_dict = parse_llm_json(llm_raw_response)
-            except ValueError:
-                logger.warning("Voice LLM 응답 파싱 실패 -> Fallback 사용")
-                bot_response_dict = self._create_fallback_response(llm_raw_response)
+            bot_response_dict = self._parse_llm_response(llm_raw_response, "Voice LLM 응답 파싱 실패 -> Fallback 사용", VoiceReframingOutput)
 
             # [감정 데이터 처리]
             raw_emotion = request.emotion.get("top_emotion", "neutral")
@@ -95,7 +97,8 @@ class ReframingService:
                 session_id=request.session_id,
                 user_input=request.user_input,
                 bot_response=bot_response_dict,
-                s3_url=request.s3_url
+                s3_url=request.s3_url,
+                turn_count=turn_count
             )
 
             return bot_response_dict
@@ -104,6 +107,214 @@ class ReframingService:
             logger.error(f"음성 리프레이밍 로직 오류: {e}", exc_info=True)
             raise AppError(500, "음성 상담 답변 생성 실패", str(e))
 
+    async def execute_reframing_async(self, request: ReframingRequest) -> dict:
+        """execute_reframing의 asyncio 버전 (LLM 응답 대기 중 워커 스레드를 점유하지 않음)"""
+        try:
+            history, turn_count, summary = await self._load_context_async(request.session_id)
+
+            prompt = get_reframing_prompt(
+                request.user_input, history, turn_count,
+                summary=summary, token_budget=config.history_token_budget
+            )
+            llm_raw_response = await self.llm_service.aio.get_llm_response(prompt, use_bedrock=False, endpoint="reframing", schema=ReframingOutput)
+
+            bot_response_dict = self._parse_llm_response(llm_raw_response, "LLM 응답 파싱 실패 -> Fallback 사용")
+            top_emotion = bot_response_dict.pop("top_emotion", "neutral")
+            bot_response_dict["emotion"] = top_emotion
+
+            await run_blocking(
+                self._save_session_sync,
+                user_id=request.user_id,
+                session_id=request.session_id,
+                user_input=request.user_input,
+                bot_response=bot_response_dict,
+                s3_url=None,
+                turn_count=turn_count
+            )
+            return bot_response_dict
+
+        except Exception as e:
+            logger.error(f"리프레이밍 로직 오류: {e}", exc_info=True)
+            raise AppError(500, "상담 답변 생성 실패", str(e))
+
+    async def execute_voice_reframing_async(self, request: VoiceReframingRequest) -> dict:
+        """execute_voice_reframing의 asyncio 버전"""
+        try:
+            history, turn_count, summary = await self._load_context_async(request.session_id)
+
+            prompt = get_voice_reframing_prompt(
+                user_input=request.user_input,
+                history=history,
+                emotion=request.emotion,
+                user_name=request.user_name or "내담자",
+                turn_count=turn_count,
+                summary=summary,
+                token_budget=config.history_token_budget
+            )
+            llm_raw_response = await self.llm_service.aio.get_llm_response(prompt, use_bedrock=False, endpoint="voice_reframing", schema=VoiceReframingOutput)
+
+            bot_response_dict = self._parse_llm_response(llm_raw_response, "Voice LLM 응답 파싱 실패 -> Fallback 사용", VoiceReframingOutput)
+            bot_response_dict["emotion"] = request.emotion.get("top_emotion", "neutral")
+
+            await run_blocking(
+                self._save_session_sync,
+                user_id=request.user_id,
+                session_id=request.session_id,
+                user_input=request.user_input,
+                bot_response=bot_response_dict,
+                s3_url=request.s3_url,
+                turn_count=turn_count
+            )
+            return bot_response_dict
+
+        except Exception as e:
+            logger.error(f"음성 리프레이밍 로직 오류: {e}", exc_info=True)
+            raise AppError(500, "음성 상담 답변 생성 실패", str(e))
+
+    def stream_reframing(self, request: ReframingRequest) -> Tuple[Iterator[Tuple[str, Any]], Callable[[], None]]:
+        """
+        텍스트 상담 스트리밍 버전: 필드가 완성되는 대로 ("field", {...}) 이벤트를 내보내고, 마지막에 ("done", 최종 응답)을 보냅니다.
+        (히스토리 조회/프롬프트 생성은 스트림 시작 전에 수행하여 오류 시 일반 에러 응답이 나가도록 함)
+        Returns:
+            (events, save_turn) - save_turn은 응답 전송 후 세션 로그를 저장 (StreamingResponse의 background로 실행)
+        """
+        try:
+            history, turn_count, summary = self._load_context(request.session_id)
+            prompt = get_reframing_prompt(
+                request.user_input, history, turn_count,
+                summary=summary, token_budget=config.history_token_budget
+            )
+        except Exception as e:
+            logger.error(f"리프레이밍 스트림 준비 오류: {e}", exc_info=True)
+            raise AppError(500, "상담 답변 생성 실패", str(e))
+
+        return self._stream_and_save(
+            prompt=prompt,
+            user_id=request.user_id,
+            session_id=request.session_id,
+            user_input=request.user_input,
+            s3_url=None,
+            fixed_emotion=None,
+            endpoint="reframing",
+            turn_count=turn_count
+        )
+
+    def stream_voice_reframing(self, request: VoiceReframingRequest) -> Tuple[Iterator[Tuple[str, Any]], Callable[[], None]]:
+        """음성 상담 스트리밍 버전 (감정은 외부 분석 결과를 그대로 사용, 반환값은 stream_reframing과 동일)"""
+        try:
+            history, turn_count, summary = self._load_context(request.session_id)
+            prompt = get_voice_reframing_prompt(
+                user_input=request.user_input,
+                history=history,
+                emotion=request.emotion,
+                user_name=request.user_name or "내담자",
+                turn_count=turn_count,
+                summary=summary,
+                token_budget=config.history_token_budget
+            )
+        except Exception as e:
+            logger.error(f"음성 리프레이밍 스트림 준비 오류: {e}", exc_info=True)
+            raise AppError(500, "음성 상담 답변 생성 실패", str(e))
+
+        return self._stream_and_save(
+            prompt=prompt,
+            user_id=request.user_id,
+            session_id=request.session_id,
+            user_input=request.user_input,
+            s3_url=request.s3_url,
+            fixed_emotion=request.emotion.get("top_emotion", "neutral"),
+            endpoint="voice_reframing",
+            turn_count=turn_count
+        )
+
+    def _stream_and_save(self, prompt, user_id, session_id, user_input, s3_url, fixed_emotion, endpoint=None, turn_count=None):
+        """
+        [스트리밍 헬퍼 함수]
+        LLM 청크 -> 필드 이벤트 변환 제너레이터와, 최종 응답이 만들어졌으면 로그를 저장하는 함수를 반환합니다.
+        저장을 제너레이터 안(done 이후)에서 하면 클라이언트가 done 직후 연결을 끊을 때
+        서버가 제너레이터를 더 돌리지 않아 턴이 유실되므로, 저장은 응답과 분리된 백그라운드 작업으로 실행합니다.
+        """
+        # 음성 상담(fixed_emotion)은 LLM 추론 감정이 선택 항목
+        schema = ReframingOutput if fixed_emotion is None else VoiceReframingOutput
+        completed = {}
+
+        def save_turn():
+            # 오류 / done 전 연결 종료로 최종 응답이 없으면 저장하지 않음 (중복 호출 시 1회만 저장)
+            bot_response_dict = completed.pop("bot_response", None)
+            if bot_response_dict is None:
+                return
+            self._save_session_sync(
+                user_id=user_id,
+                session_id=session_id,
+                user_input=user_input,
+                bot_response=bot_response_dict,
+                s3_url=s3_url,
+                turn_count=turn_count
+            )
+
+        events = self._stream_events(prompt, schema, fixed_emotion, endpoint, completed)
+        return events, save_turn
+
+    def _stream_events(self, prompt, schema, fixed_emotion, endpoint, completed: dict) -> Iterator[Tuple[str, Any]]:
+        full_text = ""
+        try:
+            chunks = self.llm_service.stream_llm_response(prompt, use_bedrock=False, endpoint=endpoint, schema=schema)
+            for key, value in iter_completed_fields(chunks):
+                if key is None:
+                    full_text = value
+                    break
+                if key == "top_emotion":
+                    # 텍스트 상담만 LLM 추론 감정을 사용 (음성은 외부 분석 결과 사용)
+                    if fixed_emotion is not None:
+                        continue
+                    key = "emotion"
+                yield "field", {"field": key, "value": value}
+        except Exception as e:
+            logger.error(f"리프레이밍 스트리밍 중 오류: {e}", exc_info=True)
+            yield "error", {"message": "상담 답변 생성 실패", "detail": str(e)}
+            return
+
+        try:
+            bot_response_dict = parse_structured(full_text, schema)
+        except ValueError:
+            logger.warning("스트리밍 LLM 응답 파싱 실패 -> Fallback 사용")
+            bot_response_dict = self._create_fallback_response(full_text)
+
+        top_emotion = bot_response_dict.pop("top_emotion", "neutral")
+        bot_response_dict["emotion"] = fixed_emotion if fixed_emotion is not None else top_emotion
+
+        completed["bot_response"] = bot_response_dict
+        yield "done", bot_response_dict
+
+    def _load_context(self, session_id: str) -> tuple:
+        """
+        [기억] 최근 N턴 원문 + 세션 턴 수 + 그 이전 대화의 누적 요약
+        Returns:
+            (history, turn_count, summary)
+        """
+        # 최근 대화 / 턴 수 / 누적 요약을 한 번의 DB 왕복으로 조회
+        history, turn_count, row = self.chat_repo.get_session_context(
+            session_id,
+            history_limit=config.session_history_turns,
+            include_summary=config.session_summary_enabled
+        )
+        summary = None
+        if row and turn_count > config.session_history_turns:
+            summary = row[0]
+        return history, turn_count, summary
+
+    async def _load_context_async(self, session_id: str) -> tuple:
+        """_load_context의 asyncio 버전"""
+        return await run_blocking(self._load_context, session_id)
+
+    def _parse_llm_response(self, llm_raw_response: str, warn_msg: str, schema=ReframingOutput) -> dict:
+        # 구조화 출력이므로 실패는 프로바이더 전체 장애(오류 JSON)인 경우뿐
+        try:
+            return parse_structured(llm_raw_response, schema)
+        except ValueError:
+            logger.warning(warn_msg)
+            return self._create_fallback_response(llm_raw_response)
+
     def _create_fallback_response(self, msg: str) -> dict:
         return {
             "empathy": "죄송해요, 잠시 생각이 꼬였나 봐요.",
@@ -114,19 +325,19 @@ class ReframingService:
             "emotion": "neutral"
         }
 
-    def _save_session_sync(self, user_id, session_id, user_input, bot_response, s3_url=None):
+    def _save_session_sync(self, user_id, session_id, user_input, bot_response, s3_url=None, turn_count=None):
         """
         [동기 저장 헬퍼 함수]
         SQS를 거치지 않고 직접 임베딩을 생성하고 DB에 저장합니다.
+        turn_count(저장 전 세션 턴 수)가 주어지면 저장 후 세션 요약 갱신을 요청합니다.
         """
-        # 임베딩 생성 (실패 시 0 벡터로 대체하여 흐름 끊기지 않게 함)
-        embedding = []
+        # 임베딩 생성 (실패 시 NULL로 저장하여 흐름 끊기지 않게 함, 이후 백필 작업이 채움)
+        embedding = None
         try:
             # 약 0.3~0.5초 소요 예상
             embedding = self.llm_service.get_embedding(user_input)
         except Exception as e:
             logger.error(f"임베딩 생성 실패 (저장은 계속 진행): {e}")
-            embedding = [0.0] * 1024  # 1024차원 0 벡터
 
         # DB 저장
         try:
@@ -142,10 +353,17 @@ class ReframingService:
             logger.error(f"DB 저장 실패: {e}")
             # 저장이 실패해도 사용자에게 답변은 전달되어야 하므로 예외를 다시 던지지 않음
             # 필요 시 raise하여 500 에러 처리 가능
+            return
+
+        # 최근 N턴 창 밖으로 밀려난 대화를 요약에 반영 (SQS 워커에서 비동기 처리)
+        if turn_count is not None:
+            request_summary_update(session_id, turn_count + 1)
 
 # --- 의존성 주입용 함수 ---
 def get_reframing_service(
         chat_repo: ChatRepository = Depends(get_chat_repository),
         llm_service: LLMService = Depends(get_llm_service)
 ) -> ReframingService:
+    # 상담(Gemini) + 질의 임베딩(Bedrock)만 미리 초기화 (Cold start 시 동시 진행)
+    llm_service.prefetch("gemini", "bedrock")
     return ReframingService(chat_repo, llm_service)
@@ -8,9 +8,11 @@ from fastapi import Depends
 from exception import AppError
 from service.llm_service import LLMService, get_llm_service
 from repository.report_repository import ReportRepository, get_report_repository
+from repository.async_repository import AsyncRepository
 from prompts.report import get_report_prompt
 from schema.history import WeeklyReportResponse, WeeklyReportItem, MonthlyReportListResponse
-from util.json_parser import parse_llm_json
+from schema.llm_output import WeeklyReportOutput
+from util.structured_output import parse_structured
 
 logger = logging.getLogger()
 
@@ -22,57 +24,53 @@ class ReportService:
     def generate_weekly_report(self, user_id: str, target_date: date) -> WeeklyReportResponse:
         try:
             # 날짜 계산
-            start_of_week = target_date - timedelta(days=target_date.weekday())
-            end_of_week = start_of_week + timedelta(days=6)
-            period_str = f"{start_of_week.strftime('%Y-%m-%d')} ~ {end_of_week.strftime('%Y-%m-%d')}"
+            start_of_week, end_of_week, period_str = self._get_week_range(target_date)
 
             # DB 조회
             logs = self.report_repo.get_logs_by_period(user_id, start_of_week, end_of_week)
-
             if not logs:
-                raise AppError(
-                    status_code=404,
-                    message="해당 기간에 대화 기록이 없어 리포트를 생성할 수 없습니다."
-                )
-
-            # 프롬프트 구성
-            logs_text = ""
-            for log in logs:
-                day_str = log[2].strftime("%A")
-                bot_res = log[1] if isinstance(log[1], dict) else {}
-                empathy = bot_res.get('empathy', '')
-                logs_text += f"[{day_str}] 나: {log[0]}\n상담사: {empathy}\n---\n"
+                raise self._no_logs_error()
 
             # LLM 호출
-            prompt = get_report_prompt(logs_text, period_str)
-            llm_raw = self.llm_service.get_llm_response(prompt)
+            prompt = get_report_prompt(self._build_logs_text(logs), period_str)
+            llm_raw = self.llm_service.get_llm_response(prompt, endpoint="weekly_report", schema=WeeklyReportOutput)
 
             # JSON 파싱
-            try:
-                report_data = parse_llm_json(llm_raw)
-            except ValueError as parse_e:
-                # 어떤 내용이라도 저장하거나, 명확하게 에러 로그를 남기는 것이 좋음
-                logger.error(f"리포트 생성 중 파싱 오류: {parse_e}")
-                report_data = {
-                    "title": "주간 마음 정리 (생성 실패)",
-                    "content": llm_raw, # 원본 텍스트라도 저장 시도
-                    "emotions": {}
-                }
+            report_data = self._parse_report(llm_raw)
 
             # DB 저장
             report_id = self.report_repo.save_weekly_report(user_id, start_of_week, end_of_week, report_data)
 
-            if report_id == -1:
-                raise Exception("DB 저장 실패")
+            return self._to_response(report_id, report_data, period_str)
 
-            return WeeklyReportResponse(
-                report_id=report_id,
-                title=report_data.get("title", "무제"),
-                content=report_data.get("content", ""),
-                period=period_str,
-                emotions=report_data.get("emotions", {})
+        except AppError as ae:
+            raise ae
+        except Exception as e:
+            logger.error(f"주간 리포트 생성 중 시스템 오류: {e}", exc_info=True)
+            raise AppError(
+                status_code=500,
+                message="리포트 생성 중 알 수 없는 오류가 발생했습니다.",
+                detail=str(e)
             )
 
+    async def generate_weekly_report_async(self, user_id: str, target_date: date) -> WeeklyReportResponse:
+        """generate_weekly_report의 asyncio 버전 (LLM 대기 중 워커 스레드를 점유하지 않음)"""
+        try:
+            start_of_week, end_of_week, period_str = self._get_week_range(target_date)
+
+            repo = AsyncRepository(self.report_repo)
+            logs = await repo.get_logs_by_period(user_id, start_of_week, end_of_week)
+            if not logs:
+                raise self._no_logs_error()
+
+            prompt = get_report_prompt(self._build_logs_text(logs), period_str)
+            llm_raw = await self.llm_service.aio.get_llm_response(prompt, endpoint="weekly_report", schema=WeeklyReportOutput)
+
+            report_data = self._parse_report(llm_raw)
+            report_id = await repo.save_weekly_report(user_id, start_of_week, end_of_week, report_data)
+
+            return self._to_response(report_id, report_data, period_str)
+
         except AppError as ae:
             raise ae
         except Exception as e:
@@ -83,6 +81,56 @@ class ReportService:
                 detail=str(e)
             )
 
+    def _get_week_range(self, target_date: date) -> tuple:
+        start_of_week = target_date - timedelta(days=target_date.weekday())
+        end_of_week = start_of_week + timedelta(days=6)
+        period_str = f"{start_of_week.strftime('%Y-%m-%d')} ~ {end_of_week.strftime('%Y-%m-%d')}"
+        return start_of_week, end_of_week, period_str
+
+    def _no_logs_error(self) -> AppError:
+        return AppError(
+            status_code=404,
+            message="해당 기간에 대화 기록이 없어 리포트를 생성할 수 없습니다."
+        )
+
+    def _build_logs_text(self, logs: list) -> str:
+        # 프롬프트 구성
+        logs_text = ""
+        for log in logs:
+            day_str = log[2].strftime("%A")
+            bot_res = log[1] if isinstance(log[1], dict) else {}
+            empathy = bot_res.get('empathy', '')
+            logs_text += f"[{day_str}] 나: {log[0]}\n상담사: {empathy}\n---\n"
+        return logs_text
+
+    def _parse_report(self, llm_raw: str) -> dict:
+        try:
+            report_data = parse_structured(llm_raw, WeeklyReportOutput)
+        except ValueError as parse_e:
+            # 어떤 내용이라도 저장하거나, 명확하게 에러 로그를 남기는 것이 좋음
+            logger.error(f"리포트 생성 중 파싱 오류: {parse_e}")
+            return {
+                "title": "주간 마음 정리 (생성 실패)",
+                "content": llm_raw, # 원본 텍스트라도 저장 시도
+                "emotions": {}
+            }
+
+        # 구조화 출력의 감정 목록 [{"emotion", "count"}] -> 저장/응답 형식 {감정: 횟수}
+        report_data["emotions"] = {item["emotion"]: item["count"] for item in report_data.get("emotions", [])}
+        return report_data
+
+    def _to_response(self, report_id: int, report_data: dict, period_str: str) -> WeeklyReportResponse:
+        if report_id == -1:
+            raise Exception("DB 저장 실패")
+
+        return WeeklyReportResponse(
+            report_id=report_id,
+            title=report_data.get("title", "무제"),
+            content=report_data.get("content", ""),
+            period=period_str,
+            emotions=report_data.get("emotions", {})
+        )
+
     def get_reports_by_month(self, user_id: str, year: int, month: int) -> MonthlyReportListResponse:
         try:
             rows = self.report_repo.find_reports_by_month(user_id, year, month)
@@ -169,7 +217,8 @@ class ReportService:
             logger.info(f"배치 주간 리포트 생성 시작 (전주): period={period_str}")
             
             # 해당 기간에 로그가 있는 모든 사용자 조회
-            user_ids = self.report_repo.get_users_with_logs_in_period(start_of_prev_week, end_of_prev_week)
+            # (이미 리포트가 있는 사용자도 같은 왕복에서 함께 조회하여 사용자별 존재 확인 쿼리를 없앰)
+            user_ids, reported_user_ids = self.report_repo.get_report_batch_targets(start_of_prev_week, end_of_prev_week)
             
             if not user_ids:
                 logger.info(f"기간 {period_str}에 로그가 있는 사용자가 없습니다.")
@@ -223,7 +272,7 @@ class ReportService:
                 
                 try:
                     # 이미 리포트가 존재하는지 확인
-                    if self.report_repo.check_report_exists(user_id, start_of_prev_week, end_of_prev_week):
+                    if user_id in reported_user_ids:
                         logger.info(f"[{idx}/{len(unique_user_ids)}] 사용자 {user_id}: 이미 리포트가 존재하여 스킵")
                         skipped_count += 1
                         results.append({
@@ -316,4 +365,5 @@ def get_report_service(
         report_repo: ReportRepository = Depends(get_report_repository),
         llm_service: LLMService = Depends(get_llm_service)
 ) -> ReportService:
+    llm_service.prefetch("gemini")
     return ReportService(report_repo, llm_service)
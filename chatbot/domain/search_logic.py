@@ -1,21 +1,29 @@
 # chatbot/domain/search_logic.py
 import logging
-import json
-import re
 from fastapi import Depends
 
 from exception import AppError
 from service.llm_service import LLMService, get_llm_service
 from repository.search_repository import SearchRepository, get_search_repository
+from repository.async_repository import AsyncRepository
+from service.semantic_cache import SemanticAnswerCache, get_semantic_cache
+from util.concurrency import run_blocking
 from util import response_builder
 from prompts.search import get_search_prompt
+from schema.llm_output import SearchOutput
+from util.structured_output import parse_structured
 
 logger = logging.getLogger()
 
+# LLM 오류/파싱 실패로 만들어진 응답은 캐시하지 않음
+_ERROR_ANSWER_PREFIXES = ("오류 발생", "죄송합니다. 답변 생성 중")
+
 class SearchService:
-    def __init__(self, search_repo: SearchRepository, llm_service: LLMService):
+    def __init__(self, search_repo: SearchRepository, llm_service: LLMService,
+                 semantic_cache: SemanticAnswerCache = None):
         self.search_repo = search_repo
         self.llm_service = llm_service
+        self.semantic_cache = semantic_cache # None이면 의미 캐시 사용 안 함
 
     def execute_search(self, user_chat: str, user_info: str, use_bedrock: bool) -> dict:
         try:
@@ -28,21 +36,24 @@ class SearchService:
                 # 임베딩 실패는 검색 자체를 불가능하게 하므로 에러 처리
                 raise Exception(f"임베딩 생성 실패: {embed_e}")
 
+            # 의미 캐시 조회 (유사 질의의 최종 응답 재사용)
+            partition = dataset_version = None
+            if self.semantic_cache:
+                partition = self.semantic_cache.make_partition(user_info, locations, use_bedrock)
+                dataset_version = self._get_dataset_version()
+                if dataset_version:
+                    cached = self.semantic_cache.lookup(embedding, partition, dataset_version)
+                    if cached is not None:
+                        return cached
+
             # DB 검색
             welfare_results = self.search_repo.search_welfare_services(embedding, locations)
             employment_results = self.search_repo.search_employment_jobs(embedding)
 
             logger.info(f"검색 결과: 복지 {len(welfare_results)}건, 채용 {len(employment_results)}건")
 
-            # 결과 정규화 및 통합
-            norm_welfare = response_builder.normalize_results(welfare_results, "WELFARE")
-            norm_employment = response_builder.normalize_results(employment_results, "EMPLOYMENT")
-
-            all_results = sorted(norm_welfare + norm_employment, key=lambda x: x[0])
-            top_3_tuples = [item[1] for item in all_results[:3]]
-
-            # 재순위화
-            final_results = response_builder.rerank_results(top_3_tuples, locations)
+            # 결과 정규화, 통합 및 재순위화
+            final_results = self._rank_results(welfare_results, employment_results, locations)
 
             if not final_results:
                 # 검색 결과 없음은 에러가 아님 (정상 응답)
@@ -52,19 +63,59 @@ class SearchService:
             context_str = response_builder.format_context_string(final_results)
             prompt = get_search_prompt(context_str, user_info, user_chat)
 
-            llm_response = self.llm_service.get_llm_response(prompt, use_bedrock=use_bedrock)
+            llm_response = self.llm_service.get_llm_response(prompt, use_bedrock=use_bedrock, endpoint="search", schema=SearchOutput)
 
             # 결과 파싱
-            json_match = re.search(r'\{.*\}', llm_response, re.DOTALL)
-            if not json_match:
-                logger.error(f"LLM 응답 파싱 실패: {llm_response}")
-                # 파싱 실패 시 에러를 던지기보다 안내 문구 반환이 나을 수 있음
-                return {
-                    'answer': "죄송합니다. 답변 생성 중 일시적인 오류가 발생했습니다.",
-                    'services': []
-                }
+            result = self._parse_llm_response(llm_response)
+            if dataset_version and self._is_cacheable(result):
+                self.semantic_cache.store(embedding, partition, dataset_version, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"검색 서비스 시스템 오류: {e}", exc_info=True)
+            raise AppError(
+                status_code=500,
+                message="검색 서비스를 처리하는 중 오류가 발생했습니다.",
+                detail=str(e)
+            )
+
+    async def execute_search_async(self, user_chat: str, user_info: str, use_bedrock: bool) -> dict:
+        """execute_search의 asyncio 버전 (임베딩/LLM 대기 중 워커 스레드를 점유하지 않음)"""
+        try:
+            locations = response_builder.extract_locations(user_chat)
+
+            try:
+                embedding = await self.llm_service.aio.get_embedding(user_chat)
+            except Exception as embed_e:
+                raise Exception(f"임베딩 생성 실패: {embed_e}")
 
-            return json.loads(json_match.group(0))
+            partition = dataset_version = None
+            if self.semantic_cache:
+                partition = self.semantic_cache.make_partition(user_info, locations, use_bedrock)
+                dataset_version = await run_blocking(self._get_dataset_version)
+                if dataset_version:
+                    cached = self.semantic_cache.lookup(embedding, partition, dataset_version)
+                    if cached is not None:
+                        return cached
+
+            repo = AsyncRepository(self.search_repo)
+            welfare_results = await repo.search_welfare_services(embedding, locations)
+            employment_results = await repo.search_employment_jobs(embedding)
+
+            logger.info(f"검색 결과: 복지 {len(welfare_results)}건, 채용 {len(employment_results)}건")
+
+            final_results = self._rank_results(welfare_results, employment_results, locations)
+            if not final_results:
+                return {'answer': '관련 정보를 찾을 수 없습니다.', 'services': []}
+
+            context_str = response_builder.format_context_string(final_results)
+            prompt = get_search_prompt(context_str, user_info, user_chat)
+
+            llm_response = await self.llm_service.aio.get_llm_response(prompt, use_bedrock=use_bedrock, endpoint="search", schema=SearchOutput)
+            result = self._parse_llm_response(llm_response)
+            if dataset_version and self._is_cacheable(result):
+                self.semantic_cache.store(embedding, partition, dataset_version, result)
+            return result
 
         except Exception as e:
             logger.error(f"검색 서비스 시스템 오류: {e}", exc_info=True)
@@ -74,9 +125,45 @@ class SearchService:
                 detail=str(e)
             )
 
+    def _get_dataset_version(self):
+        """데이터셋 버전 (조회 실패 시 None -> 이번 요청은 캐시를 건너뜀)"""
+        try:
+            return self.semantic_cache.dataset_version(self.search_repo.get_dataset_version)
+        except Exception as e:
+            logger.warning(f"데이터셋 버전 조회 실패 (의미 캐시 건너뜀): {e}")
+            return None
+
+    def _is_cacheable(self, result: dict) -> bool:
+        answer = result.get('answer')
+        return isinstance(answer, str) and bool(answer) and not answer.startswith(_ERROR_ANSWER_PREFIXES)
+
+    def _rank_results(self, welfare_results: list, employment_results: list, locations) -> list:
+        norm_welfare = response_builder.normalize_results(welfare_results, "WELFARE")
+        norm_employment = response_builder.normalize_results(employment_results, "EMPLOYMENT")
+
+        all_results = sorted(norm_welfare + norm_employment, key=lambda x: x[0])
+        top_3_tuples = [item[1] for item in all_results[:3]]
+
+        # 재순위화
+        return response_builder.rerank_results(top_3_tuples, locations)
+
+    def _parse_llm_response(self, llm_response: str) -> dict:
+        try:
+            return parse_structured(llm_response, SearchOutput)
+        except ValueError as e:
+            logger.error(f"LLM 응답 파싱 실패: {e}")
+            # 파싱 실패 시 에러를 던지기보다 안내 문구 반환이 나을 수 있음
+            return {
+                'answer': "죄송합니다. 답변 생성 중 일시적인 오류가 발생했습니다.",
+                'services': []
+            }
+
 # --- 의존성 주입용 함수 ---
 def get_search_service(
         search_repo: SearchRepository = Depends(get_search_repository),
-        llm_service: LLMService = Depends(get_llm_service)
+        llm_service: LLMService = Depends(get_llm_service),
+        semantic_cache: SemanticAnswerCache = Depends(get_semantic_cache)
 ) -> SearchService:
-    return SearchService(search_repo, llm_service)
+    # 답변 생성(Gemini) + 질의 임베딩(Bedrock)만 미리 초기화 (Cold start 시 동시 진행)
+    llm_service.prefetch("gemini", "bedrock")
+    return SearchService(search_repo, llm_service, semantic_cache)
@@ -1,27 +1,77 @@
 # chatbot/lambda_function.py
 import logging
-from mangum import Mangum
-from main import app
-from service import worker_service
+import os
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# FastAPI 핸들러 (API Gateway용)
-mangum_handler = Mangum(app)
+# 이벤트 유형별 코드는 해당 이벤트가 처음 들어올 때 import 합니다.
+# - SQS: service.worker_service만 로드 (FastAPI 앱 / 컨트롤러 / Mangum 미로드)
+# - HTTP: main(FastAPI 앱)과 Mangum만 로드
+# Vertex AI / OpenAI SDK는 두 경로 모두 실제 호출 시점까지 import되지 않습니다. (service.llm_service 참고)
+_mangum_handler = None
+
+def _get_http_handler():
+    """FastAPI 핸들러 (API Gateway용, 최초 HTTP 이벤트에서 생성)"""
+    global _mangum_handler
+    if _mangum_handler is None:
+        from mangum import Mangum
+        from main import app
+        _mangum_handler = Mangum(app)
+    return _mangum_handler
 
 def lambda_handler(event, context):
     """
     Main Entry Point: 이벤트 소스에 따라 적절한 핸들러로 라우팅
     """
 
+    # Warm-up 이벤트 (예약 호출 / Provisioned Concurrency 보조): DB·프로바이더 연결만 맺고 바로 반환
+    if is_warmup_event(event):
+        from service.warmup import run_warmup
+        return run_warmup(preload=_get_http_handler)
+
+    # 스키마 마이그레이션 (배포 파이프라인에서 {"migrate": true}로 직접 호출, VPC 내부에서 DB 접근)
+    if isinstance(event, dict) and event.get("migrate") is True:
+        from migrations import migrate
+        return {"migrated": migrate(dry_run=bool(event.get("dry_run")))}
+
+    # 임베딩 백필 (EventBridge 예약 규칙의 상수 입력 {"embedding_backfill": true})
+    if isinstance(event, dict) and event.get("embedding_backfill") is True:
+        from service.embedding_backfill import run_embedding_backfill
+        return run_embedding_backfill()
+
+    # 상수 입력 없이 들어온 EventBridge 예약 이벤트는 어떤 작업인지 알 수 없으므로 경고만 남기고 무시
+    if is_unrouted_scheduled_event(event):
+        logger.warning(f"처리할 작업이 지정되지 않은 예약 이벤트 무시 (규칙에 상수 입력 필요): {event.get('resources')}")
+        return {"status": "ignored", "reason": "scheduled event without constant input"}
+
     # SQS 이벤트인지 감지
     # (Records 키가 있고, 첫 번째 레코드의 출처가 aws:sqs인 경우)
     if is_sqs_event(event):
+        from service import worker_service
         return worker_service.process_sqs_batch(event['Records'])
 
     # 기본 HTTP API 요청 (FastAPI)
-    return mangum_handler(event, context)
+    return _get_http_handler()(event, context)
+
+def is_warmup_event(event):
+    """
+    Warm-up 이벤트 판별 (명시적인 표시가 있는 이벤트만)
+    - {"warmup": true} (직접 호출 / EventBridge 예약 규칙의 상수 입력)
+    - {"source": "serverless-plugin-warmup"} 또는 EventBridge 규칙의 source "sapori.warmup"
+    일반 EventBridge 예약 이벤트(aws.events)는 다른 예약 작업과 구분할 수 없으므로 Warm-up으로 보지 않습니다.
+    """
+    if not isinstance(event, dict):
+        return False
+    return event.get("warmup") is True or event.get("source") in ("serverless-plugin-warmup", "sapori.warmup")
+
+def is_unrouted_scheduled_event(event):
+    """상수 입력 없이 기본 페이로드로 들어온 EventBridge 예약 이벤트"""
+    return (
+        isinstance(event, dict)
+        and event.get("source") == "aws.events"
+        and event.get("detail-type") == "Scheduled Event"
+    )
 
 def is_sqs_event(event):
     """이벤트가 SQS 트리거인지 확인하는 헬퍼 함수"""
@@ -29,3 +79,7 @@ def is_sqs_event(event):
         if event['Records'][0].get('eventSource') == 'aws:sqs':
             return True
     return False
+
+# Provisioned Concurrency 초기화 단계에서는 요청 전에 미리 로드 (초기화 시간은 요청 지연에 포함되지 않음)
+if os.environ.get("AWS_LAMBDA_INITIALIZATION_TYPE") == "provisioned-concurrency":
+    _get_http_handler()
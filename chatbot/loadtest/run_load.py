@@ -0,0 +1,86 @@
+# chatbot/loadtest/run_load.py
+"""
+/chatbot/reframing, /chatbot/query 처리량 측정용 부하 발생기 (폐쇄 루프, 동시 사용자 N명)
+
+실행 예:
+  cd chatbot && python loadtest/run_load.py --base-url http://127.0.0.1:8000 --endpoint reframing -c 20 -d 60
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+_QUESTIONS = [
+    "서울에 사는 청년인데 월세 지원 받을 수 있나요?",
+    "경기도 노인 일자리 공고 알려주세요",
+    "한부모 가정 양육비 지원이 궁금해요",
+    "부산 장애인 취업 지원 프로그램이 있나요?",
+]
+_UTTERANCES = [
+    "요즘 뭘 해도 다 망할 것 같아요",
+    "친구가 답장을 안 해서 나를 싫어하는 것 같아",
+    "발표를 망쳐서 회사에서 잘릴 것 같아요",
+    "오늘은 그냥 기분이 좀 괜찮았어요",
+]
+
+def _payload(endpoint: str, worker: int, seq: int, session_id: str) -> dict:
+    if endpoint == "query":
+        return {"query1": "제공된 정보 없음", "query2": _QUESTIONS[seq % len(_QUESTIONS)], "bedrock": False}
+    return {"user_id": f"loadtest-{worker}", "session_id": session_id, "user_input": _UTTERANCES[seq % len(_UTTERANCES)]}
+
+async def _worker(client: httpx.AsyncClient, endpoint: str, worker: int, deadline: float, latencies: list, statuses: Counter):
+    session_id = uuid.uuid4().hex[:6]
+    seq = 0
+    while time.monotonic() < deadline:
+        start = time.monotonic()
+        try:
+            response = await client.post(f"/chatbot/{endpoint}", json=_payload(endpoint, worker, seq, session_id))
+            statuses[response.status_code] += 1
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+        latencies.append(time.monotonic() - start)
+        seq += 1
+
+def _percentile(values: list, p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+async def run(base_url: str, endpoint: str, concurrency: int, duration: float):
+    latencies, statuses = [], Counter()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        started = time.monotonic()
+        deadline = started + duration
+        await asyncio.gather(*(
+            _worker(client, endpoint, i, deadline, latencies, statuses) for i in range(concurrency)
+        ))
+        elapsed = time.monotonic() - started
+
+    if not latencies:
+        print("요청이 완료되지 않았습니다.")
+        return
+    print(f"endpoint=/chatbot/{endpoint} concurrency={concurrency} duration={elapsed:.1f}s")
+    print(f"requests={len(latencies)} throughput={len(latencies) / elapsed:.2f} req/s statuses={dict(statuses)}")
+    print(
+        f"latency(ms) mean={statistics.mean(latencies) * 1000:.0f} "
+        f"p50={_percentile(latencies, 50) * 1000:.0f} p95={_percentile(latencies, 95) * 1000:.0f} "
+        f"p99={_percentile(latencies, 99) * 1000:.0f}"
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SAPORI 챗봇 부하 테스트")
+    parser.add_argument("--base-url", default=os.environ.get("LOADTEST_BASE_URL", "http://127.0.0.1:8000"))
+    parser.add_argument("--endpoint", choices=["reframing", "query"], default="reframing")
+    parser.add_argument("-c", "--concurrency", type=int, default=10)
+    parser.add_argument("-d", "--duration", type=float, default=30.0, help="측정 시간(초)")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.base_url, args.endpoint, args.concurrency, args.duration))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+# chatbot/loadtest/standin_server.py
+"""
+부하 테스트용 LLM/임베딩 대역(stand-in) 서버
+
+LLMService가 사용하는 API 표면만 흉내 내며, 실제 모델 대신 요청의 스키마에 맞는 결정적 JSON을 반환합니다.
+- Bedrock Runtime: POST /model/{modelId}/invoke (Titan 임베딩 / Claude Messages), /invoke-with-response-stream
+- Vertex AI (REST): POST /{version}/projects/.../models/{model}:generateContent / :streamGenerateContent
+- OpenAI 호환 (vLLM): POST /v1/chat/completions (stream 포함), GET /v1/models
+
+실행: cd chatbot && uvicorn loadtest.standin_server:app --port 8089 --workers 4
+챗봇 쪽은 LLM_STANDIN_URL=http://127.0.0.1:8089 로 이 서버를 바라보게 합니다.
+
+환경 변수
+- STANDIN_LATENCY: 프로바이더별 지연 분포 (JSON, 로그정규분포 중앙값/시그마)
+  예: {"claude": {"p50_ms": 1500, "sigma": 0.5}, "gemini": {"p50_ms": 2500}, "titan": {"p50_ms": 40}}
+- STANDIN_ERROR_RATE: 오류 주입 비율 (0~1, 기본 0) / STANDIN_ERROR_STATUS: 주입할 HTTP 상태 (기본 429)
+- STANDIN_TTFT_RATIO: 스트리밍 시 전체 지연 중 첫 청크까지의 비율 (기본 0.3)
+- STANDIN_SEED: 지연/오류 난수 시드 (응답 내용과 임베딩은 입력 텍스트로만 결정)
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import os
+import random
+import struct
+import time
+import uuid
+import zlib
+from typing import Any, Dict, Iterator, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from util.token_budget import estimate_tokens
+
+_DEFAULT_LATENCY = {
+    "titan": {"p50_ms": 40, "sigma": 0.3},
+    "claude": {"p50_ms": 1500, "sigma": 0.5},
+    "gemini": {"p50_ms": 2500, "sigma": 0.5},
+    "openai": {"p50_ms": 800, "sigma": 0.4},
+}
+_CHUNK_CHARS = 24  # 스트리밍 청크 크기 (문자)
+# Vertex REST 요청은 enum을 정수로 인코딩 ($alt=json;enum-encoding=int)
+_GAPIC_TYPES = {1: "string", 2: "number", 3: "integer", 4: "boolean", 5: "array", 6: "object", 7: "null"}
+
+class StandinSettings:
+    def __init__(self):
+        self.latency: Dict[str, dict] = {k: dict(v) for k, v in _DEFAULT_LATENCY.items()}
+        for provider, spec in json.loads(os.environ.get("STANDIN_LATENCY") or "{}").items():
+            self.latency.setdefault(provider, {}).update(spec)
+        self.error_rate = float(os.environ.get("STANDIN_ERROR_RATE", "0"))
+        self.error_status = int(os.environ.get("STANDIN_ERROR_STATUS", "429"))
+        self.ttft_ratio = float(os.environ.get("STANDIN_TTFT_RATIO", "0.3"))
+        self.rng = random.Random(os.environ.get("STANDIN_SEED", "0"))
+
+    def sample_latency(self, provider: str) -> float:
+        """지연 시간(초) 샘플 (로그정규분포)"""
+        spec = self.latency.get(provider, {})
+        median = spec.get("p50_ms", 0) / 1000
+        return median * math.exp(spec.get("sigma", 0) * self.rng.gauss(0, 1))
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self.rng.random() < self.error_rate
+
+settings = StandinSettings()
+app = FastAPI(title="SAPORI LLM Stand-in", docs_url=None, redoc_url=None)
+
+# --- 결정적 응답 생성 ---
+def _seeded(text: str) -> random.Random:
+    return random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+
+def pseudo_embedding(text: str, dimensions: int = 1024) -> list:
+    """같은 텍스트는 항상 같은 L2 정규화 벡터 (Titan v2 normalize=true와 동일한 성질)"""
+    rng = _seeded(text)
+    vector = [rng.gauss(0, 1) for _ in range(dimensions)]
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+def _schema_type(schema: dict) -> str:
+    kind = schema.get("type") or "string"
+    if isinstance(kind, int):
+        return _GAPIC_TYPES.get(kind, "string")
+    return kind.lower()
+
+def fake_from_schema(schema: Optional[dict], rng: random.Random, name: str = "value") -> Any:
+    """
+    JSON Schema(Bedrock/vLLM) 또는 Gemini response_schema(OpenAPI 부분집합)에 맞는 값을 생성합니다.
+    nullable / anyOf[X, null] 필드도 항상 값을 채웁니다.
+    """
+    if not schema:
+        return f"[stand-in] {name}"
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    options = schema.get("anyOf")
+    if options:
+        non_null = [o for o in options if _schema_type(o) != "null"] or options
+        return fake_from_schema(non_null[0], rng, name)
+
+    kind = _schema_type(schema)
+    if kind == "object":
+        return {key: fake_from_schema(sub, rng, key) for key, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [fake_from_schema(schema.get("items"), rng, name) for _ in range(rng.randint(1, 2))]
+    if kind == "integer":
+        return rng.randint(0, 5)
+    if kind == "number":
+        return round(rng.random(), 3)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return f"[stand-in] {name} #{rng.randint(1000, 9999)}"
+
+def generate_output(prompt: str, schema: Optional[dict]) -> dict:
+    """프롬프트로 시드를 정해 스키마에 맞는 응답 객체를 만듭니다. (스키마 없는 요청은 공통 키로 응답)"""
+    rng = _seeded(prompt)
+    if schema:
+        return fake_from_schema(schema, rng)
+    return {"answer": f"[stand-in] answer #{rng.randint(1000, 9999)}", "services": [], "empathy": "[stand-in] empathy"}
+
+def _chunks(text: str) -> Iterator[str]:
+    for i in range(0, len(text), _CHUNK_CHARS):
+        yield text[i:i + _CHUNK_CHARS]
+
+async def _stream_delays(provider: str, pieces: list):
+    """전체 지연을 TTFT와 청크 간 간격으로 나눠 청크를 흘려보냅니다."""
+    total = settings.sample_latency(provider)
+    await asyncio.sleep(total * settings.ttft_ratio)
+    gap = total * (1 - settings.ttft_ratio) / max(1, len(pieces))
+    for i, piece in enumerate(pieces):
+        if i:
+            await asyncio.sleep(gap)
+        yield piece
+
+# --- Bedrock Runtime ---
+def _bedrock_error(status: int) -> Response:
+    code = "ThrottlingException" if status == 429 else "ServiceUnavailableException"
+    return JSONResponse(
+        {"message": f"[stand-in] injected {code}"}, status_code=status,
+        headers={"x-amzn-ErrorType": f"{code}:http://internal.amazon.com/coral/com.amazon.bedrock/"}
+    )
+
+def _claude_prompt(body: dict) -> str:
+    parts = []
+    for message in body.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content or [])
+    return "\n".join(parts)
+
+def _claude_schema(body: dict) -> Optional[dict]:
+    tools = body.get("tools") or []
+    return tools[0].get("input_schema") if tools else None
+
+def _claude_message(model_id: str, body: dict) -> dict:
+    prompt = _claude_prompt(body)
+    output = generate_output(prompt, _claude_schema(body))
+    text = json.dumps(output, ensure_ascii=False)
+    if body.get("tools"):
+        content = [{"type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:16]}", "name": body["tools"][0]["name"], "input": output}]
+        stop_reason = "tool_use"
+    else:
+        content = [{"type": "text", "text": text}]
+        stop_reason = "end_turn"
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:16]}", "type": "message", "role": "assistant", "model": model_id,
+        "content": content, "stop_reason": stop_reason,
+        "usage": {"input_tokens": estimate_tokens(prompt), "output_tokens": estimate_tokens(text)}
+    }
+
+def encode_event_stream_message(payload: dict) -> bytes:
+    """AWS event stream(application/vnd.amazon.eventstream) 메시지 1개를 인코딩합니다."""
+    body = json.dumps({"bytes": base64.b64encode(json.dumps(payload).encode()).decode()}).encode()
+    headers = b""
+    for name, value in ((":event-type", "chunk"), (":content-type", "application/json"), (":message-type", "event")):
+        headers += struct.pack(">B", len(name)) + name.encode() + struct.pack(">BH", 7, len(value)) + value.encode()
+    prelude = struct.pack(">II", 16 + len(headers) + len(body), len(headers))
+    message = prelude + struct.pack(">I", zlib.crc32(prelude)) + headers + body
+    return message + struct.pack(">I", zlib.crc32(message))
+
+def _claude_stream_events(message: dict) -> list:
+    block = message["content"][0]
+    if block["type"] == "tool_use":
+        start = {"type": "tool_use", "id": block["id"], "name": block["name"], "input": {}}
+        deltas = [{"type": "input_json_delta", "partial_json": p} for p in _chunks(json.dumps(block["input"], ensure_ascii=False))]
+    else:
+        start = {"type": "text", "text": ""}
+        deltas = [{"type": "text_delta", "text": p} for p in _chunks(block["text"])]
+
+    usage = message["usage"]
+    head = {**message, "content": [], "stop_reason": None, "usage": {"input_tokens": usage["input_tokens"], "output_tokens": 1}}
+    return [
+        {"type": "message_start", "message": head},
+        {"type": "content_block_start", "index": 0, "content_block": start},
+        *({"type": "content_block_delta", "index": 0, "delta": d} for d in deltas),
+        {"type": "content_block_stop", "index": 0},
+        {"type": "message_delta", "delta": {"stop_reason": message["stop_reason"]}, "usage": {"output_tokens": usage["output_tokens"]}},
+        {"type": "message_stop", "amazon-bedrock-invocationMetrics": {
+            "inputTokenCount": usage["input_tokens"], "outputTokenCount": usage["output_tokens"]}},
+    ]
+
+@app.post("/model/{model_id}/invoke")
+async def bedrock_invoke(model_id: str, request: Request):
+    body = await request.json()
+    if "titan-embed" in model_id:
+        await asyncio.sleep(settings.sample_latency("titan"))
+        if settings.should_fail():
+            return _bedrock_error(settings.error_status)
+        text = body.get("inputText", "")
+        embedding = pseudo_embedding(text, int(body.get("dimensions", 1024)))
+        return {"embedding": embedding, "embeddingsByType": {"float": embedding}, "inputTextTokenCount": estimate_tokens(text)}
+
+    await asyncio.sleep(settings.sample_latency("claude"))
+    if settings.should_fail():
+        return _bedrock_error(settings.error_status)
+    return _claude_message(model_id, body)
+
+@app.post("/model/{model_id}/invoke-with-response-stream")
+async def bedrock_invoke_stream(model_id: str, request: Request):
+    body = await request.json()
+    if settings.should_fail():
+        return _bedrock_error(settings.error_status)
+    events = _claude_stream_events(_claude_message(model_id, body))
+
+    async def stream():
+        async for event in _stream_delays("claude", events):
+            yield encode_event_stream_message(event)
+
+    return StreamingResponse(stream(), media_type="application/vnd.amazon.eventstream")
+
+# --- Vertex AI (REST transport) ---
+def _gemini_error(status: int) -> Response:
+    reason = "RESOURCE_EXHAUSTED" if status == 429 else "UNAVAILABLE"
+    return JSONResponse({"error": {"code": status, "message": "[stand-in] injected error", "status": reason}}, status_code=status)
+
+def _gemini_prompt(body: dict) -> str:
+    return "\n".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+
+def _gemini_response(model: str, text: str, prompt_tokens: int, output_tokens: Optional[int], finished: bool) -> dict:
+    candidate = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+    if finished:
+        candidate["finishReason"] = "STOP"
+    usage = {"promptTokenCount": prompt_tokens}
+    if output_tokens is not None:
+        usage.update(candidatesTokenCount=output_tokens, totalTokenCount=prompt_tokens + output_tokens)
+    return {"candidates": [candidate], "usageMetadata": usage, "modelVersion": model}
+
+@app.post("/{version}/projects/{resource:path}")
+async def vertex_generate(version: str, resource: str, request: Request):
+    path, _, method = resource.rpartition(":")
+    if method not in ("generateContent", "streamGenerateContent", "countTokens"):
+        return _gemini_error(404)
+    model = path.rsplit("/", 1)[-1]
+    body = await request.json()
+    if method == "countTokens":
+        return {"totalTokens": estimate_tokens(_gemini_prompt(body))}
+    generation_config = body.get("generationConfig") or body.get("generation_config") or {}
+    schema = generation_config.get("responseSchema") or generation_config.get("response_schema")
+
+    prompt = _gemini_prompt(body)
+    text = json.dumps(generate_output(prompt, schema), ensure_ascii=False)
+    prompt_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(text)
+
+    if method == "generateContent":
+        await asyncio.sleep(settings.sample_latency("gemini"))
+        if settings.should_fail():
+            return _gemini_error(settings.error_status)
+        return _gemini_response(model, text, prompt_tokens, output_tokens, finished=True)
+
+    if settings.should_fail():
+        return _gemini_error(settings.error_status)
+    pieces = list(_chunks(text))
+
+    async def stream():
+        # REST 서버 스트리밍은 JSON 배열을 나눠 보내는 형식
+        yield "["
+        index = 0
+        async for piece in _stream_delays("gemini", pieces):
+            last = index == len(pieces) - 1
+            chunk = _gemini_response(model, piece, prompt_tokens, output_tokens if last else None, finished=last)
+            yield ("," if index else "") + json.dumps(chunk, ensure_ascii=False)
+            index += 1
+        yield "]"
+
+    return StreamingResponse(stream(), media_type="application/json")
+
+# --- OpenAI 호환 (vLLM) ---
+def _openai_error(status: int) -> Response:
+    return JSONResponse({"error": {"message": "[stand-in] injected error", "type": "server_error", "code": status}}, status_code=status)
+
+@app.get("/v1/models")
+async def openai_models():
+    return {"object": "list", "data": [{"id": "stand-in", "object": "model", "owned_by": "stand-in"}]}
+
+@app.post("/v1/chat/completions")
+async def openai_chat(request: Request):
+    body = await request.json()
+    model = body.get("model", "stand-in")
+    prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+    response_format = body.get("response_format") or {}
+    schema = (response_format.get("json_schema") or {}).get("schema") or body.get("guided_json")
+
+    text = json.dumps(generate_output(prompt, schema), ensure_ascii=False)
+    usage = {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(text)}
+    usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+    completion_id, created = f"chatcmpl-{uuid.uuid4().hex[:16]}", int(time.time())
+
+    if not body.get("stream"):
+        await asyncio.sleep(settings.sample_latency("openai"))
+        if settings.should_fail():
+            return _openai_error(settings.error_status)
+        return {
+            "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": usage
+        }
+
+    if settings.should_fail():
+        return _openai_error(settings.error_status)
+    include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+    def sse(choices, **extra):
+        chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model, "choices": choices, **extra}
+        return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+
+    async def stream():
+        async for piece in _stream_delays("openai", list(_chunks(text))):
+            yield sse([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+        yield sse([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if include_usage:
+            yield sse([], usage=usage)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
@@ -0,0 +1,6 @@
+# chatbot/migrations/__init__.py
+# 버전 관리형 스키마 마이그레이션 (chatbot / welfare-data-ingestor 공용 테이블 포함)
+
+from .runner import Migration, apply_migrations, discover_migrations, migrate, split_statements
+
+__all__ = ['Migration', 'apply_migrations', 'discover_migrations', 'migrate', 'split_statements']
@@ -0,0 +1,26 @@
+# chatbot/migrations/__main__.py
+"""
+스키마 마이그레이션 실행 (DB_HOST / DB_NAME / DB_USER / DB_PASSWORD 환경 변수 사용)
+
+실행 예:
+  cd chatbot && python -m migrations            # 미적용 마이그레이션 전부 적용
+  cd chatbot && python -m migrations --dry-run  # 적용 예정 목록만 출력
+"""
+import argparse
+import logging
+import sys
+
+from migrations.runner import migrate
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SAPORI 스키마 마이그레이션")
+    parser.add_argument("--target", type=int, default=None, help="이 버전까지만 적용")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    applied = migrate(target=args.target, dry_run=args.dry_run)
+    print(f"{'적용 예정' if args.dry_run else '적용 완료'}: {applied or '없음'}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# chatbot/migrations/runner.py
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger()
+
+VERSIONS_DIR = Path(__file__).parent / "versions"
+_VERSION_FILE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+# 첫 줄에 이 표시가 있으면 트랜잭션 없이 문장 단위로 실행 (CREATE INDEX CONCURRENTLY 등)
+NO_TRANSACTION_MARKER = "-- migrate:no-transaction"
+# 여러 인스턴스(배포 파이프라인 / Lambda)가 동시에 실행해도 한 곳만 적용하도록 잡는 advisory lock 키
+_ADVISORY_LOCK_ID = 0x5A90_1DB
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def sql(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+    @property
+    def no_transaction(self) -> bool:
+        return self.sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+
+def discover_migrations(directory: Path = VERSIONS_DIR) -> List[Migration]:
+    """versions/NNNN_이름.sql 파일을 버전 순으로 반환합니다. (버전 중복 시 ValueError)"""
+    migrations = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _VERSION_FILE.match(path.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"마이그레이션 버전 중복: {migrations[version].path.name}, {path.name}")
+        migrations[version] = Migration(version, match.group(2), path)
+    return [migrations[v] for v in sorted(migrations)]
+
+def split_statements(sql: str) -> List[str]:
+    """세미콜론으로 끝나는 줄 단위로 문장을 나눕니다. (주석만 있는 조각은 제외, 함수 본문($$) 미지원)"""
+    statements, current = [], []
+    for line in sql.splitlines():
+        current.append(line)
+        if line.rstrip().endswith(";"):
+            statements.append("\n".join(current))
+            current = []
+    statements.append("\n".join(current))
+
+    def has_code(statement: str) -> bool:
+        return any(line.strip() and not line.strip().startswith("--") for line in statement.splitlines())
+
+    return [s.strip() for s in statements if has_code(s)]
+
+def applied_versions(conn) -> set:
+    rows = conn.execute("SELECT version FROM schema_migrations").fetchall()
+    return {row[0] for row in rows}
+
+def apply_migrations(conn, target: Optional[int] = None, dry_run: bool = False) -> List[Migration]:
+    """
+    아직 적용되지 않은 마이그레이션을 버전 순으로 적용하고, 적용한(dry_run이면 적용할) 목록을 반환합니다.
+    각 마이그레이션은 자체 트랜잭션에서 실행되며 schema_migrations에 기록됩니다.
+    Args:
+        conn: psycopg 연결 (autocommit으로 전환됨)
+        target: 이 버전까지만 적용 (None이면 전부)
+    """
+    conn.autocommit = True
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version     INT PRIMARY KEY,
+            name        TEXT        NOT NULL,
+            applied_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    conn.execute("SELECT pg_advisory_lock(%s)", (_ADVISORY_LOCK_ID,))
+    try:
+        done = applied_versions(conn)
+        pending = [
+            m for m in discover_migrations()
+            if m.version not in done and (target is None or m.version <= target)
+        ]
+        for migration in pending:
+            if dry_run:
+                logger.info(f"[dry-run] 적용 예정: {migration.path.name}")
+                continue
+            logger.info(f"마이그레이션 적용: {migration.path.name}")
+            if migration.no_transaction:
+                for statement in split_statements(migration.sql):
+                    conn.execute(statement)
+                _record(conn, migration)
+            else:
+                with conn.transaction():
+                    conn.execute(migration.sql)
+                    _record(conn, migration)
+        return pending
+    finally:
+        conn.execute("SELECT pg_advisory_unlock(%s)", (_ADVISORY_LOCK_ID,))
+
+def _record(conn, migration: Migration):
+    conn.execute(
+        "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+        (migration.version, migration.name)
+    )
+
+def migrate(target: Optional[int] = None, dry_run: bool = False) -> List[str]:
+    """환경 변수(DB_*)의 DB에 새 연결을 맺어 apply_migrations를 실행하고, 적용한 파일 이름 목록을 반환합니다."""
+    import psycopg
+    from dependency import _connection_kwargs
+
+    with psycopg.connect(**_connection_kwargs()) as conn:
+        return [m.path.name for m in apply_migrations(conn, target=target, dry_run=dry_run)]
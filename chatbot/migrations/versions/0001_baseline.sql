@@ -0,0 +1,67 @@
+-- 기준 스키마 (chatbot / welfare-data-ingestor가 사용하는 기존 테이블)
+-- 운영 DB에는 이미 존재하므로 IF NOT EXISTS로 아무 것도 바꾸지 않고, 새 환경(로컬 / 테스트 DB)에서만 생성됩니다.
+CREATE EXTENSION IF NOT EXISTS vector;
+
+-- 상담 로그 (chatbot)
+CREATE TABLE IF NOT EXISTS cbt_logs (
+    id            BIGSERIAL PRIMARY KEY,
+    user_id       VARCHAR(64) NOT NULL,
+    session_id    VARCHAR(64) NOT NULL,
+    user_input    TEXT        NOT NULL,
+    bot_response  JSONB,
+    embedding     VECTOR(1024),
+    s3_url        TEXT,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- 주간 리포트 (chatbot)
+CREATE TABLE IF NOT EXISTS weekly_reports (
+    report_id         SERIAL PRIMARY KEY,
+    user_id           VARCHAR(64) NOT NULL,
+    start_date        DATE        NOT NULL,
+    end_date          DATE        NOT NULL,
+    report_title      TEXT,
+    report_content    TEXT,
+    emotions_summary  JSONB,
+    created_at        TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- 복지 서비스 (welfare-data-ingestor: WelfareRepository)
+CREATE TABLE IF NOT EXISTS welfare_services (
+    id                  TEXT PRIMARY KEY,
+    service_name        TEXT,
+    service_summary     TEXT,
+    embedding           VECTOR(1024),
+    province            TEXT,
+    city_district       TEXT,
+    department_name     TEXT,
+    target_audience     TEXT[],
+    life_cycle          TEXT[],
+    interest_theme      TEXT[],
+    support_cycle       TEXT,
+    support_type        TEXT,
+    application_method  TEXT,
+    last_modified_date  TEXT,
+    detail_link         TEXT
+);
+
+-- 장애인 구인 공고 (welfare-data-ingestor: EmploymentRepository)
+CREATE TABLE IF NOT EXISTS employment_jobs (
+    id                  BIGSERIAL PRIMARY KEY,
+    company_name        TEXT,
+    job_title           TEXT,
+    job_description     TEXT,
+    embedding           VECTOR(1024),
+    job_type            TEXT,
+    salary              TEXT,
+    salary_type         TEXT,
+    location            TEXT,
+    required_skills     TEXT,
+    required_career     TEXT,
+    required_education  TEXT,
+    last_modified_date  TEXT,
+    detail_link         TEXT,
+    term_date_start     DATE,
+    term_date_end       DATE,
+    term_date_str       TEXT
+);
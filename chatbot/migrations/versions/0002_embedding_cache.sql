@@ -0,0 +1,12 @@
+-- 임베딩 캐시 (chatbot / welfare-data-ingestor 공용)
+-- cache_key = sha256("{model_id}|{dimensions}|{정규화된 텍스트}")
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    cache_key    CHAR(64) PRIMARY KEY,
+    model_id     TEXT        NOT NULL,
+    dimensions   INT         NOT NULL,
+    embedding    VECTOR      NOT NULL,
+    created_at   TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Warm-up 시 최근 임베딩을 LRU로 적재 (ORDER BY created_at DESC LIMIT N)
+CREATE INDEX IF NOT EXISTS embedding_cache_created_at_idx ON embedding_cache (created_at DESC);
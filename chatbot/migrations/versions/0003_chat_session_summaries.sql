@@ -0,0 +1,8 @@
+-- 상담 세션 누적 요약 (최근 N턴 이전의 대화를 압축하여 프롬프트 크기를 일정하게 유지)
+-- summarized_turns = 요약에 반영된 cbt_logs 턴 수 (세션 첫 턴부터 순서대로)
+CREATE TABLE IF NOT EXISTS chat_session_summaries (
+    session_id        VARCHAR(64) PRIMARY KEY,
+    summary           TEXT        NOT NULL,
+    summarized_turns  INT         NOT NULL DEFAULT 0,
+    updated_at        TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,29 @@
+-- 채팅방(세션) 상태 (cbt_logs에 턴이 저장될 때마다 ChatRepository.log_cbt_session이 같은 문장에서 upsert)
+-- 목록 조회 / 턴 수 조회가 사용자의 누적 대화량과 무관하게 세션 1행만 읽도록 유지
+CREATE TABLE IF NOT EXISTS chat_sessions (
+    session_id       VARCHAR(64) PRIMARY KEY,
+    user_id          VARCHAR(64) NOT NULL,
+    turn_count       INT         NOT NULL DEFAULT 0,
+    last_message     TEXT,
+    last_emotion     TEXT,
+    last_distortion  TEXT,
+    last_updated     TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- 채팅방 목록 키셋 페이지네이션: WHERE user_id = ? AND (last_updated, session_id) < (?, ?) ORDER BY last_updated DESC, session_id DESC
+CREATE INDEX IF NOT EXISTS chat_sessions_user_updated_idx
+    ON chat_sessions (user_id, last_updated DESC, session_id DESC);
+
+-- 기존 cbt_logs로부터 최초 1회 채우기 (이미 있는 세션은 건너뜀)
+INSERT INTO chat_sessions (session_id, user_id, turn_count, last_message, last_emotion, last_distortion, last_updated)
+SELECT DISTINCT ON (session_id)
+    session_id,
+    user_id,
+    COUNT(*) OVER (PARTITION BY session_id),
+    user_input,
+    bot_response::jsonb ->> 'emotion',
+    bot_response::jsonb ->> 'detected_distortion',
+    created_at
+FROM cbt_logs
+ORDER BY session_id, created_at DESC
+ON CONFLICT (session_id) DO NOTHING;
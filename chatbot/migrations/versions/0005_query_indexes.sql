@@ -0,0 +1,33 @@
+-- migrate:no-transaction
+-- 핫 쿼리용 인덱스 (운영 테이블 쓰기를 막지 않도록 CONCURRENTLY, 문장 단위로 실행)
+-- 빌드가 중간에 실패하면 INVALID 인덱스가 남아 IF NOT EXISTS가 건너뛰므로, 해당 인덱스를 DROP 후 다시 실행하세요.
+
+-- 채팅 상세 키셋 페이지네이션 / 최근 대화 조회 (ChatRepository.get_session_messages, get_chat_history, get_session_turns)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS cbt_logs_session_created_id_idx
+    ON cbt_logs (session_id, created_at DESC, id DESC);
+
+-- 사용자별 기간 로그 (ReportRepository.get_logs_by_period: user_id = ? AND created_at >= ? AND created_at < ?)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS cbt_logs_user_created_idx
+    ON cbt_logs (user_id, created_at);
+
+-- 기간 내 로그가 있는 사용자 (ReportRepository.get_users_with_logs_in_period / get_report_batch_targets)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS cbt_logs_created_idx
+    ON cbt_logs (created_at);
+
+-- 사용자별 월간 리포트 / 존재 확인 (ReportRepository.find_reports_by_month, check_report_exists)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS weekly_reports_user_start_idx
+    ON weekly_reports (user_id, start_date);
+
+-- 기간별 리포트 작성 사용자 (ReportRepository.get_report_batch_targets)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS weekly_reports_period_idx
+    ON weekly_reports (start_date, end_date);
+
+-- 벡터 검색 (SearchRepository: ORDER BY embedding <=> ? LIMIT 10, 코사인 거리)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS welfare_services_embedding_hnsw_idx
+    ON welfare_services USING hnsw (embedding vector_cosine_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS employment_jobs_embedding_hnsw_idx
+    ON employment_jobs USING hnsw (embedding vector_cosine_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS cbt_logs_embedding_hnsw_idx
+    ON cbt_logs USING hnsw (embedding vector_cosine_ops);
@@ -0,0 +1,16 @@
+-- 테이블별 벡터 검색 모드 (SearchRepository가 읽어 1단계 후보 검색 방식을 정함, pgvector 0.7 이상)
+--   vector  : 원본 vector(1024) HNSW 인덱스로 바로 top-K (기본값)
+--   halfvec : (embedding::halfvec(1024)) HNSW 인덱스로 후보 rerank_candidates개 -> 원본 벡터로 정확히 재정렬
+--   binary  : (binary_quantize(embedding)::bit(1024)) 해밍 거리 HNSW 인덱스로 후보 -> 원본 벡터로 정확히 재정렬
+-- 모드 전환은 새 마이그레이션에서 해당 인덱스를 CONCURRENTLY로 만든 뒤 이 테이블을 UPDATE 하세요. (README 참고)
+CREATE TABLE IF NOT EXISTS vector_search_modes (
+    table_name         TEXT        PRIMARY KEY,
+    mode               TEXT        NOT NULL DEFAULT 'vector' CHECK (mode IN ('vector', 'halfvec', 'binary')),
+    rerank_candidates  INT         NOT NULL DEFAULT 40 CHECK (rerank_candidates BETWEEN 10 AND 1000),
+    updated_at         TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO vector_search_modes (table_name) VALUES
+    ('welfare_services'),
+    ('employment_jobs')
+ON CONFLICT (table_name) DO NOTHING;
@@ -0,0 +1,19 @@
+-- migrate:no-transaction
+-- 상담 로그 임베딩 상태: 임베딩 생성 실패 / 지연 시 0 벡터 대신 NULL + 'pending'으로 저장하고 백필 작업이 채움
+--   ready   : embedding 저장됨
+--   pending : 백필 대기 (embedding IS NULL)
+--   failed  : EMBEDDING_BACKFILL_MAX_ATTEMPTS회 실패하여 포기 (embedding IS NULL)
+-- 상수 기본값 컬럼 추가는 테이블을 다시 쓰지 않음 (CHECK 검증용 1회 스캔만 수행)
+ALTER TABLE cbt_logs
+    ADD COLUMN IF NOT EXISTS embedding_status TEXT NOT NULL DEFAULT 'ready'
+        CHECK (embedding_status IN ('ready', 'pending', 'failed')),
+    ADD COLUMN IF NOT EXISTS embedding_attempts SMALLINT NOT NULL DEFAULT 0;
+
+-- 기존 0 벡터 / NULL 임베딩을 백필 대상으로 전환 (0 벡터는 코사인 거리가 정의되지 않아 검색과 인덱스를 오염시킴)
+UPDATE cbt_logs
+SET embedding = NULL, embedding_status = 'pending'
+WHERE embedding_status = 'ready' AND (embedding IS NULL OR vector_norm(embedding) = 0);
+
+-- 백필 대상 조회 (ChatRepository.claim_pending_embeddings: WHERE embedding_status = 'pending' ORDER BY id ... SKIP LOCKED)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS cbt_logs_embedding_pending_idx
+    ON cbt_logs (id) WHERE embedding_status = 'pending';
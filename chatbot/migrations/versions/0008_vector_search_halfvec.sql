@@ -0,0 +1,15 @@
+-- migrate:no-transaction
+-- 복지/구인 벡터 검색의 halfvec 표현식 인덱스 (CONCURRENTLY, 문장 단위로 실행)
+-- 모드는 vector로 둡니다. halfvec 전환은 recall을 확인한 뒤 운영자가 직접 UPDATE 하세요. (README 참고)
+-- 빌드가 중간에 실패하면 INVALID 인덱스가 남아 IF NOT EXISTS가 건너뛰므로, 해당 인덱스를 DROP 후 다시 실행하세요.
+-- (SearchRepository는 유효한 표현식 인덱스가 없는 모드를 vector로 대체하므로 전환 전/실패 시에도 전체 스캔하지 않음)
+
+-- 0006에서 넣었던 cbt_logs 행 제거 (SearchRepository가 cbt_logs 검색에 쓰지 않음)
+DELETE FROM vector_search_modes WHERE table_name = 'cbt_logs';
+
+-- SearchRepository._CANDIDATE_ORDER["halfvec"]와 같은 표현식
+CREATE INDEX CONCURRENTLY IF NOT EXISTS welfare_services_embedding_halfvec_idx
+    ON welfare_services USING hnsw ((embedding::halfvec(1024)) halfvec_cosine_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS employment_jobs_embedding_halfvec_idx
+    ON employment_jobs USING hnsw ((embedding::halfvec(1024)) halfvec_cosine_ops);
@@ -0,0 +1,18 @@
+# chatbot/prompts/cacheable.py
+
+class CacheablePrompt(str):
+    """
+    정적 프리픽스 + 동적 서픽스로 구성된 프롬프트 (str 그대로 사용 가능)
+
+    모든 요청에서 바이트 단위로 동일한 static_prefix를 앞에 두고, 턴/사용자마다 바뀌는 값은
+    dynamic_suffix에만 넣습니다. 이렇게 해야 vLLM automatic prefix caching, Gemini implicit caching,
+    Vertex AI CachedContent가 프리픽스 구간의 입력 토큰 처리를 재사용할 수 있습니다.
+    """
+    static_prefix: str
+    dynamic_suffix: str
+
+    def __new__(cls, static_prefix: str, dynamic_suffix: str):
+        prompt = super().__new__(cls, static_prefix + dynamic_suffix)
+        prompt.static_prefix = static_prefix
+        prompt.dynamic_suffix = dynamic_suffix
+        return prompt
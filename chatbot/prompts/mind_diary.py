@@ -1,18 +1,10 @@
 # chatbot/prompts/mind_diary.py
+from prompts.cacheable import CacheablePrompt
 
-MIND_DIARY_PROMPT_TEMPLATE = """
+# 정적 프리픽스: 요청마다 바뀌는 값이 없어야 함 (provider 프리픽스 캐시 대상)
+MIND_DIARY_STATIC_PREFIX = """
 당신은 전문 심리상담사이자 CBT(인지행동치료) 전문가 '도란이'입니다.
-사용자 '{user_name}'님이 작성한 '마음일기'를 읽고, 먼저 다가가서 대화를 시작해야 합니다.
-
-[마음일기 정보]
-- 주제(질문): {question}
-- 작성 내용: "{content}"
-- 작성 일시: {recorded_at}
-
-[감정 분석 결과]
-- 주된 감정: {top_emotion}
-- 감정 세부 구성:
-{emotion_details_str}
+사용자가 작성한 '마음일기'(맨 아래 [마음일기 정보])를 읽고, 먼저 다가가서 대화를 시작해야 합니다.
 
 [분석 기준: 인지 오류 및 긍정 상태]
 1. 흑백사고: 완전한 실패 아니면 대단한 성공, 양극단으로만 구분함.
@@ -40,13 +32,30 @@ MIND_DIARY_PROMPT_TEMPLATE = """
    - 이미 긍정적이라면 그 마음을 지지하고 응원해주세요.
 
 **출력 형식 (반드시 JSON 포맷 준수):**
-{{
+{
     "empathy": "따뜻한 공감 및 첫인사",
     "detected_distortion": "탐지된 항목 (예: '긍정 정서 강화', '흑백사고' 등. 없으면 '없음')",
     "analysis": "일기 내용에 대한 심리적 분석",
     "socratic_question": "대화를 이어가는 열린 질문",
     "alternative_thought": "힘이 되는 긍정적인 관점 제안"
-}}
+}
+
+---
+"""
+
+# 동적 서픽스: 사용자 / 일기 / 감정 분석 결과
+MIND_DIARY_DYNAMIC_TEMPLATE = """[사용자 이름]
+{user_name}
+
+[마음일기 정보]
+- 주제(질문): {question}
+- 작성 내용: "{content}"
+- 작성 일시: {recorded_at}
+
+[감정 분석 결과]
+- 주된 감정: {top_emotion}
+- 감정 세부 구성:
+{emotion_details_str}
 """
 
 def get_mind_diary_prompt(
@@ -56,7 +65,7 @@ def get_mind_diary_prompt(
         top_emotion: str,
         emotion_details: dict,
         recorded_at: str
-) -> str:
+) -> CacheablePrompt:
     # 감정 수치를 보기 좋은 문자열로 변환 (예: - happy: 10% ...)
     # 값이 0보다 큰 감정만 추려서 표시
     details_str = ""
@@ -66,11 +75,14 @@ def get_mind_diary_prompt(
             percent = int(score * 100)
             details_str += f"  - {emo}: {percent}%\n"
 
-    return MIND_DIARY_PROMPT_TEMPLATE.format(
-        user_name=user_name,
-        question=question,
-        content=content,
-        top_emotion=top_emotion,
-        emotion_details_str=details_str,
-        recorded_at=recorded_at
+    return CacheablePrompt(
+        MIND_DIARY_STATIC_PREFIX,
+        MIND_DIARY_DYNAMIC_TEMPLATE.format(
+            user_name=user_name,
+            question=question,
+            content=content,
+            top_emotion=top_emotion,
+            emotion_details_str=details_str,
+            recorded_at=recorded_at
+        )
     )
@@ -1,20 +1,18 @@
 # chatbot/prompts/reframing.py
 import json
 
+from prompts.cacheable import CacheablePrompt
+from util.token_budget import estimate_tokens, truncate_to_tokens
+
 # =============================================================================
 # [Text] 텍스트 상담용 템플릿
 # =============================================================================
-REFRAMING_PROMPT_TEMPLATE = """
+# 정적 프리픽스: 요청마다 바뀌는 값이 없어야 함 (provider 프리픽스 캐시 대상)
+REFRAMING_STATIC_PREFIX = """
 당신은 따뜻하고 통찰력 있는 전문 심리상담사 '도란이'입니다.
 내담자(User)는 현재 심리적인 어려움을 겪고 있거나, 마음의 정리가 필요해 찾아왔습니다.
-**[호칭 가이드]** 아래 [이전 대화 맥락]을 참고하여 내담자의 이름을 유추할 수 있다면 그 이름을 사용하고, 알 수 없다면 '내담자'라고 지칭하세요.
-현재 이 세션의 **{turn_count}번째 대화**가 진행 중입니다.
-
-[이전 대화 맥락]
-{history_text}
-
-[현재 내담자의 말]
-"{user_input}"
+**[호칭 가이드]** 맨 아래 [이전 대화 맥락]을 참고하여 내담자의 이름을 유추할 수 있다면 그 이름을 사용하고, 알 수 없다면 '내담자'라고 지칭하세요.
+이 세션의 현재 턴 수는 맨 아래 [세션 정보]에 있습니다.
 
 **⭐⭐[핵심 지시사항: 텍스트 심층 분석]⭐⭐**
 내담자의 텍스트 표면에 드러난 말이 아닌, **행간에 숨겨진 감정**을 포착하세요.
@@ -68,31 +66,38 @@ REFRAMING_PROMPT_TEMPLATE = """
 3. 'neutral'은 오직 `detected_distortion`이 '없음'이거나 '긍정 정서 강화'일 때만 허용됩니다.
 
 **출력 형식 (JSON 포맷 준수):**
-{{
+{
     "empathy": "반영적 경청 및 공감 멘트",
     "detected_distortion": "탐지된 항목 (예: 흑백사고, 긍정 정서 강화 등)",
     "analysis": "내담자를 위한 교육적 분석 코멘트",
     "socratic_question": "생각을 확장하거나 종료를 권유하는 질문",
     "alternative_thought": "건강한 대안적 사고 또는 지지와 격려",
     "top_emotion": "happy, sad, neutral, angry, anxiety, surprise 중 *택 1* (Neutral 지양)"
-}}
+}
+
+---
+"""
+
+# 동적 서픽스: 턴 수 / 대화 맥락 / 현재 발화
+REFRAMING_DYNAMIC_TEMPLATE = """[세션 정보]
+현재 이 세션의 **{turn_count}번째 대화**가 진행 중입니다.
+
+[이전 대화 맥락]
+{history_text}
+
+[현재 내담자의 말]
+"{user_input}"
 """
 
 # =============================================================================
 # [Voice] 음성 상담용 템플릿
 # =============================================================================
-VOICE_REFRAMING_PROMPT_TEMPLATE = """
+VOICE_REFRAMING_STATIC_PREFIX = """
 당신은 따뜻하고 통찰력 있는 전문 심리상담사 '도란이'입니다.
-현재 내담자 **'{user_name}'님**과 **음성**으로 대화를 나누고 있으며, 이 세션의 **{turn_count}번째 대화**가 진행 중입니다.
-
-[음성 감정 분석 정보]
-{emotion_desc}
-
-[현재 내담자의 말 (STT)]
-"{user_input}"
+현재 내담자와 **음성**으로 대화를 나누고 있습니다. 내담자의 이름과 이 세션의 턴 수는 맨 아래 [세션 정보]에 있습니다.
 
 **⭐⭐[핵심 지시사항: 감정의 교차 검증 (Cross-Validation)]⭐⭐**
-당신은 위 [음성 감정 분석 정보]와 [내담자의 말]을 비교하여 **가장 타당한 감정**을 도출해야 합니다. 기계적인 음성 분석 결과보다 **당신의 문맥 파악 능력**이 더 중요합니다. 아래 **우선순위 로직**을 반드시 따르세요.
+당신은 맨 아래 [음성 감정 분석 정보]와 [현재 내담자의 말 (STT)]을 비교하여 **가장 타당한 감정**을 도출해야 합니다. 기계적인 음성 분석 결과보다 **당신의 문맥 파악 능력**이 더 중요합니다. 아래 **우선순위 로직**을 반드시 따르세요.
 
 1. **내용과 음성의 '불일치' 해결 (Conflict Resolution):**
    - **Case A (방어기제/숨김):** 내담자의 말은 "괜찮아요", "별거 아니에요"처럼 평범하지만(Neutral), 음성 정보가 'Sad'나 'Anxiety'라면?
@@ -107,9 +112,6 @@ VOICE_REFRAMING_PROMPT_TEMPLATE = """
 3. **위기 상황 (안전 최우선):**
    - 텍스트에서 자살, 자해, 범죄 암시가 보이면 음성 결과가 무엇이든 무조건 **위기 개입** 매뉴얼을 따르세요.
 
-[이전 대화 맥락]
-{history_text}
-
 [상담사 분석 가이드라인 (CBT 기반)]
 1. 흑백사고: 모든 것을 '성공 아니면 실패'로만 보는 이분법적 사고.
 2. 선택적 추상: 긍정적인 면은 무시하고 사소한 부정적 세부 사항에만 집착하는 것.
@@ -148,57 +150,127 @@ VOICE_REFRAMING_PROMPT_TEMPLATE = """
 3. 'neutral'은 오직 `detected_distortion`이 '없음'이거나 '긍정 정서 강화'일 때만 허용됩니다.
 
 **출력 형식 (JSON 포맷 준수):**
-{{
+{
     "empathy": "판단된 감정(음성/텍스트 교차검증)을 반영한 공감 멘트",
     "detected_distortion": "탐지된 항목 (예: 흑백사고, 긍정 정서 강화 등)",
     "analysis": "내담자를 위한 교육적 분석 코멘트",
     "socratic_question": "생각을 확장하거나 종료를 권유하는 질문",
     "alternative_thought": "건강한 대안적 사고 또는 지지와 격려",
     "top_emotion": "최종 판단된 감정 (happy, sad, neutral, angry, anxiety, surprise 중 택 1. *주의: 교차 검증 결과에 따를 것*)"
-}}
+}
+
+---
+"""
+
+VOICE_REFRAMING_DYNAMIC_TEMPLATE = """[세션 정보]
+현재 내담자 **'{user_name}'님**과 이 세션의 **{turn_count}번째 대화**가 진행 중입니다.
+
+[이전 대화 맥락]
+{history_text}
+
+[음성 감정 분석 정보]
+{emotion_desc}
+
+[현재 내담자의 말 (STT)]
+"{user_input}"
 """
 
 # =============================================================================
 # [Helper] 헬퍼 함수
 # =============================================================================
-def _format_history(history: list) -> str:
-    if not history:
+def extract_bot_message(bot_response, detailed: bool = False) -> str:
+    """저장된 bot_response(JSON 문자열 또는 dict)에서 상담사 발화를 꺼냅니다."""
+    if isinstance(bot_response, str):
+        try:
+            res = json.loads(bot_response)
+        except:
+            res = {"empathy": bot_response}
+    else:
+        res = bot_response or {}
+
+    if not detailed:
+        return res.get('socratic_question') or res.get('empathy')
+
+    # 요약용: 공감/인지 오류/대안 사고까지 포함
+    parts = [res.get('empathy')]
+    if res.get('detected_distortion'):
+        parts.append(f"(인지 오류: {res['detected_distortion']})")
+    parts.append(res.get('alternative_thought'))
+    parts.append(res.get('socratic_question'))
+    return " ".join(p for p in parts if p)
+
+def _format_history(history: list, summary: str = None, start_turn: int = 1, token_budget: int = None) -> str:
+    """
+    [이전 대화 맥락] 구성: 세션 누적 요약 + 최근 N턴 원문
+    token_budget이 주어지면 요약은 예산의 절반 이내로 자르고, 남은 예산 안에서
+    최신 턴부터 채워 넣습니다. (세션이 길어져도 프롬프트 크기가 일정하게 유지됨)
+    """
+    if not history and not summary:
         return "(없음. 대화 시작)"
 
-    history_text = ""
-    for idx, (past_input, past_response) in enumerate(history):
-        if isinstance(past_response, str):
-            try:
-                res = json.loads(past_response)
-            except:
-                res = {"empathy": past_response}
-        else:
-            res = past_response or {}
-
-        bot_msg = res.get('socratic_question') or res.get('empathy')
-        history_text += f"Turn {idx+1}:\n - 내담자: {past_input}\n - 상담사: {bot_msg}\n"
-    return history_text
-
-def get_reframing_prompt(user_input: str, history: list, turn_count: int = 1) -> str:
-    """텍스트 상담용 (user_name 없음, 프롬프트에서 추론 유도)"""
-    return REFRAMING_PROMPT_TEMPLATE.format(
-        user_input=user_input,
-        history_text=_format_history(history),
-        turn_count=turn_count
+    summary_text = ""
+    if summary:
+        if token_budget:
+            summary = truncate_to_tokens(summary, token_budget // 2, from_start=True)
+        summary_text = f"[이전 상담 요약]\n{summary}\n\n[최근 대화]\n"
+
+    remaining = token_budget - estimate_tokens(summary_text) if token_budget else None
+    # 한 턴이 예산을 독차지하지 않도록 턴 단위 상한 적용
+    per_turn = max(remaining // 2, 1) if remaining else None
+
+    turn_lines = []
+    for idx in range(len(history) - 1, -1, -1):
+        past_input, past_response = history[idx]
+        bot_msg = extract_bot_message(past_response)
+        if per_turn:
+            past_input = truncate_to_tokens(past_input or "", per_turn // 2)
+            bot_msg = truncate_to_tokens(bot_msg or "", per_turn // 2)
+        line = f"Turn {start_turn + idx}:\n - 내담자: {past_input}\n - 상담사: {bot_msg}\n"
+        if remaining is not None:
+            if estimate_tokens(line) > remaining:
+                break
+            remaining -= estimate_tokens(line)
+        turn_lines.append(line)
+
+    return summary_text + "".join(reversed(turn_lines))
+
+def _history_start_turn(history: list, turn_count: int) -> int:
+    """최근 N턴 원문의 첫 번째 턴 번호 (turn_count = 저장된 전체 턴 수)"""
+    return max(1, turn_count - len(history) + 1)
+
+def get_reframing_prompt(user_input: str, history: list, turn_count: int = 1,
+                         summary: str = None, token_budget: int = None) -> CacheablePrompt:
+    """
+    텍스트 상담용 (user_name 없음, 프롬프트에서 추론 유도)
+    Args:
+        summary: 최근 N턴 이전 대화의 누적 요약 (chat_session_summaries)
+        token_budget: [이전 대화 맥락]에 허용할 추정 토큰 수 (None이면 제한 없음)
+    """
+    return CacheablePrompt(
+        REFRAMING_STATIC_PREFIX,
+        REFRAMING_DYNAMIC_TEMPLATE.format(
+            user_input=user_input,
+            history_text=_format_history(history, summary, _history_start_turn(history, turn_count), token_budget),
+            turn_count=turn_count
+        )
     )
 
-def get_voice_reframing_prompt(user_input: str, history: list, emotion: dict, user_name: str = "내담자", turn_count: int = 1) -> str:
-    """음성 상담용 (user_name 명시적으로 받음)"""
+def get_voice_reframing_prompt(user_input: str, history: list, emotion: dict, user_name: str = "내담자", turn_count: int = 1,
+                               summary: str = None, token_budget: int = None) -> CacheablePrompt:
+    """음성 상담용 (user_name 명시적으로 받음, summary/token_budget은 get_reframing_prompt와 동일)"""
     # 감정 데이터: {'top_emotion': 'anxiety', 'confidence': 0.9, ...}
     top_emotion = emotion.get('top_emotion', 'neutral')
     confidence = emotion.get('confidence', 0.0)
 
     emotion_desc = f"현재 내담자의 목소리 분석 결과, 주된 감정은 '{top_emotion}'이며 강도는 {confidence}입니다."
 
-    return VOICE_REFRAMING_PROMPT_TEMPLATE.format(
-        user_name=user_name,
-        emotion_desc=emotion_desc,
-        history_text=_format_history(history),
-        user_input=user_input,
-        turn_count=turn_count
+    return CacheablePrompt(
+        VOICE_REFRAMING_STATIC_PREFIX,
+        VOICE_REFRAMING_DYNAMIC_TEMPLATE.format(
+            user_name=user_name,
+            emotion_desc=emotion_desc,
+            history_text=_format_history(history, summary, _history_start_turn(history, turn_count), token_budget),
+            user_input=user_input,
+            turn_count=turn_count
+        )
     )
@@ -2,7 +2,7 @@
 
 REPORT_PROMPT_TEMPLATE = """
 당신은 사용자의 마음을 치유하는 'AI 심리 작가'입니다.
-아래는 사용자가 지난 일주일간 챗봇과 나눈 감정 일기(대화 로그)입니다.
+아래는 사용자가 지난 일주일({period})간 챗봇과 나눈 감정 일기(대화 로그)입니다.
 
 [대화 로그]
 {logs_text}
@@ -17,8 +17,7 @@ REPORT_PROMPT_TEMPLATE = """
 {{
   "title": "소설 제목 (예: 위기 속에 피어난 성장)",
   "content": "소설 본문 텍스트...",
-  "emotions": {{"우울": 3, "기쁨": 1, "불안": 2}}, 
-  "period": "{period}"
+  "emotions": [{{"emotion": "우울", "count": 3}}, {{"emotion": "기쁨", "count": 1}}, {{"emotion": "불안", "count": 2}}]
 }}
 """
 
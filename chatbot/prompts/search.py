@@ -1,6 +1,8 @@
 # chatbot/prompts/search.py
+from prompts.cacheable import CacheablePrompt
 
-SEARCH_PROMPT_TEMPLATE = """Human:
+# 정적 프리픽스: 요청마다 바뀌는 값이 없어야 함 (provider 프리픽스 캐시 대상)
+SEARCH_STATIC_PREFIX = """Human:
 당신은 대한민국 복지 정책 및 구인 정보 데이터베이스를 기반으로 답변하는 전문가 '복지알리미'입니다. 당신의 답변은 오직 [참고자료]에만 근거해야 하며, 절대 당신의 외부 지식을 사용해서는 안 됩니다.
 
 **답변 생성 로직 (매우 중요):**
@@ -31,7 +33,10 @@ SEARCH_PROMPT_TEMPLATE = """Human:
 -   'answer'는 Markdown 형식의 문자열입니다. JSON 표준에 맞게 줄바꿈 등은 이스케이프 처리되어야 합니다.
 -   'services'는 JSON 객체의 리스트입니다. 각 객체는 'service_name', 'summary', 'target', 'region', 'url' 키를 포함해야 합니다.
 
----
+"""
+
+# 동적 서픽스: 검색 결과 / 사용자 정보 / 질문
+SEARCH_DYNAMIC_TEMPLATE = """---
 [참고자료]
 {context_str}
 ---
@@ -44,12 +49,15 @@ SEARCH_PROMPT_TEMPLATE = """Human:
 Assistant:
 """
 
-def get_search_prompt(context_str: str, user_info: str, user_chat: str) -> str:
+def get_search_prompt(context_str: str, user_info: str, user_chat: str) -> CacheablePrompt:
     """
     기존 get_final_prompt의 이름을 명확하게 변경
     """
-    return SEARCH_PROMPT_TEMPLATE.format(
-        context_str=context_str,
-        user_info=user_info,
-        user_chat=user_chat
+    return CacheablePrompt(
+        SEARCH_STATIC_PREFIX,
+        SEARCH_DYNAMIC_TEMPLATE.format(
+            context_str=context_str,
+            user_info=user_info,
+            user_chat=user_chat
+        )
     )
@@ -0,0 +1,58 @@
+# chatbot/prompts/summary.py
+from prompts.cacheable import CacheablePrompt
+from prompts.reframing import extract_bot_message
+
+# 정적 프리픽스: 요청마다 바뀌는 값이 없어야 함 (provider 프리픽스 캐시 대상)
+SESSION_SUMMARY_STATIC_PREFIX = """
+당신은 심리상담 기록을 정리하는 보조 상담사입니다.
+맨 아래 [기존 요약]과 [새로 추가된 대화]를 합쳐, 다음 상담에서 상담사 '도란이'가 참고할 **누적 요약**을 작성하세요.
+
+**[요약 지시사항]**
+1. 내담자의 이름(언급된 경우), 주요 고민과 상황, 반복되는 감정 흐름을 유지하세요.
+2. 지금까지 탐지된 인지 오류와 내담자가 얻은 통찰, 상담사가 제안한 대안적 사고를 포함하세요.
+3. 위기 신호(자살, 자해 등)가 언급된 적이 있다면 반드시 남기세요.
+4. 인사말이나 반복되는 공감 표현은 생략하고, 사실과 맥락 위주로 간결하게 작성하세요.
+5. 기존 요약의 중요한 내용은 새 대화와 충돌하지 않는 한 삭제하지 마세요.
+6. 요약 길이 제한은 맨 아래 [요약 길이 제한]을 따르세요.
+
+**출력 형식 (JSON 포맷 준수):**
+{
+    "summary": "누적 요약 (3인칭 서술, 한국어)"
+}
+
+---
+"""
+
+SESSION_SUMMARY_DYNAMIC_TEMPLATE = """[요약 길이 제한]
+공백 포함 {max_chars}자 이내
+
+[기존 요약]
+{previous_summary}
+
+[새로 추가된 대화]
+{turns_text}
+"""
+
+def get_session_summary_prompt(previous_summary: str, turns: list, start_turn: int = 1, max_chars: int = 800) -> CacheablePrompt:
+    """
+    세션 누적 요약 갱신용 프롬프트
+    Args:
+        turns: [(user_input, bot_response), ...] 요약에 새로 반영할 턴 (오래된 순)
+        start_turn: turns[0]의 세션 내 턴 번호
+    """
+    turns_text = ""
+    for idx, (past_input, past_response) in enumerate(turns):
+        turns_text += (
+            f"Turn {start_turn + idx}:\n"
+            f" - 내담자: {past_input}\n"
+            f" - 상담사: {extract_bot_message(past_response, detailed=True)}\n"
+        )
+
+    return CacheablePrompt(
+        SESSION_SUMMARY_STATIC_PREFIX,
+        SESSION_SUMMARY_DYNAMIC_TEMPLATE.format(
+            max_chars=max_chars,
+            previous_summary=previous_summary or "(없음)",
+            turns_text=turns_text or "(없음)"
+        )
+    )
@@ -0,0 +1,22 @@
+# chatbot/repository/async_repository.py
+from util.concurrency import run_blocking
+
+class AsyncRepository:
+    """
+    동기 Repository를 감싸 모든 public 메서드를 await 가능하게 만드는 어댑터.
+    DB 호출은 전용 스레드 풀에서 실행되므로 이벤트 루프를 막지 않습니다.
+
+    예) history = await AsyncRepository(chat_repo).get_chat_history(session_id, limit=5)
+    """
+    def __init__(self, repo):
+        self._repo = repo
+
+    def __getattr__(self, name):
+        attr = getattr(self._repo, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        async def _call(*args, **kwargs):
+            return await run_blocking(attr, *args, **kwargs)
+
+        return _call
@@ -3,6 +3,8 @@ import json
 import logging
 from fastapi import Depends
 from dependency import get_db_conn
+from repository.pipeline import fetch_pipelined
+from repository.vector import to_vector
 
 logger = logging.getLogger()
 
@@ -28,11 +30,60 @@ class ChatRepository:
             logger.error(f"대화 내역 조회 실패: {e}")
             return []
 
-    def log_cbt_session(self, user_id: str, session_id: str, user_input: str, bot_response: dict, embedding: list, s3_url: str = None):
+    def get_session_context(self, session_id: str, history_limit: int, include_summary: bool = True) -> tuple:
+        """
+        상담 턴 시작 시 필요한 세션 맥락을 한 번의 왕복(파이프라인)으로 조회
+        Returns:
+            (history, turn_count, summary_row) - history는 오래된 순, summary_row는 (summary, summarized_turns) 또는 None
+        """
+        statements = [
+            ("""
+                SELECT user_input, bot_response
+                FROM cbt_logs
+                WHERE session_id = %s
+                ORDER BY created_at DESC
+                LIMIT %s
+            """, (session_id, history_limit)),
+            ("SELECT turn_count FROM chat_sessions WHERE session_id = %s", (session_id,)),
+        ]
+        if include_summary:
+            statements.append((
+                "SELECT summary, summarized_turns FROM chat_session_summaries WHERE session_id = %s", (session_id,)
+            ))
+        try:
+            results = fetch_pipelined(self.conn, statements)
+            history = results[0][::-1]
+            turn_count = results[1][0][0] if results[1] else 0
+            summary_row = results[2][0] if include_summary and results[2] else None
+            return history, turn_count, summary_row
+        except Exception as e:
+            logger.error(f"세션 맥락 조회 실패: {e}")
+            self.conn.rollback()
+            return [], 0, None
+
+    def log_cbt_session(self, user_id: str, session_id: str, user_input: str, bot_response: dict, embedding: list | None, s3_url: str = None):
+        # cbt_logs 저장과 chat_sessions(채팅방 상태) 갱신을 한 문장(한 왕복, 한 트랜잭션)으로 처리
+        # 늦게 도착한 이전 턴은 turn_count만 올리고 last_* 필드는 덮어쓰지 않음
+        # embedding이 None(생성 실패 / 지연)이면 NULL + 'pending'으로 저장하고 백필 작업이 채움
         sql = """
-            INSERT INTO cbt_logs (user_id, session_id, user_input, bot_response, embedding, s3_url)
-            VALUES (%s, %s, %s, %s, %s, %s)
+            WITH inserted AS (
+                INSERT INTO cbt_logs (user_id, session_id, user_input, bot_response, embedding, embedding_status, s3_url)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                RETURNING user_id, session_id, user_input, created_at
+            )
+            INSERT INTO chat_sessions (session_id, user_id, turn_count, last_message, last_emotion, last_distortion, last_updated)
+            SELECT session_id, user_id, 1, user_input, %s, %s, created_at FROM inserted
+            ON CONFLICT (session_id) DO UPDATE
+                SET turn_count = chat_sessions.turn_count + 1,
+                    last_message = CASE WHEN EXCLUDED.last_updated >= chat_sessions.last_updated
+                        THEN EXCLUDED.last_message ELSE chat_sessions.last_message END,
+                    last_emotion = CASE WHEN EXCLUDED.last_updated >= chat_sessions.last_updated
+                        THEN EXCLUDED.last_emotion ELSE chat_sessions.last_emotion END,
+                    last_distortion = CASE WHEN EXCLUDED.last_updated >= chat_sessions.last_updated
+                        THEN EXCLUDED.last_distortion ELSE chat_sessions.last_distortion END,
+                    last_updated = GREATEST(chat_sessions.last_updated, EXCLUDED.last_updated)
         """
+        details = bot_response if isinstance(bot_response, dict) else {}
         try:
             with self.conn.cursor() as cur:
                 cur.execute(sql, (
@@ -40,8 +91,11 @@ class ChatRepository:
                     session_id,
                     user_input,
                     json.dumps(bot_response, ensure_ascii=False),
-                    json.dumps(embedding),
-                    s3_url  # [핵심] DB에 저장 (없으면 None)
+                    to_vector(embedding) if embedding is not None else None,
+                    "ready" if embedding is not None else "pending",
+                    s3_url,  # [핵심] DB에 저장 (없으면 None)
+                    details.get("emotion"),
+                    details.get("detected_distortion")
                 ))
                 self.conn.commit()
                 logger.info(f"CBT 로그 DB 저장 완료 (Session: {session_id})")
@@ -49,58 +103,120 @@ class ChatRepository:
             logger.error(f"CBT 로그 저장 실패: {e}")
             self.conn.rollback()
 
-    def get_user_sessions(self, user_id: str) -> list:
-        """사용자의 채팅방 목록 조회"""
+    def claim_pending_embeddings(self, limit: int) -> list:
+        """
+        임베딩 백필 대상 행을 잠그고 가져옵니다. (다른 워커가 잠근 행은 건너뜀)
+        잠금은 save_backfilled_embeddings의 커밋(또는 롤백)까지 유지됩니다.
+        Returns:
+            [(id, user_input), ...]
+        """
         sql = """
-            WITH recent_logs AS (
-                SELECT 
-                    session_id,
-                    user_input,
-                    created_at,
-                    bot_response,
-                    ROW_NUMBER() OVER(PARTITION BY session_id ORDER BY created_at DESC) as rn
-                FROM cbt_logs
-                WHERE user_id = %s
-            )
-            SELECT session_id, user_input, created_at, bot_response
-            FROM recent_logs
-            WHERE rn = 1
-            ORDER BY created_at DESC;
+            SELECT id, user_input
+            FROM cbt_logs
+            WHERE embedding_status = 'pending'
+            ORDER BY id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
         """
+        with self.conn.cursor() as cur:
+            cur.execute(sql, (limit,))
+            return cur.fetchall()
+
+    def save_backfilled_embeddings(self, embedded: list, failed_ids: list, max_attempts: int):
+        """
+        백필 결과를 한 트랜잭션으로 반영하고 잠금을 풉니다.
+        Args:
+            embedded: [(id, embedding), ...] -> 'ready'
+            failed_ids: 이번에 실패한 id -> 시도 횟수 +1, max_attempts에 도달하면 'failed'
+        """
+        try:
+            with self.conn.cursor() as cur:
+                if embedded:
+                    # executemany는 파이프라인으로 전송되므로 건수와 무관하게 한 번의 왕복
+                    cur.executemany(
+                        "UPDATE cbt_logs SET embedding = %s, embedding_status = 'ready' WHERE id = %s",
+                        [(to_vector(embedding), log_id) for log_id, embedding in embedded]
+                    )
+                if failed_ids:
+                    cur.execute("""
+                        UPDATE cbt_logs
+                        SET embedding_attempts = embedding_attempts + 1,
+                            embedding_status = CASE WHEN embedding_attempts + 1 >= %s THEN 'failed' ELSE 'pending' END
+                        WHERE id = ANY(%s)
+                    """, (max_attempts, list(failed_ids)))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def get_user_sessions(self, user_id: str, limit: int, after: tuple = None) -> list:
+        """
+        사용자의 채팅방 목록 조회 (chat_sessions, 최신순 키셋 페이지네이션)
+        Args:
+            after: 이전 페이지 마지막 행의 (last_updated, session_id), 첫 페이지는 None
+        Returns:
+            [(session_id, last_message, last_updated, last_emotion, last_distortion), ...]
+        """
+        sql = """
+            SELECT session_id, last_message, last_updated, last_emotion, last_distortion
+            FROM chat_sessions
+            WHERE user_id = %s
+        """
+        params = [user_id]
+        if after:
+            sql += " AND (last_updated, session_id) < (%s, %s)"
+            params.extend(after)
+        sql += " ORDER BY last_updated DESC, session_id DESC LIMIT %s"
+        params.append(limit)
         try:
             with self.conn.cursor() as cur:
-                cur.execute(sql, (user_id,))
+                cur.execute(sql, tuple(params))
                 return cur.fetchall()
         except Exception as e:
             logger.error(f"세션 목록 조회 실패: {e}")
+            self.conn.rollback()
             return []
 
-    def get_session_messages(self, session_id: str, limit: int, offset: int) -> tuple:
-        count_sql = "SELECT COUNT(*) FROM cbt_logs WHERE session_id = %s"
+    def get_session_messages(self, session_id: str, limit: int, offset: int = 0, before: tuple = None) -> tuple:
+        """
+        세션 대화 상세 조회 (최신순)
+        - before가 있으면 키셋 페이지네이션: (created_at, id) < before 인 행부터 limit개 (페이지 깊이와 무관하게 일정 비용)
+        - 없으면 offset부터 limit개 (기존 page 파라미터 호환)
+        전체 턴 수는 COUNT 대신 chat_sessions.turn_count를 같은 왕복(파이프라인)에서 읽습니다.
+        Returns:
+            ([(user_input, bot_response, created_at, s3_url, id), ...], total_count)
+        """
+        count_sql = "SELECT turn_count FROM chat_sessions WHERE session_id = %s"
 
+        # 인덱스: cbt_logs (session_id, created_at DESC, id DESC) - migrations/versions/0005_query_indexes.sql
         data_sql = """
-            SELECT user_input, bot_response, created_at, s3_url
+            SELECT user_input, bot_response, created_at, s3_url, id
             FROM cbt_logs
             WHERE session_id = %s
-            ORDER BY created_at DESC
-            LIMIT %s OFFSET %s
         """
+        params = [session_id]
+        if before:
+            data_sql += " AND (created_at, id) < (%s, %s)"
+            params.extend(before)
+        data_sql += " ORDER BY created_at DESC, id DESC LIMIT %s"
+        params.append(limit)
+        if not before and offset:
+            data_sql += " OFFSET %s"
+            params.append(offset)
         try:
-            with self.conn.cursor() as cur:
-                cur.execute(count_sql, (session_id,))
-                total_count = cur.fetchone()[0]
-
-                cur.execute(data_sql, (session_id, limit, offset))
-                rows = cur.fetchall()
-
-            return rows, total_count
+            count_rows, rows = fetch_pipelined(self.conn, [
+                (count_sql, (session_id,)),
+                (data_sql, tuple(params)),
+            ])
+            return rows, count_rows[0][0] if count_rows else 0
         except Exception as e:
             logger.error(f"상세 대화 조회 실패: {e}")
+            self.conn.rollback()
             return [], 0
 
     def get_session_turn_count(self, session_id: str) -> int:
         """session_id에 해당 하는 세션의 대화 횟수 조회"""
-        sql = "SELECT COUNT(*) FROM cbt_logs WHERE session_id = %s"
+        sql = "SELECT turn_count FROM chat_sessions WHERE session_id = %s"
         try:
             with self.conn.cursor() as cur:
                 cur.execute(sql, (session_id,))
@@ -111,6 +227,60 @@ class ChatRepository:
             logger.error(f"세션 턴 수 조회 실패: {e}")
             return 0
 
+    def get_session_turns(self, session_id: str, offset: int, limit: int) -> list:
+        """세션의 대화를 오래된 순으로 offset번째 턴부터 limit개 조회 (누적 요약 갱신용)"""
+        sql = """
+            SELECT user_input, bot_response
+            FROM cbt_logs
+            WHERE session_id = %s
+            ORDER BY created_at ASC
+            LIMIT %s OFFSET %s
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(sql, (session_id, limit, offset))
+                return cur.fetchall()
+        except Exception as e:
+            logger.error(f"요약 대상 대화 조회 실패: {e}")
+            return []
+
+    def get_session_summary(self, session_id: str):
+        """
+        세션 누적 요약 조회
+        Returns:
+            (summary, summarized_turns) 또는 None (요약 없음/조회 실패)
+        """
+        sql = "SELECT summary, summarized_turns FROM chat_session_summaries WHERE session_id = %s"
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(sql, (session_id,))
+                return cur.fetchone()
+        except Exception as e:
+            logger.error(f"세션 요약 조회 실패: {e}")
+            self.conn.rollback()
+            return None
+
+    def upsert_session_summary(self, session_id: str, summary: str, summarized_turns: int) -> bool:
+        """세션 누적 요약 저장 (더 적은 턴을 반영한 늦은 갱신은 무시)"""
+        sql = """
+            INSERT INTO chat_session_summaries (session_id, summary, summarized_turns)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (session_id) DO UPDATE
+                SET summary = EXCLUDED.summary,
+                    summarized_turns = EXCLUDED.summarized_turns,
+                    updated_at = now()
+                WHERE chat_session_summaries.summarized_turns < EXCLUDED.summarized_turns
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(sql, (session_id, summary, summarized_turns))
+                self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"세션 요약 저장 실패: {e}")
+            self.conn.rollback()
+            return False
+
 # --- 의존성 주입용 헬퍼 함수 ---
 def get_chat_repository(conn=Depends(get_db_conn)) -> ChatRepository:
     return ChatRepository(conn)
@@ -0,0 +1,69 @@
+# chatbot/repository/embedding_cache_repository.py
+import logging
+from repository.vector import to_vector
+
+logger = logging.getLogger()
+
+class EmbeddingCacheRepository:
+    """
+    embedding_cache 테이블 (영속 캐시 계층) 조회/저장
+    벡터는 pgvector 바이너리 형식으로 주고받습니다. (조회: binary 커서, 저장: array('f') 파라미터)
+    """
+    def __init__(self, conn):
+        self.conn = conn
+
+    def find_embedding(self, cache_key: str) -> list | None:
+        sql = "SELECT embedding FROM embedding_cache WHERE cache_key = %s"
+        with self.conn.cursor(binary=True) as cur:
+            cur.execute(sql, (cache_key,))
+            row = cur.fetchone()
+        return row[0] if row else None
+
+    def find_embeddings(self, cache_keys: list) -> dict:
+        """여러 키를 한 번의 쿼리로 조회하여 {cache_key: embedding}을 반환합니다."""
+        if not cache_keys:
+            return {}
+        sql = "SELECT cache_key, embedding FROM embedding_cache WHERE cache_key = ANY(%s)"
+        with self.conn.cursor(binary=True) as cur:
+            cur.execute(sql, (list(cache_keys),))
+            rows = cur.fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def find_recent_embeddings(self, model_id: str, dimensions: int, limit: int) -> dict:
+        """최근 저장된 임베딩을 {cache_key: embedding}으로 반환합니다. (Warm-up 시 LRU 적재용)"""
+        sql = """
+            SELECT cache_key, embedding FROM embedding_cache
+            WHERE model_id = %s AND dimensions = %s
+            ORDER BY created_at DESC
+            LIMIT %s
+        """
+        with self.conn.cursor(binary=True) as cur:
+            cur.execute(sql, (model_id, dimensions, limit))
+            rows = cur.fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def save_embedding(self, cache_key: str, model_id: str, dimensions: int, embedding: list):
+        self.save_embeddings([(cache_key, model_id, dimensions, embedding)])
+
+    def save_embeddings(self, rows: list):
+        """
+        (cache_key, model_id, dimensions, embedding) 목록을 일괄 저장합니다.
+        executemany는 psycopg3에서 파이프라인으로 전송되므로 건수와 무관하게 한 번의 왕복입니다.
+        """
+        if not rows:
+            return
+        sql = """
+            INSERT INTO embedding_cache (cache_key, model_id, dimensions, embedding)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (cache_key) DO NOTHING
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.executemany(sql, [
+                    (cache_key, model_id, dimensions, to_vector(embedding))
+                    for cache_key, model_id, dimensions, embedding in rows
+                ])
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
@@ -0,0 +1,27 @@
+# chatbot/repository/pipeline.py
+from typing import List, Optional, Sequence, Tuple
+from psycopg import Pipeline
+
+def fetch_pipelined(conn, statements: Sequence[Tuple[str, Optional[tuple]]]) -> List[list]:
+    """
+    서로 독립적인 조회 쿼리 여러 개를 psycopg3 파이프라인 모드로 한 번에 보내고 결과를 모아 반환합니다.
+    (쿼리 N개 = 네트워크 왕복 1회, libpq가 파이프라인을 지원하지 않으면 순차 실행)
+
+    예) (history, count) = fetch_pipelined(conn, [(history_sql, (sid, 5)), (count_sql, (sid,))])
+    Returns:
+        statements 순서대로 각 쿼리의 fetchall() 결과
+    """
+    cursors = [conn.cursor() for _ in statements]
+    try:
+        if Pipeline.is_supported():
+            # 블록을 나갈 때 한 번 Sync 하며 모든 결과를 수신
+            with conn.pipeline():
+                for cur, (sql, params) in zip(cursors, statements):
+                    cur.execute(sql, params)
+        else:
+            for cur, (sql, params) in zip(cursors, statements):
+                cur.execute(sql, params)
+        return [cur.fetchall() for cur in cursors]
+    finally:
+        for cur in cursors:
+            cur.close()
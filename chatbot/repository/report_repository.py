@@ -1,12 +1,20 @@
 # chatbot/repository/report_repository.py
 import json
 import logging
-from datetime import date
+from datetime import date, timedelta
 from fastapi import Depends
 from dependency import get_db_conn
+from repository.pipeline import fetch_pipelined
 
 logger = logging.getLogger()
 
+def _day_range(start_date: date, end_date: date) -> tuple:
+    """
+    [start_date, end_date] 날짜 구간을 반열린 구간 (start_date 0시, end_date 다음날 0시)으로 변환
+    created_at::date BETWEEN 과 같은 결과지만 created_at 인덱스를 범위 검색으로 사용할 수 있음
+    """
+    return start_date, end_date + timedelta(days=1)
+
 class ReportRepository:
     def __init__(self, conn):
         self.conn = conn
@@ -15,13 +23,13 @@ class ReportRepository:
         sql = """
             SELECT user_input, bot_response, created_at
             FROM cbt_logs
-            WHERE user_id = %s 
-              AND created_at::date BETWEEN %s AND %s
+            WHERE user_id = %s
+              AND created_at >= %s AND created_at < %s
             ORDER BY created_at ASC
         """
         try:
             with self.conn.cursor() as cur:
-                cur.execute(sql, (user_id, start_date, end_date))
+                cur.execute(sql, (user_id, *_day_range(start_date, end_date)))
                 return cur.fetchall()
         except Exception as e:
             logger.error(f"기간별 로그 조회 실패: {e}")
@@ -65,13 +73,14 @@ class ReportRepository:
                 emotions_summary
             FROM weekly_reports
             WHERE user_id = %s
-              AND EXTRACT(YEAR FROM start_date) = %s
-              AND EXTRACT(MONTH FROM start_date) = %s
+              AND start_date >= %s AND start_date < %s
             ORDER BY start_date ASC
         """
+        month_start = date(year, month, 1)
+        next_month_start = date(year + month // 12, month % 12 + 1, 1)
         try:
             with self.conn.cursor() as cur:
-                cur.execute(sql, (user_id, year, month))
+                cur.execute(sql, (user_id, month_start, next_month_start))
                 return cur.fetchall()
         except Exception as e:
             logger.error(f"월별 리포트 조회 실패: {e}")
@@ -86,18 +95,47 @@ class ReportRepository:
         sql = """
             SELECT DISTINCT user_id
             FROM cbt_logs
-            WHERE created_at::date BETWEEN %s AND %s
+            WHERE created_at >= %s AND created_at < %s
             ORDER BY user_id
         """
         try:
             with self.conn.cursor() as cur:
-                cur.execute(sql, (start_date, end_date))
+                cur.execute(sql, _day_range(start_date, end_date))
                 rows = cur.fetchall()
                 return [row[0] for row in rows]
         except Exception as e:
             logger.error(f"기간별 사용자 목록 조회 실패: {e}")
             return []
 
+    def get_report_batch_targets(self, start_date: date, end_date: date) -> tuple:
+        """
+        배치 리포트 대상 조회: 기간 내 로그가 있는 사용자와 이미 리포트가 있는 사용자를 한 번의 왕복(파이프라인)으로 조회
+        Returns:
+            (user_ids, reported_user_ids) - user_id 리스트, 이미 리포트가 있는 user_id 집합
+        """
+        users_sql = """
+            SELECT DISTINCT user_id
+            FROM cbt_logs
+            WHERE created_at >= %s AND created_at < %s
+            ORDER BY user_id
+        """
+        reported_sql = """
+            SELECT DISTINCT user_id
+            FROM weekly_reports
+            WHERE start_date = %s
+              AND end_date = %s
+        """
+        try:
+            user_rows, reported_rows = fetch_pipelined(self.conn, [
+                (users_sql, _day_range(start_date, end_date)),
+                (reported_sql, (start_date, end_date)),
+            ])
+            return [row[0] for row in user_rows], {row[0] for row in reported_rows}
+        except Exception as e:
+            logger.error(f"배치 리포트 대상 조회 실패: {e}")
+            self.conn.rollback()
+            return [], set()
+
     def check_report_exists(self, user_id: str, start_date: date, end_date: date) -> bool:
         """
         특정 사용자의 특정 기간에 이미 리포트가 존재하는지 확인합니다.
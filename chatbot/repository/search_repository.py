@@ -1,57 +1,199 @@
 # chatbot/repository/search_repository.py
-import json
 import logging
+import time
 from fastapi import Depends
+from config import config
 from dependency import get_db_conn
+from repository.vector import to_vector
 
 logger = logging.getLogger()
 
+# 1단계 후보 검색 정렬식 (마이그레이션에서 만든 표현식 인덱스와 글자 그대로 같아야 인덱스를 탐)
+_CANDIDATE_ORDER = {
+    "halfvec": "embedding::halfvec(1024) <=> CAST(%s AS HALFVEC(1024))",
+    "binary": "binary_quantize(embedding)::bit(1024) <~> binary_quantize(CAST(%s AS VECTOR(1024)))",
+}
+# 모드별 표현식 인덱스 연산자 클래스 (유효한 인덱스가 없으면 양자화식이 전체 행에 계산되므로 vector 모드로 대체)
+_INDEX_OPCLASS = {
+    "halfvec": "halfvec_cosine_ops",
+    "binary": "bit_hamming_ops",
+}
+_DEFAULT_MODE = ("vector", 40)
+# pgvector HNSW 기본 ef_search: 후보 수가 이보다 많으면 트랜잭션 한정으로 올려야 후보가 모자라지 않음
+_HNSW_DEFAULT_EF_SEARCH = 40
+
+# 테이블별 검색 모드 {table_name: (mode, rerank_candidates)} (VECTOR_SEARCH_MODE_TTL_SECONDS 주기로 다시 읽음)
+_search_modes: dict = {}
+_search_modes_loaded_at = 0.0
+# pgvector 0.8 이상의 hnsw.iterative_scan 지원 여부 (프로세스당 1회 조회, None이면 미조회)
+_iterative_scan: bool | None = None
+
 class SearchRepository:
     def __init__(self, conn):
         self.conn = conn
 
     def search_welfare_services(self, embedding: list[float], locations: list[str] | None) -> list:
-        sql_params = [json.dumps(embedding)]
+        where_params = []
         where_clauses = []
 
         if locations:
             loc_conditions = " OR ".join(["(province = %s OR city_district = %s)"] * len(locations))
             where_clauses.append(f"({loc_conditions})")
             for loc in locations:
-                sql_params.extend([loc, loc])
+                where_params.extend([loc, loc])
 
         sql_where = f" WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
-        sql = f"""
-            SELECT 
-                (embedding <=> CAST(%s AS VECTOR(1024))) AS score,
-                service_name, service_summary, detail_link, province, city_district
-            FROM welfare_services {sql_where}
-            ORDER BY score
-            LIMIT 10;
-        """
         try:
-            with self.conn.cursor() as cur:
-                cur.execute(sql, tuple(sql_params))
-                return cur.fetchall()
+            return self._nearest(
+                "welfare_services",
+                "service_name, service_summary, detail_link, province, city_district",
+                embedding, sql_where, where_params
+            )
         except Exception as e:
             logger.error(f"복지 DB 오류: {e}")
             raise
 
     def search_employment_jobs(self, embedding: list[float]) -> list:
+        try:
+            return self._nearest(
+                "employment_jobs",
+                "job_title, company_name, job_description, detail_link, location",
+                embedding
+            )
+        except Exception as e:
+            logger.error(f"구인정보 DB 오류: {e}")
+            raise
+
+    def _nearest(self, table: str, columns: str, embedding: list[float], sql_where: str = "", where_params: list | None = None, limit: int = 10) -> list:
+        """
+        코사인 거리 top-K 검색. 결과 행: (score, *columns)
+        halfvec / binary 모드는 양자화 인덱스로 후보를 넉넉히 뽑은 뒤 원본 vector(1024)로 정확히 재정렬합니다.
+        """
+        mode, candidates = self._search_mode(table)
+        iterative_scan = bool(sql_where) and self._supports_iterative_scan()
+        if sql_where and not iterative_scan:
+            # 조건이 있는데 iterative scan이 없으면 양자화 후보도 사후 필터로 거의 비므로 정확한 vector 경로로 검색
+            mode = "vector"
+        vector = to_vector(embedding)
+        where_params = where_params or []
+
+        if mode in _CANDIDATE_ORDER:
+            sql = f"""
+                SELECT
+                    (embedding <=> CAST(%s AS VECTOR(1024))) AS score,
+                    {columns}
+                FROM (
+                    SELECT embedding, {columns}
+                    FROM {table}{sql_where}
+                    ORDER BY {_CANDIDATE_ORDER[mode]}
+                    LIMIT %s
+                ) AS candidates
+                ORDER BY score
+                LIMIT %s;
+            """
+            params = (vector, *where_params, vector, candidates, limit)
+        else:
+            sql = f"""
+                SELECT
+                    (embedding <=> CAST(%s AS VECTOR(1024))) AS score,
+                    {columns}
+                FROM {table}{sql_where}
+                ORDER BY score
+                LIMIT %s;
+            """
+            params = (vector, *where_params, limit)
+
+        # 트랜잭션 한정 설정 [(이름, 값)]
+        settings = []
+        if mode in _CANDIDATE_ORDER and candidates > _HNSW_DEFAULT_EF_SEARCH:
+            settings.append(("hnsw.ef_search", str(candidates)))
+        if sql_where:
+            # HNSW 인덱스 스캔은 ef_search개를 뽑은 뒤 WHERE를 적용하므로, 선택적인 조건이면 limit(후보 수)보다 적게(또는 0건) 반환됨
+            # pgvector 0.8+: 조건을 만족하는 행이 모일 때까지 인덱스를 이어서 탐색
+            #   (양자화 후보는 어차피 원본 벡터로 재정렬하므로 relaxed_order, vector 모드는 거리 순서를 지키는 strict_order)
+            # 그 이전 버전: 인덱스 없이 정확히 계산 (조건 필터 + top-K 정렬)
+            if not iterative_scan:
+                settings.append(("enable_indexscan", "off"))
+            elif mode in _CANDIDATE_ORDER:
+                settings.append(("hnsw.iterative_scan", "relaxed_order"))
+            else:
+                settings.append(("hnsw.iterative_scan", "strict_order"))
+
+        with self.conn.cursor() as cur:
+            for name, value in settings:
+                cur.execute(f"SELECT set_config('{name}', %s, true)", (value,))
+            cur.execute(sql, params)
+            return cur.fetchall()
+
+    def _supports_iterative_scan(self) -> bool:
+        """설치된 pgvector가 hnsw.iterative_scan(0.8 이상)을 지원하는지 (조회 실패 시 False, 다음 호출에서 다시 조회)"""
+        global _iterative_scan
+        if _iterative_scan is None:
+            try:
+                with self.conn.cursor() as cur:
+                    cur.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+                    row = cur.fetchone()
+                _iterative_scan = bool(row) and tuple(int(part) for part in row[0].split(".")[:2]) >= (0, 8)
+            except Exception as e:
+                logger.warning(f"pgvector 버전 조회 실패, 필터 검색은 정확 계산으로 수행: {e}")
+                self.conn.rollback()
+                return False
+        return _iterative_scan
+
+    def _search_mode(self, table: str) -> tuple:
+        """
+        vector_search_modes 테이블의 (mode, rerank_candidates). 테이블이 없으면(마이그레이션 전) 기본 vector 모드
+        모드에 맞는 유효한(VALID) HNSW 표현식 인덱스가 없으면 경고 후 vector 모드로 검색합니다.
+        """
+        global _search_modes, _search_modes_loaded_at
+        now = time.monotonic()
+        if now - _search_modes_loaded_at >= config.vector_search_mode_ttl_seconds:
+            _search_modes_loaded_at = now
+            sql = """
+                SELECT
+                    m.table_name, m.mode, m.rerank_candidates,
+                    ARRAY(
+                        SELECT pg_get_indexdef(i.indexrelid)
+                        FROM pg_index i
+                        WHERE i.indrelid = to_regclass(m.table_name) AND i.indisvalid
+                    )
+                FROM vector_search_modes m;
+            """
+            try:
+                with self.conn.cursor() as cur:
+                    cur.execute(sql)
+                    modes = {}
+                    for table_name, mode, candidates, index_defs in cur.fetchall():
+                        opclass = _INDEX_OPCLASS.get(mode)
+                        if opclass and not any(opclass in index_def for index_def in index_defs):
+                            logger.warning(f"{table_name}: {mode} 모드의 {opclass} 인덱스가 없어 vector 모드로 검색합니다.")
+                            mode = "vector"
+                        modes[table_name] = (mode, candidates)
+                    _search_modes = modes
+            except Exception as e:
+                logger.warning(f"벡터 검색 모드 조회 실패, 기존 설정 사용: {e}")
+                self.conn.rollback()
+        return _search_modes.get(table, _DEFAULT_MODE)
+
+    def get_dataset_version(self) -> str:
+        """
+        복지/구인 데이터셋 버전 (건수 + 최종 수정일 조합)
+        Ingestor가 데이터를 추가/삭제하면 값이 바뀌어 의미 캐시가 무효화됩니다.
+        """
         sql = """
-            SELECT 
-                (embedding <=> CAST(%s AS VECTOR(1024))) AS score,
-                job_title, company_name, job_description, detail_link, location
-            FROM employment_jobs
-            ORDER BY score
-            LIMIT 10;
+            SELECT
+                (SELECT COUNT(*) FROM welfare_services),
+                (SELECT MAX(last_modified_date) FROM welfare_services),
+                (SELECT COUNT(*) FROM employment_jobs),
+                (SELECT MAX(last_modified_date) FROM employment_jobs);
         """
         try:
             with self.conn.cursor() as cur:
-                cur.execute(sql, (json.dumps(embedding),))
-                return cur.fetchall()
+                cur.execute(sql)
+                row = cur.fetchone()
+                return "|".join(str(v) for v in row)
         except Exception as e:
-            logger.error(f"구인정보 DB 오류: {e}")
+            logger.error(f"데이터셋 버전 조회 오류: {e}")
             raise
 
 # --- 의존성 주입용 헬퍼 함수 ---
@@ -0,0 +1,65 @@
+# chatbot/repository/vector.py
+import logging
+import struct
+import sys
+from array import array
+
+from psycopg.adapt import Dumper, Loader
+from psycopg.pq import Format
+from psycopg.types import TypeInfo
+
+logger = logging.getLogger()
+
+# pgvector 바이너리 표현: int16 차원 수 + int16 예약(0) + float32 x 차원 (모두 network byte order)
+_HEADER = struct.Struct("!HH")
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+def to_vector(values) -> array:
+    """
+    임베딩(list[float] / numpy float32 배열 / array('f'))을 바이너리 전송용 array('f')로 변환합니다.
+    이 타입으로 넘긴 파라미터만 pgvector 바이너리 형식으로 전송됩니다. (일반 list는 기존처럼 PostgreSQL 배열)
+    """
+    if isinstance(values, array) and values.typecode == "f":
+        return values
+    if hasattr(values, "astype") and hasattr(values, "tobytes"):
+        # numpy 배열: 원소별 변환 없이 메모리를 그대로 복사
+        vector = array("f")
+        vector.frombytes(values.astype("float32", copy=False).tobytes())
+        return vector
+    return array("f", values)
+
+class VectorBinaryDumper(Dumper):
+    """array('f') -> pgvector 바이너리 (float 하나당 4바이트, 텍스트 '[0.0123...,' 대비 3~4배 작고 서버 파싱 없음)"""
+    format = Format.BINARY
+
+    def dump(self, obj: array) -> bytes:
+        if _NATIVE_LITTLE_ENDIAN:
+            obj = array("f", obj)
+            obj.byteswap()
+        return _HEADER.pack(len(obj), 0) + obj.tobytes()
+
+class VectorBinaryLoader(Loader):
+    """pgvector 바이너리 -> list[float]"""
+    format = Format.BINARY
+
+    def load(self, data) -> list:
+        dimensions, _ = _HEADER.unpack_from(data)
+        vector = array("f")
+        vector.frombytes(bytes(data[_HEADER.size:_HEADER.size + dimensions * 4]))
+        if _NATIVE_LITTLE_ENDIAN:
+            vector.byteswap()
+        return vector.tolist()
+
+def register_vector(conn) -> bool:
+    """
+    연결에 pgvector 바이너리 어댑터를 등록합니다. (커넥션 풀의 configure 콜백에서 새 연결마다 1회)
+    vector 확장이 없으면 False를 반환하며, 이 경우 array('f') 파라미터는 전송할 수 없습니다.
+    """
+    info = TypeInfo.fetch(conn, "vector")
+    if info is None:
+        logger.warning("pgvector(vector 타입)를 찾을 수 없어 바이너리 벡터 어댑터를 등록하지 않습니다.")
+        return False
+    dumper = type("VectorDumper", (VectorBinaryDumper,), {"oid": info.oid})
+    conn.adapters.register_dumper(array, dumper)
+    conn.adapters.register_loader(info.oid, VectorBinaryLoader)
+    return True
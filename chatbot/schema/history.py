@@ -16,6 +16,7 @@ class ChatSessionItem(BaseModel):
 
 class SessionListResponse(BaseModel):
     sessions: List[ChatSessionItem]
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
 
 # --- 채팅 상세 내역 (Chat History) ---
 class ChatMessage(BaseModel):
@@ -38,8 +39,10 @@ class ChatMessage(BaseModel):
 class ChatHistoryResponse(BaseModel):
     session_id: str
     messages: List[ChatMessage]
-    total_page: int
-    current_page: int
+    # page 기반 조회에서만 채움 (cursor 조회는 키셋 페이지네이션이라 페이지 번호가 없으므로 null)
+    total_page: Optional[int] = Field(None, description="전체 페이지 수 (chat_sessions의 세션 턴 수 기준, cursor 조회 시 null)")
+    current_page: Optional[int] = Field(None, description="현재 페이지 번호 (cursor 조회 시 null)")
+    next_cursor: Optional[str] = Field(None, description="더 오래된 대화를 조회할 커서 (마지막 페이지면 null)")
 
 # --- 주간 리포트 (Weekly Report) ---
 class WeeklyReportRequest(BaseModel):
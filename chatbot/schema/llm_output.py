@@ -0,0 +1,64 @@
+# chatbot/schema/llm_output.py
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator
+
+# LLM이 반환해야 하는 JSON 구조 (API 응답 스키마와 별개)
+# LLMService.get_llm_response(schema=...)로 전달하면 프로바이더별 구조화 출력(JSON 모드 / Tool use / Guided decoding)에 사용됩니다.
+
+Emotion = Literal["happy", "sad", "neutral", "angry", "anxiety", "surprise"]
+
+# --- 상담 (Reframing / Voice Reframing) ---
+class ReframingOutput(BaseModel):
+    empathy: str = Field(..., description="반영적 경청 및 공감 멘트")
+    detected_distortion: str = Field(..., description="탐지된 인지 오류 (예: 흑백사고, 긍정 정서 강화, 위기 상황, 없음)")
+    analysis: str = Field(..., description="내담자를 위한 교육적 분석 코멘트")
+    socratic_question: str = Field(..., description="생각을 확장하거나 종료를 권유하는 질문")
+    alternative_thought: str = Field(..., description="건강한 대안적 사고 또는 지지와 격려")
+    top_emotion: Emotion = Field(..., description="핵심 감정")
+
+class VoiceReframingOutput(ReframingOutput):
+    # 음성 상담은 외부 음성 감정 분석 결과를 최종 감정으로 사용하므로 선택
+    top_emotion: Optional[Emotion] = Field(None, description="교차 검증으로 판단된 감정")
+
+# --- 마음일기 선제 대화 ---
+class MindDiaryOutput(BaseModel):
+    empathy: str = Field(..., description="따뜻한 공감 및 첫인사")
+    detected_distortion: str = Field(..., description="탐지된 항목 (없으면 '없음')")
+    analysis: str = Field(..., description="일기 내용에 대한 심리적 분석")
+    socratic_question: str = Field(..., description="대화를 이어가는 열린 질문")
+    alternative_thought: str = Field(..., description="힘이 되는 긍정적인 관점 제안")
+
+# --- 복지/구인 검색 ---
+class SearchServiceOutput(BaseModel):
+    service_name: str = Field(..., description="서비스/공고 이름")
+    summary: Optional[str] = Field(None, description="한두 문장 요약")
+    target: Optional[str] = Field(None, description="지원 대상")
+    region: Optional[str] = Field(None, description="지역")
+    url: Optional[str] = Field(None, description="상세 링크")
+
+class SearchOutput(BaseModel):
+    answer: str = Field(..., description="Markdown 형식의 답변")
+    services: List[SearchServiceOutput] = Field(default_factory=list, description="추천 서비스 목록")
+
+# --- 주간 리포트 ---
+class EmotionCount(BaseModel):
+    emotion: str = Field(..., description="감정 이름 (예: 우울, 기쁨, 불안)")
+    count: int = Field(..., description="해당 감정이 나타난 횟수")
+
+class WeeklyReportOutput(BaseModel):
+    title: str = Field(..., description="소설 제목")
+    content: str = Field(..., description="소설 본문")
+    # 키가 자유로운 dict는 Gemini response_schema로 표현할 수 없어 목록으로 받음
+    emotions: List[EmotionCount] = Field(default_factory=list, description="감정 통계")
+
+    @field_validator("emotions", mode="before")
+    @classmethod
+    def _accept_mapping(cls, value):
+        # {"우울": 3} 형태(기존 프롬프트 형식)도 허용
+        if isinstance(value, dict):
+            return [{"emotion": k, "count": v} for k, v in value.items()]
+        return value
+
+# --- 세션 누적 요약 ---
+class SessionSummaryOutput(BaseModel):
+    summary: str = Field(..., description="누적 요약 (3인칭 서술, 한국어)")
@@ -0,0 +1,197 @@
+# chatbot/service/async_llm_service.py
+import asyncio
+import json
+import logging
+import time
+try:
+    from config import config
+except ImportError:
+    from ..config import config
+
+from prompts.cacheable import CacheablePrompt
+from service.lazy_provider import LazyProvider
+from service.llm_hedging import get_hedge_policy, run_hedged_async
+from service.llm_metrics import record_usage, track_llm_call
+from util.concurrency import run_blocking
+
+logger = logging.getLogger()
+
+class AsyncLLMService:
+    """
+    LLMService의 asyncio 버전.
+    - Vertex AI(Gemini): generate_content_async (네이티브 비동기)
+    - vLLM(Gemma): AsyncOpenAI (네이티브 비동기)
+    - Bedrock(Claude/Titan): boto3가 동기 전용이므로 전용 스레드 풀로 오프로드
+    인증/모델 객체는 동기 LLMService와 공유합니다.
+    """
+
+    def __init__(self, llm_service):
+        self.sync = llm_service
+        self._hf = LazyProvider(
+            "gemma-async", self._init_hf_client,
+            configured=lambda: bool(config.hf_endpoint_url and config.hf_api_token)
+        )
+
+    @property
+    def hf_client(self):
+        return self._hf.get()
+
+    @hf_client.setter
+    def hf_client(self, value):
+        self._hf.set(value)
+
+    def _init_hf_client(self):
+        if not config.hf_endpoint_url or not config.hf_api_token:
+            return None
+
+        try:
+            base_url = f"{config.hf_endpoint_url.rstrip('/')}/v1"
+            return self.sync.registry.get_async_openai(base_url, config.hf_api_token, model=self.sync.MODEL_ID_GEMMA)
+        except Exception as e:
+            logger.error(f"HF 비동기 클라이언트 초기화 실패: {e}")
+            return None
+
+    async def get_embedding(self, text: str) -> list[float]:
+        return await run_blocking(self.sync.get_embedding, text)
+
+    async def get_llm_response(self, prompt: str, use_bedrock: bool = False, endpoint: str = None, schema=None) -> str:
+        """
+        LLMService.get_llm_response의 asyncio 버전 (라우팅/서킷 브레이커/Hedging 상태 공유)
+        Args:
+            endpoint: 호출한 엔드포인트 이름 (프롬프트 유형 / LLM_HEDGE_POLICIES 키)
+            schema: 응답 JSON 구조 (Pydantic 모델, 구조화 출력 사용)
+        """
+        primary = "bedrock" if use_bedrock else "gemini"
+        route = self.sync._route(primary, endpoint)
+
+        policy = get_hedge_policy(endpoint)
+        if policy and route and policy.secondary != route[0] and policy.secondary in route:
+            return await self._get_hedged_response(prompt, primary, route, policy, endpoint, schema)
+
+        return await self._get_routed_response(prompt, primary, route, endpoint, schema)
+
+    async def _get_routed_response(self, prompt: str, primary: str, route: list, endpoint: str, schema=None) -> str:
+        router = self.sync.router
+        last_error = None
+        for attempt, provider in enumerate(route):
+            slot = router.acquire(provider)
+            if not slot:
+                continue
+            try:
+                text = await self._call_provider(provider, prompt, schema, endpoint, attempt)
+            except asyncio.CancelledError:
+                # 요청 취소로 결과 없이 끝난 호출: 얻은 probe 슬롯만 반납
+                router.release(provider, slot)
+                raise
+            except Exception as e:
+                logger.error(f"LLM 비동기 호출 실패 ({provider}): {e}")
+                last_error = e
+                continue
+
+            if provider != primary:
+                logger.warning(f"LLM 우회 응답: {primary} -> {provider} (endpoint={endpoint})")
+            return text
+
+        if last_error is None:
+            return self.sync._create_error_json("사용 가능한 LLM 프로바이더가 없습니다. (서킷 열림)")
+        return self.sync._create_error_json(f"시스템 오류: {last_error}")
+
+    async def _get_hedged_response(self, prompt: str, primary: str, route: list, policy, endpoint: str, schema=None) -> str:
+        """LLMService._get_hedged_response의 asyncio 버전 (패배한 요청은 Task 취소 후 얻은 슬롯 반납)"""
+        router = self.sync.router
+        first = route[0]
+        slots = {first: router.acquire(first)}
+        if not slots[first]:
+            return await self._get_routed_response(prompt, primary, route, endpoint, schema)
+
+        delay = self.sync.latency.hedge_delay(first, policy)
+        winner, text, hedged = await run_hedged_async(
+            (first, lambda: self._call_provider(first, prompt, schema, endpoint)),
+            (policy.secondary, lambda: self._call_provider(policy.secondary, prompt, schema, endpoint, attempt=1)),
+            delay,
+            schema=schema,
+            admit_secondary=lambda: self.sync._acquire_slot(slots, policy.secondary),
+            on_cancelled=lambda provider: router.release(provider, slots.get(provider))
+        )
+        if winner is None:
+            logger.error(f"Hedged LLM 비동기 호출 모두 실패 (endpoint={endpoint})")
+            return self.sync._create_error_json("LLM 응답 생성 실패")
+
+        self.sync.hedge_stats.record(endpoint, winner, hedged)
+        return text
+
+    async def _call_provider(self, provider: str, prompt: str, schema=None, endpoint: str = None, attempt: int = 0) -> str:
+        """프로바이더를 호출하고 성공/실패를 라우터(서킷 브레이커)에, 호출 지표를 EMF로 기록합니다."""
+        router = self.sync.router
+        kwargs = {"schema": schema} if schema else {}
+        try:
+            with track_llm_call(provider, self.sync._model_id(provider), endpoint, attempt):
+                if provider == "bedrock":
+                    # boto3는 취소할 수 없으므로 패배 시에도 스레드에서 끝까지 실행됨 (결과만 버림)
+                    text = await run_blocking(self.sync._call_bedrock, prompt, **kwargs)
+                elif provider == "gemma":
+                    text = await self._call_gemma(prompt, **kwargs)
+                else:
+                    text = await self._call_gemini(prompt, **kwargs)
+        except asyncio.CancelledError:
+            # Hedging 패배 / 요청 취소는 실패로 세지 않음 (슬롯 반납은 슬롯을 얻은 호출자가 수행)
+            raise
+        except Exception:
+            router.record_failure(provider)
+            raise
+        router.record_success(provider)
+        return text
+
+    async def get_gemma_response(self, prompt: str, max_tokens: int = 2048) -> str:
+        if not await self._hf.aget():
+            error_msg = "오류: vLLM 클라이언트가 초기화되지 않았습니다. 설정을 확인하세요."
+            logger.error(error_msg)
+            return json.dumps({"empathy": error_msg}, ensure_ascii=False)
+
+        from openai import OpenAIError
+        try:
+            with track_llm_call("gemma", self.sync.MODEL_ID_GEMMA):
+                return await self._call_gemma(prompt, max_tokens)
+
+        except OpenAIError as e:
+            logger.error(f"vLLM 비동기 호출 오류 (OpenAI Error): {e}")
+            return json.dumps({"empathy": f"AI 모델 오류: {str(e)}"}, ensure_ascii=False)
+
+        except Exception as e:
+            logger.error(f"Gemma 비동기 연결 알 수 없는 오류: {e}")
+            return json.dumps({"empathy": f"시스템 오류: {str(e)}"}, ensure_ascii=False)
+
+    async def _call_gemma(self, prompt: str, max_tokens: int = 2048, schema=None) -> str:
+        """vLLM(Gemma) 비동기 호출 (오류 시 예외 발생, 응답 시간 기록)"""
+        client = await self._hf.aget()
+        if not client:
+            raise RuntimeError("vLLM 클라이언트가 초기화되지 않았습니다.")
+
+        start = time.monotonic()
+        response = await client.chat.completions.create(
+            model=self.sync.MODEL_ID_GEMMA,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=0.7,
+            top_p=0.9,
+            **self.sync._openai_schema_kwargs(schema)
+        )
+        self.sync.latency.record("gemma", time.monotonic() - start)
+        record_usage(*self.sync._openai_usage(response))
+        return response.choices[0].message.content
+
+    async def _call_gemini(self, prompt: str, schema=None) -> str:
+        """Gemini 비동기 호출 (오류 시 예외 발생, 응답 시간 기록)"""
+        # 첫 접근 시 프로바이더 초기화(SSM 조회, vertexai.init)는 블로킹이므로 이벤트 루프 밖에서 수행
+        model = await self.sync._providers["gemini"].aget()
+        if not model:
+            raise RuntimeError("Gemini 미설정")
+        start = time.monotonic()
+        contents = prompt
+        if isinstance(prompt, CacheablePrompt) and await self.sync._prompt_cache.aget():
+            # 최초 1회 CachedContent 생성은 블로킹 호출이므로 스레드로 오프로드
+            model, contents = await run_blocking(self.sync._gemini_request, prompt)
+        response = await model.generate_content_async(contents, **self.sync._gemini_kwargs(schema))
+        self.sync.latency.record("gemini", time.monotonic() - start)
+        record_usage(*self.sync._gemini_usage(response))
+        return response.text
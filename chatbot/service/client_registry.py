@@ -0,0 +1,178 @@
+# chatbot/service/client_registry.py
+import logging
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config as BotoConfig
+try:
+    from config import config
+except ImportError:
+    from ..config import config
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI, OpenAI
+
+logger = logging.getLogger()
+
+ClientKey = Tuple[str, str, Optional[str]]  # (provider, endpoint, model)
+
+class ClientRegistry:
+    """
+    LLM 프로바이더 클라이언트 레지스트리.
+    (provider, endpoint, model) 키당 클라이언트를 한 번만 생성하고,
+    OpenAI 호환 클라이언트는 keep-alive가 설정된 httpx 커넥션 풀 하나를 공유합니다.
+    모듈 수준 싱글톤이므로 Warm Lambda 호출 간에도 TLS 연결이 재사용됩니다.
+    """
+
+    def __init__(self):
+        self._clients: Dict[ClientKey, Any] = {}
+        self._lock = threading.RLock()  # factory 안에서 공유 풀 생성 시 재진입
+        self._http_client: Optional["httpx.Client"] = None
+        self._async_http_client: Optional["httpx.AsyncClient"] = None
+
+    # --- 공용 ---
+    def get(self, key: ClientKey, factory: Callable[[], Any]) -> Any:
+        """키에 해당하는 클라이언트를 반환하고, 없으면 factory로 생성 후 등록합니다."""
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = factory()
+                self._clients[key] = client
+                logger.info(f"LLM 클라이언트 생성: provider={key[0]}, endpoint={key[1]}, model={key[2]}")
+        return client
+
+    def evict(self, provider: str = None, endpoint: str = None, model: str = None) -> int:
+        """
+        조건에 맞는 클라이언트를 제거합니다. (인자를 모두 생략하면 전체 제거)
+        공유 httpx 풀은 다른 클라이언트도 사용 중이므로 닫지 않습니다.
+        Returns:
+            int: 제거된 클라이언트 수
+        """
+        with self._lock:
+            targets = [
+                key for key in self._clients
+                if (provider is None or key[0] == provider)
+                and (endpoint is None or key[1] == endpoint)
+                and (model is None or key[2] == model)
+            ]
+            for key in targets:
+                del self._clients[key]
+        if targets:
+            logger.info(f"LLM 클라이언트 {len(targets)}개 제거 (provider={provider}, endpoint={endpoint}, model={model})")
+        return len(targets)
+
+    def warm_up(self, timeout: float = 3.0) -> Dict[str, bool]:
+        """
+        등록된 OpenAI 호환 엔드포인트에 가벼운 요청(/v1/models)을 보내 TLS 연결을 미리 맺어둡니다.
+        실패해도 예외를 던지지 않으며, 결과는 {endpoint: 성공 여부}로 반환합니다.
+        """
+        results = {}
+        for (provider, endpoint, _), client in list(self._clients.items()):
+            if provider != "openai" or endpoint in results:
+                continue
+            try:
+                client.with_options(timeout=timeout, max_retries=0).models.list()
+                results[endpoint] = True
+            except Exception as e:
+                logger.warning(f"LLM 엔드포인트 warm-up 실패 ({endpoint}): {e}")
+                results[endpoint] = False
+        return results
+
+    def keys(self):
+        return list(self._clients.keys())
+
+    # --- 공유 커넥션 풀 (httpx / OpenAI SDK는 첫 vLLM 클라이언트 생성 시 import) ---
+    def _http_limits(self) -> "httpx.Limits":
+        import httpx
+        return httpx.Limits(
+            max_connections=config.llm_http_max_connections,
+            max_keepalive_connections=config.llm_http_max_connections,
+            keepalive_expiry=config.llm_http_keepalive_expiry
+        )
+
+    def _http_timeout(self) -> "httpx.Timeout":
+        import httpx
+        return httpx.Timeout(config.llm_http_timeout, connect=5.0)
+
+    @property
+    def http_client(self) -> "httpx.Client":
+        if self._http_client is None:
+            import httpx
+            with self._lock:
+                if self._http_client is None:
+                    self._http_client = httpx.Client(limits=self._http_limits(), timeout=self._http_timeout())
+        return self._http_client
+
+    @property
+    def async_http_client(self) -> "httpx.AsyncClient":
+        if self._async_http_client is None:
+            import httpx
+            with self._lock:
+                if self._async_http_client is None:
+                    self._async_http_client = httpx.AsyncClient(limits=self._http_limits(), timeout=self._http_timeout())
+        return self._async_http_client
+
+    # --- 프로바이더별 ---
+    def get_openai(self, base_url: str, api_key: str, model: str = None) -> "OpenAI":
+        """OpenAI 호환(vLLM) 동기 클라이언트 (공유 httpx 풀 사용)"""
+        from openai import OpenAI
+        return self.get(
+            ("openai", base_url, model),
+            lambda: OpenAI(base_url=base_url, api_key=api_key, http_client=self.http_client)
+        )
+
+    def get_async_openai(self, base_url: str, api_key: str, model: str = None) -> "AsyncOpenAI":
+        """OpenAI 호환(vLLM) 비동기 클라이언트 (공유 httpx 비동기 풀 사용)"""
+        from openai import AsyncOpenAI
+        return self.get(
+            ("openai-async", base_url, model),
+            lambda: AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=self.async_http_client)
+        )
+
+    def get_bedrock_runtime(self, region_name: str = "ap-northeast-2"):
+        """bedrock-runtime 클라이언트 (커넥션 풀 크기 / TCP keep-alive 조정)"""
+        boto_config = BotoConfig(
+            max_pool_connections=config.bedrock_max_pool_connections,
+            tcp_keepalive=True,
+            connect_timeout=5,
+            read_timeout=config.llm_http_timeout
+        )
+        standin = {}
+        if config.llm_standin_url:
+            # 부하 테스트용 대역 서버 (서명 검증을 하지 않으므로 더미 자격 증명 사용)
+            standin = {"endpoint_url": config.llm_standin_url, "aws_access_key_id": "standin", "aws_secret_access_key": "standin"}
+        return self.get(
+            ("bedrock", region_name, None),
+            lambda: boto3.client(service_name='bedrock-runtime', region_name=region_name, config=boto_config, **standin)
+        )
+
+    def get_sqs(self, region_name: str = "ap-northeast-2"):
+        """SQS 클라이언트 (세션 요약 갱신 등 백그라운드 작업 발행용)"""
+        return self.get(
+            ("sqs", region_name, None),
+            lambda: boto3.client('sqs', region_name=region_name, config=BotoConfig(tcp_keepalive=True, connect_timeout=5))
+        )
+
+    def get_ssm(self, region_name: str = "ap-northeast-2"):
+        """SSM 클라이언트 (GCP 인증 정보 등 파라미터 조회용)"""
+        return self.get(
+            ("ssm", region_name, None),
+            lambda: boto3.client('ssm', region_name=region_name, config=BotoConfig(connect_timeout=5))
+        )
+
+    def get_gemini_model(self, project_id: str, model_name: str):
+        """Vertex AI GenerativeModel (vertexai.init 이후 호출해야 함)"""
+        from vertexai.generative_models import GenerativeModel
+        return self.get(("vertex", project_id, model_name), lambda: GenerativeModel(model_name))
+
+# --- 의존성 주입용 (Singleton 패턴) ---
+@lru_cache()
+def get_client_registry() -> ClientRegistry:
+    return ClientRegistry()
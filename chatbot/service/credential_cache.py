@@ -0,0 +1,39 @@
+# chatbot/service/credential_cache.py
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from typing import Callable
+
+logger = logging.getLogger()
+
+def load_cached_secret(name: str, fetch: Callable[[], str], ttl_seconds: float, cache_dir: str = None) -> str:
+    """
+    SSM 등에서 가져온 비밀 값을 로컬 파일(Lambda는 /tmp)에 ttl_seconds 동안 캐시합니다.
+    같은 실행 환경의 다음 Cold start(프로세스 재시작)에서는 네트워크 조회를 건너뜁니다.
+    (파일 권한 0600, ttl_seconds <= 0이면 캐시하지 않음)
+    """
+    if ttl_seconds <= 0:
+        return fetch()
+
+    digest = hashlib.sha256(name.encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(cache_dir or tempfile.gettempdir(), f"sapori-secret-{digest}")
+
+    try:
+        if time.time() - os.path.getmtime(path) < ttl_seconds:
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+    except OSError:
+        pass
+
+    value = fetch()
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"비밀 값 로컬 캐시 저장 실패 ({name}): {e}")
+    return value
@@ -0,0 +1,57 @@
+# chatbot/service/embedding_backfill.py
+import logging
+try:
+    from config import config
+except ImportError:
+    from ..config import config
+
+from dependency import borrow_db_conn
+from repository.chat_repository import ChatRepository
+from service.llm_service import get_llm_service
+
+logger = logging.getLogger()
+
+# SQS 메시지 {"source": "embedding-backfill"} / EventBridge 예약 규칙의 상수 입력 {"embedding_backfill": true}
+BACKFILL_EVENT_SOURCE = "embedding-backfill"
+
+def backfill_pending_embeddings(repo: ChatRepository, llm, batch_size: int = None, max_batches: int = None) -> dict:
+    """
+    embedding_status = 'pending'인 상담 로그를 배치 단위로 잠그고(SKIP LOCKED) 임베딩을 만들어 일괄 갱신합니다.
+    여러 워커가 동시에 실행해도 같은 행을 중복 처리하지 않습니다.
+    Returns:
+        dict: {"embedded": 채운 행 수, "failed": 실패한 행 수, "batches": 처리한 배치 수}
+    """
+    batch_size = batch_size or config.embedding_backfill_batch_size
+    max_batches = max_batches or config.embedding_backfill_max_batches
+    result = {"embedded": 0, "failed": 0, "batches": 0}
+
+    for _ in range(max_batches):
+        rows = repo.claim_pending_embeddings(batch_size)
+        if not rows:
+            repo.conn.rollback()
+            break
+
+        try:
+            batch = llm.get_embeddings([user_input for _, user_input in rows])
+            embeddings = batch.embeddings
+        except Exception as e:
+            logger.error(f"백필 임베딩 생성 실패 ({len(rows)}건): {e}")
+            embeddings = [None] * len(rows)
+
+        embedded = [(log_id, embedding) for (log_id, _), embedding in zip(rows, embeddings) if embedding is not None]
+        failed_ids = [log_id for (log_id, _), embedding in zip(rows, embeddings) if embedding is None]
+        repo.save_backfilled_embeddings(embedded, failed_ids, config.embedding_backfill_max_attempts)
+
+        result["embedded"] += len(embedded)
+        result["failed"] += len(failed_ids)
+        result["batches"] += 1
+        if len(rows) < batch_size:
+            break
+
+    logger.info(f"임베딩 백필 완료: {result}")
+    return result
+
+def run_embedding_backfill() -> dict:
+    """예약 이벤트(Lambda 직접 호출)용: 풀에서 연결을 빌려 백필을 실행합니다."""
+    with borrow_db_conn() as conn:
+        return backfill_pending_embeddings(ChatRepository(conn), get_llm_service())
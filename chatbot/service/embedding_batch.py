@@ -0,0 +1,96 @@
+# chatbot/service/embedding_batch.py
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger()
+
+THROTTLING_ERROR_CODES = {"ThrottlingException", "TooManyRequestsException", "ServiceQuotaExceededException"}
+
+@dataclass
+class EmbeddingBatchResult:
+    """
+    get_embeddings 결과 (입력 순서 보존)
+    - embeddings[i]: i번째 텍스트의 임베딩, 실패 시 None
+    - errors[i]: i번째 텍스트의 오류 메시지 (실패한 항목만)
+    """
+    embeddings: List[Optional[List[float]]]
+    errors: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def failed_count(self) -> int:
+        return len(self.errors)
+
+class AdaptiveBackoff:
+    """
+    워커들이 공유하는 적응형 지연값.
+    Throttling이 발생하면 지연을 2배로 늘리고, 성공할 때마다 절반으로 줄여 처리율을 자동 조절합니다.
+    """
+    def __init__(self, base_delay: float = 0.2, max_delay: float = 5.0):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._delay = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        delay = self._delay
+        if delay > 0:
+            time.sleep(delay * random.uniform(0.5, 1.0))  # jitter
+
+    def on_throttle(self):
+        with self._lock:
+            self._delay = min(self.max_delay, max(self.base_delay, self._delay * 2))
+
+    def on_success(self):
+        with self._lock:
+            self._delay = self._delay / 2 if self._delay > self.base_delay / 4 else 0.0
+
+def is_throttling_error(e: Exception) -> bool:
+    if isinstance(e, ClientError):
+        return e.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+    return False
+
+def embed_concurrently(
+        texts: List[str],
+        embed_fn: Callable[[str], List[float]],
+        max_workers: int = 8,
+        max_retries: int = 5
+) -> EmbeddingBatchResult:
+    """
+    texts를 제한된 워커 풀로 병렬 임베딩합니다.
+    Throttling 오류는 공유 백오프 후 재시도하고, 그 외 오류는 해당 항목만 실패로 기록합니다.
+    """
+    results: List[Optional[List[float]]] = [None] * len(texts)
+    errors: Dict[int, str] = {}
+    if not texts:
+        return EmbeddingBatchResult(results, errors)
+
+    backoff = AdaptiveBackoff()
+
+    def _embed_one(idx: int):
+        for attempt in range(max_retries + 1):
+            backoff.wait()
+            try:
+                results[idx] = embed_fn(texts[idx])
+                backoff.on_success()
+                return
+            except Exception as e:
+                if is_throttling_error(e) and attempt < max_retries:
+                    backoff.on_throttle()
+                    logger.warning(f"임베딩 Throttling (item={idx}, attempt={attempt + 1}) -> 백오프 후 재시도")
+                    continue
+                errors[idx] = f"{type(e).__name__}: {e}"
+                return
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(texts))), thread_name_prefix="embed") as executor:
+        list(executor.map(_embed_one, range(len(texts))))
+
+    if errors:
+        logger.error(f"일괄 임베딩 중 {len(errors)}/{len(texts)}건 실패")
+    return EmbeddingBatchResult(results, errors)
@@ -0,0 +1,176 @@
+# chatbot/service/embedding_cache.py
+import hashlib
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from dependency import borrow_db_conn
+from repository.embedding_cache_repository import EmbeddingCacheRepository
+
+logger = logging.getLogger()
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화: 유니코드 NFC + 공백 정리 (welfare-data-ingestor와 동일 규칙)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def make_cache_key(model_id: str, dimensions: int, text: str) -> str:
+    """(모델 ID, 차원, 정규화 텍스트) 기반 content-addressed 키"""
+    raw = f"{model_id}|{dimensions}|{normalize_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class EmbeddingCache:
+    """
+    2단계 임베딩 캐시
+    - 1단계: 프로세스 내 LRU (Lambda 컨테이너가 살아있는 동안 유지)
+    - 2단계: Postgres embedding_cache 테이블 (컨테이너/서비스 간 공유)
+    캐시 오류는 절대 임베딩 생성을 막지 않도록 모두 로그만 남깁니다.
+    """
+    # 영속 계층 장애 시 재시도까지 대기 시간 (매 요청마다 DB 연결 실패를 반복하지 않도록)
+    DB_RETRY_COOLDOWN_SECONDS = 60
+
+    def __init__(self, model_id: str, dimensions: int, max_entries: int = 2048, use_db: bool = True):
+        self.model_id = model_id
+        self.dimensions = dimensions
+        self.max_entries = max_entries
+        self.use_db = use_db
+
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_disabled_until = 0.0
+
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def key_for(self, text: str) -> str:
+        return make_cache_key(self.model_id, self.dimensions, text)
+
+    def get(self, text: str) -> list | None:
+        key = self.key_for(text)
+
+        with self._lock:
+            cached = self._lru.get(key)
+            if cached is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return list(cached)
+
+        embedding = self._db_get(key)
+        if embedding is not None:
+            self._lru_put(key, embedding)
+            with self._lock:
+                self.db_hits += 1
+            return embedding
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def get_many(self, texts: list) -> dict:
+        """여러 텍스트를 한 번에 조회하여 {인덱스: 임베딩}을 반환합니다. (DB 계층은 단일 쿼리)"""
+        found = {}
+        missing = {}
+        with self._lock:
+            for idx, text in enumerate(texts):
+                key = self.key_for(text)
+                cached = self._lru.get(key)
+                if cached is not None:
+                    self._lru.move_to_end(key)
+                    self.hits += 1
+                    found[idx] = list(cached)
+                else:
+                    missing.setdefault(key, []).append(idx)
+
+        if missing:
+            from_db = self._db_get_many(list(missing.keys()))
+            for key, embedding in from_db.items():
+                self._lru_put(key, embedding)
+                for idx in missing.pop(key):
+                    found[idx] = embedding
+            with self._lock:
+                self.db_hits += len(from_db)
+                self.misses += len(missing)
+        return found
+
+    def put(self, text: str, embedding: list):
+        key = self.key_for(text)
+        self._lru_put(key, embedding)
+        self._db_put(key, embedding)
+
+    def put_many(self, embeddings: dict):
+        """{텍스트: 임베딩}을 한 번에 저장합니다. (DB 계층은 한 번의 왕복)"""
+        if not embeddings:
+            return
+        rows = []
+        for text, embedding in embeddings.items():
+            key = self.key_for(text)
+            self._lru_put(key, embedding)
+            rows.append((key, self.model_id, self.dimensions, embedding))
+        self._db_put_many(rows)
+
+    def prime(self, limit: int) -> int:
+        """
+        영속 계층의 최근 임베딩을 LRU에 미리 적재합니다. (Warm-up용, 최근 것이 LRU 뒤쪽에 오도록 역순 적재)
+        Returns:
+            int: 적재한 항목 수
+        """
+        limit = min(limit, self.max_entries)
+        if limit <= 0 or not self._db_available():
+            return 0
+        try:
+            with borrow_db_conn() as conn:
+                recent = EmbeddingCacheRepository(conn).find_recent_embeddings(self.model_id, self.dimensions, limit)
+        except Exception as e:
+            self._db_failed("적재", e)
+            return 0
+        for key, embedding in reversed(list(recent.items())):
+            self._lru_put(key, embedding)
+        return len(recent)
+
+    def _lru_put(self, key: str, embedding: list):
+        with self._lock:
+            self._lru[key] = tuple(embedding)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _db_available(self) -> bool:
+        return self.use_db and time.monotonic() >= self._db_disabled_until
+
+    def _db_failed(self, action: str, e: Exception):
+        logger.warning(f"임베딩 캐시 DB {action} 실패 ({self.DB_RETRY_COOLDOWN_SECONDS}초간 LRU만 사용): {e}")
+        self._db_disabled_until = time.monotonic() + self.DB_RETRY_COOLDOWN_SECONDS
+
+    def _db_get(self, key: str) -> list | None:
+        if not self._db_available():
+            return None
+        try:
+            with borrow_db_conn() as conn:
+                return EmbeddingCacheRepository(conn).find_embedding(key)
+        except Exception as e:
+            self._db_failed("조회", e)
+            return None
+
+    def _db_get_many(self, keys: list) -> dict:
+        if not self._db_available():
+            return {}
+        try:
+            with borrow_db_conn() as conn:
+                return EmbeddingCacheRepository(conn).find_embeddings(keys)
+        except Exception as e:
+            self._db_failed("조회", e)
+            return {}
+
+    def _db_put(self, key: str, embedding: list):
+        self._db_put_many([(key, self.model_id, self.dimensions, embedding)])
+
+    def _db_put_many(self, rows: list):
+        if not self._db_available():
+            return
+        try:
+            with borrow_db_conn() as conn:
+                EmbeddingCacheRepository(conn).save_embeddings(rows)
+        except Exception as e:
+            self._db_failed("저장", e)
@@ -0,0 +1,74 @@
+# chatbot/service/lazy_provider.py
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from util.concurrency import run_blocking
+
+logger = logging.getLogger()
+
+# 여러 프로바이더를 동시에 초기화하기 위한 풀 (SSM 조회, vertexai.init 등 블로킹 I/O)
+_init_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="provider-init")
+
+_UNSET = object()
+
+class LazyProvider:
+    """
+    프로바이더 클라이언트를 첫 사용 시 한 번만 초기화합니다. (스레드 안전)
+    - factory가 None을 반환하거나 예외가 나면 None을 저장하고 다시 시도하지 않습니다. (미설정 프로바이더)
+    - prefetch()로 백그라운드 초기화를 미리 시작하면 여러 프로바이더를 동시에 준비할 수 있습니다.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], configured: Callable[[], bool] = lambda: True):
+        self.name = name
+        self._factory = factory
+        self._configured = configured
+        self._value = _UNSET
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self) -> bool:
+        return self._value is not _UNSET
+
+    def get(self) -> Optional[Any]:
+        if self._value is _UNSET:
+            with self._lock:
+                if self._value is _UNSET:
+                    self._value = self._create()
+        return self._value
+
+    async def aget(self) -> Optional[Any]:
+        """
+        get()의 asyncio 버전: 초기화 전이면 락 대기 / SSM 조회 / vertexai.init 등을 스레드 풀에서 실행하여
+        콜드 스타트 중에도 이벤트 루프의 다른 코루틴을 막지 않습니다.
+        """
+        if self._value is not _UNSET:
+            return self._value
+        return await run_blocking(self.get)
+
+    def set(self, value: Any):
+        """초기화 결과를 직접 지정합니다. (테스트 / 수동 주입)"""
+        self._value = value
+
+    def available(self) -> bool:
+        """초기화 전에는 설정값만으로 판단하여 라우팅 후보 확인이 초기화를 유발하지 않도록 합니다."""
+        if self._value is _UNSET:
+            return self._configured()
+        return self._value is not None
+
+    def prefetch(self) -> Optional[Future]:
+        """아직 초기화 전이면 백그라운드에서 초기화를 시작합니다."""
+        if self.initialized or not self._configured():
+            return None
+        return _init_executor.submit(self.get)
+
+    def _create(self):
+        start = time.monotonic()
+        try:
+            value = self._factory()
+        except Exception as e:
+            logger.error(f"{self.name} 프로바이더 초기화 실패: {e}")
+            value = None
+        logger.info(f"{self.name} 프로바이더 초기화: {(time.monotonic() - start) * 1000:.0f}ms (사용 가능: {value is not None})")
+        return value
@@ -0,0 +1,271 @@
+# chatbot/service/llm_hedging.py
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+try:
+    from config import config
+except ImportError:
+    from ..config import config
+from util.json_parser import parse_llm_json
+from util.structured_output import parse_structured
+
+logger = logging.getLogger()
+
+PROVIDERS = ("gemini", "bedrock", "gemma")
+
+# 동기 Hedging 전용 스레드 풀 (패배한 요청은 결과만 버려지고 이 풀에서 끝까지 실행됨)
+# 제출 후 아직 끝나지 않은 작업 수를 세어, 빈 스레드가 없으면 Secondary를 큐에 쌓지 않고 Hedge를 생략
+_hedge_max_workers = config.llm_hedge_max_workers
+_hedge_executor = ThreadPoolExecutor(max_workers=_hedge_max_workers, thread_name_prefix="llm-hedge")
+_hedge_in_flight = 0
+_hedge_lock = threading.Lock()
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """
+    엔드포인트별 Hedging 정책
+    - secondary: 지연 시 추가로 호출할 프로바이더 (bedrock | gemma | gemini)
+    - percentile: Primary 지연 분포의 몇 백분위를 넘으면 Hedge 할지
+    - min_delay / max_delay: 계산된 지연의 하한/상한 (초)
+    - default_delay: 지연 샘플이 부족할 때 사용할 값 (초)
+    """
+    secondary: str = "bedrock"
+    percentile: float = 95.0
+    min_delay: float = 1.0
+    max_delay: float = 10.0
+    default_delay: float = 4.0
+
+@lru_cache()
+def _load_policies(raw: str) -> Dict[str, HedgePolicy]:
+    """LLM_HEDGE_POLICIES(JSON) -> {endpoint: HedgePolicy}"""
+    if not raw:
+        return {}
+    try:
+        parsed = json.loads(raw)
+        policies = {}
+        for endpoint, options in parsed.items():
+            policy = HedgePolicy(**(options or {}))
+            if policy.secondary not in PROVIDERS:
+                raise ValueError(f"지원하지 않는 secondary 프로바이더: {policy.secondary}")
+            policies[endpoint] = policy
+        return policies
+    except Exception as e:
+        logger.error(f"LLM_HEDGE_POLICIES 파싱 실패 (Hedging 비활성화): {e}")
+        return {}
+
+def get_hedge_policy(endpoint: Optional[str]) -> Optional[HedgePolicy]:
+    """엔드포인트에 설정된 Hedging 정책을 반환합니다. (미설정 시 None = Hedging 안 함)"""
+    if not endpoint:
+        return None
+    return _load_policies(config.llm_hedge_policies).get(endpoint)
+
+class LatencyTracker:
+    """프로바이더별 최근 응답 시간(초)을 보관하고 백분위 값을 계산합니다."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float):
+        with self._lock:
+            self._samples[provider].append(seconds)
+
+    def percentile(self, provider: str, p: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples[provider])
+        if len(samples) < self.min_samples:
+            return None
+        idx = min(len(samples) - 1, max(0, int(round(p / 100 * len(samples))) - 1))
+        return samples[idx]
+
+    def hedge_delay(self, provider: str, policy: HedgePolicy) -> float:
+        observed = self.percentile(provider, policy.percentile)
+        delay = policy.default_delay if observed is None else observed
+        return min(policy.max_delay, max(policy.min_delay, delay))
+
+class HedgeStats:
+    """엔드포인트별 승자 프로바이더 집계 (Hedge 지연값 튜닝용)"""
+
+    def __init__(self):
+        self._counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, winner: str, hedged: bool):
+        with self._lock:
+            self._counts[(endpoint, winner, hedged)] += 1
+        logger.info(f"Hedged LLM 응답: endpoint={endpoint}, winner={winner}, hedged={hedged}")
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            result = defaultdict(dict)
+            for (endpoint, winner, hedged), count in self._counts.items():
+                result[endpoint][f"{winner}{'(hedged)' if hedged else ''}"] = count
+            return dict(result)
+
+def is_valid_response(text: Optional[str], schema=None) -> bool:
+    """딕셔너리로 파싱되는 응답(schema가 있으면 스키마 검증 통과)만 유효로 간주합니다."""
+    try:
+        if schema is not None:
+            return isinstance(parse_structured(text, schema), dict)
+        return isinstance(parse_llm_json(text), dict)
+    except ValueError:
+        return False
+
+def _submit(fn: Callable[[], str], started: threading.Event = None):
+    """
+    Hedging 풀에 빈 스레드가 있으면 작업을 제출합니다. (started: 실제로 스레드에서 실행이 시작되면 set)
+    빈 스레드 확인과 예약을 한 번에 하므로 제출된 작업은 큐에서 기다리지 않습니다.
+    Returns: Future / 풀이 가득 차면 None (제출하지 않음)
+    """
+    global _hedge_in_flight
+
+    def run():
+        if started is not None:
+            started.set()
+        return fn()
+
+    def release(_):
+        global _hedge_in_flight
+        with _hedge_lock:
+            _hedge_in_flight -= 1
+
+    with _hedge_lock:
+        if _hedge_in_flight >= _hedge_max_workers:
+            return None
+        _hedge_in_flight += 1
+    future = _hedge_executor.submit(run)
+    future.add_done_callback(release)  # 시작 전에 취소된 작업도 호출됨
+    return future
+
+def _run_inline(provider: str, fn: Callable[[], str], schema=None) -> Tuple[Optional[str], Optional[str], bool]:
+    """풀이 가득 찼을 때: Hedge 없이 호출 스레드에서 바로 실행 (풀 큐에서 기다리지 않음)"""
+    future = Future()
+    try:
+        future.set_result(fn())
+    except Exception as e:
+        future.set_exception(e)
+    winner = _valid_result(future, provider, schema)
+    return (winner[0], winner[1], False) if winner else (None, None, False)
+
+def run_hedged(
+        primary: Tuple[str, Callable[[], str]],
+        secondary: Tuple[str, Callable[[], str]],
+        delay: float,
+        schema=None,
+        admit_secondary: Callable[[], bool] = None,
+        on_cancelled: Callable[[str], None] = None
+) -> Tuple[Optional[str], Optional[str], bool]:
+    """
+    Primary를 먼저 호출하고, delay초 안에 유효한 응답이 없으면 Secondary를 추가로 호출합니다.
+    먼저 유효한 응답을 낸 쪽을 반환하며, 나머지는 결과를 버립니다.
+    (스레드는 강제 종료할 수 없으므로 아직 시작 전인 경우에만 취소됨)
+    - delay는 Primary가 풀에서 실제로 시작된 시점부터 잽니다.
+    - 풀에 빈 스레드가 없으면(부하 상황) Primary를 호출 스레드에서 바로 실행하고 Hedge하지 않습니다.
+    - Secondary 시점에 빈 스레드가 없거나 admit_secondary()가 False면(서킷 차단) Secondary 없이 Primary만 기다립니다.
+    - on_cancelled(provider): 시작 전에 취소되어 결과를 기록하지 못한 호출 (서킷 슬롯 반납용)
+    Returns:
+        (승자 프로바이더, 응답 텍스트, Hedge 발생 여부) / 모두 실패 시 (None, None, hedged)
+    """
+    started = threading.Event()
+    primary_future = _submit(primary[1], started)
+    if primary_future is None:
+        logger.warning(f"Hedging 스레드 풀 포화 -> Primary({primary[0]})만 호출 스레드에서 실행")
+        return _run_inline(primary[0], primary[1], schema)
+    futures = {primary_future: primary[0]}
+    started.wait()  # 빈 스레드를 예약했으므로 곧바로 시작됨
+    done, pending = wait(futures, timeout=delay)
+
+    for future in done:
+        winner = _valid_result(future, futures[future], schema)
+        if winner:
+            return winner[0], winner[1], False
+
+    hedged = False
+    if admit_secondary is not None and not admit_secondary():
+        logger.info(f"Secondary({secondary[0]}) 서킷 차단 -> Hedge 생략")
+    else:
+        secondary_future = _submit(secondary[1])
+        if secondary_future is None:
+            logger.warning(f"Hedging 스레드 풀 포화 -> Secondary({secondary[0]}) 생략")
+            if on_cancelled is not None:
+                on_cancelled(secondary[0])  # admit_secondary로 얻은 슬롯 반납
+        else:
+            futures[secondary_future] = secondary[0]
+            pending = set(futures) - done
+            hedged = True
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            winner = _valid_result(future, futures[future], schema)
+            if winner:
+                for loser in pending:
+                    if loser.cancel() and on_cancelled is not None:
+                        on_cancelled(futures[loser])
+                return winner[0], winner[1], hedged
+
+    return None, None, hedged
+
+async def run_hedged_async(
+        primary: Tuple[str, Callable[[], Awaitable[str]]],
+        secondary: Tuple[str, Callable[[], Awaitable[str]]],
+        delay: float,
+        schema=None,
+        admit_secondary: Callable[[], bool] = None,
+        on_cancelled: Callable[[str], None] = None
+) -> Tuple[Optional[str], Optional[str], bool]:
+    """
+    run_hedged의 asyncio 버전 (패배한 Task는 cancel)
+    on_cancelled(provider)는 결과 없이 취소된 Task마다 한 번 호출됩니다. (시작 전 취소 포함, 바깥 요청 취소 시에도)
+    """
+    tasks = {asyncio.ensure_future(primary[1]()): primary[0]}
+    pending = set(tasks)
+    hedged = False
+
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        for task in done:
+            winner = _valid_result(task, tasks[task], schema)
+            if winner:
+                return winner[0], winner[1], False
+
+        if admit_secondary is not None and not admit_secondary():
+            logger.info(f"Secondary({secondary[0]}) 서킷 차단 -> Hedge 생략")
+        else:
+            tasks[asyncio.ensure_future(secondary[1]())] = secondary[0]
+            pending = set(tasks) - done
+            hedged = True
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                winner = _valid_result(task, tasks[task], schema)
+                if winner:
+                    return winner[0], winner[1], hedged
+        return None, None, hedged
+    finally:
+        for task in pending:
+            if task.cancel() and on_cancelled is not None:
+                on_cancelled(tasks[task])
+
+def _valid_result(future, provider: str, schema=None) -> Optional[Tuple[str, str]]:
+    """완료된 Future에서 유효한 응답이면 (provider, text)를, 아니면 None을 반환합니다."""
+    if future.cancelled():
+        return None
+    error = future.exception()
+    if error is not None:
+        logger.warning(f"Hedged LLM 호출 실패 ({provider}): {error}")
+        return None
+    text = future.result()
+    if not is_valid_response(text, schema):
+        logger.warning(f"Hedged LLM 응답 JSON 파싱 실패 ({provider})")
+        return None
+    return provider, text
@@ -0,0 +1,144 @@
+# chatbot/service/llm_metrics.py
+import asyncio
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+try:
+    from config import config
+except ImportError:
+    from ..config import config
+
+logger = logging.getLogger()
+
+# CloudWatch Embedded Metric Format 차원: 엔드포인트×모델 / 모델 전체
+_DIMENSIONS = [["Endpoint", "Model"], ["Model"]]
+_UNITS = {
+    "LatencyMs": "Milliseconds",
+    "TimeToFirstTokenMs": "Milliseconds",
+    "InputTokens": "Count",
+    "OutputTokens": "Count",
+    "Retries": "Count",
+    "Errors": "Count",
+    "Fallbacks": "Count",
+}
+
+@dataclass
+class LLMCallMetrics:
+    """LLM 프로바이더 호출 1건의 계측값"""
+    provider: str
+    model: str
+    endpoint: Optional[str] = None
+    streamed: bool = False
+    attempt: int = 0  # 라우팅 순서상 몇 번째 프로바이더인지 (0 = 요청한 프로바이더)
+    started_at: float = field(default_factory=time.monotonic)
+    latency_ms: Optional[float] = None
+    ttft_ms: Optional[float] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    retries: int = 0  # SDK 내부 재시도 횟수 (botocore RetryAttempts 등)
+    error_class: Optional[str] = None
+    cancelled: bool = False
+
+    def mark_first_token(self):
+        if self.ttft_ms is None:
+            self.ttft_ms = (time.monotonic() - self.started_at) * 1000
+
+    def add_usage(self, input_tokens=None, output_tokens=None, retries=None):
+        # 프로바이더 SDK 버전에 따라 없을 수 있으므로 정수일 때만 반영
+        if isinstance(input_tokens, int):
+            self.input_tokens = input_tokens
+        if isinstance(output_tokens, int):
+            self.output_tokens = output_tokens
+        if isinstance(retries, int):
+            self.retries = retries
+
+    def to_emf(self, namespace: str) -> dict:
+        values = {
+            "LatencyMs": round(self.latency_ms or 0.0, 1),
+            "Retries": self.retries,
+            "Errors": 1 if self.error_class and not self.cancelled else 0,
+            "Fallbacks": 1 if self.attempt > 0 else 0,
+        }
+        if self.ttft_ms is not None:
+            values["TimeToFirstTokenMs"] = round(self.ttft_ms, 1)
+        if self.input_tokens is not None:
+            values["InputTokens"] = self.input_tokens
+        if self.output_tokens is not None:
+            values["OutputTokens"] = self.output_tokens
+
+        return {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [{
+                    "Namespace": namespace,
+                    "Dimensions": _DIMENSIONS,
+                    "Metrics": [{"Name": name, "Unit": _UNITS[name]} for name in values],
+                }],
+            },
+            "Endpoint": self.endpoint or "direct",
+            "Model": self.model,
+            # 이하 차원이 아닌 속성 (Logs Insights 검색용)
+            "Provider": self.provider,
+            "Streamed": self.streamed,
+            "ErrorClass": self.error_class,
+            "Cancelled": self.cancelled,
+            **values,
+        }
+
+_current_call: ContextVar[Optional[LLMCallMetrics]] = ContextVar("llm_call_metrics", default=None)
+
+def emit(metrics: LLMCallMetrics):
+    """EMF 로그 한 줄을 stdout으로 출력합니다. (Lambda가 CloudWatch Logs로 전달 -> 지표로 자동 추출)"""
+    if metrics.latency_ms is None:
+        metrics.latency_ms = (time.monotonic() - metrics.started_at) * 1000
+    if not config.llm_metrics_enabled:
+        return
+    try:
+        print(json.dumps(metrics.to_emf(config.llm_metrics_namespace), ensure_ascii=False), flush=True)
+    except Exception as e:
+        logger.warning(f"LLM 지표 출력 실패: {e}")
+
+@contextmanager
+def track_llm_call(provider: str, model: str, endpoint: str = None, attempt: int = 0):
+    """
+    블로킹/async 호출 1건을 계측합니다. 블록 안의 프로바이더 호출은 record_usage()로 토큰 수를 기록합니다.
+    (취소된 Hedging 패배 호출은 오류로 세지 않음)
+    """
+    metrics = LLMCallMetrics(provider=provider, model=model, endpoint=endpoint, attempt=attempt)
+    token = _current_call.set(metrics)
+    try:
+        yield metrics
+    except asyncio.CancelledError:
+        metrics.cancelled = True
+        metrics.error_class = "CancelledError"
+        raise
+    except Exception as e:
+        metrics.error_class = type(e).__name__
+        raise
+    finally:
+        _current_call.reset(token)
+        emit(metrics)
+
+def record_usage(input_tokens=None, output_tokens=None, retries=None):
+    """현재 track_llm_call 블록의 계측값에 토큰 수/재시도 횟수를 기록합니다. (블록 밖이면 무시)"""
+    metrics = _current_call.get()
+    if metrics is not None:
+        metrics.add_usage(input_tokens, output_tokens, retries)
+
+def track_stream(chunks: Iterator[str], metrics: LLMCallMetrics) -> Iterator[str]:
+    """스트리밍 응답을 감싸 첫 청크 도착 시간(TTFT)과 전체 시간을 기록합니다."""
+    metrics.streamed = True
+    try:
+        for chunk in chunks:
+            if metrics.error_class is None:
+                metrics.mark_first_token()
+            yield chunk
+    except Exception as e:
+        metrics.error_class = type(e).__name__
+        raise
+    finally:
+        emit(metrics)
@@ -0,0 +1,167 @@
+# chatbot/service/llm_router.py
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Dict, List, Optional
+
+logger = logging.getLogger()
+
+# 프롬프트 유형(엔드포인트)별로 응답 가능한 프로바이더
+# - gemma(vLLM)는 CBT 상담 데이터로 파인튜닝된 모델이므로 상담형 프롬프트에만 사용
+COUNSELING_PROVIDERS = ("gemini", "bedrock", "gemma")
+GENERAL_PROVIDERS = ("gemini", "bedrock")
+PROMPT_COMPATIBILITY = {
+    "reframing": COUNSELING_PROVIDERS,
+    "voice_reframing": COUNSELING_PROVIDERS,
+    "mind_diary": COUNSELING_PROVIDERS,
+    "search": GENERAL_PROVIDERS,
+    "weekly_report": GENERAL_PROVIDERS,
+    "session_summary": GENERAL_PROVIDERS,
+}
+
+class CircuitBreaker:
+    """
+    프로바이더 단위 서킷 브레이커
+    - CLOSED: 정상 호출
+    - OPEN: 연속 실패가 failure_threshold에 도달하면 recovery_timeout 동안 호출 차단
+    - HALF_OPEN: recovery_timeout 경과 후 한 건만 시험 호출(probe), 성공하면 CLOSED로 복구
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    # acquire() 반환값: PASS = 정상 호출 허가, PROBE = HALF_OPEN 시험 호출 슬롯 획득 (release 대상)
+    PASS = "pass"
+    PROBE = "probe"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        """호출 가능 여부만 확인합니다. (상태 변경 없음)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                return time.monotonic() - self.opened_at >= self.recovery_timeout
+            return not self._probe_in_flight
+
+    def acquire(self) -> Optional[str]:
+        """
+        호출 직전에 사용: HALF_OPEN이면 probe 슬롯 한 개만 허용합니다.
+        Returns:
+            PASS / PROBE (허가, 결과를 기록하지 못하고 끝나면 release에 그대로 넘김) 또는 None (차단)
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return self.PASS
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return self.PROBE
+            return None
+
+    def release(self, slot: Optional[str]):
+        """
+        결과 없이 끝난 호출(취소 등)이 acquire로 받은 슬롯을 반납합니다.
+        실제로 probe 슬롯을 잡은 호출만 해제하므로, 다른 요청의 진행 중인 probe를 풀지 않습니다.
+        """
+        if slot != self.PROBE:
+            return
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_success(self) -> bool:
+        """Returns: 이번 성공으로 회로가 복구(CLOSED)되었는지 여부"""
+        with self._lock:
+            recovered = self.state != self.CLOSED
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+            return recovered
+
+    def record_failure(self) -> bool:
+        """Returns: 이번 실패로 회로가 열렸는지 여부"""
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                opened = self.state != self.OPEN
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                return opened
+            return False
+
+class LLMRouter:
+    """
+    프로바이더별 최근 오류율/지연과 서킷 브레이커 상태를 보고 호출 순서를 결정합니다.
+    요청한 프로바이더(primary)가 사용 가능하면 항상 우선하고, 불가하면
+    프롬프트 유형과 호환되는 나머지 프로바이더를 (오류율, 지연) 순으로 시도합니다.
+    """
+
+    def __init__(self, latency_tracker, failure_threshold: int = 5, recovery_timeout: float = 30.0, window: int = 50):
+        self.latency = latency_tracker
+        self.breakers: Dict[str, CircuitBreaker] = defaultdict(
+            lambda: CircuitBreaker(failure_threshold, recovery_timeout)
+        )
+        self._outcomes = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def candidates(self, primary: str, prompt_type: Optional[str] = None) -> List[str]:
+        """시도할 프로바이더 순서 (서킷이 열린 프로바이더 제외)"""
+        compatible = PROMPT_COMPATIBILITY.get(prompt_type, GENERAL_PROVIDERS)
+        fallbacks = sorted(
+            (p for p in compatible if p != primary and self.breakers[p].is_available()),
+            key=self._score
+        )
+        if self.breakers[primary].is_available():
+            return [primary] + fallbacks
+        return fallbacks
+
+    def acquire(self, provider: str) -> Optional[str]:
+        return self.breakers[provider].acquire()
+
+    def release(self, provider: str, slot: Optional[str]):
+        self.breakers[provider].release(slot)
+
+    def record_success(self, provider: str):
+        with self._lock:
+            self._outcomes[provider].append(True)
+        if self.breakers[provider].record_success():
+            logger.info(f"LLM 서킷 복구: {provider}")
+
+    def record_failure(self, provider: str):
+        with self._lock:
+            self._outcomes[provider].append(False)
+        if self.breakers[provider].record_failure():
+            logger.warning(f"LLM 서킷 열림: {provider} ({self.breakers[provider].recovery_timeout}초 동안 우회)")
+
+    def error_rate(self, provider: str) -> float:
+        with self._lock:
+            outcomes = list(self._outcomes[provider])
+        if not outcomes:
+            return 0.0
+        return outcomes.count(False) / len(outcomes)
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {
+            provider: {
+                "state": breaker.state,
+                "error_rate": round(self.error_rate(provider), 3),
+                "p50_latency": self.latency.percentile(provider, 50),
+            }
+            for provider, breaker in list(self.breakers.items())
+        }
+
+    def _score(self, provider: str):
+        p50 = self.latency.percentile(provider, 50)
+        return self.error_rate(provider), p50 if p50 is not None else float("inf")
@@ -1,65 +1,197 @@
 import json
-import boto3
+import time
 import logging
 from botocore.exceptions import ClientError
 from functools import lru_cache
-from openai import OpenAI, OpenAIError
+from importlib.util import find_spec
+from typing import Iterator
 try:
     from config import config
 except ImportError:
     from ..config import config
+from service.client_registry import ClientRegistry, get_client_registry
+from service.credential_cache import load_cached_secret
+from service.embedding_cache import EmbeddingCache
+from service.prompt_cache import VertexPrefixCache
+from prompts.cacheable import CacheablePrompt
+from service.embedding_batch import EmbeddingBatchResult, embed_concurrently
+from service.lazy_provider import LazyProvider
+from service.llm_hedging import HedgeStats, LatencyTracker, get_hedge_policy, run_hedged
+from service.llm_metrics import LLMCallMetrics, record_usage, track_llm_call, track_stream
+from service.llm_router import LLMRouter
+from util.structured_output import gemini_response_schema, provider_json_schema
 
-# Optional: Vertex AI
-try:
-    import vertexai
-    from vertexai.generative_models import GenerativeModel
-    from google.oauth2 import service_account
-except ImportError:
-    vertexai = None
+# Optional: Vertex AI / OpenAI SDK는 import에만 수 초가 걸리므로 첫 사용 시점에 import
+# (SQS 임베딩 배치, Gemini를 쓰지 않는 라우트의 Cold start 단축)
+_HAS_VERTEXAI = find_spec("vertexai") is not None
 
 logger = logging.getLogger()
 
 class LLMService:
     MODEL_ID_BEDROCK_CLAUDE = 'anthropic.claude-3-5-sonnet-20240620-v1:0'
     MODEL_ID_BEDROCK_EMBEDDING = 'amazon.titan-embed-text-v2:0'
+    EMBEDDING_DIMENSIONS = 1024  # Titan v2 기본 차원 (DB 컬럼 VECTOR(1024)와 일치)
     MODEL_ID_GEMINI = "gemini-2.5-pro"
 
     # vLLM에 로드된 모델명 (서버 로그나 curl /v1/models로 확인된 ID 사용)
     # 만약 이름을 모르면 "/workspace/" 혹은 "default" 등을 시도
     MODEL_ID_GEMMA = "0xMori/gemma-2-9b-safori-cbt-merged"
 
-    def __init__(self):
-        # AWS Client 초기화
-        self.bedrock_runtime = boto3.client(service_name='bedrock-runtime', region_name='ap-northeast-2')
+    def __init__(self, registry: ClientRegistry = None):
+        # 프로바이더 클라이언트는 레지스트리에서 공유 (Warm 호출 간 커넥션 재사용)
+        self.registry = registry or get_client_registry()
+
+        # 프로바이더는 첫 사용 시 초기화 (SQS 임베딩 배치 등은 Vertex AI / vLLM 초기화 비용을 내지 않음)
+        self._providers = {
+            "bedrock": LazyProvider("bedrock", lambda: self.registry.get_bedrock_runtime(region_name='ap-northeast-2')),
+            "gemini": LazyProvider(
+                "gemini", self._init_gemini,
+                configured=lambda: _HAS_VERTEXAI and bool(config.gcp_ssm_param_name or config.llm_standin_url)
+            ),
+            "gemma": LazyProvider(
+                "gemma", self._init_hf_client,
+                configured=lambda: bool(config.hf_endpoint_url and config.hf_api_token)
+            ),
+        }
+        # (선택) 정적 프롬프트 프리픽스를 Vertex AI CachedContent로 재사용
+        self._prompt_cache = LazyProvider("prompt_cache", self._init_prompt_cache)
+
+        # 임베딩 캐시 (LRU + Postgres)
+        self.embedding_cache = EmbeddingCache(
+            model_id=self.MODEL_ID_BEDROCK_EMBEDDING,
+            dimensions=self.EMBEDDING_DIMENSIONS,
+            max_entries=config.embedding_cache_max_entries,
+            use_db=config.embedding_cache_db_enabled
+        )
+
+        # 프로바이더별 응답 시간 / Hedging 승자 집계 (Hedge 지연값 계산용)
+        self.latency = LatencyTracker()
+        self.hedge_stats = HedgeStats()
+
+        # 프로바이더 라우터 (오류율/지연 추적 + 서킷 브레이커)
+        self.router = LLMRouter(
+            self.latency,
+            failure_threshold=config.llm_circuit_failure_threshold,
+            recovery_timeout=config.llm_circuit_recovery_seconds
+        )
+
+        # asyncio 버전 (async 엔드포인트용, 최초 접근 시 생성)
+        self._aio = None
+
+    # --- 프로바이더 (Lazy) ---
+    @property
+    def bedrock_runtime(self):
+        return self._providers["bedrock"].get()
+
+    @bedrock_runtime.setter
+    def bedrock_runtime(self, value):
+        self._providers["bedrock"].set(value)
+
+    @property
+    def gemini_pro_model(self):
+        return self._providers["gemini"].get()
+
+    @gemini_pro_model.setter
+    def gemini_pro_model(self, value):
+        self._providers["gemini"].set(value)
+
+    @property
+    def hf_client(self):
+        return self._providers["gemma"].get()
+
+    @hf_client.setter
+    def hf_client(self, value):
+        self._providers["gemma"].set(value)
+
+    @property
+    def prompt_cache(self):
+        return self._prompt_cache.get()
 
-        # Vertex AI (Gemini) 초기화
-        self.gemini_pro_model = self._init_gemini()
+    @prompt_cache.setter
+    def prompt_cache(self, value):
+        self._prompt_cache.set(value)
 
-        # Hugging Face (vLLM) 클라이언트 초기화
-        self.hf_client = self._init_hf_client()
+    def prefetch(self, *providers: str):
+        """
+        라우트가 사용할 프로바이더를 백그라운드에서 동시에 초기화합니다. (이미 초기화됐으면 무시)
+        예: llm_service.prefetch("gemini", "bedrock")
+        """
+        for provider in providers:
+            self._providers[provider].prefetch()
+
+    @property
+    def aio(self):
+        """같은 인증/모델을 공유하는 AsyncLLMService 인스턴스"""
+        if self._aio is None:
+            from service.async_llm_service import AsyncLLMService
+            self._aio = AsyncLLMService(self)
+        return self._aio
 
     def _init_gemini(self):
-        if not vertexai:
+        if not _HAS_VERTEXAI:
             logger.info("Gemini 라이브러리 없음")
             return None
 
+        if config.llm_standin_url:
+            return self._init_standin_gemini()
+
         try:
             gcp_ssm_name = config.gcp_ssm_param_name
             if gcp_ssm_name:
-                ssm_client = boto3.client('ssm', region_name='ap-northeast-2')
-                ssm_response = ssm_client.get_parameter(Name=gcp_ssm_name, WithDecryption=True)
-                gcp_credentials_dict = json.loads(ssm_response['Parameter']['Value'])
+                # SSM 조회 결과는 /tmp에 캐시 (같은 실행 환경의 다음 Cold start에서 재사용)
+                gcp_credentials_dict = json.loads(load_cached_secret(
+                    gcp_ssm_name,
+                    lambda: self._fetch_ssm_parameter(gcp_ssm_name),
+                    ttl_seconds=config.gcp_credentials_cache_ttl_seconds
+                ))
+
+                import vertexai
+                from google.oauth2 import service_account
 
                 credentials = service_account.Credentials.from_service_account_info(gcp_credentials_dict)
                 project_id = gcp_credentials_dict['project_id']
 
                 vertexai.init(project=project_id, credentials=credentials)
                 logger.info(f"Vertex AI 초기화 성공: {project_id}")
-                return GenerativeModel(self.MODEL_ID_GEMINI)
+                return self.registry.get_gemini_model(project_id, self.MODEL_ID_GEMINI)
         except Exception as e:
             logger.error(f"Vertex AI 초기화 실패: {e}")
             return None
 
+    def _fetch_ssm_parameter(self, name: str) -> str:
+        ssm_response = self.registry.get_ssm().get_parameter(Name=name, WithDecryption=True)
+        return ssm_response['Parameter']['Value']
+
+    def _init_prompt_cache(self):
+        if config.vertex_context_cache_enabled and self.gemini_pro_model:
+            return VertexPrefixCache(self.MODEL_ID_GEMINI, ttl_seconds=config.vertex_context_cache_ttl_seconds)
+        return None
+
+    def _init_standin_gemini(self):
+        """부하 테스트용 대역 서버를 Vertex AI REST 엔드포인트로 사용 (인증 없음)"""
+        try:
+            import vertexai
+            from google.auth.credentials import AnonymousCredentials
+            vertexai.init(
+                project="standin",
+                location="us-central1",
+                credentials=AnonymousCredentials(),
+                api_endpoint=config.llm_standin_url,
+                api_transport="rest"
+            )
+            try:
+                # generate_content_async(AsyncLLMService)도 REST로 보내려면 비동기 자격 증명이 필요
+                from google.auth.aio.credentials import AnonymousCredentials as AsyncAnonymousCredentials
+                from google.cloud.aiplatform import initializer
+                initializer._set_async_rest_credentials(AsyncAnonymousCredentials())
+            except Exception as e:
+                logger.warning(f"Vertex AI 비동기 REST 설정 실패 (async Gemini 호출은 대역 서버 미사용): {e}")
+            logger.info(f"Vertex AI 대역 서버 사용: {config.llm_standin_url}")
+            return self.registry.get_gemini_model("standin", self.MODEL_ID_GEMINI)
+        except Exception as e:
+            logger.error(f"Vertex AI 대역 서버 초기화 실패: {e}")
+            return None
+
     def _init_hf_client(self):
         """
         OpenAI 호환 클라이언트를 초기화합니다 (vLLM용)
@@ -72,10 +204,7 @@ class LLMService:
             # vLLM/OpenAI 호환 주소 처리: 끝에 /v1 붙이기
             base_url = f"{config.hf_endpoint_url.rstrip('/')}/v1"
 
-            client = OpenAI(
-                base_url=base_url,
-                api_key=config.hf_api_token
-            )
+            client = self.registry.get_openai(base_url, config.hf_api_token, model=self.MODEL_ID_GEMMA)
             logger.info("HF vLLM(OpenAI) 클라이언트 초기화 성공")
             return client
         except Exception as e:
@@ -92,21 +221,10 @@ class LLMService:
             logger.error(error_msg)
             return json.dumps({"empathy": error_msg}, ensure_ascii=False)
 
-        messages = [
-            {"role": "user", "content": prompt}
-        ]
-
+        from openai import OpenAIError
         try:
-            response = self.hf_client.chat.completions.create(
-                model=self.MODEL_ID_GEMMA,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=0.7,
-                top_p=0.9
-            )
-
-            result_text = response.choices[0].message.content
-            return result_text
+            with track_llm_call("gemma", self.MODEL_ID_GEMMA):
+                return self._call_gemma(prompt, max_tokens)
 
         except OpenAIError as e:
             logger.error(f"vLLM 호출 오류 (OpenAI Error): {e}")
@@ -116,13 +234,73 @@ class LLMService:
             logger.error(f"Gemma 연결 알 수 없는 오류: {e}")
             return json.dumps({"empathy": f"시스템 오류: {str(e)}"}, ensure_ascii=False)
 
+    def _call_gemma(self, prompt: str, max_tokens: int = 2048, schema=None) -> str:
+        """vLLM(Gemma) 호출 (오류 시 예외 발생, 응답 시간 기록)"""
+        if not self.hf_client:
+            raise RuntimeError("vLLM 클라이언트가 초기화되지 않았습니다.")
+
+        start = time.monotonic()
+        response = self.hf_client.chat.completions.create(
+            model=self.MODEL_ID_GEMMA,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=0.7,
+            top_p=0.9,
+            **self._openai_schema_kwargs(schema)
+        )
+        self.latency.record("gemma", time.monotonic() - start)
+        record_usage(*self._openai_usage(response))
+        return response.choices[0].message.content
+
+    def stream_gemma_response(self, prompt: str, max_tokens: int = 2048, schema=None, metrics: LLMCallMetrics = None) -> Iterator[str]:
+        """
+        vLLM(Gemma) 응답을 토큰 청크 단위로 스트리밍합니다. (stream=True)
+        metrics를 넘기면 마지막 청크의 토큰 사용량과 오류 유형을 기록합니다.
+        """
+        if not self.hf_client:
+            error_msg = "오류: vLLM 클라이언트가 초기화되지 않았습니다. 설정을 확인하세요."
+            logger.error(error_msg)
+            yield json.dumps({"empathy": error_msg}, ensure_ascii=False)
+            return
+
+        started = False
+        try:
+            stream = self.hf_client.chat.completions.create(
+                model=self.MODEL_ID_GEMMA,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                temperature=0.7,
+                top_p=0.9,
+                stream=True,
+                stream_options={"include_usage": True},
+                **self._openai_schema_kwargs(schema)
+            )
+            for chunk in stream:
+                if metrics and getattr(chunk, "usage", None):
+                    metrics.add_usage(*self._openai_usage(chunk))
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    started = True
+                    yield delta
+
+        except Exception as e:
+            logger.error(f"vLLM 스트리밍 오류: {e}")
+            if metrics:
+                metrics.error_class = type(e).__name__
+            # 이미 일부 청크가 나갔다면 오류 JSON을 덧붙이지 않음 (응답 오염 방지)
+            if not started:
+                yield json.dumps({"empathy": f"AI 모델 오류: {str(e)}"}, ensure_ascii=False)
+
     def get_dynamic_model_response(
         self, 
         prompt: str, 
         model_type: str = "gemini",
         model_name: str = None,
         hf_endpoint_url: str = None,
-        max_tokens: int = 2048
+        max_tokens: int = 2048,
+        schema=None
     ) -> str:
         """
         동적으로 모델을 선택하여 응답을 생성합니다.
@@ -133,14 +311,16 @@ class LLMService:
             model_name: HF 모델명 (hf 타입일 경우 필수)
             hf_endpoint_url: HF Endpoint URL (hf 타입일 경우 필수)
             max_tokens: 최대 토큰 수
+            schema: 응답 JSON 구조 (Pydantic 모델, 구조화 출력 사용)
         
         Returns:
             str: 모델 응답 텍스트
         """
         if model_type == "gemini":
-            return self._get_gemini_direct_response(prompt)
+            return self._get_gemini_direct_response(prompt, schema)
         
         elif model_type == "hf":
+            from openai import OpenAIError
             if not model_name or not hf_endpoint_url:
                 error_msg = "HF 모델 사용 시 model_name과 hf_endpoint_url이 필요합니다."
                 logger.error(error_msg)
@@ -153,23 +333,23 @@ class LLMService:
                 logger.error(error_msg)
                 return json.dumps({"empathy": error_msg}, ensure_ascii=False)
             
-            # 동적 HF 클라이언트 생성
+            # 동적 HF 클라이언트 (엔드포인트별로 한 번만 생성 후 재사용)
             try:
                 base_url = f"{hf_endpoint_url.rstrip('/')}/v1"
-                dynamic_client = OpenAI(
-                    base_url=base_url,
-                    api_key=hf_api_token
-                )
+                dynamic_client = self.registry.get_openai(base_url, hf_api_token, model=model_name)
                 
                 messages = [{"role": "user", "content": prompt}]
                 
-                response = dynamic_client.chat.completions.create(
-                    model=model_name,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=0.7,
-                    top_p=0.9
-                )
+                with track_llm_call("hf", model_name, endpoint="dev_dynamic"):
+                    response = dynamic_client.chat.completions.create(
+                        model=model_name,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=0.7,
+                        top_p=0.9,
+                        **self._openai_schema_kwargs(schema)
+                    )
+                    record_usage(*self._openai_usage(response))
                 
                 result_text = response.choices[0].message.content
                 logger.info(f"동적 HF 모델 호출 성공 - endpoint: {hf_endpoint_url}, model: {model_name}")
@@ -189,6 +369,53 @@ class LLMService:
             return json.dumps({"empathy": error_msg}, ensure_ascii=False)
 
     def get_embedding(self, text: str) -> list[float]:
+        """캐시(LRU -> DB)를 먼저 확인하고, 없을 때만 Bedrock Titan을 호출합니다."""
+        cached = self.embedding_cache.get(text)
+        if cached is not None:
+            return cached
+
+        embedding = self._invoke_embedding(text)
+        if embedding:
+            self.embedding_cache.put(text, embedding)
+        return embedding
+
+    def get_embeddings(self, texts: list[str]) -> EmbeddingBatchResult:
+        """
+        여러 텍스트를 한 번에 임베딩합니다. (입력 순서 보존, 항목별 오류 반환)
+        캐시 적중분과 중복 텍스트는 제외하고, 나머지만 제한된 워커 풀로 병렬 호출합니다.
+        """
+        embeddings = [None] * len(texts)
+        errors = {}
+
+        cached = self.embedding_cache.get_many(texts)
+        for idx, embedding in cached.items():
+            embeddings[idx] = embedding
+
+        # 캐시 미스 텍스트 (중복 제거)
+        pending = {}
+        for idx, text in enumerate(texts):
+            if idx not in cached:
+                pending.setdefault(text, []).append(idx)
+
+        if pending:
+            unique_texts = list(pending.keys())
+            batch = embed_concurrently(unique_texts, self._invoke_embedding, max_workers=config.embedding_max_workers)
+            generated = {}
+            for unique_idx, text in enumerate(unique_texts):
+                embedding = batch.embeddings[unique_idx]
+                for idx in pending[text]:
+                    if embedding is not None:
+                        embeddings[idx] = embedding
+                    else:
+                        errors[idx] = batch.errors.get(unique_idx, "임베딩 생성 실패")
+                if embedding is not None:
+                    generated[text] = embedding
+            # 새로 만든 임베딩은 한 번에 캐시에 저장 (DB 왕복 1회)
+            self.embedding_cache.put_many(generated)
+
+        return EmbeddingBatchResult(embeddings, errors)
+
+    def _invoke_embedding(self, text: str) -> list[float]:
         body = json.dumps({"inputText": text})
         try:
             response = self.bedrock_runtime.invoke_model(
@@ -203,38 +430,314 @@ class LLMService:
             logger.error(f"Bedrock 임베딩 오류: {e}")
             raise e
 
-    def get_llm_response(self, prompt: str, use_bedrock: bool = False) -> str:
-        if use_bedrock:
-            return self._get_bedrock_response(prompt)
+    def get_llm_response(self, prompt: str, use_bedrock: bool = False, endpoint: str = None, schema=None) -> str:
+        """
+        요청한 프로바이더(primary)를 우선 호출하되, 서킷이 열렸거나 호출이 실패하면
+        프롬프트 유형(endpoint)과 호환되는 다른 프로바이더로 우회합니다.
+        Args:
+            endpoint: 호출한 엔드포인트 이름 (프롬프트 유형 / LLM_HEDGE_POLICIES 키)
+            schema: 응답 JSON 구조 (Pydantic 모델). 지정하면 프로바이더별 구조화 출력으로
+                    스키마에 맞는 JSON 텍스트만 생성합니다. (Gemini response_schema / Bedrock tool use / vLLM guided decoding)
+        """
+        primary = "bedrock" if use_bedrock else "gemini"
+        route = self._route(primary, endpoint)
+
+        policy = get_hedge_policy(endpoint)
+        if policy and route and policy.secondary != route[0] and policy.secondary in route:
+            return self._get_hedged_response(prompt, primary, route, policy, endpoint, schema)
+
+        return self._get_routed_response(prompt, primary, route, endpoint, schema)
+
+    def _route(self, primary: str, endpoint: str = None) -> list[str]:
+        """라우터가 정한 시도 순서 중 설정(초기화)된 프로바이더만 반환합니다."""
+        return [p for p in self.router.candidates(primary, endpoint) if self._is_configured(p)]
+
+    def _is_configured(self, provider: str) -> bool:
+        """초기화 전이면 설정값으로만 판단 (라우팅 후보 확인만으로 초기화하지 않음)"""
+        return self._providers[provider].available()
+
+    def _get_routed_response(self, prompt: str, primary: str, route: list[str], endpoint: str, schema=None) -> str:
+        last_error = None
+        for attempt, provider in enumerate(route):
+            if not self.router.acquire(provider):
+                continue
+            try:
+                text = self._call_provider(provider, prompt, schema, endpoint, attempt)
+            except Exception as e:
+                logger.error(f"LLM 호출 실패 ({provider}): {e}")
+                last_error = e
+                continue
+
+            if provider != primary:
+                logger.warning(f"LLM 우회 응답: {primary} -> {provider} (endpoint={endpoint})")
+            return text
+
+        if last_error is None:
+            return self._create_error_json("사용 가능한 LLM 프로바이더가 없습니다. (서킷 열림)")
+        return self._create_error_json(f"시스템 오류: {last_error}")
+
+    def _get_hedged_response(self, prompt: str, primary: str, route: list[str], policy, endpoint: str, schema=None) -> str:
+        """
+        Primary가 지연 백분위(policy.percentile)를 넘기면 Secondary를 추가로 호출하고,
+        먼저 유효한 JSON 응답을 낸 쪽을 반환합니다.
+        두 호출 모두 서킷 브레이커의 acquire를 거치며(HALF_OPEN이면 probe 1건만), Secondary를 얻지 못하면 Hedge하지 않습니다.
+        """
+        first = route[0]
+        slots = {first: self.router.acquire(first)}
+        if not slots[first]:
+            return self._get_routed_response(prompt, primary, route, endpoint, schema)
+
+        delay = self.latency.hedge_delay(first, policy)
+        winner, text, hedged = run_hedged(
+            (first, lambda: self._call_provider(first, prompt, schema, endpoint)),
+            (policy.secondary, lambda: self._call_provider(policy.secondary, prompt, schema, endpoint, attempt=1)),
+            delay,
+            schema=schema,
+            admit_secondary=lambda: self._acquire_slot(slots, policy.secondary),
+            on_cancelled=lambda provider: self.router.release(provider, slots.get(provider))
+        )
+        if winner is None:
+            logger.error(f"Hedged LLM 호출 모두 실패 (endpoint={endpoint})")
+            return self._create_error_json("LLM 응답 생성 실패")
+
+        self.hedge_stats.record(endpoint, winner, hedged)
+        return text
+
+    def _acquire_slot(self, slots: dict, provider: str) -> bool:
+        """서킷 브레이커 슬롯을 얻어 slots에 기록합니다. (취소 시 실제로 얻은 슬롯만 반납하기 위함)"""
+        slots[provider] = self.router.acquire(provider)
+        return bool(slots[provider])
+
+    def _call_provider(self, provider: str, prompt: str, schema=None, endpoint: str = None, attempt: int = 0) -> str:
+        """
+        프로바이더를 호출하고 성공/실패를 라우터(서킷 브레이커)에 기록합니다.
+        호출마다 지연/토큰/오류 지표를 EMF로 남깁니다. (attempt: 라우팅 순서상 위치, 0보다 크면 우회 호출)
+        """
+        kwargs = {"schema": schema} if schema else {}
+        try:
+            with track_llm_call(provider, self._model_id(provider), endpoint, attempt):
+                if provider == "bedrock":
+                    text = self._call_bedrock(prompt, **kwargs)
+                elif provider == "gemma":
+                    text = self._call_gemma(prompt, **kwargs)
+                else:
+                    text = self._call_gemini(prompt, **kwargs)
+        except Exception:
+            self.router.record_failure(provider)
+            raise
+        self.router.record_success(provider)
+        return text
+
+    def stream_llm_response(self, prompt: str, use_bedrock: bool = False, endpoint: str = None, schema=None) -> Iterator[str]:
+        """
+        LLM 응답을 생성되는 대로 청크(str) 단위로 반환합니다.
+        첫 청크가 도착하는 즉시 클라이언트로 전달할 수 있어 TTFB가 크게 줄어듭니다.
+        (스트림 시작 시 라우팅 순서대로 서킷 브레이커 슬롯을 얻은 첫 프로바이더를 사용하고,
+         스트림이 끝나면 성공/실패를 기록, 클라이언트가 중간에 끊으면 슬롯만 반납)
+        """
+        primary = "bedrock" if use_bedrock else "gemini"
+        route = self._route(primary, endpoint) or [primary]
+        provider, slot = None, None
+        for provider in route:
+            slot = self.router.acquire(provider)
+            if slot:
+                break
+        if not slot:
+            yield self._create_error_json("사용 가능한 LLM 프로바이더가 없습니다. (서킷 열림)")
+            return
+        if provider != primary:
+            logger.warning(f"LLM 스트리밍 우회: {primary} -> {provider} (endpoint={endpoint})")
+
+        metrics = LLMCallMetrics(
+            provider=provider, model=self._model_id(provider), endpoint=endpoint,
+            streamed=True, attempt=route.index(provider)
+        )
+        if provider == "bedrock":
+            chunks = self._stream_bedrock_response(prompt, schema, metrics)
+        elif provider == "gemma":
+            chunks = self.stream_gemma_response(prompt, schema=schema, metrics=metrics)
         else:
-            return self._get_gemini_direct_response(prompt)
+            chunks = self._stream_gemini_response(prompt, schema, metrics)
 
-    def _get_bedrock_response(self, prompt: str) -> str:
+        try:
+            yield from track_stream(chunks, metrics)
+        except GeneratorExit:
+            # 클라이언트 연결 종료 등 결과 없이 끝난 스트림: 얻은 probe 슬롯만 반납
+            self.router.release(provider, slot)
+            raise
+        except Exception:
+            self.router.record_failure(provider)
+            raise
+        # 스트리밍 함수는 오류를 오류 JSON 청크로 바꿔 내보내므로 metrics.error_class로 판단
+        if metrics.error_class:
+            self.router.record_failure(provider)
+        else:
+            self.router.record_success(provider)
+
+    def _model_id(self, provider: str) -> str:
+        if provider == "bedrock":
+            return self.MODEL_ID_BEDROCK_CLAUDE
+        if provider == "gemma":
+            return self.MODEL_ID_GEMMA
+        return self.MODEL_ID_GEMINI
+
+    @staticmethod
+    def _openai_usage(response) -> tuple:
+        """OpenAI 호환 응답(vLLM)의 (입력 토큰, 출력 토큰)"""
+        usage = getattr(response, "usage", None)
+        return getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None)
+
+    @staticmethod
+    def _gemini_usage(response) -> tuple:
+        """Gemini 응답(스트리밍 시 마지막 청크)의 (입력 토큰, 출력 토큰)"""
+        usage = getattr(response, "usage_metadata", None)
+        return getattr(usage, "prompt_token_count", None), getattr(usage, "candidates_token_count", None)
+
+    def _get_gemini_direct_response(self, prompt: str, schema=None) -> str:
+        if not self.gemini_pro_model:
+            return self._create_error_json("Gemini 미설정")
+        try:
+            with track_llm_call("gemini", self.MODEL_ID_GEMINI):
+                return self._call_gemini(prompt, schema=schema)
+        except Exception as e:
+            logger.error(f"Gemini 오류: {e}")
+            return self._create_error_json(f"Gemini 오류: {e}")
+
+    def _call_bedrock(self, prompt: str, schema=None) -> str:
+        """Bedrock Claude 호출 (오류 시 예외 발생, 응답 시간 기록)"""
+        start = time.monotonic()
+        response = self.bedrock_runtime.invoke_model(
+            body=json.dumps(self._bedrock_request_body(prompt, schema)),
+            modelId=self.MODEL_ID_BEDROCK_CLAUDE
+        )
+        response_body = json.loads(response.get('body').read())
+        self.latency.record("bedrock", time.monotonic() - start)
+        usage = response_body.get('usage', {})
+        record_usage(
+            usage.get('input_tokens'), usage.get('output_tokens'),
+            response.get('ResponseMetadata', {}).get('RetryAttempts')  # botocore 내부 재시도 횟수
+        )
+        return self._bedrock_response_text(response_body)
+
+    def _bedrock_request_body(self, prompt: str, schema=None) -> dict:
+        """
+        Claude Messages API 요청 본문
+        schema가 있으면 해당 스키마를 input_schema로 갖는 도구를 강제 호출(tool_choice)하여
+        도구 입력(JSON)으로 응답을 받습니다.
+        """
         request_body = {
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": 4096,
             "messages": [{"role": "user", "content": prompt}]
         }
+        if schema:
+            request_body["tools"] = [{
+                "name": schema.__name__,
+                "description": "응답을 지정된 JSON 구조로 반환합니다.",
+                "input_schema": provider_json_schema(schema)
+            }]
+            request_body["tool_choice"] = {"type": "tool", "name": schema.__name__}
+        return request_body
+
+    def _bedrock_response_text(self, response_body: dict) -> str:
+        for block in response_body.get('content', []):
+            if block.get('type') == 'tool_use':
+                return json.dumps(block.get('input', {}), ensure_ascii=False)
+        return response_body['content'][0]['text']
+
+    def _gemini_kwargs(self, schema=None) -> dict:
+        """Gemini JSON 모드 + response_schema (schema 미지정 시 빈 dict)"""
+        if not schema:
+            return {}
+        return {"generation_config": {
+            "response_mime_type": "application/json",
+            "response_schema": gemini_response_schema(schema)
+        }}
+
+    def _openai_schema_kwargs(self, schema=None) -> dict:
+        """vLLM guided decoding (OpenAI 호환 response_format=json_schema, 미지정 시 빈 dict)"""
+        if not schema:
+            return {}
+        return {"response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": schema.__name__, "schema": provider_json_schema(schema)}
+        }}
+
+    def _call_gemini(self, prompt: str, schema=None) -> str:
+        """Gemini 호출 (오류 시 예외 발생, 응답 시간 기록)"""
+        if not self.gemini_pro_model:
+            raise RuntimeError("Gemini 미설정")
+        start = time.monotonic()
+        model, contents = self._gemini_request(prompt)
+        response = model.generate_content(contents, **self._gemini_kwargs(schema))
+        self.latency.record("gemini", time.monotonic() - start)
+        record_usage(*self._gemini_usage(response))
+        return response.text
+
+    def _gemini_request(self, prompt: str):
+        """
+        Vertex 컨텍스트 캐시를 쓸 수 있으면 (캐시 참조 모델, 동적 서픽스)를,
+        아니면 (기본 모델, 전체 프롬프트)를 반환합니다.
+        """
+        if self.prompt_cache and isinstance(prompt, CacheablePrompt):
+            cached_model = self.prompt_cache.get_model(prompt.static_prefix)
+            if cached_model is not None:
+                return cached_model, prompt.dynamic_suffix
+        return self.gemini_pro_model, prompt
+
+    def _stream_bedrock_response(self, prompt: str, schema=None, metrics: LLMCallMetrics = None) -> Iterator[str]:
+        started = False
         try:
-            response = self.bedrock_runtime.invoke_model(
-                body=json.dumps(request_body),
+            response = self.bedrock_runtime.invoke_model_with_response_stream(
+                body=json.dumps(self._bedrock_request_body(prompt, schema)),
                 modelId=self.MODEL_ID_BEDROCK_CLAUDE
             )
-            response_body = json.loads(response.get('body').read())
-            return response_body['content'][0]['text']
+            for event in response.get('body'):
+                chunk = json.loads(event['chunk']['bytes']) if 'chunk' in event else {}
+                if metrics:
+                    # 입력 토큰은 message_start, 출력 토큰은 message_delta에 누적값으로 도착
+                    if chunk.get('type') == 'message_start':
+                        metrics.add_usage(input_tokens=chunk.get('message', {}).get('usage', {}).get('input_tokens'))
+                    elif chunk.get('type') == 'message_delta':
+                        metrics.add_usage(output_tokens=chunk.get('usage', {}).get('output_tokens'))
+                if chunk.get('type') == 'content_block_delta':
+                    # 도구 사용(구조화 출력)은 input_json_delta.partial_json으로 JSON 텍스트가 도착
+                    delta = chunk.get('delta', {})
+                    text = delta.get('text') or delta.get('partial_json')
+                    if text:
+                        started = True
+                        yield text
         except Exception as e:
-            logger.error(f"Bedrock 오류: {e}")
-            return self._create_error_json(f"시스템 오류: {e}")
+            logger.error(f"Bedrock 스트리밍 오류: {e}")
+            if metrics:
+                metrics.error_class = type(e).__name__
+            if not started:
+                yield self._create_error_json(f"시스템 오류: {e}")
 
-    def _get_gemini_direct_response(self, prompt: str) -> str:
+    def _stream_gemini_response(self, prompt: str, schema=None, metrics: LLMCallMetrics = None) -> Iterator[str]:
         if not self.gemini_pro_model:
-            return self._create_error_json("Gemini 미설정")
+            yield self._create_error_json("Gemini 미설정")
+            return
+        started = False
         try:
-            response = self.gemini_pro_model.generate_content(prompt)
-            return response.text
+            model, contents = self._gemini_request(prompt)
+            for chunk in model.generate_content(contents, stream=True, **self._gemini_kwargs(schema)):
+                if metrics:
+                    metrics.add_usage(*self._gemini_usage(chunk))
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # 텍스트 파트가 없는 청크 (finish_reason 전용 등)
+                    continue
+                if text:
+                    started = True
+                    yield text
         except Exception as e:
-            logger.error(f"Gemini 오류: {e}")
-            return self._create_error_json(f"Gemini 오류: {e}")
+            logger.error(f"Gemini 스트리밍 오류: {e}")
+            if metrics:
+                metrics.error_class = type(e).__name__
+            if not started:
+                yield self._create_error_json(f"Gemini 오류: {e}")
 
     def _create_error_json(self, msg: str) -> str:
         return json.dumps({"answer": f"오류 발생: {msg}", "services": []}, ensure_ascii=False)
@@ -0,0 +1,77 @@
+# chatbot/service/prompt_cache.py
+import datetime
+import hashlib
+import logging
+import threading
+import time
+from typing import Dict, Set, Tuple
+
+logger = logging.getLogger()
+
+class VertexPrefixCache:
+    """
+    CacheablePrompt의 static_prefix를 Vertex AI CachedContent(system_instruction)로 등록하고,
+    그 캐시를 참조하는 GenerativeModel을 재사용합니다. (이후 요청은 dynamic_suffix만 전송)
+
+    - 프리픽스 해시별로 한 번만 생성하고, 만료 직전에 다시 생성합니다.
+    - 생성 실패(최소 토큰 수 미달, 권한 등) 시 retry_cooldown 동안 시도하지 않고 일반 호출로 대체합니다.
+    - 생성(네트워크 호출)은 잠금 밖에서 프리픽스별로 한 요청만 수행하고, 그동안 다른 요청은 기다리지 않고
+      기존 모델(재생성 중인 경우) 또는 일반 호출을 사용합니다.
+    """
+
+    def __init__(self, model_name: str, ttl_seconds: int = 3600, retry_cooldown: float = 300.0):
+        self.model_name = model_name
+        self.ttl_seconds = ttl_seconds
+        self.retry_cooldown = retry_cooldown
+        self._models: Dict[str, Tuple[object, float]] = {}  # prefix_hash -> (model, 재생성 시각)
+        self._failed_at: Dict[str, float] = {}
+        self._creating: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def get_model(self, static_prefix: str):
+        """캐시를 참조하는 GenerativeModel을 반환합니다. (사용 불가 시 None)"""
+        key = hashlib.sha256(static_prefix.encode("utf-8")).hexdigest()
+        now = time.monotonic()
+
+        cached = self._models.get(key)
+        if cached and now < cached[1]:
+            return cached[0]
+        if now - self._failed_at.get(key, -self.retry_cooldown) < self.retry_cooldown:
+            return None
+
+        with self._lock:
+            cached = self._models.get(key)
+            if cached and now < cached[1]:
+                return cached[0]
+            if key in self._creating:
+                # 다른 요청이 생성 중: 재생성이면 아직 유효한 기존 모델(실제 만료 1분 전), 최초 생성이면 일반 호출
+                return cached[0] if cached else None
+            self._creating.add(key)
+
+        try:
+            model = self._create(static_prefix)
+        except Exception as e:
+            logger.warning(f"Vertex 컨텍스트 캐시 생성 실패 (일반 호출로 대체): {e}")
+            with self._lock:
+                self._failed_at[key] = now
+                self._models.pop(key, None)
+                self._creating.discard(key)
+            return None
+
+        with self._lock:
+            # 만료 1분 전에 재생성 (요청 중 만료 방지)
+            self._models[key] = (model, now + max(60, self.ttl_seconds - 60))
+            self._creating.discard(key)
+        logger.info(f"Vertex 컨텍스트 캐시 생성: prefix={key[:12]}, ttl={self.ttl_seconds}s")
+        return model
+
+    def _create(self, static_prefix: str):
+        from vertexai.preview import caching
+        from vertexai.preview.generative_models import GenerativeModel
+
+        cached_content = caching.CachedContent.create(
+            model_name=self.model_name,
+            system_instruction=static_prefix,
+            ttl=datetime.timedelta(seconds=self.ttl_seconds)
+        )
+        return GenerativeModel.from_cached_content(cached_content=cached_content)
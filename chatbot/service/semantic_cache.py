@@ -0,0 +1,154 @@
+# chatbot/service/semantic_cache.py
+import copy
+import logging
+import math
+import operator
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+try:
+    from config import config
+except ImportError:
+    from ..config import config
+
+from service.embedding_cache import normalize_text
+
+logger = logging.getLogger()
+
+@dataclass
+class _Entry:
+    vector: Tuple[float, ...]   # L2 정규화된 질의 임베딩
+    partition: tuple            # (user_info, 지역, 모델) - 같은 파티션끼리만 비교
+    dataset_version: str
+    answer: dict
+    created_at: float
+
+def _normalize(vector: List[float]) -> Optional[Tuple[float, ...]]:
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        return None
+    return tuple(v / norm for v in vector)
+
+class SemanticAnswerCache:
+    """
+    /chatbot/query 최종 응답({answer, services}) 의미 기반 캐시 (In-process)
+    - 키: 질의 임베딩 + 파티션(user_info, 추출 지역, Bedrock 사용 여부)
+    - 적중: 같은 파티션 & 같은 데이터셋 버전에서 코사인 유사도가 threshold 이상인 가장 가까운 항목
+    - 만료: TTL + 최대 항목 수(LRU)
+    """
+
+    def __init__(self, threshold: float = 0.95, ttl_seconds: float = 3600, max_entries: int = 256,
+                 version_ttl_seconds: float = 60):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.version_ttl_seconds = version_ttl_seconds
+
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        self._version: Optional[str] = None
+        self._version_checked_at = 0.0
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_partition(user_info: str, locations: Optional[list], use_bedrock: bool) -> tuple:
+        return normalize_text(user_info or ""), tuple(sorted(locations or [])), bool(use_bedrock)
+
+    def dataset_version(self, fetch_version: Callable[[], str]) -> str:
+        """데이터셋 버전을 version_ttl_seconds 동안 캐시하여 매 요청 DB 조회를 피합니다."""
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked_at >= self.version_ttl_seconds:
+            version = fetch_version()
+            if self._version is not None and version != self._version:
+                logger.info(f"복지/구인 데이터셋 변경 감지 -> 의미 캐시 무효화 ({self._version} -> {version})")
+                self.clear()
+            self._version = version
+            self._version_checked_at = now
+        return self._version
+
+    def lookup(self, embedding: List[float], partition: tuple, dataset_version: str) -> Optional[dict]:
+        query = _normalize(embedding)
+        best_id, best_score = None, self.threshold
+        now = time.monotonic()
+
+        with self._lock:
+            if query is not None:
+                for entry_id, entry in list(self._entries.items()):
+                    if now - entry.created_at > self.ttl_seconds:
+                        del self._entries[entry_id]
+                        continue
+                    if entry.partition != partition or entry.dataset_version != dataset_version:
+                        continue
+                    score = sum(map(operator.mul, query, entry.vector))
+                    if score >= best_score:
+                        best_id, best_score = entry_id, score
+
+            if best_id is None:
+                self.misses += 1
+                self._log_stats()
+                return None
+
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            self._log_stats()
+            answer = self._entries[best_id].answer
+
+        logger.info(f"의미 캐시 적중 (similarity={best_score:.4f})")
+        return copy.deepcopy(answer)
+
+    def store(self, embedding: List[float], partition: tuple, dataset_version: str, answer: dict):
+        vector = _normalize(embedding)
+        if vector is None:
+            return
+        with self._lock:
+            self._entries[self._next_id] = _Entry(
+                vector=vector,
+                partition=partition,
+                dataset_version=dataset_version,
+                answer=copy.deepcopy(answer),
+                created_at=time.monotonic()
+            )
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "dataset_version": self._version,
+        }
+
+    def _log_stats(self):
+        total = self.hits + self.misses
+        if total % 50 == 0:
+            logger.info(f"의미 캐시 통계 - 적중: {self.hits}, 미스: {self.misses}, 적중률: {self.hit_rate:.1%}")
+
+# --- 의존성 주입용 (Singleton 패턴) ---
+@lru_cache()
+def get_semantic_cache() -> Optional[SemanticAnswerCache]:
+    if not config.semantic_cache_enabled:
+        return None
+    return SemanticAnswerCache(
+        threshold=config.semantic_cache_threshold,
+        ttl_seconds=config.semantic_cache_ttl_seconds,
+        max_entries=config.semantic_cache_max_entries
+    )
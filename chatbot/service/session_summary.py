@@ -0,0 +1,82 @@
+# chatbot/service/session_summary.py
+import json
+import logging
+try:
+    from config import config
+except ImportError:
+    from ..config import config
+
+from prompts.summary import get_session_summary_prompt
+from repository.chat_repository import ChatRepository
+from service.client_registry import get_client_registry
+from schema.llm_output import SessionSummaryOutput
+from util.structured_output import parse_structured
+
+logger = logging.getLogger()
+
+SUMMARY_EVENT_SOURCE = "session-summary"
+
+def request_summary_update(session_id: str, turn_count: int) -> bool:
+    """
+    턴 저장 후 호출: 최근 N턴 창 밖으로 밀려난 대화가 생겼으면 요약 갱신 메시지를 SQS로 발행합니다.
+    (요약 LLM 호출은 워커에서 수행되므로 상담 응답 지연에 영향 없음)
+    Args:
+        turn_count: 방금 저장한 턴을 포함한 세션 전체 턴 수
+    Returns:
+        bool: 발행 여부
+    """
+    if not config.session_summary_enabled or turn_count <= config.session_history_turns:
+        return False
+    if not config.session_summary_sqs_url:
+        logger.debug("SESSION_SUMMARY_SQS_URL 미설정 -> 세션 요약 갱신 생략")
+        return False
+
+    try:
+        get_client_registry().get_sqs().send_message(
+            QueueUrl=config.session_summary_sqs_url,
+            MessageBody=json.dumps({"source": SUMMARY_EVENT_SOURCE, "session_id": session_id}, ensure_ascii=False)
+        )
+        return True
+    except Exception as e:
+        # 요약 갱신 실패는 다음 턴에 다시 시도되므로 상담 흐름을 막지 않음
+        logger.error(f"세션 요약 갱신 요청 실패 (Session: {session_id}): {e}")
+        return False
+
+def refresh_session_summary(session_id: str, repo: ChatRepository, llm) -> bool:
+    """
+    최근 N턴 이전까지의 대화 중 아직 요약에 반영되지 않은 턴을 기존 요약에 합칩니다. (SQS 워커)
+    Returns:
+        bool: 성공(갱신했거나 갱신할 턴이 없음) 시 True, 실패 시 False
+    """
+    row = repo.get_session_summary(session_id)
+    previous_summary, summarized_turns = row if row else ("", 0)
+
+    total_turns = repo.get_session_turn_count(session_id)
+    target_turns = total_turns - config.session_history_turns
+    if target_turns <= summarized_turns:
+        return True
+    # 한 번에 요약할 턴 수 제한 (요약 프롬프트 크기 상한, 남은 턴은 다음 갱신에서 처리)
+    target_turns = min(target_turns, summarized_turns + config.session_summary_max_turns_per_update)
+
+    turns = repo.get_session_turns(session_id, offset=summarized_turns, limit=target_turns - summarized_turns)
+    if not turns:
+        return False
+
+    prompt = get_session_summary_prompt(
+        previous_summary,
+        turns,
+        start_turn=summarized_turns + 1,
+        max_chars=config.session_summary_max_chars
+    )
+    llm_raw_response = llm.get_llm_response(prompt, use_bedrock=False, endpoint="session_summary", schema=SessionSummaryOutput)
+
+    try:
+        summary = parse_structured(llm_raw_response, SessionSummaryOutput)["summary"]
+    except ValueError:
+        summary = None
+    if not summary:
+        logger.warning(f"세션 요약 생성 실패 (Session: {session_id}) -> 다음 턴에 재시도")
+        return False
+
+    logger.info(f"세션 요약 갱신: session={session_id}, turns={summarized_turns} -> {summarized_turns + len(turns)}")
+    return repo.upsert_session_summary(session_id, summary, summarized_turns + len(turns))
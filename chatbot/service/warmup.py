@@ -0,0 +1,96 @@
+# chatbot/service/warmup.py
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+try:
+    from config import config
+except ImportError:
+    from ..config import config
+
+from dependency import _init_db_pool, borrow_db_conn
+
+logger = logging.getLogger()
+
+def _timed(stage: Callable[[], Optional[dict]]) -> dict:
+    """단계 하나를 실행하고 {ok, ms, ...}로 결과를 반환합니다. (실패해도 예외를 던지지 않음)"""
+    start = time.monotonic()
+    try:
+        result = {"ok": True, **(stage() or {})}
+    except Exception as e:
+        logger.warning(f"Warm-up 단계 실패: {e}")
+        result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    result["ms"] = round((time.monotonic() - start) * 1000, 1)
+    return result
+
+def _warm_db(llm_service) -> Dict[str, dict]:
+    """커넥션 풀(minconn개 연결) -> SELECT 1 -> 임베딩 LRU 적재 (순서 의존)"""
+    def open_pool():
+        # 풀 생성 후 minconn개 연결이 실제로 맺어질 때까지 대기
+        _init_db_pool().wait(timeout=config.db_pool_timeout_seconds)
+        return {"minconn": config.db_pool_minconn}
+
+    stages = {"db_pool": _timed(open_pool)}
+
+    def ping():
+        with borrow_db_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+                cur.fetchone()
+
+    stages["db_ping"] = _timed(ping)
+    stages["embedding_cache"] = _timed(
+        lambda: {"primed": llm_service.embedding_cache.prime(config.warmup_embedding_prime_limit)}
+    )
+    return stages
+
+def _warm_bedrock(llm_service) -> dict:
+    # 캐시를 거치지 않고 짧은 텍스트 임베딩을 직접 호출하여 TLS 연결을 맺어 둠
+    llm_service._invoke_embedding("warmup")
+    return {}
+
+def _warm_gemini(llm_service) -> dict:
+    model = llm_service.gemini_pro_model
+    if model is None:
+        return {"skipped": "미설정"}
+    # count_tokens는 과금되지 않는 호출로 채널(gRPC/REST) 연결만 맺음
+    model.count_tokens("warmup")
+    return {}
+
+def _warm_gemma(llm_service) -> dict:
+    if llm_service.hf_client is None:
+        return {"skipped": "미설정"}
+    results = llm_service.registry.warm_up()
+    if results and not all(results.values()):
+        raise RuntimeError(f"vLLM 엔드포인트 연결 실패: {results}")
+    return {"endpoints": len(results)}
+
+def run_warmup(preload: Callable[[], object] = None) -> dict:
+    """
+    Warm-up 이벤트 처리: 첫 실제 요청이 연결 수립 비용을 내지 않도록 DB / 프로바이더 연결을 미리 맺습니다.
+    각 단계의 소요 시간(ms)과 성공 여부를 반환하며, 일부 단계가 실패해도 나머지는 계속 진행합니다.
+    Args:
+        preload: HTTP 앱 로드 함수 (lambda_function의 Mangum 핸들러 생성)
+    """
+    from service.llm_service import get_llm_service
+
+    start = time.monotonic()
+    stages: Dict[str, dict] = {}
+    if preload:
+        stages["app"] = _timed(lambda: {"loaded": preload() is not None})
+    llm_service = get_llm_service()
+
+    # DB와 프로바이더별 연결은 서로 독립적이므로 동시에 진행
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="warmup") as executor:
+        db_future = executor.submit(_warm_db, llm_service)
+        provider_futures = {
+            name: executor.submit(_timed, lambda fn=fn: fn(llm_service))
+            for name, fn in (("bedrock", _warm_bedrock), ("gemini", _warm_gemini), ("gemma", _warm_gemma))
+        }
+        stages.update(db_future.result())
+        stages.update({name: future.result() for name, future in provider_futures.items()})
+
+    total_ms = round((time.monotonic() - start) * 1000, 1)
+    summary = ", ".join(f"{name}={stage['ms']:.0f}ms{'' if stage['ok'] else '(실패)'}" for name, stage in stages.items())
+    logger.info(f"Warm-up 완료 ({total_ms:.0f}ms): {summary}")
+    return {"warmup": True, "total_ms": total_ms, "stages": stages}
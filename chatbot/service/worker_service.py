@@ -7,9 +7,12 @@ from datetime import datetime
 
 from dependency import get_db_conn
 from service.llm_service import get_llm_service
+from service.session_summary import SUMMARY_EVENT_SOURCE, refresh_session_summary
+from service.embedding_backfill import BACKFILL_EVENT_SOURCE, backfill_pending_embeddings
 from repository.chat_repository import ChatRepository
 from prompts.mind_diary import get_mind_diary_prompt
-from util.json_parser import parse_llm_json
+from schema.llm_output import MindDiaryOutput
+from util.structured_output import parse_structured
 
 logger = logging.getLogger()
 
@@ -30,9 +33,21 @@ def process_sqs_batch(records: list) -> dict:
         success_count = 0
         failed_count = 0
 
+        # 1. 레코드 파싱
+        payloads = []
         for record in records:
             try:
-                payload = json.loads(record['body'])
+                payloads.append(json.loads(record['body']))
+            except json.JSONDecodeError:
+                logger.error(f"SQS Body 파싱 실패: {record.get('body')}")
+                failed_count += 1
+
+        # 2. 일반 대화 로그의 임베딩을 한 번에 병렬 생성 (레코드별 순차 호출 대신)
+        prefetched_embeddings = _prefetch_log_embeddings(payloads, llm_service)
+
+        # 3. 레코드별 처리
+        for idx, payload in enumerate(payloads):
+            try:
                 source = payload.get("source")
 
                 is_success = False
@@ -40,18 +55,24 @@ def process_sqs_batch(records: list) -> dict:
                 if source == "mind-diary":
                     # Case A: 마음일기 분석 완료 -> 선제적 대화 생성
                     is_success = _handle_mind_diary_event(payload, chat_repo, llm_service)
+                elif source == SUMMARY_EVENT_SOURCE:
+                    # Case C: 상담 세션 누적 요약 갱신
+                    is_success = _handle_session_summary(payload, chat_repo, llm_service)
+                elif source == BACKFILL_EVENT_SOURCE:
+                    # Case D: NULL로 저장된 상담 로그 임베딩 백필
+                    is_success = _handle_embedding_backfill(payload, chat_repo, llm_service)
                 else:
                     # Case B: 일반 대화 로그 저장
-                    is_success = _handle_log_archiving(payload, chat_repo, llm_service)
+                    is_success = _handle_log_archiving(
+                        payload, chat_repo, llm_service,
+                        embedding=prefetched_embeddings.get(idx)
+                    )
 
                 if is_success:
                     success_count += 1
                 else:
                     failed_count += 1
 
-            except json.JSONDecodeError:
-                logger.error(f"SQS Body 파싱 실패: {record.get('body')}")
-                failed_count += 1
             except Exception as e:
                 logger.error(f"SQS 메시지 처리 중 알 수 없는 오류: {e}", exc_info=True)
                 failed_count += 1
@@ -71,9 +92,42 @@ def process_sqs_batch(records: list) -> dict:
         except StopIteration:
             pass
 
-def _handle_log_archiving(payload: dict, repo: ChatRepository, llm) -> bool:
+def _prefetch_log_embeddings(payloads: list, llm) -> dict:
+    """
+    일반 대화 로그 payload들의 user_input 임베딩을 get_embeddings로 일괄 생성합니다.
+    Returns:
+        dict: {payload 인덱스: 임베딩} (실패한 항목은 포함하지 않음)
+    """
+    targets = [
+        (idx, payload.get('user_input'))
+        for idx, payload in enumerate(payloads)
+        if isinstance(payload, dict)
+        and payload.get("source") not in ("mind-diary", SUMMARY_EVENT_SOURCE, BACKFILL_EVENT_SOURCE)
+        and payload.get('user_input')
+    ]
+    if not targets:
+        return {}
+
+    try:
+        batch = llm.get_embeddings([text for _, text in targets])
+    except Exception as e:
+        logger.error(f"일괄 임베딩 생성 실패: {e}")
+        return {}
+
+    for batch_idx, error in batch.errors.items():
+        logger.error(f"임베딩 생성 실패 (Session: {payloads[targets[batch_idx][0]].get('session_id')}): {error}")
+
+    return {
+        payload_idx: batch.embeddings[batch_idx]
+        for batch_idx, (payload_idx, _) in enumerate(targets)
+        if batch.embeddings[batch_idx] is not None
+    }
+
+def _handle_log_archiving(payload: dict, repo: ChatRepository, llm, embedding: list = None) -> bool:
     """
     기존 대화 로그 저장 로직
+    Args:
+        embedding: 미리 생성된 임베딩 (없으면 NULL + 'pending'으로 저장하여 백필 작업이 채움)
     Returns:
         bool: 성공 시 True, 실패(필수값 누락 등) 시 False
     """
@@ -91,13 +145,6 @@ def _handle_log_archiving(payload: dict, repo: ChatRepository, llm) -> bool:
 
         logger.info(f"로그 저장 작업 처리 중 (Session: {session_id})")
 
-        # Titan 임베딩 생성
-        embedding = [0.0] * 1024
-        try:
-            embedding = llm.get_embedding(user_input)
-        except Exception as e:
-            logger.error(f"임베딩 생성 실패 (Session: {session_id}): {e}")
-
         # DB 저장
         repo.log_cbt_session(
             user_id=user_id,
@@ -113,6 +160,36 @@ def _handle_log_archiving(payload: dict, repo: ChatRepository, llm) -> bool:
         logger.error(f"로그 저장 중 오류 발생: {e}")
         return False
 
+def _handle_session_summary(payload: dict, repo: ChatRepository, llm) -> bool:
+    """
+    세션 누적 요약 갱신
+    Returns:
+        bool: 성공 시 True, 실패 시 False
+    """
+    session_id = payload.get('session_id')
+    if not session_id:
+        logger.warning(f"세션 요약 필수 필드 누락: {payload}")
+        return False
+
+    try:
+        return refresh_session_summary(session_id, repo, llm)
+    except Exception as e:
+        logger.error(f"세션 요약 갱신 중 오류 발생: {e}", exc_info=True)
+        return False
+
+def _handle_embedding_backfill(payload: dict, repo: ChatRepository, llm) -> bool:
+    """
+    임베딩 백필 (embedding_status = 'pending' 행 채우기)
+    Returns:
+        bool: 성공 시 True, 실패 시 False
+    """
+    try:
+        backfill_pending_embeddings(repo, llm, batch_size=payload.get("batch_size"), max_batches=payload.get("max_batches"))
+        return True
+    except Exception as e:
+        logger.error(f"임베딩 백필 중 오류 발생: {e}", exc_info=True)
+        return False
+
 def _handle_mind_diary_event(payload: dict, repo: ChatRepository, llm) -> bool:
     """
     마음일기 데이터를 바탕으로 챗봇이 먼저 말을 거는 로직
@@ -151,11 +228,11 @@ def _handle_mind_diary_event(payload: dict, repo: ChatRepository, llm) -> bool:
         )
 
         # LLM 응답 생성 (첫 마디)
-        llm_raw_response = llm.get_llm_response(prompt, use_bedrock=False)
+        llm_raw_response = llm.get_llm_response(prompt, use_bedrock=False, endpoint="mind_diary", schema=MindDiaryOutput)
 
-        # JSON 파싱 (유틸리티 사용)
+        # 구조화 출력 검증 (실패는 프로바이더 전체 장애인 경우뿐)
         try:
-            bot_response_dict = parse_llm_json(llm_raw_response)
+            bot_response_dict = parse_structured(llm_raw_response, MindDiaryOutput)
         except ValueError:
             logger.warning("마음일기 LLM 파싱 실패 -> Fallback")
             bot_response_dict = {
@@ -187,7 +264,7 @@ def _handle_mind_diary_event(payload: dict, repo: ChatRepository, llm) -> bool:
             session_id=new_session_id,
             user_input=content, # 식별용 마커
             bot_response=final_bot_response,
-            embedding=[0.0] * 1024,
+            embedding=None,  # 백필 작업에서 생성 (선제 대화 응답 지연 방지)
             s3_url=s3_url
         )
 
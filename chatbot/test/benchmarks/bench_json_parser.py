@@ -0,0 +1,74 @@
+# chatbot/test/benchmarks/bench_json_parser.py
+"""
+IncrementalJSONParser vs 기존(정규식) 구현 마이크로 벤치마크 (pytest 수집 대상 아님)
+
+실행: cd chatbot && python test/benchmarks/bench_json_parser.py
+"""
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from util.json_parser import iter_completed_fields, parse_llm_json  # noqa: E402
+
+# --- 기존 구현 (비교용) ---
+_LEGACY_FIELD = re.compile(r'"(\w+)"\s*:\s*"((?:[^"\\]|\\.)*)"\s*[,}]', re.DOTALL)
+
+def legacy_parse_llm_json(text: str) -> dict:
+    cleaned_text = re.sub(r"```json\s*|\s*```", "", text, flags=re.IGNORECASE | re.DOTALL).strip()
+    try:
+        return json.loads(cleaned_text)
+    except json.JSONDecodeError:
+        pass
+    match = re.search(r'\{.*\}', text, re.DOTALL)
+    if match:
+        return json.loads(match.group(0))
+    raise ValueError
+
+def legacy_iter_completed_fields(chunks):
+    buffer = ""
+    emitted = set()
+    for chunk in chunks:
+        buffer += chunk
+        for match in _LEGACY_FIELD.finditer(buffer):
+            key = match.group(1)
+            if key in emitted:
+                continue
+            emitted.add(key)
+            yield key, match.group(2)
+    yield None, buffer
+
+def _sample(answer_chars: int) -> str:
+    body = {
+        "empathy": "많이 힘드셨겠어요. " * 5,
+        "detected_distortion": "흑백사고",
+        "analysis": "분석 " * (answer_chars // 3),
+        "socratic_question": "어떻게 생각하세요?",
+        "alternative_thought": "대안 " * 20,
+        "top_emotion": "sad"
+    }
+    return "```json\n" + json.dumps(body, ensure_ascii=False, indent=2) + "\n```\n"
+
+def _chunks(text: str, size: int = 16):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def main():
+    for chars in (1_000, 10_000, 50_000):
+        text = _sample(chars)
+        chunks = _chunks(text)
+        runs = {1_000: 200, 10_000: 20}.get(chars, 3)  # 기존 스트리밍 구현은 길이에 대해 이차 시간
+
+        blocking_old = timeit.timeit(lambda: legacy_parse_llm_json(text), number=runs) / runs
+        blocking_new = timeit.timeit(lambda: parse_llm_json(text), number=runs) / runs
+        stream_old = timeit.timeit(lambda: list(legacy_iter_completed_fields(chunks)), number=runs) / runs
+        stream_new = timeit.timeit(lambda: list(iter_completed_fields(chunks)), number=runs) / runs
+
+        print(f"[{len(text):>6} chars / {len(chunks):>5} chunks]")
+        print(f"  blocking  legacy {blocking_old * 1e3:8.3f} ms | incremental {blocking_new * 1e3:8.3f} ms")
+        print(f"  streaming legacy {stream_old * 1e3:8.3f} ms | incremental {stream_new * 1e3:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
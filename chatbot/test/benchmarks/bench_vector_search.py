@@ -0,0 +1,145 @@
+# chatbot/test/benchmarks/bench_vector_search.py
+"""
+벡터 검색 모드(vector / halfvec / binary + 재정렬) recall@10 / 지연 시간 / 인덱스 크기 비교 벤치마크 (pytest 수집 대상 아님)
+
+합성 코퍼스(군집 구조의 정규화된 1024차원 벡터)를 임시 테이블에 넣고, 모드별 HNSW 인덱스를 만든 뒤
+SearchRepository의 실제 검색 경로로 질의합니다. 정답은 인덱스 없이 계산한 정확한 top-10입니다.
+(DB 환경 변수 필요, pgvector 0.7 이상)
+
+실행: cd chatbot && python test/benchmarks/bench_vector_search.py --rows 20000 --queries 200
+"""
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import psycopg  # noqa: E402
+from dependency import _connection_kwargs  # noqa: E402
+from repository import search_repository  # noqa: E402
+from repository.search_repository import SearchRepository  # noqa: E402
+from repository.vector import register_vector, to_vector  # noqa: E402
+
+TABLE = "bench_vector_search"
+DIMENSIONS = 1024
+TOP_K = 10
+
+# 모드별 인덱스 (마이그레이션에서 쓰는 것과 같은 표현식)
+INDEXES = {
+    "vector": f"CREATE INDEX {TABLE}_idx ON {TABLE} USING hnsw (embedding vector_cosine_ops)",
+    "halfvec": f"CREATE INDEX {TABLE}_idx ON {TABLE} USING hnsw ((embedding::halfvec(1024)) halfvec_cosine_ops)",
+    "binary": f"CREATE INDEX {TABLE}_idx ON {TABLE} USING hnsw ((binary_quantize(embedding)::bit(1024)) bit_hamming_ops)",
+}
+
+def _normalize(values: list) -> list:
+    norm = math.sqrt(sum(v * v for v in values)) or 1.0
+    return [v / norm for v in values]
+
+def _centers(rng: random.Random, clusters: int = 64) -> list:
+    return [[rng.gauss(0, 1) for _ in range(DIMENSIONS)] for _ in range(clusters)]
+
+def _samples(rng: random.Random, centers: list, count: int, spread: float = 0.6):
+    """실제 임베딩처럼 주제별로 뭉친 분포 (군집 중심 + 가우시안 잡음)"""
+    for _ in range(count):
+        center = rng.choice(centers)
+        yield _normalize([c + rng.gauss(0, spread) for c in center])
+
+def _load(conn, rng: random.Random, centers: list, rows: int):
+    conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    conn.execute(f"CREATE TABLE {TABLE} (id BIGSERIAL PRIMARY KEY, name TEXT, embedding VECTOR(1024))")
+    batch = []
+    with conn.cursor() as cur:
+        for i, embedding in enumerate(_samples(rng, centers, rows)):
+            batch.append((f"doc {i}", to_vector(embedding)))
+            if len(batch) == 1000:
+                cur.executemany(f"INSERT INTO {TABLE} (name, embedding) VALUES (%s, %s)", batch)
+                batch = []
+        if batch:
+            cur.executemany(f"INSERT INTO {TABLE} (name, embedding) VALUES (%s, %s)", batch)
+    conn.commit()
+    conn.execute(f"ANALYZE {TABLE}")
+    conn.commit()
+
+def _exact_top_k(conn, queries: list) -> list:
+    conn.execute("SET enable_indexscan = off")
+    truth = []
+    for query in queries:
+        rows = conn.execute(
+            f"SELECT name FROM {TABLE} ORDER BY embedding <=> %s LIMIT {TOP_K}", (to_vector(query),)
+        ).fetchall()
+        truth.append({row[0] for row in rows})
+    conn.execute("RESET enable_indexscan")
+    conn.commit()
+    return truth
+
+def _build_index(conn, mode: str) -> tuple:
+    """모드별 인덱스만 남기고 (빌드 시간 초, 인덱스 크기 MB)를 반환"""
+    conn.execute(f"DROP INDEX IF EXISTS {TABLE}_idx")
+    started = time.perf_counter()
+    conn.execute(INDEXES[mode])
+    conn.commit()
+    build_seconds = time.perf_counter() - started
+    index_bytes = conn.execute("SELECT pg_relation_size(%s)", (f"{TABLE}_idx",)).fetchone()[0]
+    conn.commit()
+    return build_seconds, index_bytes / 2**20
+
+def _measure(conn, mode: str, candidates: int, queries: list, truth: list) -> tuple:
+    """SearchRepository 검색 경로로 (recall@10, p50 ms, p95 ms)를 측정"""
+    # 모드를 고정 (TTL이 지나도 vector_search_modes를 다시 읽지 않도록)
+    search_repository._search_modes = {TABLE: (mode, candidates)}
+    search_repository._search_modes_loaded_at = float("inf")
+    repo = SearchRepository(conn)
+
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        rows = repo._nearest(TABLE, "name", query, limit=TOP_K)
+        latencies.append((time.perf_counter() - started) * 1e3)
+        conn.rollback()  # set_config(..., true)는 트랜잭션 한정이므로 질의마다 종료
+        hits += len(expected & {row[1] for row in rows})
+
+    latencies.sort()
+    return hits / (TOP_K * len(queries)), statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[40, 100, 200])
+    parser.add_argument("--keep", action="store_true", help="끝난 뒤 벤치마크 테이블을 남김")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    conn = psycopg.connect(**_connection_kwargs())
+    register_vector(conn)
+    conn.commit()
+    try:
+        print(f"합성 코퍼스 {args.rows}건 적재 중...")
+        centers = _centers(rng)
+        _load(conn, rng, centers, args.rows)
+        # 질의도 같은 분포에서 뽑되 코퍼스에는 없는 벡터
+        queries = list(_samples(rng, centers, args.queries))
+        truth = _exact_top_k(conn, queries)
+
+        print(f"{'mode':<8} {'cand':>5} {'recall@10':>10} {'p50 ms':>8} {'p95 ms':>8} {'index MB':>9} {'build s':>8}")
+        for mode in ("vector", "halfvec", "binary"):
+            build_seconds, index_mb = _build_index(conn, mode)
+            for candidates in (args.candidates if mode != "vector" else [TOP_K]):
+                recall, p50, p95 = _measure(conn, mode, candidates, queries, truth)
+                print(
+                    f"{mode:<8} {candidates:>5} {recall:>10.3f} {p50:>8.2f} {p95:>8.2f} "
+                    f"{index_mb:>9.1f} {build_seconds:>8.1f}"
+                )
+    finally:
+        if not args.keep:
+            conn.rollback()
+            conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+            conn.commit()
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,16 @@ else:
     os.environ["CBT_LOG_SQS_URL"] = "https://sqs.dummy.url"
     os.environ["GCP_SSM_PARAM_NAME"] = "dummy_param"
     os.environ["ANTHROPIC_API_KEY"] = "dummy_key"
+    # 단위 테스트에서는 임베딩 캐시의 DB 계층을 사용하지 않음 (LRU만)
+    os.environ["EMBEDDING_CACHE_DB_ENABLED"] = "false"
 
 # 통합 테스트용 마커 등록
 def pytest_configure(config):
     config.addinivalue_line("markers", "integration: mark test as integration test")
+
+@pytest.fixture(autouse=True)
+def _reset_client_registry():
+    """테스트마다 boto3/OpenAI Mock이 새로 적용되도록 공유 클라이언트 레지스트리를 비움"""
+    from service.client_registry import get_client_registry
+    get_client_registry().evict()
+    yield
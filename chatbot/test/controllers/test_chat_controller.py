@@ -91,3 +91,31 @@ def test_get_history_service_error():
     assert json_res["message"] == "DB 연결 실패" # 우리가 설정한 메시지
 
     app.dependency_overrides = {}
+
+def test_reframing_stream_sse_format():
+    """
+    [Scenario] 스트리밍 API가 text/event-stream 형식으로 이벤트를 전달하는지 테스트
+    """
+    from domain.reframing_logic import get_reframing_service
+
+    mock_service = Mock()
+    save_turn = Mock()
+    mock_service.stream_reframing.return_value = (iter([
+        ("field", {"field": "empathy", "value": "힘드셨겠어요."}),
+        ("done", {"empathy": "힘드셨겠어요.", "emotion": "sad"})
+    ]), save_turn)
+    app.dependency_overrides[get_reframing_service] = lambda: mock_service
+
+    response = client.post(
+        "/chatbot/reframing/stream",
+        json={"user_id": "u1", "session_id": "ABC123", "user_input": "힘들어요"}
+    )
+
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert 'event: field\ndata: {"field": "empathy", "value": "힘드셨겠어요."}\n\n' in response.text
+    assert response.text.rstrip().split("\n\n")[-1].startswith("event: done")
+    # 로그 저장은 응답 전송 후 백그라운드 작업으로 실행
+    save_turn.assert_called_once()
@@ -0,0 +1,230 @@
+# chatbot/test/integration/test_query_plans.py
+import os
+import random
+import uuid
+from datetime import date, datetime, timedelta, timezone
+import pytest
+
+# 이 테스트는 'TEST_SCOPE=integration' 일 때만 실행됨 (pgvector가 설치된 로컬 / 테스트 DB 필요)
+pytestmark = [
+    pytest.mark.skipif(os.environ.get("TEST_SCOPE") != "integration", reason="통합 테스트 환경이 아님"),
+    pytest.mark.integration,
+]
+
+class _ExplainCursor:
+    """실행하는 쿼리 앞에 EXPLAIN을 붙이고, 결과 대신 실행 계획을 기록하는 커서"""
+    def __init__(self, cur, plans: list):
+        self._cur = cur
+        self._plans = plans
+
+    def execute(self, sql, params=None):
+        self._cur.execute("EXPLAIN " + sql, params)
+
+    def _record(self):
+        self._plans.append("\n".join(row[0] for row in self._cur.fetchall()))
+
+    def fetchall(self):
+        self._record()
+        return []
+
+    def fetchone(self):
+        self._record()
+        return None
+
+    def close(self):
+        self._cur.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class _ExplainConnection:
+    def __init__(self, conn):
+        self._conn = conn
+        self.plans = []
+
+    def cursor(self):
+        return _ExplainCursor(self._conn.cursor(), self.plans)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+def _vector(rng: random.Random) -> str:
+    return "[" + ",".join(f"{rng.uniform(-1, 1):.4f}" for _ in range(1024)) + "]"
+
+@pytest.fixture(scope="module")
+def seeded_conn():
+    """마이그레이션을 적용하고 합성 데이터를 넣은 뒤, 순차 스캔을 끈 autocommit 연결을 반환"""
+    import psycopg
+    from dependency import _connection_kwargs
+    from migrations import apply_migrations
+    from repository.vector import register_vector
+
+    rng = random.Random(7)
+    conn = psycopg.connect(**_connection_kwargs())
+    apply_migrations(conn)
+    register_vector(conn)
+
+    prefix = f"plan_{uuid.uuid4().hex[:6]}"
+    now = datetime.now(timezone.utc)
+    with conn.transaction():
+        with conn.cursor() as cur:
+            for i in range(200):
+                user_id, session_id = f"{prefix}_u{i % 20}", f"{prefix}_s{i % 40}"
+                cur.execute(
+                    "INSERT INTO cbt_logs (user_id, session_id, user_input, bot_response, embedding, created_at) "
+                    "VALUES (%s, %s, %s, '{}', %s::vector, %s)",
+                    (user_id, session_id, f"입력 {i}", _vector(rng), now - timedelta(hours=i))
+                )
+                cur.execute(
+                    "INSERT INTO weekly_reports (user_id, start_date, end_date) VALUES (%s, %s, %s)",
+                    (user_id, date(2024, 1, 1) + timedelta(weeks=i % 52), date(2024, 1, 7) + timedelta(weeks=i % 52))
+                )
+                cur.execute(
+                    "INSERT INTO welfare_services (id, service_name, embedding) VALUES (%s, %s, %s::vector)",
+                    (f"{prefix}_w{i}", f"서비스 {i}", _vector(rng))
+                )
+                cur.execute(
+                    "INSERT INTO employment_jobs (job_title, embedding) VALUES (%s, %s::vector)",
+                    (f"공고 {i}", _vector(rng))
+                )
+    for table in ("cbt_logs", "weekly_reports", "welfare_services", "employment_jobs", "chat_sessions"):
+        conn.execute(f"ANALYZE {table}")
+    # 작은 테이블에서는 순차 스캔이 더 싸므로 끄고, 조건이 인덱스를 '사용할 수 있는' 형태인지만 검증
+    conn.execute("SET enable_seqscan = off")
+    yield conn, prefix
+    conn.close()
+
+def _assert_index_scans(plans: list):
+    assert plans, "실행된 쿼리가 없습니다."
+    for plan in plans:
+        assert "Seq Scan" not in plan, plan
+        assert "Index" in plan, plan
+
+def test_report_repository_queries_use_indexes(seeded_conn):
+    from repository.report_repository import ReportRepository
+    conn, prefix = seeded_conn
+    explain = _ExplainConnection(conn)
+    repo = ReportRepository(explain)
+
+    repo.get_logs_by_period(f"{prefix}_u1", date.today() - timedelta(days=7), date.today())
+    repo.get_users_with_logs_in_period(date.today() - timedelta(days=7), date.today())
+    repo.find_reports_by_month(f"{prefix}_u1", 2024, 3)
+    repo.check_report_exists(f"{prefix}_u1", date(2024, 1, 1), date(2024, 1, 7))
+    repo.get_report_batch_targets(date(2024, 1, 1), date(2024, 1, 7))
+
+    assert len(explain.plans) == 6
+    _assert_index_scans(explain.plans)
+
+def test_chat_repository_queries_use_indexes(seeded_conn):
+    from repository.chat_repository import ChatRepository
+    conn, prefix = seeded_conn
+    explain = _ExplainConnection(conn)
+    repo = ChatRepository(explain)
+    session_id = f"{prefix}_s1"
+
+    repo.get_chat_history(session_id, limit=5)
+    repo.get_session_turn_count(session_id)
+    repo.get_session_turns(session_id, offset=0, limit=10)
+    repo.get_session_context(session_id, history_limit=5)
+    repo.get_session_messages(session_id, 21)
+    repo.get_session_messages(session_id, 21, before=(datetime.now(timezone.utc), 10**9))
+    repo.get_user_sessions(f"{prefix}_u1", limit=20)
+    repo.get_user_sessions(f"{prefix}_u1", limit=20, after=(datetime.now(timezone.utc), "zzz"))
+
+    _assert_index_scans(explain.plans)
+
+def test_migrations_build_halfvec_indexes_but_keep_vector_mode(seeded_conn, monkeypatch):
+    """
+    [Scenario] 마이그레이션은 halfvec 인덱스만 만들고 모드는 vector로 두며, 운영자가 UPDATE 하면 halfvec으로 검색
+    """
+    from repository import search_repository
+    conn, _ = seeded_conn
+    monkeypatch.setattr(search_repository, "_search_modes_loaded_at", 0.0)
+    repo = search_repository.SearchRepository(conn)
+
+    assert repo._search_mode("welfare_services") == ("vector", 40)
+    assert repo._search_mode("employment_jobs") == ("vector", 40)
+    assert conn.execute("SELECT COUNT(*) FROM vector_search_modes WHERE table_name = 'cbt_logs'").fetchone()[0] == 0
+
+    with conn.transaction(force_rollback=True):
+        conn.execute("UPDATE vector_search_modes SET mode = 'halfvec' WHERE table_name = 'welfare_services'")
+        monkeypatch.setattr(search_repository, "_search_modes_loaded_at", 0.0)
+        assert repo._search_mode("welfare_services") == ("halfvec", 40)
+
+def test_vector_search_uses_hnsw_index(seeded_conn, monkeypatch):
+    import time
+    from repository import search_repository
+    from repository.search_repository import SearchRepository
+    conn, _ = seeded_conn
+    # 모드 조회 쿼리가 EXPLAIN 되지 않도록 고정
+    monkeypatch.setattr(search_repository, "_search_modes", {})
+    monkeypatch.setattr(search_repository, "_search_modes_loaded_at", time.monotonic())
+    explain = _ExplainConnection(conn)
+    repo = SearchRepository(explain)
+    embedding = [0.01] * 1024
+
+    repo.search_welfare_services(embedding, None)
+    repo.search_employment_jobs(embedding)
+
+    assert len(explain.plans) == 2
+    assert all("hnsw" in plan for plan in explain.plans), explain.plans
+
+@pytest.mark.parametrize("mode, index_sql", [
+    ("vector", None),
+    ("halfvec", "USING hnsw ((embedding::halfvec(1024)) halfvec_cosine_ops)"),
+    ("binary", "USING hnsw ((binary_quantize(embedding)::bit(1024)) bit_hamming_ops)"),
+])
+def test_filtered_vector_search_returns_full_limit(seeded_conn, monkeypatch, mode, index_sql):
+    """
+    [Scenario] 선택적인 지역 조건(212건 중 12건)에서도 HNSW 후보(ef_search=40)에서 걸러져 모자라지 않고 10건을 반환
+    """
+    import time
+    from repository import search_repository
+    conn, prefix = seeded_conn
+    index_name = f"welfare_services_embedding_{mode}_filter_idx"
+    if index_sql:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON welfare_services {index_sql}")
+    region = f"{prefix}_region"
+    rng = random.Random(11)
+    with conn.cursor() as cur:
+        for i in range(12):
+            cur.execute(
+                "INSERT INTO welfare_services (id, service_name, province, embedding) VALUES (%s, %s, %s, %s::vector)",
+                (f"{prefix}_r{i}", f"지역 서비스 {i}", region, _vector(rng))
+            )
+    monkeypatch.setattr(search_repository, "_search_modes", {"welfare_services": (mode, 40)})
+    monkeypatch.setattr(search_repository, "_search_modes_loaded_at", time.monotonic())
+    try:
+        with conn.transaction():  # set_config(..., true)는 트랜잭션 한정
+            rows = search_repository.SearchRepository(conn).search_welfare_services([0.01] * 1024, [region])
+    finally:
+        conn.execute("DELETE FROM welfare_services WHERE province = %s", (region,))
+        if index_sql:
+            conn.execute(f"DROP INDEX {index_name}")
+
+    assert len(rows) == 10
+    assert all(row[4] == region for row in rows)
+
+@pytest.mark.parametrize("mode, index_sql", [
+    ("halfvec", "USING hnsw ((embedding::halfvec(1024)) halfvec_cosine_ops)"),
+    ("binary", "USING hnsw ((binary_quantize(embedding)::bit(1024)) bit_hamming_ops)"),
+])
+def test_quantized_search_modes_use_expression_index(seeded_conn, monkeypatch, mode, index_sql):
+    import time
+    from repository import search_repository
+    conn, _ = seeded_conn
+    index_name = f"employment_jobs_embedding_{mode}_plan_idx"
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON employment_jobs {index_sql}")
+    monkeypatch.setattr(search_repository, "_search_modes", {"employment_jobs": (mode, 40)})
+    monkeypatch.setattr(search_repository, "_search_modes_loaded_at", time.monotonic())
+    explain = _ExplainConnection(conn)
+    try:
+        search_repository.SearchRepository(explain).search_employment_jobs([0.01] * 1024)
+    finally:
+        conn.execute(f"DROP INDEX {index_name}")
+
+    assert len(explain.plans) == 1
+    assert index_name in explain.plans[0], explain.plans
@@ -3,6 +3,7 @@ from unittest.mock import Mock
 from datetime import datetime
 
 from domain.chat_logic import ChatService
+from exception import AppError
 from repository.chat_repository import ChatRepository
 from schema.history import SessionListResponse, ChatHistoryResponse
 
@@ -14,10 +15,10 @@ def test_get_user_sessions_success():
     mock_repo = Mock(spec=ChatRepository)
 
     # 2. 가짜 데이터 준비 (DB에서 fetchall() 했을 때 나오는 튜플 형태)
-    # (session_id, user_input, created_at, bot_response_json)
+    # (session_id, last_message, last_updated, last_emotion, last_distortion)
     mock_data = [
-        ("session_1", "안녕하세요", datetime(2025, 1, 1, 12, 0, 0), {"detected_distortion": "흑백논리"}),
-        ("session_2", "힘들어요", datetime(2025, 1, 2, 12, 0, 0), {}) # 왜곡 없음
+        ("session_1", "안녕하세요", datetime(2025, 1, 1, 12, 0, 0), "anxiety", "흑백논리"),
+        ("session_2", "힘들어요", datetime(2025, 1, 2, 12, 0, 0), None, None) # 왜곡 없음
     ]
 
     # 3. Mock 동작 설정: get_user_sessions가 호출되면 mock_data를 리턴
@@ -41,8 +42,39 @@ def test_get_user_sessions_success():
     assert result.sessions[0].last_message == "안녕하세요"
     assert result.sessions[1].distortion_tags == []
 
-    # Repository가 올바른 인자로 호출되었는지 확인
-    mock_repo.get_user_sessions.assert_called_once_with("test_user")
+    assert result.sessions[0].emotion == "anxiety"
+
+    # Repository가 올바른 인자로 호출되었는지 확인 (첫 페이지: 커서 없음, 한 페이지 미만이므로 다음 커서 없음)
+    mock_repo.get_user_sessions.assert_called_once_with("test_user", limit=20, after=None)
+    assert result.next_cursor is None
+
+def test_get_user_sessions_keyset_cursor_round_trip():
+    """
+    [Scenario] 페이지가 가득 차면 마지막 행의 (last_updated, session_id)를 커서로 돌려주고, 다음 요청에서 그대로 복원
+    """
+    mock_repo = Mock(spec=ChatRepository)
+    last_updated = datetime(2025, 1, 2, 12, 0, 0)
+    mock_repo.get_user_sessions.return_value = [
+        ("session_2", "힘들어요", last_updated, None, None),
+        ("session_1", "안녕하세요", datetime(2025, 1, 1, 12, 0, 0), None, "분석 불가"),
+    ]
+    service = ChatService(chat_repo=mock_repo)
+
+    first = service.get_user_sessions("test_user", size=2)
+    assert first.next_cursor
+    assert first.sessions[1].distortion_tags == []
+
+    mock_repo.get_user_sessions.return_value = []
+    second = service.get_user_sessions("test_user", cursor=first.next_cursor, size=2)
+
+    mock_repo.get_user_sessions.assert_called_with("test_user", limit=2, after=(datetime(2025, 1, 1, 12, 0, 0), "session_1"))
+    assert second.sessions == [] and second.next_cursor is None
+
+def test_get_user_sessions_rejects_malformed_cursor():
+    service = ChatService(chat_repo=Mock(spec=ChatRepository))
+    with pytest.raises(AppError) as exc_info:
+        service.get_user_sessions("test_user", cursor="not-a-cursor")
+    assert exc_info.value.status_code == 400
 
 def test_get_session_history_success():
     """
@@ -62,7 +94,8 @@ def test_get_session_history_success():
                 "emotion": "sad"
             },
             datetime.now(),
-            None
+            None,
+            101
         )
     ]
     mock_total_count = 10
@@ -90,3 +123,49 @@ def test_get_session_history_success():
     assert assistant_msg.socratic_question == "왜죠?"
     assert assistant_msg.alternative_thought == "자신을 격려하세요."
     assert assistant_msg.emotion == "sad"
+    assert result.next_cursor is None
+
+    # 첫 페이지는 커서 없이 한 행 더(size + 1) 조회
+    mock_repo.get_session_messages.assert_called_once_with("session_1", 21, offset=0, before=None)
+
+def test_get_session_history_cursor_pagination():
+    """
+    [Scenario] 한 페이지보다 많이 남아 있으면 가장 오래된 행의 (created_at, id)로 next_cursor를 만들고,
+    그 커서로 요청하면 OFFSET 없이 키셋 조건으로 조회
+    """
+    mock_repo = Mock(spec=ChatRepository)
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    # 최신순(DESC) 21행 -> 20행만 응답, 20번째(가장 오래된) 행이 커서
+    mock_rows = [(f"메시지 {i}", {}, base.replace(minute=59 - i), None, 500 - i) for i in range(21)]
+    mock_repo.get_session_messages.return_value = (mock_rows, 45)
+    service = ChatService(chat_repo=mock_repo)
+
+    first = service.get_session_history("session_1")
+    assert len(first.messages) == 40
+    assert first.messages[0].content == "메시지 19"  # 응답은 오래된 순
+    assert first.total_page == 3 and first.current_page == 1
+
+    mock_repo.get_session_messages.return_value = ([], 45)
+    second = service.get_session_history("session_1", page=2, cursor=first.next_cursor)
+
+    mock_repo.get_session_messages.assert_called_with(
+        "session_1", 21, offset=0, before=(base.replace(minute=40), 481)
+    )
+    assert second.next_cursor is None
+
+def test_get_session_history_cursor_response_has_no_page_numbers():
+    """
+    [Scenario] cursor 조회 응답은 페이지 번호(current_page / total_page) 없이 next_cursor만 제공
+    """
+    mock_repo = Mock(spec=ChatRepository)
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    mock_rows = [(f"메시지 {i}", {}, base.replace(minute=59 - i), None, 500 - i) for i in range(21)]
+    mock_repo.get_session_messages.return_value = (mock_rows, 45)
+    service = ChatService(chat_repo=mock_repo)
+    cursor = service.get_session_history("session_1").next_cursor
+
+    result = service.get_session_history("session_1", page=3, cursor=cursor)
+
+    body = result.model_dump()
+    assert body["current_page"] is None and body["total_page"] is None
+    assert body["next_cursor"] and len(body["messages"]) == 40
@@ -0,0 +1,42 @@
+# chatbot/test/services/test_client_registry.py
+from unittest.mock import patch, Mock
+from service.client_registry import ClientRegistry
+from service.llm_service import LLMService
+
+def test_registry_reuses_clients_and_shares_http_pool():
+    """
+    [Scenario] 같은 (provider, endpoint, model)은 같은 클라이언트, 다른 엔드포인트도 httpx 풀은 공유
+    """
+    registry = ClientRegistry()
+    a1 = registry.get_openai("https://a.example/v1", "token")
+    a2 = registry.get_openai("https://a.example/v1", "token")
+    b = registry.get_openai("https://b.example/v1", "token")
+
+    assert a1 is a2
+    assert a1 is not b
+    assert a1._client is b._client is registry.http_client
+
+    assert registry.evict(endpoint="https://a.example/v1") == 1
+    assert registry.get_openai("https://a.example/v1", "token") is not a1
+
+@patch("boto3.client")
+def test_dynamic_hf_model_reuses_client(mock_boto_client):
+    """
+    [Scenario] /chatbot/dev/reframing의 동적 HF 호출은 요청마다 클라이언트를 새로 만들지 않음
+    """
+    registry = ClientRegistry()
+    service = LLMService(registry=registry)
+    mock_client = Mock()
+    mock_client.chat.completions.create.return_value.choices = [Mock(message=Mock(content='{"empathy": "ok"}'))]
+
+    with patch("service.llm_service.config") as mock_config, \
+            patch.object(registry, "get", wraps=registry.get) as mock_get:
+        mock_config.hf_api_token = "token"
+        registry._clients[("openai", "https://hf.example/v1", "m")] = mock_client
+        for _ in range(3):
+            result = service.get_dynamic_model_response("p", model_type="hf", model_name="m", hf_endpoint_url="https://hf.example/")
+
+    assert result == '{"empathy": "ok"}'
+    assert mock_client.chat.completions.create.call_count == 3
+    assert len([k for k in registry.keys() if k[0] == "openai"]) == 1
+    assert mock_get.call_count == 3
@@ -0,0 +1,86 @@
+# chatbot/test/services/test_db_pool.py
+from unittest.mock import MagicMock, patch
+import pytest
+from psycopg import pq
+import dependency
+from config import config
+
+@pytest.fixture(autouse=True)
+def reset_pool_state():
+    dependency._db_pool = None
+    dependency._last_activity = 0.0
+    yield
+    dependency._db_pool = None
+    dependency._last_activity = 0.0
+
+class _Conn:
+    """WeakKeyDictionary에 들어갈 수 있는 가짜 연결"""
+    def __init__(self, status=pq.TransactionStatus.IDLE):
+        self.info = MagicMock(transaction_status=status)
+        self.rollback = MagicMock()
+
+def test_pool_is_created_once_with_lifetime_and_keepalive_settings():
+    with patch.object(dependency, "ConnectionPool") as MockPool, \
+            patch.object(config, "db_proxy_mode", False):
+        first = dependency._init_db_pool()
+        second = dependency._init_db_pool()
+
+    assert first is second
+    MockPool.assert_called_once()
+    kwargs = MockPool.call_args.kwargs
+    assert kwargs["check"] is dependency._check_connection
+    assert kwargs["max_lifetime"] == config.db_pool_max_lifetime_seconds
+    assert kwargs["max_idle"] == config.db_pool_max_idle_seconds
+    assert kwargs["kwargs"]["keepalives"] == 1
+    assert "prepare_threshold" not in kwargs["kwargs"]
+
+def test_proxy_mode_disables_server_side_prepared_statements():
+    with patch.object(config, "db_proxy_mode", True):
+        assert dependency._connection_kwargs()["prepare_threshold"] is None
+
+def test_check_pings_only_connections_idle_longer_than_threshold():
+    fresh, stale, unknown = _Conn(), _Conn(), _Conn()
+    now = dependency.time.monotonic()
+    dependency._last_returned[fresh] = now
+    dependency._last_returned[stale] = now - config.db_pool_check_idle_seconds - 1
+
+    with patch.object(dependency.ConnectionPool, "check_connection") as mock_ping:
+        dependency._check_connection(fresh)
+        mock_ping.assert_not_called()
+        dependency._check_connection(stale)
+        dependency._check_connection(unknown)
+
+    assert mock_ping.call_count == 2
+
+def test_borrow_rolls_back_open_transaction_before_returning():
+    """
+    [Scenario] 조회만 하고 커밋하지 않은 연결은 반납 전에 롤백 (idle in transaction 방지)
+    """
+    pool = MagicMock()
+    conn = _Conn(status=pq.TransactionStatus.INTRANS)
+    pool.getconn.return_value = conn
+    dependency._db_pool = pool
+
+    with dependency.borrow_db_conn() as borrowed:
+        assert borrowed is conn
+
+    conn.rollback.assert_called_once()
+    pool.putconn.assert_called_once_with(conn)
+    assert conn in dependency._last_returned
+
+def test_pool_is_checked_after_long_idle_gap():
+    """
+    [Scenario] Lambda thaw 등으로 풀이 오래 쉬었다가 다시 쓰이면 유휴 연결을 일괄 검증
+    """
+    pool = MagicMock()
+    pool.getconn.return_value = _Conn()
+    dependency._db_pool = pool
+
+    with dependency.borrow_db_conn():
+        pass
+    pool.check.assert_not_called()
+
+    dependency._last_activity -= config.db_pool_max_idle_seconds + 1
+    with dependency.borrow_db_conn():
+        pass
+    pool.check.assert_called_once()
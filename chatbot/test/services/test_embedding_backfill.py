@@ -0,0 +1,74 @@
+# chatbot/test/services/test_embedding_backfill.py
+import json
+from unittest.mock import MagicMock, Mock, patch
+from repository.chat_repository import ChatRepository
+from service.embedding_backfill import BACKFILL_EVENT_SOURCE, backfill_pending_embeddings
+from service.embedding_batch import EmbeddingBatchResult
+from service.worker_service import process_sqs_batch
+
+def test_backfill_embeds_claimed_rows_and_marks_failures():
+    repo = Mock(spec=ChatRepository)
+    repo.conn = Mock()
+    repo.claim_pending_embeddings.side_effect = [[(1, "첫 번째"), (2, "두 번째")], []]
+    llm = Mock()
+    llm.get_embeddings.return_value = EmbeddingBatchResult([[0.1] * 3, None], {1: "Throttling"})
+
+    result = backfill_pending_embeddings(repo, llm, batch_size=2, max_batches=5)
+
+    assert result == {"embedded": 1, "failed": 1, "batches": 1}
+    llm.get_embeddings.assert_called_once_with(["첫 번째", "두 번째"])
+    embedded, failed_ids, _ = repo.save_backfilled_embeddings.call_args.args
+    assert embedded == [(1, [0.1] * 3)]
+    assert failed_ids == [2]
+    # 빈 배치에서는 SKIP LOCKED 조회 트랜잭션만 닫고 종료
+    repo.conn.rollback.assert_called_once()
+
+def test_backfill_stops_at_short_batch_and_counts_provider_outage_as_failures():
+    repo = Mock(spec=ChatRepository)
+    repo.conn = Mock()
+    repo.claim_pending_embeddings.return_value = [(7, "입력")]
+    llm = Mock()
+    llm.get_embeddings.side_effect = Exception("Bedrock 장애")
+
+    result = backfill_pending_embeddings(repo, llm, batch_size=10, max_batches=5)
+
+    assert result == {"embedded": 0, "failed": 1, "batches": 1}
+    assert repo.claim_pending_embeddings.call_count == 1
+    assert repo.save_backfilled_embeddings.call_args.args[:2] == ([], [7])
+
+def test_repository_bulk_updates_embeddings_and_attempts_in_one_transaction():
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+
+    ChatRepository(conn).save_backfilled_embeddings([(1, [0.1, 0.2]), (2, [0.3, 0.4])], [3], max_attempts=5)
+
+    sql, rows = cur.executemany.call_args.args
+    assert "embedding_status = 'ready'" in sql
+    assert [row[1] for row in rows] == [1, 2]
+    assert cur.execute.call_args.args[1] == (5, [3])
+    conn.commit.assert_called_once()
+
+def test_log_cbt_session_stores_missing_embedding_as_pending_null():
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+
+    ChatRepository(conn).log_cbt_session("u1", "s1", "안녕", {"emotion": "sad"}, embedding=None)
+
+    params = cur.execute.call_args.args[1]
+    assert params[4] is None
+    assert params[5] == "pending"
+
+@patch("service.worker_service.backfill_pending_embeddings")
+@patch("service.worker_service.ChatRepository")
+@patch("service.worker_service.get_llm_service")
+@patch("service.worker_service.get_db_conn")
+def test_sqs_backfill_message_runs_backfill_without_embedding_prefetch(mock_get_db_conn, mock_get_llm, MockChatRepo, mock_backfill):
+    mock_db_gen = MagicMock()
+    mock_db_gen.__next__.side_effect = [Mock(), StopIteration]
+    mock_get_db_conn.return_value = mock_db_gen
+
+    result = process_sqs_batch([{"body": json.dumps({"source": BACKFILL_EVENT_SOURCE, "batch_size": 32})}])
+
+    assert result["success"] == 1
+    mock_backfill.assert_called_once_with(MockChatRepo.return_value, mock_get_llm.return_value, batch_size=32, max_batches=None)
+    mock_get_llm.return_value.get_embeddings.assert_not_called()
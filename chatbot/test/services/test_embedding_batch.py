@@ -0,0 +1,45 @@
+# chatbot/test/services/test_embedding_batch.py
+from unittest.mock import patch
+from botocore.exceptions import ClientError
+from service.embedding_batch import embed_concurrently
+from service.llm_service import LLMService
+
+def _throttle_error():
+    return ClientError({"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}}, "InvokeModel")
+
+@patch("service.embedding_batch.time.sleep")
+def test_embed_concurrently_keeps_order_and_retries_throttling(mock_sleep):
+    """
+    [Scenario] 결과는 입력 순서를 유지하고, Throttling은 재시도 후 성공 / 그 외 오류는 해당 항목만 실패
+    """
+    throttled_once = set()
+
+    def fake_embed(text):
+        if text == "bad":
+            raise ValueError("임베딩 생성 실패: 응답 없음")
+        if text == "slow" and text not in throttled_once:
+            throttled_once.add(text)
+            raise _throttle_error()
+        return [float(len(text))]
+
+    result = embed_concurrently(["a", "slow", "bad", "dddd"], fake_embed, max_workers=4)
+
+    assert result.embeddings == [[1.0], [4.0], None, [4.0]]
+    assert list(result.errors) == [2]
+    assert "ValueError" in result.errors[2]
+    assert result.failed_count == 1
+
+@patch("boto3.client")
+def test_get_embeddings_dedupes_and_uses_cache(mock_boto_client):
+    """
+    [Scenario] 중복 텍스트와 캐시 적중 텍스트는 Bedrock을 다시 호출하지 않음
+    """
+    service = LLMService()
+    service.embedding_cache.put("cached", [9.0])
+
+    with patch.object(service, "_invoke_embedding", side_effect=lambda t: [float(len(t))]) as mock_invoke:
+        result = service.get_embeddings(["ab", "cached", "ab", "xyz"])
+
+    assert result.embeddings == [[2.0], [9.0], [2.0], [3.0]]
+    assert result.errors == {}
+    assert sorted(c.args[0] for c in mock_invoke.call_args_list) == ["ab", "xyz"]
@@ -0,0 +1,64 @@
+# chatbot/test/services/test_embedding_cache.py
+import json
+from unittest.mock import patch, Mock
+from service.embedding_cache import EmbeddingCache, make_cache_key
+from service.llm_service import LLMService
+
+def test_cache_key_is_content_addressed():
+    """
+    [Scenario] 공백/유니코드 정규화 후 같은 텍스트는 같은 키, 모델/차원이 다르면 다른 키
+    """
+    model = "amazon.titan-embed-text-v2:0"
+    assert make_cache_key(model, 1024, "장애인  취업 지원 ") == make_cache_key(model, 1024, "장애인 취업 지원")
+    assert make_cache_key(model, 1024, "장애인 취업 지원") != make_cache_key(model, 512, "장애인 취업 지원")
+    assert make_cache_key(model, 1024, "장애인 취업 지원") != make_cache_key("other-model", 1024, "장애인 취업 지원")
+
+def test_lru_eviction_and_stats():
+    """
+    [Scenario] LRU 최대 크기를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+    """
+    cache = EmbeddingCache("m", 3, max_entries=2, use_db=False)
+    cache.put("a", [1.0, 0.0, 0.0])
+    cache.put("b", [0.0, 1.0, 0.0])
+    assert cache.get("a") == [1.0, 0.0, 0.0]  # a를 최근 사용으로 갱신
+    cache.put("c", [0.0, 0.0, 1.0])           # b가 제거되어야 함
+
+    assert cache.get("b") is None
+    assert cache.get("c") == [0.0, 0.0, 1.0]
+    assert cache.hits == 2
+    assert cache.misses == 1
+
+@patch("boto3.client")
+def test_get_embedding_uses_cache(mock_boto_client):
+    """
+    [Scenario] 동일한 질의는 두 번째부터 Bedrock을 호출하지 않음
+    """
+    mock_bedrock = mock_boto_client.return_value
+    mock_response_body = json.dumps({"embedding": [0.1, 0.2, 0.3]})
+    mock_bedrock.invoke_model.return_value = {
+        "body": Mock(read=lambda: mock_response_body)
+    }
+
+    service = LLMService()
+    first = service.get_embedding("장애인 취업 지원")
+    second = service.get_embedding(" 장애인 취업  지원")
+
+    assert first == second == [0.1, 0.2, 0.3]
+    mock_bedrock.invoke_model.assert_called_once()
+
+def test_prime_loads_recent_embeddings_into_lru():
+    """
+    [Scenario] Warm-up 시 영속 계층의 최근 임베딩을 LRU에 적재 (LRU 크기 이내, 가장 최근 항목이 마지막까지 유지)
+    """
+    cache = EmbeddingCache("m", 3, max_entries=2, use_db=True)
+    recent = {cache.key_for("최근"): [1.0, 0.0, 0.0], cache.key_for("이전"): [0.0, 1.0, 0.0]}
+
+    with patch("service.embedding_cache.borrow_db_conn"), \
+            patch("service.embedding_cache.EmbeddingCacheRepository") as mock_repo:
+        mock_repo.return_value.find_recent_embeddings.return_value = recent
+        assert cache.prime(limit=10) == 2
+
+    mock_repo.return_value.find_recent_embeddings.assert_called_once_with("m", 3, 2)
+    assert list(cache._lru)[-1] == cache.key_for("최근")
+    with patch.object(cache, "_db_get", return_value=None):
+        assert cache.get("이전") == [0.0, 1.0, 0.0]
@@ -0,0 +1,56 @@
+# chatbot/test/services/test_import_budget.py
+import os
+import subprocess
+import sys
+import pytest
+
+CHATBOT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# 이벤트 경로별 import 예산 (cumulative, ms) - CI 편차를 감안한 상한, IMPORT_BUDGET_SCALE로 조정
+IMPORT_BUDGET_MS = {
+    "lambda_function": 100,
+    "service.worker_service": 1500,
+    "main": 2000,
+}
+# 어떤 경로에서도 import 시점에 로드되면 안 되는 무거운 SDK (실제 호출 시점에 import)
+FORBIDDEN_AT_IMPORT = ("vertexai", "google.cloud.aiplatform", "openai")
+
+def _import_profile(module: str) -> dict:
+    """python -X importtime 출력을 {모듈명: cumulative(us)}로 파싱합니다."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=CHATBOT_ROOT, env=os.environ.copy(), capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+@pytest.mark.parametrize("module", list(IMPORT_BUDGET_MS))
+def test_import_time_budget(module):
+    """
+    [Scenario] 이벤트 경로별 import 시간이 예산 이내이고, Vertex AI / OpenAI SDK를 미리 로드하지 않음
+    """
+    profile = _import_profile(module)
+
+    eager = sorted(
+        name for name in profile
+        if any(name == sdk or name.startswith(sdk + ".") for sdk in FORBIDDEN_AT_IMPORT)
+    )
+    assert not eager, f"{module} import 시 무거운 SDK 로드: {eager[:5]}"
+
+    budget_ms = IMPORT_BUDGET_MS[module] * float(os.environ.get("IMPORT_BUDGET_SCALE", "1"))
+    elapsed_ms = profile[module] / 1000
+    assert elapsed_ms <= budget_ms, f"{module} import {elapsed_ms:.0f}ms > 예산 {budget_ms:.0f}ms"
+
+def test_sqs_dispatch_does_not_load_http_app():
+    """
+    [Scenario] lambda_function 로드만으로는 FastAPI 앱/Mangum/컨트롤러를 import하지 않음
+    """
+    profile = _import_profile("lambda_function")
+    assert not {"main", "mangum", "fastapi", "service.worker_service"} & set(profile)
@@ -0,0 +1,37 @@
+import json
+import pytest
+from util.json_parser import IncrementalJSONParser, iter_completed_fields, parse_llm_json
+
+RESPONSE = {
+    "empathy": "\"괜찮아요\"라고 하셨지만 {마음}이 무거워 보여요.\\n",
+    "services": [{"service_name": "청년 수당", "url": "http://a/b?x={1}"}],
+    "score": 0.5,
+    "top_emotion": "sad"
+}
+WRAPPED = "다음은 결과입니다 {참고}.\n```json\n" + json.dumps(RESPONSE, ensure_ascii=False, indent=2) + "\n```\n추가 설명 { 끝"
+
+def test_parse_llm_json_tolerates_fences_prose_and_non_json_braces():
+    """
+    [Scenario] 코드 블록 / 앞뒤 설명 / JSON이 아닌 중괄호 구간이 섞여도 첫 번째 JSON 객체를 추출
+    """
+    assert parse_llm_json(WRAPPED) == RESPONSE
+    assert parse_llm_json('{"a": {"b": [1, {"c": "}"}]}} 뒤 {"x": 1}') == {"a": {"b": [1, {"c": "}"}]}}
+
+    with pytest.raises(ValueError):
+        parse_llm_json("JSON이 없는 응답 {이름}")
+
+def test_incremental_fields_are_identical_for_every_chunk_split():
+    """
+    [Scenario] 청크가 어느 위치에서 나뉘어도(이스케이프/키 중간 포함) 같은 필드가 같은 순서로 한 번씩 나옴
+    """
+    expected = list(RESPONSE.items())
+    for split in range(1, len(WRAPPED)):
+        chunks = [WRAPPED[:split], WRAPPED[split:]]
+        events = list(iter_completed_fields(chunks))
+        assert events[:-1] == expected, split
+        assert events[-1] == (None, WRAPPED)
+
+    # 한 글자씩 들어오는 경우
+    parser = IncrementalJSONParser()
+    fields = [field for char in WRAPPED for field in parser.feed(char)]
+    assert fields == expected and parser.result == RESPONSE
@@ -0,0 +1,153 @@
+# chatbot/test/services/test_llm_hedging.py
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+import pytest
+from service import llm_hedging
+from service.llm_hedging import HedgePolicy, LatencyTracker, _load_policies, run_hedged, run_hedged_async
+from service.llm_service import LLMService
+
+VALID = json.dumps({"empathy": "괜찮아요"})
+FAST_POLICY = HedgePolicy(secondary="bedrock", min_delay=0.05, default_delay=0.05)
+
+@patch("boto3.client")
+def test_hedged_response_returns_secondary_when_primary_is_slow(mock_boto_client):
+    """
+    [Scenario] Primary(Gemini)가 Hedge 지연을 넘기면 Secondary(Bedrock)의 유효한 응답을 먼저 반환하고 승자를 기록
+    """
+    service = LLMService()
+    service.gemini_pro_model = object()  # Gemini 설정된 상태로 간주
+
+    def slow_gemini(prompt):
+        time.sleep(0.5)
+        return VALID
+
+    with patch("service.llm_service.get_hedge_policy", return_value=FAST_POLICY), \
+            patch.object(service, "_call_gemini", side_effect=slow_gemini), \
+            patch.object(service, "_call_bedrock", return_value=VALID) as mock_bedrock:
+        start = time.monotonic()
+        result = service.get_llm_response("p", endpoint="reframing")
+        elapsed = time.monotonic() - start
+
+    assert result == VALID
+    assert elapsed < 0.4
+    mock_bedrock.assert_called_once_with("p")
+    assert service.hedge_stats.snapshot() == {"reframing": {"bedrock(hedged)": 1}}
+
+@patch("boto3.client")
+def test_no_hedge_when_primary_is_fast_or_endpoint_not_configured(mock_boto_client):
+    """
+    [Scenario] Primary가 지연 전에 유효한 응답을 내면 Secondary를 호출하지 않음 / 정책 없는 엔드포인트는 단일 호출
+    """
+    service = LLMService()
+    service.gemini_pro_model = object()  # Gemini 설정된 상태로 간주
+
+    with patch("service.llm_service.get_hedge_policy", return_value=FAST_POLICY), \
+            patch.object(service, "_call_gemini", return_value=VALID), \
+            patch.object(service, "_call_bedrock") as mock_bedrock:
+        assert service.get_llm_response("p", endpoint="reframing") == VALID
+        mock_bedrock.assert_not_called()
+
+    with patch.object(service, "_call_gemini", return_value="JSON 아님"), \
+            patch.object(service, "_call_bedrock") as mock_bedrock:
+        assert service.get_llm_response("p", endpoint="unknown") == "JSON 아님"
+        mock_bedrock.assert_not_called()
+
+def test_async_hedge_cancels_loser():
+    """
+    [Scenario] asyncio Hedging: 늦은 Primary Task는 Secondary가 이기면 취소됨
+    """
+    primary_cancelled = asyncio.Event()
+
+    async def slow_primary():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            primary_cancelled.set()
+            raise
+
+    async def fast_secondary():
+        return VALID
+
+    async def scenario():
+        result = await run_hedged_async(("gemini", slow_primary), ("gemma", fast_secondary), 0.05)
+        await asyncio.sleep(0)
+        return result
+
+    winner, text, hedged = asyncio.run(scenario())
+    assert (winner, text, hedged) == ("gemma", VALID, True)
+
+def test_latency_percentile_and_policy_loading():
+    """
+    [Scenario] 샘플이 충분하면 백분위 기반 지연, 부족하면 기본값 / 잘못된 정책 JSON은 Hedging 비활성화
+    """
+    tracker = LatencyTracker(min_samples=10)
+    policy = HedgePolicy(percentile=90, min_delay=0.5, max_delay=10, default_delay=4)
+    assert tracker.hedge_delay("gemini", policy) == 4
+
+    for i in range(1, 11):
+        tracker.record("gemini", float(i))
+    assert tracker.percentile("gemini", 90) == 9.0
+    assert tracker.hedge_delay("gemini", policy) == 9.0
+
+    assert _load_policies('{"reframing": {"secondary": "gemma", "percentile": 90}}')["reframing"].secondary == "gemma"
+    assert _load_policies('{"reframing": {"secondary": "unknown"}}') == {}
+
+@pytest.fixture
+def small_hedge_pool(monkeypatch):
+    def _make(workers: int):
+        executor = ThreadPoolExecutor(max_workers=workers)
+        monkeypatch.setattr(llm_hedging, "_hedge_executor", executor)
+        monkeypatch.setattr(llm_hedging, "_hedge_max_workers", workers)
+        monkeypatch.setattr(llm_hedging, "_hedge_in_flight", 0)
+        return executor
+    return _make
+
+def test_primary_runs_on_calling_thread_when_pool_is_full(small_hedge_pool):
+    """
+    [Scenario] 풀이 가득 차면 Primary를 풀 큐에 쌓지 않고 호출 스레드에서 바로 실행 (Hedge 없음)
+    """
+    small_hedge_pool(1)
+    release = threading.Event()
+    blocker = llm_hedging._submit(lambda: release.wait(1))
+    secondary = Mock(return_value=VALID)
+    caller = threading.get_ident()
+    primary_thread = []
+
+    def primary():
+        primary_thread.append(threading.get_ident())
+        return VALID
+
+    start = time.monotonic()
+    winner, text, hedged = run_hedged(("gemini", primary), ("bedrock", secondary), delay=0.01)
+    elapsed = time.monotonic() - start
+    release.set()
+    blocker.result()
+
+    assert (winner, text, hedged) == ("gemini", VALID, False)
+    assert primary_thread == [caller]
+    assert elapsed < 0.5  # blocker(최대 1초)를 기다리지 않음
+    secondary.assert_not_called()
+
+def test_no_hedge_when_pool_has_no_idle_worker(small_hedge_pool):
+    """
+    [Scenario] Primary가 지연을 넘겨도 빈 스레드가 없으면 Secondary를 큐에 쌓지 않고 Primary 결과를 사용
+    """
+    small_hedge_pool(2)
+    release = threading.Event()
+    blocker = llm_hedging._submit(lambda: release.wait(1))
+    secondary = Mock(return_value=VALID)
+
+    def slow_primary():
+        time.sleep(0.2)
+        return VALID
+
+    winner, text, hedged = run_hedged(("gemini", slow_primary), ("bedrock", secondary), delay=0.05)
+    release.set()
+    blocker.result()
+
+    assert (winner, hedged) == ("gemini", False)
+    secondary.assert_not_called()
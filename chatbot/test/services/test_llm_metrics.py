@@ -0,0 +1,104 @@
+# chatbot/test/services/test_llm_metrics.py
+import asyncio
+import io
+import json
+from unittest.mock import MagicMock, patch
+import pytest
+from service.async_llm_service import AsyncLLMService
+from service.llm_metrics import LLMCallMetrics, record_usage, track_llm_call, track_stream
+from service.llm_service import LLMService
+
+def _emitted(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith('{"_aws"')]
+
+def test_emf_record_structure():
+    """
+    [Scenario] EMF 레코드는 Endpoint/Model 차원과 측정된 지표만 선언
+    """
+    metrics = LLMCallMetrics(provider="bedrock", model="claude", endpoint="search", attempt=1)
+    metrics.latency_ms = 120.0
+    metrics.add_usage(input_tokens=10, output_tokens=MagicMock())  # 정수가 아닌 값은 무시
+
+    record = metrics.to_emf("Test/LLM")
+    directive = record["_aws"]["CloudWatchMetrics"][0]
+    names = [m["Name"] for m in directive["Metrics"]]
+
+    assert directive["Namespace"] == "Test/LLM"
+    assert directive["Dimensions"] == [["Endpoint", "Model"], ["Model"]]
+    assert "InputTokens" in names and "OutputTokens" not in names and "TimeToFirstTokenMs" not in names
+    assert record["Endpoint"] == "search" and record["Model"] == "claude"
+    assert record["InputTokens"] == 10 and record["Fallbacks"] == 1 and record["Errors"] == 0
+
+def test_track_llm_call_records_error_class(capsys):
+    """
+    [Scenario] 블록 안에서 예외가 나면 오류 유형을 기록하고 예외는 그대로 전파
+    """
+    with pytest.raises(TimeoutError):
+        with track_llm_call("gemini", "gemini-2.5-pro", "reframing"):
+            record_usage(input_tokens=5)
+            raise TimeoutError("slow")
+
+    [record] = _emitted(capsys)
+    assert record["Errors"] == 1
+    assert record["ErrorClass"] == "TimeoutError"
+    assert record["InputTokens"] == 5
+
+@patch("boto3.client")
+def test_bedrock_call_records_tokens_and_retries(mock_boto_client, capsys):
+    """
+    [Scenario] 라우팅된 Bedrock 호출은 응답 본문의 usage와 botocore 재시도 횟수를 기록
+    """
+    service = LLMService()
+    body = {"content": [{"type": "text", "text": "{}"}], "usage": {"input_tokens": 42, "output_tokens": 7}}
+    service.bedrock_runtime = MagicMock()
+    service.bedrock_runtime.invoke_model.return_value = {
+        "body": io.BytesIO(json.dumps(body).encode()),
+        "ResponseMetadata": {"RetryAttempts": 2}
+    }
+
+    assert service.get_llm_response("p", use_bedrock=True, endpoint="search") == "{}"
+
+    [record] = _emitted(capsys)
+    assert record["Endpoint"] == "search"
+    assert record["Model"] == LLMService.MODEL_ID_BEDROCK_CLAUDE
+    assert (record["InputTokens"], record["OutputTokens"], record["Retries"]) == (42, 7, 2)
+
+@patch("boto3.client")
+def test_async_bedrock_usage_crosses_thread_pool(mock_boto_client, capsys):
+    """
+    [Scenario] async 경로에서 스레드 풀로 오프로드된 Bedrock 호출도 토큰 수가 같은 지표에 기록됨
+    """
+    service = LLMService()
+    service.gemini_pro_model = None
+    body = {"content": [{"type": "text", "text": "{}"}], "usage": {"input_tokens": 3, "output_tokens": 4}}
+    service.bedrock_runtime = MagicMock()
+    service.bedrock_runtime.invoke_model.return_value = {"body": io.BytesIO(json.dumps(body).encode())}
+
+    result = asyncio.run(AsyncLLMService(service).get_llm_response("p", use_bedrock=True, endpoint="search"))
+
+    assert result == "{}"
+    [record] = _emitted(capsys)
+    assert (record["InputTokens"], record["OutputTokens"]) == (3, 4)
+
+def test_track_stream_records_ttft_once_consumed(capsys):
+    """
+    [Scenario] 스트리밍은 첫 청크에서 TTFT를 기록하고, 소비가 끝난 뒤 한 번만 출력
+    """
+    metrics = LLMCallMetrics(provider="gemini", model="gemini-2.5-pro", endpoint="reframing")
+    stream = track_stream(iter(['{"a"', ': 1}']), metrics)
+
+    assert next(stream) == '{"a"'
+    assert metrics.ttft_ms is not None
+    assert _emitted(capsys) == []
+
+    assert list(stream) == [': 1}']
+    [record] = _emitted(capsys)
+    assert "TimeToFirstTokenMs" in [m["Name"] for m in record["_aws"]["CloudWatchMetrics"][0]["Metrics"]]
+    assert record["Streamed"] is True
+
+@patch("service.llm_metrics.config")
+def test_metrics_disabled_prints_nothing(mock_config, capsys):
+    mock_config.llm_metrics_enabled = False
+    with track_llm_call("gemma", "gemma"):
+        pass
+    assert _emitted(capsys) == []
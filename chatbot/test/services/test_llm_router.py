@@ -0,0 +1,201 @@
+# chatbot/test/services/test_llm_router.py
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import patch
+from service.async_llm_service import AsyncLLMService
+from service.llm_hedging import HedgePolicy, LatencyTracker
+from service.llm_router import CircuitBreaker, LLMRouter
+from service.llm_service import LLMService
+
+VALID = json.dumps({"empathy": "괜찮아요"})
+
+def test_circuit_breaker_opens_and_recovers_with_half_open_probe():
+    """
+    [Scenario] 연속 실패 N회 -> OPEN, recovery_timeout 후 probe 한 건만 허용, 성공 시 CLOSED 복구
+    """
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.acquire()
+
+    time.sleep(0.06)
+    assert breaker.acquire()          # probe 슬롯
+    assert not breaker.acquire()      # 동시에 두 번째 probe 불가
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.acquire()
+
+def test_router_respects_prompt_compatibility():
+    """
+    [Scenario] gemma(vLLM)는 상담형 프롬프트에만 후보로 포함
+    """
+    router = LLMRouter(LatencyTracker())
+    assert router.candidates("gemini", "reframing") == ["gemini", "bedrock", "gemma"]
+    assert router.candidates("gemini", "search") == ["gemini", "bedrock"]
+
+    for _ in range(5):
+        router.record_failure("gemini")
+    assert router.candidates("gemini", "search") == ["bedrock"]
+
+@patch("boto3.client")
+def test_llm_service_bypasses_open_circuit(mock_boto_client):
+    """
+    [Scenario] Gemini가 연속 실패하면 Bedrock으로 우회하고, 서킷이 열린 뒤에는 Gemini를 아예 호출하지 않음
+    """
+    service = LLMService()
+    service.gemini_pro_model = object()
+    service.router = LLMRouter(service.latency, failure_threshold=2, recovery_timeout=60)
+
+    with patch.object(service, "_call_gemini", side_effect=TimeoutError("Vertex AI timeout")) as mock_gemini, \
+            patch.object(service, "_call_bedrock", return_value=VALID) as mock_bedrock:
+        for _ in range(4):
+            assert service.get_llm_response("p", endpoint="search") == VALID
+
+    assert mock_gemini.call_count == 2
+    assert mock_bedrock.call_count == 4
+    assert service.router.snapshot()["gemini"]["state"] == "open"
+
+HEDGE_POLICY = HedgePolicy(secondary="bedrock", min_delay=0.05, default_delay=0.05)
+
+def _open_circuit(router: LLMRouter, provider: str):
+    for _ in range(2):
+        router.record_failure(provider)
+    time.sleep(0.06)  # recovery_timeout 경과 -> 다음 acquire가 HALF_OPEN probe
+
+def test_release_only_frees_probe_slot_it_acquired():
+    """
+    [Scenario] CLOSED일 때 얻은 슬롯(PASS)을 반납해도, 그 사이 다른 요청이 잡은 probe는 유지됨
+    """
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.0)
+    slot = breaker.acquire()
+    assert slot == CircuitBreaker.PASS
+
+    breaker.record_failure()
+    assert breaker.acquire() == CircuitBreaker.PROBE  # 다른 요청의 probe
+    breaker.release(slot)
+    assert not breaker.acquire()
+
+@patch("boto3.client")
+def test_concurrent_hedges_send_single_probe_to_half_open_secondary(mock_boto_client):
+    """
+    [Scenario] Secondary(Bedrock)가 HALF_OPEN 대기 상태일 때 동시에 Hedge가 발동해도 probe는 한 건만 나가고,
+    슬롯을 얻지 못한 요청은 Hedge 없이 Primary 응답을 사용
+    """
+    service = LLMService()
+    service.gemini_pro_model = object()
+    service.router = LLMRouter(service.latency, failure_threshold=2, recovery_timeout=0.05)
+    _open_circuit(service.router, "bedrock")
+
+    def slow_gemini(prompt):
+        time.sleep(0.3)
+        return VALID
+
+    def slow_bedrock(prompt):
+        time.sleep(0.2)
+        return VALID
+
+    results = []
+    with patch("service.llm_service.get_hedge_policy", return_value=HEDGE_POLICY), \
+            patch.object(service, "_call_gemini", side_effect=slow_gemini), \
+            patch.object(service, "_call_bedrock", side_effect=slow_bedrock) as mock_bedrock:
+        threads = [
+            threading.Thread(target=lambda: results.append(service.get_llm_response("p", endpoint="reframing")))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert results == [VALID, VALID]
+    assert mock_bedrock.call_count == 1
+    assert service.hedge_stats.snapshot()["reframing"] == {"bedrock(hedged)": 1, "gemini": 1}
+    assert service.router.snapshot()["bedrock"]["state"] == "closed"
+
+@patch("boto3.client")
+def test_async_hedge_returns_probe_slot_of_cancelled_secondary(mock_boto_client):
+    """
+    [Scenario] asyncio Hedging: HALF_OPEN Secondary의 probe가 패배로 취소되면 슬롯을 반납하여 다음 probe가 가능
+    """
+    service = LLMService()
+    service.gemini_pro_model = object()
+    service.router = LLMRouter(service.latency, failure_threshold=2, recovery_timeout=0.05)
+    _open_circuit(service.router, "bedrock")
+    async_service = AsyncLLMService(service)
+
+    async def gemini(prompt, **kwargs):
+        await asyncio.sleep(0.1)
+        return VALID
+
+    def slow_bedrock(prompt):
+        time.sleep(0.3)
+        return VALID
+
+    with patch("service.async_llm_service.get_hedge_policy", return_value=HEDGE_POLICY), \
+            patch.object(async_service, "_call_gemini", side_effect=gemini), \
+            patch.object(service, "_call_bedrock", side_effect=slow_bedrock) as mock_bedrock:
+        result = asyncio.run(async_service.get_llm_response("p", endpoint="reframing"))
+
+    assert result == VALID
+    mock_bedrock.assert_called_once()
+    assert service.router.breakers["bedrock"].state == CircuitBreaker.HALF_OPEN
+    assert service.router.acquire("bedrock") == CircuitBreaker.PROBE
+
+@patch("boto3.client")
+def test_streaming_failures_open_circuit_and_stream_bypasses_it(mock_boto_client):
+    """
+    [Scenario] 스트리밍 실패도 서킷 브레이커에 기록되어, 연속 실패 후에는 Gemini를 건너뛰고 Bedrock으로 스트리밍
+    """
+    service = LLMService()
+    service.gemini_pro_model = object()
+    service.router = LLMRouter(service.latency, failure_threshold=2, recovery_timeout=60)
+
+    def failing_gemini(prompt, schema=None, metrics=None):
+        metrics.error_class = "DeadlineExceeded"
+        yield service._create_error_json("Gemini 오류")
+
+    def bedrock_stream(prompt, schema=None, metrics=None):
+        yield VALID
+
+    with patch.object(service, "_stream_gemini_response", side_effect=failing_gemini) as mock_gemini, \
+            patch.object(service, "_stream_bedrock_response", side_effect=bedrock_stream):
+        for _ in range(2):
+            list(service.stream_llm_response("p", endpoint="reframing"))
+        assert service.router.breakers["gemini"].state == CircuitBreaker.OPEN
+
+        assert list(service.stream_llm_response("p", endpoint="reframing")) == [VALID]
+    assert mock_gemini.call_count == 2
+    assert service.router.breakers["bedrock"].consecutive_failures == 0
+
+@patch("boto3.client")
+def test_stream_takes_half_open_probe_and_returns_it_on_disconnect(mock_boto_client):
+    """
+    [Scenario] HALF_OPEN probe는 스트림 하나만 가져가고(나머지는 우회), 클라이언트가 중간에 끊으면 결과 없이 반납
+    """
+    service = LLMService()
+    service.gemini_pro_model = object()
+    service.router = LLMRouter(service.latency, failure_threshold=1, recovery_timeout=0.01)
+    service.router.record_failure("gemini")
+    time.sleep(0.02)
+
+    def gemini_stream(prompt, schema=None, metrics=None):
+        yield "{"
+        yield "}"
+
+    with patch.object(service, "_stream_gemini_response", side_effect=gemini_stream), \
+            patch.object(service, "_stream_bedrock_response", return_value=iter([VALID])) as mock_bedrock:
+        probe = service.stream_llm_response("p", endpoint="reframing")
+        assert next(probe) == "{"                       # probe 슬롯 사용 중
+        assert list(service.stream_llm_response("p", endpoint="reframing")) == [VALID]
+        mock_bedrock.assert_called_once()
+
+        probe.close()                                   # 클라이언트 연결 종료
+    breaker = service.router.breakers["gemini"]
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.acquire() == CircuitBreaker.PROBE
@@ -1,6 +1,7 @@
 # chatbot/test/services/test_llm_service_logic.py
 import pytest
 import json
+import asyncio
 from unittest.mock import patch, Mock
 from service.llm_service import LLMService
 
@@ -44,3 +45,22 @@ def test_get_bedrock_response_success(mock_boto_client):
     response = service.get_llm_response("안녕", use_bedrock=True)
 
     assert response == "안녕하세요"
+
+
+@patch("boto3.client")
+def test_async_get_embedding_offloads_bedrock(mock_boto_client):
+    """
+    [Scenario] AsyncLLMService.get_embedding이 동기 Bedrock 클라이언트를 그대로 재사용하는지 테스트
+    """
+    mock_bedrock = mock_boto_client.return_value
+    mock_response_body = json.dumps({"embedding": [0.4, 0.5]})
+    mock_bedrock.invoke_model.return_value = {
+        "body": Mock(read=lambda: mock_response_body)
+    }
+
+    service = LLMService()
+    vector = asyncio.run(service.aio.get_embedding("테스트"))
+
+    assert vector == [0.4, 0.5]
+    # aio 인스턴스는 싱글톤처럼 재사용
+    assert service.aio is service.aio
@@ -0,0 +1,47 @@
+# chatbot/test/services/test_migrations.py
+from datetime import date
+from unittest.mock import MagicMock
+from migrations import runner
+from repository.report_repository import ReportRepository
+
+def test_versions_are_contiguous_and_index_migration_runs_outside_transaction():
+    migrations = runner.discover_migrations()
+    assert [m.version for m in migrations] == list(range(1, len(migrations) + 1))
+    by_name = {m.name: m for m in migrations}
+    assert by_name["query_indexes"].no_transaction
+    assert not by_name["baseline"].no_transaction
+
+def test_split_statements_drops_comment_only_chunks():
+    sql = "-- migrate:no-transaction\n-- 설명\nCREATE INDEX a\n    ON t (x);\n\n-- 다음\nCREATE INDEX b ON t (y);\n-- 끝\n"
+    assert runner.split_statements(sql) == ["-- migrate:no-transaction\n-- 설명\nCREATE INDEX a\n    ON t (x);", "-- 다음\nCREATE INDEX b ON t (y);"]
+
+def test_apply_migrations_skips_applied_versions_and_records_new_ones():
+    conn = MagicMock()
+    conn.execute.return_value.fetchall.return_value = [(1,), (2,)]
+
+    applied = runner.apply_migrations(conn, target=4)
+
+    assert [m.version for m in applied] == [3, 4]
+    recorded = [c.args[1] for c in conn.execute.call_args_list if "INSERT INTO schema_migrations" in c.args[0]]
+    assert recorded == [(3, "chat_session_summaries"), (4, "chat_sessions")]
+    assert conn.transaction.call_count == 2
+    assert "pg_advisory_unlock" in conn.execute.call_args_list[-1].args[0]
+
+def test_report_queries_use_half_open_ranges():
+    """
+    [Scenario] 날짜/월 조건을 created_at, start_date 컬럼의 범위 조건으로 전달 (인덱스 사용 가능 형태)
+    """
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = []
+    repo = ReportRepository(conn)
+
+    repo.get_logs_by_period("u1", date(2024, 12, 23), date(2024, 12, 29))
+    sql, params = cur.execute.call_args.args
+    assert "::date" not in sql
+    assert params == ("u1", date(2024, 12, 23), date(2024, 12, 30))
+
+    repo.find_reports_by_month("u1", 2024, 12)
+    sql, params = cur.execute.call_args.args
+    assert "EXTRACT" not in sql
+    assert params == ("u1", date(2024, 12, 1), date(2025, 1, 1))
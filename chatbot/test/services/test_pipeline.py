@@ -0,0 +1,72 @@
+# chatbot/test/services/test_pipeline.py
+from datetime import date
+from unittest.mock import MagicMock, patch
+from repository import pipeline
+from repository.chat_repository import ChatRepository
+from repository.report_repository import ReportRepository
+
+def _fake_conn(results):
+    """cursor()마다 results의 다음 결과를 돌려주는 가짜 연결 (pipeline() 진입/종료 기록)"""
+    conn = MagicMock()
+    cursors = []
+
+    def make_cursor():
+        cur = MagicMock()
+        cur.fetchall.return_value = results[len(cursors)]
+        cursors.append(cur)
+        return cur
+
+    conn.cursor.side_effect = make_cursor
+    conn.cursors = cursors
+    return conn
+
+def test_fetch_pipelined_sends_all_statements_in_one_pipeline():
+    conn = _fake_conn([[(1,)], [("a",), ("b",)]])
+
+    results = pipeline.fetch_pipelined(conn, [("SELECT 1", None), ("SELECT x FROM t WHERE y = %s", (3,))])
+
+    assert results == [[(1,)], [("a",), ("b",)]]
+    conn.pipeline.assert_called_once()
+    conn.cursors[1].execute.assert_called_once_with("SELECT x FROM t WHERE y = %s", (3,))
+    assert all(cur.close.called for cur in conn.cursors)
+
+def test_fetch_pipelined_falls_back_to_sequential_without_pipeline_support():
+    conn = _fake_conn([[(1,)], [(2,)]])
+
+    with patch.object(pipeline.Pipeline, "is_supported", return_value=False):
+        results = pipeline.fetch_pipelined(conn, [("SELECT 1", None), ("SELECT 2", None)])
+
+    assert results == [[(1,)], [(2,)]]
+    conn.pipeline.assert_not_called()
+
+def test_get_session_context_returns_history_oldest_first():
+    """
+    [Scenario] 최근 대화(DESC 조회)는 오래된 순으로 뒤집고, 턴 수 / 요약과 함께 반환
+    """
+    conn = _fake_conn([[("최근", {}), ("이전", {})], [(7,)], [("요약", 2)]])
+
+    history, turn_count, summary_row = ChatRepository(conn).get_session_context("sess1", history_limit=2)
+
+    assert history == [("이전", {}), ("최근", {})]
+    assert turn_count == 7
+    assert summary_row == ("요약", 2)
+    conn.pipeline.assert_called_once()
+
+def test_get_session_context_without_summary_and_on_failure():
+    conn = _fake_conn([[], [(0,)]])
+    assert ChatRepository(conn).get_session_context("sess1", 5, include_summary=False) == ([], 0, None)
+    assert conn.cursor.call_count == 2
+
+    broken = MagicMock()
+    broken.cursor.side_effect = RuntimeError("connection lost")
+    assert ChatRepository(broken).get_session_context("sess1", 5) == ([], 0, None)
+    broken.rollback.assert_called_once()
+
+def test_report_batch_targets_in_one_round_trip():
+    conn = _fake_conn([[("u1",), ("u2",)], [("u2",)]])
+
+    user_ids, reported = ReportRepository(conn).get_report_batch_targets(date(2024, 1, 1), date(2024, 1, 7))
+
+    assert user_ids == ["u1", "u2"]
+    assert reported == {"u2"}
+    conn.pipeline.assert_called_once()
@@ -0,0 +1,80 @@
+# chatbot/test/services/test_prompt_layout.py
+import threading
+import time
+from unittest.mock import patch, Mock
+from prompts import get_reframing_prompt, get_voice_reframing_prompt, get_search_prompt, get_mind_diary_prompt
+from service.llm_service import LLMService
+from service.prompt_cache import VertexPrefixCache
+
+def test_static_prefix_is_identical_across_turns_and_users():
+    """
+    [Scenario] 턴/사용자/입력이 달라도 정적 프리픽스는 바이트 단위로 동일하고, 동적 값은 서픽스에만 포함
+    """
+    first = get_reframing_prompt("시험을 망쳤어요", [], turn_count=1)
+    later = get_reframing_prompt("그래도 괜찮아요", [("안녕", {"empathy": "반가워요"})], turn_count=7)
+    assert first.static_prefix == later.static_prefix
+    assert "시험을 망쳤어요" not in first.static_prefix and "시험을 망쳤어요" in first.dynamic_suffix
+    assert "7번째 대화" in later.dynamic_suffix
+    assert str(later) == later.static_prefix + later.dynamic_suffix
+
+    voice_a = get_voice_reframing_prompt("힘들어요", [], {"top_emotion": "sad", "confidence": 0.9}, "민수", 2)
+    voice_b = get_voice_reframing_prompt("좋아요", [], {"top_emotion": "happy", "confidence": 0.5}, "지영", 9)
+    assert voice_a.static_prefix == voice_b.static_prefix
+    assert "민수" in voice_a.dynamic_suffix and "민수" not in voice_a.static_prefix
+
+    assert get_search_prompt("a", "b", "c").static_prefix == get_search_prompt("x", "y", "z").static_prefix
+    diary_a = get_mind_diary_prompt("민수", "q", "c", "sad", {"sad": 0.8}, "2025-01-01")
+    diary_b = get_mind_diary_prompt("지영", "q2", "c2", "happy", {"happy": 0.9}, "2025-01-02")
+    assert diary_a.static_prefix == diary_b.static_prefix
+
+@patch("boto3.client")
+def test_gemini_uses_vertex_context_cache_for_static_prefix(mock_boto_client):
+    """
+    [Scenario] Vertex 컨텍스트 캐시 사용 시 캐시 모델에는 동적 서픽스만 전송, 캐시 불가 시 전체 프롬프트로 대체
+    """
+    service = LLMService()
+    service.gemini_pro_model = Mock()
+    cached_model = Mock()
+    cached_model.generate_content.return_value = Mock(text='{"empathy": "ok"}')
+    service.prompt_cache = Mock()
+    service.prompt_cache.get_model.return_value = cached_model
+
+    prompt = get_reframing_prompt("시험을 망쳤어요", [], turn_count=1)
+    assert service._call_gemini(prompt) == '{"empathy": "ok"}'
+    cached_model.generate_content.assert_called_once_with(prompt.dynamic_suffix)
+    service.prompt_cache.get_model.assert_called_once_with(prompt.static_prefix)
+
+    service.prompt_cache.get_model.return_value = None
+    service.gemini_pro_model.generate_content.return_value = Mock(text='{"empathy": "fallback"}')
+    assert service._call_gemini(prompt) == '{"empathy": "fallback"}'
+    service.gemini_pro_model.generate_content.assert_called_once_with(prompt)
+
+def test_vertex_prefix_cache_creation_does_not_block_other_requests():
+    """
+    [Scenario] CachedContent 생성(네트워크 호출) 중인 동안 같은 프리픽스 요청은 기다리지 않고 일반 호출(None)로,
+    다른 프리픽스는 독립적으로 생성
+    """
+    cache = VertexPrefixCache("gemini-test")
+    creating = threading.Event()
+    release = threading.Event()
+    created = {}
+
+    def slow_create(prefix):
+        if prefix == "A":
+            creating.set()
+            release.wait(1)
+        return created.setdefault(prefix, Mock())
+
+    with patch.object(cache, "_create", side_effect=slow_create):
+        first = threading.Thread(target=cache.get_model, args=("A",))
+        first.start()
+        creating.wait(1)
+
+        start = time.monotonic()
+        assert cache.get_model("A") is None
+        assert cache.get_model("B") is created["B"]
+        assert time.monotonic() - start < 0.5
+
+        release.set()
+        first.join()
+        assert cache.get_model("A") is created["A"]
@@ -0,0 +1,105 @@
+# chatbot/test/services/test_provider_init.py
+import asyncio
+import os
+import stat
+import time
+from unittest.mock import Mock, patch
+from service.credential_cache import load_cached_secret
+from service.lazy_provider import LazyProvider
+from service.llm_service import LLMService
+
+@patch("boto3.client")
+def test_providers_are_not_initialized_until_first_use(mock_boto_client):
+    """
+    [Scenario] LLMService 생성만으로는 어떤 프로바이더도 초기화하지 않고, 라우팅 후보 확인도 초기화를 유발하지 않음
+    """
+    with patch.object(LLMService, "_init_gemini", return_value=object()) as mock_init_gemini:
+        service = LLMService()
+        service._providers["gemini"]._configured = lambda: True
+
+        assert service._route("gemini", "reframing")[0] == "gemini"
+        mock_init_gemini.assert_not_called()
+        mock_boto_client.assert_not_called()
+
+        service.gemini_pro_model
+        service.gemini_pro_model
+        mock_init_gemini.assert_called_once()
+
+    service.bedrock_runtime
+    assert mock_boto_client.call_args.kwargs["service_name"] == "bedrock-runtime"
+
+def test_prefetch_initializes_providers_concurrently():
+    """
+    [Scenario] prefetch는 서로 독립적인 초기화를 동시에 진행 (0.2초 x 2 -> 약 0.2초)
+    """
+    def slow_factory():
+        time.sleep(0.2)
+        return object()
+
+    providers = [LazyProvider("a", slow_factory), LazyProvider("b", slow_factory)]
+    start = time.monotonic()
+    for provider in providers:
+        provider.prefetch()
+    values = [provider.get() for provider in providers]
+
+    assert all(values)
+    assert time.monotonic() - start < 0.35
+
+def test_async_first_use_does_not_block_event_loop():
+    """
+    [Scenario] 콜드 스타트의 느린 Gemini 초기화(0.3초) 중에도 같은 루프의 다른 코루틴은 계속 진행
+    """
+    from service.async_llm_service import AsyncLLMService
+
+    def slow_gemini():
+        time.sleep(0.3)
+        return None  # 미설정 -> 호출은 실패하지만 초기화 경로만 확인
+
+    with patch("boto3.client"):
+        service = LLMService()
+    service._providers["gemini"]._factory = slow_gemini
+
+    async def scenario():
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+
+        started = time.monotonic()
+        call = asyncio.ensure_future(AsyncLLMService(service)._call_gemini("p"))
+        await ticker()
+        assert ticks[-1] - started < 0.25
+        try:
+            await call
+        except RuntimeError:
+            pass
+        return ticks
+
+    assert len(asyncio.run(scenario())) == 5
+
+def test_failed_initialization_is_not_retried():
+    factory = Mock(side_effect=RuntimeError("SSM 권한 없음"))
+    provider = LazyProvider("gemini", factory)
+
+    assert provider.get() is None and provider.get() is None
+    assert provider.available() is False
+    factory.assert_called_once()
+
+def test_secret_cache_reuses_file_until_expiry(tmp_path):
+    """
+    [Scenario] TTL 안에서는 파일 캐시를 재사용하고(0600 권한), 만료되면 다시 조회
+    """
+    fetch = Mock(side_effect=['{"v": 1}', '{"v": 2}'])
+
+    assert load_cached_secret("/sapori/gcp", fetch, ttl_seconds=60, cache_dir=str(tmp_path)) == '{"v": 1}'
+    assert load_cached_secret("/sapori/gcp", fetch, ttl_seconds=60, cache_dir=str(tmp_path)) == '{"v": 1}'
+    assert fetch.call_count == 1
+
+    [cached] = list(tmp_path.iterdir())
+    assert stat.S_IMODE(cached.stat().st_mode) == 0o600
+
+    expired = time.time() - 120
+    os.utime(cached, (expired, expired))
+    assert load_cached_secret("/sapori/gcp", fetch, ttl_seconds=60, cache_dir=str(tmp_path)) == '{"v": 2}'
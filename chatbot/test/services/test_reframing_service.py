@@ -1,7 +1,8 @@
 # chatbot/test/services/test_reframing_service.py
 import pytest
 import json
-from unittest.mock import Mock
+import asyncio
+from unittest.mock import Mock, AsyncMock
 from schema.reframing import ReframingRequest, VoiceReframingRequest
 from domain.reframing_logic import ReframingService
 from repository.chat_repository import ChatRepository
@@ -19,7 +20,7 @@ def test_execute_reframing_success():
     mock_llm_service.get_embedding.return_value = [0.1] * 1024
 
     # 2. 시나리오 데이터 설정
-    mock_chat_repo.get_chat_history.return_value = []
+    mock_chat_repo.get_session_context.return_value = ([], 0, None)
 
     # (2-2) LLM이 리턴할 가짜 JSON (top_emotion 포함)
     llm_output = {
@@ -46,7 +47,7 @@ def test_execute_reframing_success():
     assert result == expected_result
 
     # (5-2) 주요 메서드 호출 확인
-    mock_chat_repo.get_chat_history.assert_called_once()
+    mock_chat_repo.get_session_context.assert_called_once()
     mock_llm_service.get_llm_response.assert_called_once()
 
     # [NEW] 동기 저장 로직 검증
@@ -69,10 +70,10 @@ def test_execute_reframing_llm_failure():
     mock_chat_repo = Mock(spec=ChatRepository)
     mock_llm_service = Mock(spec=LLMService)
 
-    # 임베딩 Mock
-    mock_llm_service.get_embedding.return_value = [0.0] * 1024
+    # 임베딩 생성도 실패
+    mock_llm_service.get_embedding.side_effect = Exception("Bedrock 장애")
 
-    mock_chat_repo.get_chat_history.return_value = []
+    mock_chat_repo.get_session_context.return_value = ([], 0, None)
     mock_llm_service.get_llm_response.return_value = "JSON 아님 Error"
 
     service = ReframingService(chat_repo=mock_chat_repo, llm_service=mock_llm_service)
@@ -86,6 +87,8 @@ def test_execute_reframing_llm_failure():
 
     # [NEW] 실패 상황에서도 로그 저장은 시도해야 함
     mock_chat_repo.log_cbt_session.assert_called_once()
+    # 임베딩은 0 벡터 대신 NULL로 저장 (백필 작업이 채움)
+    assert mock_chat_repo.log_cbt_session.call_args.kwargs["embedding"] is None
 
 
 def test_execute_voice_reframing_success():
@@ -98,7 +101,7 @@ def test_execute_voice_reframing_success():
     # 임베딩 Mock
     mock_llm_service.get_embedding.return_value = [0.1] * 1024
 
-    mock_chat_repo.get_chat_history.return_value = []
+    mock_chat_repo.get_session_context.return_value = ([], 0, None)
 
     llm_output = {
         "empathy": "목소리에서 슬픔이 느껴지네요.",
@@ -130,3 +133,116 @@ def test_execute_voice_reframing_success():
     _, kwargs = mock_chat_repo.log_cbt_session.call_args
     assert kwargs["user_id"] == "user_voice"
     assert kwargs["s3_url"] == "https://s3.bucket/file.mp3" # URL이 DB 저장 메서드까지 잘 갔는지 확인
+
+
+def test_stream_reframing_emits_fields_then_saves():
+    """
+    [Scenario] 스트리밍 상담: 완성된 필드가 순서대로 나가고, 응답 후 저장 작업에서 DB 저장이 수행되는지 테스트
+    """
+    mock_chat_repo = Mock(spec=ChatRepository)
+    mock_llm_service = Mock(spec=LLMService)
+    mock_llm_service.get_embedding.return_value = [0.1] * 1024
+    mock_chat_repo.get_session_context.return_value = ([], 0, None)
+
+    # 필드 경계가 청크 중간에 걸리도록 분할
+    mock_llm_service.stream_llm_response.return_value = iter([
+        '```json\n{"empathy": "많이 힘드셨',
+        '군요.", "detected_distortion": "흑백논리", "analysis": "분석",',
+        ' "socratic_question": "질문?", "alternative_thought": "대안", "top_emotion": "sad"}\n```'
+    ])
+
+    service = ReframingService(chat_repo=mock_chat_repo, llm_service=mock_llm_service)
+    request = ReframingRequest(user_id="user1", session_id="sess1", user_input="난 망했어")
+    events, save_turn = service.stream_reframing(request)
+
+    first_event = next(events)
+    assert first_event == ("field", {"field": "empathy", "value": "많이 힘드셨군요."})
+    # 첫 필드가 나가는 시점에는 아직 저장하지 않음
+    mock_chat_repo.log_cbt_session.assert_not_called()
+
+    rest = list(events)
+    fields = [data["field"] for event, data in rest if event == "field"]
+    assert fields == ["detected_distortion", "analysis", "socratic_question", "alternative_thought", "emotion"]
+
+    event, final = rest[-1]
+    assert event == "done"
+    assert final["emotion"] == "sad"
+    assert "top_emotion" not in final
+
+    # 저장은 제너레이터가 아니라 응답 후 백그라운드 작업에서 수행
+    mock_chat_repo.log_cbt_session.assert_not_called()
+    save_turn()
+    save_turn()
+    mock_chat_repo.log_cbt_session.assert_called_once()
+    assert mock_chat_repo.log_cbt_session.call_args.kwargs["bot_response"] == final
+
+
+def test_stream_reframing_saves_even_if_client_disconnects_after_done():
+    """
+    [Scenario] 클라이언트가 done 직후 연결을 끊어 서버가 제너레이터를 닫아도 턴이 저장되는지 테스트
+    """
+    mock_chat_repo = Mock(spec=ChatRepository)
+    mock_llm_service = Mock(spec=LLMService)
+    mock_llm_service.get_embedding.return_value = [0.1] * 1024
+    mock_chat_repo.get_session_context.return_value = ([], 0, None)
+    mock_llm_service.stream_llm_response.return_value = iter([
+        '{"empathy": "공감", "detected_distortion": "없음", "analysis": "분석",'
+        ' "socratic_question": "질문?", "alternative_thought": "대안", "top_emotion": "sad"}'
+    ])
+
+    service = ReframingService(chat_repo=mock_chat_repo, llm_service=mock_llm_service)
+    request = ReframingRequest(user_id="user1", session_id="sess1", user_input="난 망했어")
+    events, save_turn = service.stream_reframing(request)
+
+    for event, _ in events:
+        if event == "done":
+            break
+    events.close()  # 연결 종료로 서버가 이터레이션을 중단
+
+    save_turn()
+    mock_chat_repo.log_cbt_session.assert_called_once()
+
+
+def test_stream_reframing_does_not_save_when_stream_fails():
+    mock_chat_repo = Mock(spec=ChatRepository)
+    mock_llm_service = Mock(spec=LLMService)
+    mock_chat_repo.get_session_context.return_value = ([], 0, None)
+    mock_llm_service.stream_llm_response.side_effect = Exception("provider down")
+
+    service = ReframingService(chat_repo=mock_chat_repo, llm_service=mock_llm_service)
+    events, save_turn = service.stream_reframing(ReframingRequest(user_id="u1", session_id="s1", user_input="테스트"))
+
+    assert [event for event, _ in events] == ["error"]
+    save_turn()
+    mock_chat_repo.log_cbt_session.assert_not_called()
+
+
+def test_execute_reframing_async_success():
+    """
+    [Scenario] 비동기 텍스트 상담: aio LLM 호출 결과가 동기 버전과 동일하게 가공/저장되는지 테스트
+    """
+    mock_chat_repo = Mock(spec=ChatRepository)
+    mock_llm_service = Mock(spec=LLMService)
+    mock_llm_service.get_embedding.return_value = [0.1] * 1024
+    mock_chat_repo.get_session_context.return_value = ([], 2, None)
+
+    llm_output = {
+        "empathy": "많이 힘드셨군요.",
+        "detected_distortion": "흑백논리",
+        "analysis": "분석 내용...",
+        "socratic_question": "질문?",
+        "alternative_thought": "대안",
+        "top_emotion": "anxiety"
+    }
+    mock_llm_service.aio.get_llm_response = AsyncMock(return_value=json.dumps(llm_output))
+
+    service = ReframingService(chat_repo=mock_chat_repo, llm_service=mock_llm_service)
+    request = ReframingRequest(user_id="user1", session_id="sess1", user_input="난 망했어")
+    result = asyncio.run(service.execute_reframing_async(request))
+
+    assert result["emotion"] == "anxiety"
+    assert "top_emotion" not in result
+    mock_llm_service.aio.get_llm_response.assert_awaited_once()
+    # 동기 LLM 경로는 사용하지 않음
+    mock_llm_service.get_llm_response.assert_not_called()
+    mock_chat_repo.log_cbt_session.assert_called_once()
@@ -0,0 +1,141 @@
+# chatbot/test/services/test_search_repository.py
+import time
+from array import array
+from unittest.mock import MagicMock
+import pytest
+from repository import search_repository
+from repository.search_repository import SearchRepository
+
+@pytest.fixture
+def set_modes(monkeypatch):
+    def _set(modes: dict):
+        monkeypatch.setattr(search_repository, "_search_modes", modes)
+        monkeypatch.setattr(search_repository, "_search_modes_loaded_at", time.monotonic())
+    return _set
+
+def _repo():
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = [(0.1, "청년 수당")]
+    return SearchRepository(conn), cur
+
+def test_vector_mode_orders_directly_by_full_precision_distance(set_modes):
+    set_modes({})
+    repo, cur = _repo()
+
+    assert repo.search_employment_jobs([0.1] * 4) == [(0.1, "청년 수당")]
+
+    sql, params = cur.execute.call_args.args
+    assert "candidates" not in sql
+    assert "ORDER BY score" in sql
+    assert isinstance(params[0], array) and params[-1] == 10
+
+def test_binary_mode_filters_by_hamming_then_reranks_exactly(set_modes, monkeypatch):
+    set_modes({"welfare_services": ("binary", 40)})
+    monkeypatch.setattr(search_repository, "_iterative_scan", True)
+    repo, cur = _repo()
+
+    repo.search_welfare_services([0.1] * 4, ["서울"])
+
+    # 지역 조건으로 후보가 비지 않도록 iterative scan (후보는 원본 벡터로 재정렬하므로 relaxed_order)
+    setting, search = cur.execute.call_args_list
+    assert setting.args == ("SELECT set_config('hnsw.iterative_scan', %s, true)", ("relaxed_order",))
+    sql, params = search.args
+    assert "ORDER BY binary_quantize(embedding)::bit(1024) <~> binary_quantize(CAST(%s AS VECTOR(1024)))" in sql
+    assert sql.index("<~>") < sql.rindex("ORDER BY score")
+    # (재정렬 벡터, 지역 조건 x2, 후보 검색 벡터, 후보 수, 최종 K)
+    assert params[1:3] == ("서울", "서울")
+    assert params[0] is params[3]
+    assert params[4:] == (40, 10)
+
+def test_halfvec_mode_raises_ef_search_when_candidates_exceed_default(set_modes):
+    set_modes({"employment_jobs": ("halfvec", 100)})
+    repo, cur = _repo()
+
+    repo.search_employment_jobs([0.1] * 4)
+
+    set_ef, search = cur.execute.call_args_list
+    assert set_ef.args == ("SELECT set_config('hnsw.ef_search', %s, true)", ("100",))
+    assert "embedding::halfvec(1024) <=> CAST(%s AS HALFVEC(1024))" in search.args[0]
+    assert search.args[1][-2:] == (100, 10)
+
+def test_modes_are_reloaded_after_ttl_and_missing_table_falls_back_to_vector(monkeypatch):
+    monkeypatch.setattr(search_repository, "_search_modes", {})
+    monkeypatch.setattr(search_repository, "_search_modes_loaded_at", 0.0)
+    repo, cur = _repo()
+    cur.fetchall.return_value = [(
+        "employment_jobs", "binary", 80,
+        ["CREATE INDEX employment_jobs_embedding_bq_idx ON public.employment_jobs "
+         "USING hnsw (((binary_quantize(embedding))::bit(1024)) bit_hamming_ops)"],
+    )]
+
+    assert repo._search_mode("employment_jobs") == ("binary", 80)
+    assert repo._search_mode("cbt_logs") == ("vector", 40)
+    assert cur.execute.call_count == 1  # TTL 안에서는 다시 읽지 않음
+
+    monkeypatch.setattr(search_repository, "_search_modes_loaded_at", 0.0)
+    cur.execute.side_effect = Exception("relation does not exist")
+    assert repo._search_mode("employment_jobs") == ("binary", 80)
+    repo.conn.rollback.assert_called_once()
+
+def test_mode_without_valid_expression_index_falls_back_to_vector(monkeypatch):
+    monkeypatch.setattr(search_repository, "_search_modes", {})
+    monkeypatch.setattr(search_repository, "_search_modes_loaded_at", 0.0)
+    repo, cur = _repo()
+    # binary 모드로 바꿨지만 원본 vector HNSW 인덱스만 있음 (양자화 인덱스 빌드 전 / 빌드 실패로 INVALID)
+    cur.fetchall.return_value = [
+        ("welfare_services", "binary", 100,
+         ["CREATE INDEX welfare_services_embedding_hnsw_idx ON public.welfare_services USING hnsw (embedding vector_cosine_ops)"]),
+        ("employment_jobs", "halfvec", 40,
+         ["CREATE INDEX employment_jobs_embedding_halfvec_idx ON public.employment_jobs "
+          "USING hnsw (((embedding)::halfvec(1024)) halfvec_cosine_ops)"]),
+    ]
+
+    assert repo._search_mode("welfare_services") == ("vector", 100)
+    assert repo._search_mode("employment_jobs") == ("halfvec", 40)
+    assert "indisvalid" in cur.execute.call_args.args[0]
+
+def test_filtered_vector_search_keeps_scanning_hnsw_until_limit_rows(set_modes, monkeypatch):
+    """[Scenario] 지역 조건이 있으면 ef_search개 후보에서 걸러져 결과가 모자라지 않도록 iterative scan을 켬 (pgvector 0.8+)"""
+    set_modes({})
+    monkeypatch.setattr(search_repository, "_iterative_scan", None)
+    repo, cur = _repo()
+    cur.fetchone.return_value = ("0.8.0",)
+
+    repo.search_welfare_services([0.1] * 4, ["서울"])
+
+    version, setting, search = cur.execute.call_args_list
+    assert "pg_extension" in version.args[0]
+    assert setting.args == ("SELECT set_config('hnsw.iterative_scan', %s, true)", ("strict_order",))
+    assert "WHERE" in search.args[0] and search.args[1][-1] == 10
+
+    repo.search_welfare_services([0.1] * 4, ["서울"])
+    assert cur.execute.call_count == 5  # 버전은 한 번만 조회
+
+def test_filtered_vector_search_is_exact_without_iterative_scan(set_modes, monkeypatch):
+    """[Scenario] pgvector 0.7 이하에서는 인덱스를 쓰지 않고 조건에 맞는 행을 정확히 top-K로 정렬"""
+    set_modes({})
+    monkeypatch.setattr(search_repository, "_iterative_scan", None)
+    repo, cur = _repo()
+    cur.fetchone.return_value = ("0.7.4",)
+
+    repo.search_welfare_services([0.1] * 4, ["서울"])
+    _, setting, _ = cur.execute.call_args_list
+    assert setting.args == ("SELECT set_config('enable_indexscan', %s, true)", ("off",))
+
+    # 필터가 없으면 HNSW 인덱스를 그대로 사용
+    cur.execute.reset_mock()
+    repo.search_employment_jobs([0.1] * 4)
+    assert cur.execute.call_count == 1
+
+def test_filtered_quantized_search_uses_exact_vector_path_without_iterative_scan(set_modes, monkeypatch):
+    """[Scenario] iterative scan이 없는 pgvector에서는 조건이 있는 검색에 양자화 후보 단계를 쓰지 않음"""
+    set_modes({"welfare_services": ("halfvec", 100)})
+    monkeypatch.setattr(search_repository, "_iterative_scan", False)
+    repo, cur = _repo()
+
+    repo.search_welfare_services([0.1] * 4, ["서울"])
+
+    setting, search = cur.execute.call_args_list
+    assert setting.args == ("SELECT set_config('enable_indexscan', %s, true)", ("off",))
+    assert "candidates" not in search.args[0] and "halfvec" not in search.args[0]
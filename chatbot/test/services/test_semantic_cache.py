@@ -0,0 +1,83 @@
+# chatbot/test/services/test_semantic_cache.py
+import json
+from unittest.mock import Mock
+from domain.search_logic import SearchService
+from repository.search_repository import SearchRepository
+from service.llm_service import LLMService
+from service.semantic_cache import SemanticAnswerCache
+
+ANSWER = {"answer": "서울 강남구 청년 수당이 있습니다.", "services": [{"service_name": "청년 수당"}]}
+
+def _mock_search(embedding):
+    mock_repo = Mock(spec=SearchRepository)
+    mock_llm = Mock(spec=LLMService)
+    mock_llm.get_embedding.return_value = embedding
+    mock_repo.get_dataset_version.return_value = "v1"
+    mock_repo.search_welfare_services.return_value = [
+        (0.1, "청년 수당", "매월 50만원", "http://link", "서울", "강남구")
+    ]
+    mock_repo.search_employment_jobs.return_value = []
+    mock_llm.get_llm_response.return_value = json.dumps(ANSWER)
+    return mock_repo, mock_llm
+
+def test_semantic_cache_threshold_partition_and_version():
+    """
+    [Scenario] 유사도 임계값 이상 + 같은 파티션 + 같은 데이터셋 버전일 때만 적중
+    """
+    cache = SemanticAnswerCache(threshold=0.95)
+    partition = cache.make_partition("20대 무직", ["서울"], False)
+    cache.store([1.0, 0.0, 0.0], partition, "v1", ANSWER)
+
+    assert cache.lookup([0.99, 0.05, 0.0], partition, "v1") == ANSWER            # cos ≈ 0.9987
+    assert cache.lookup([0.6, 0.8, 0.0], partition, "v1") is None                # cos = 0.6
+    assert cache.lookup([1.0, 0.0, 0.0], cache.make_partition("20대 무직", ["부산"], False), "v1") is None
+    assert cache.lookup([1.0, 0.0, 0.0], partition, "v2") is None
+    assert cache.hits == 1 and cache.misses == 3
+    assert cache.stats()["hit_rate"] == 0.25
+
+def test_semantic_cache_ttl_and_size_eviction():
+    """
+    [Scenario] TTL이 지난 항목과 최대 크기를 넘는 오래된 항목은 제거
+    """
+    cache = SemanticAnswerCache(ttl_seconds=0, max_entries=2)
+    partition = cache.make_partition("", [], False)
+    cache.store([1.0, 0.0], partition, "v1", ANSWER)
+    assert cache.lookup([1.0, 0.0], partition, "v1") is None  # TTL 0 -> 즉시 만료
+
+    cache = SemanticAnswerCache(max_entries=2)
+    for vector in ([1.0, 0.0], [0.0, 1.0], [-1.0, 0.0]):
+        cache.store(vector, partition, "v1", ANSWER)
+    assert cache.stats()["entries"] == 2
+    assert cache.lookup([1.0, 0.0], partition, "v1") is None  # 가장 오래된 항목 제거됨
+
+def test_execute_search_serves_semantic_cache_hit():
+    """
+    [Scenario] 두 번째 유사 질의는 pgvector 검색과 LLM 호출 없이 캐시된 응답 반환
+    """
+    cache = SemanticAnswerCache(threshold=0.95)
+    mock_repo, mock_llm = _mock_search([0.1, 0.2, 0.3])
+    service = SearchService(search_repo=mock_repo, llm_service=mock_llm, semantic_cache=cache)
+
+    first = service.execute_search("서울 청년 복지", "20대 무직", use_bedrock=False)
+    mock_llm.get_embedding.return_value = [0.1, 0.2, 0.31]
+    second = service.execute_search("서울 청년 복지 알려줘", "20대 무직", use_bedrock=False)
+
+    assert first == second == ANSWER
+    assert mock_llm.get_llm_response.call_count == 1
+    assert mock_repo.search_welfare_services.call_count == 1
+    mock_repo.get_dataset_version.assert_called_once()  # 버전은 TTL 동안 재사용
+
+def test_execute_search_does_not_cache_llm_errors():
+    """
+    [Scenario] LLM 오류 응답은 캐시하지 않음
+    """
+    cache = SemanticAnswerCache()
+    mock_repo, mock_llm = _mock_search([0.1, 0.2, 0.3])
+    mock_llm.get_llm_response.return_value = json.dumps({"answer": "오류 발생: Gemini 오류", "services": []})
+    service = SearchService(search_repo=mock_repo, llm_service=mock_llm, semantic_cache=cache)
+
+    service.execute_search("서울 청년 복지", "", use_bedrock=False)
+    service.execute_search("서울 청년 복지", "", use_bedrock=False)
+
+    assert mock_llm.get_llm_response.call_count == 2
+    assert cache.stats()["entries"] == 0
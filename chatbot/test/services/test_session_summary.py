@@ -0,0 +1,74 @@
+import json
+from unittest.mock import Mock, patch
+from prompts import get_reframing_prompt
+from repository.chat_repository import ChatRepository
+from service.session_summary import refresh_session_summary, request_summary_update
+from util.token_budget import estimate_tokens
+
+def test_history_stays_within_token_budget_for_long_sessions():
+    """
+    [Scenario] 턴이 길고 많아도 [이전 대화 맥락]은 토큰 예산 이내이며, 요약 + 최신 턴 순으로 채워짐
+    """
+    history = [(f"긴 고민 {i} " + "가" * 600, {"empathy": "공감 " + "나" * 600}) for i in range(5)]
+    prompt = get_reframing_prompt("오늘도 힘들어요", history, turn_count=40,
+                                  summary="요약 " + "다" * 3000, token_budget=1000)
+
+    history_text = prompt.dynamic_suffix.split("[이전 대화 맥락]\n")[1].split("\n\n[현재 내담자의 말]")[0]
+    assert estimate_tokens(history_text) <= 1000
+    assert history_text.startswith("[이전 상담 요약]")
+    # 가장 최근 턴(세션 내 40번째)은 항상 포함
+    assert "Turn 40:" in history_text and "긴 고민 4" in history_text
+
+    # 예산이 없으면 기존처럼 최근 N턴 원문 전체
+    unbounded = get_reframing_prompt("안녕", history[:2], turn_count=2)
+    assert "Turn 1:" in unbounded.dynamic_suffix and "[이전 상담 요약]" not in unbounded.dynamic_suffix
+
+@patch("service.session_summary.config")
+def test_refresh_folds_only_turns_outside_recent_window(mock_config):
+    """
+    [Scenario] 최근 N턴 이전의 미반영 턴만 요약에 합치고, 반영한 턴 수를 함께 저장
+    """
+    mock_config.session_history_turns = 5
+    mock_config.session_summary_max_turns_per_update = 20
+    mock_config.session_summary_max_chars = 800
+
+    repo = Mock(spec=ChatRepository)
+    repo.get_session_summary.return_value = ("이전 요약", 2)
+    repo.get_session_turn_count.return_value = 9
+    repo.get_session_turns.return_value = [("u3", {"empathy": "b3"}), ("u4", {"empathy": "b4"})]
+    repo.upsert_session_summary.return_value = True
+    llm = Mock()
+    llm.get_llm_response.return_value = json.dumps({"summary": "새 요약"}, ensure_ascii=False)
+
+    assert refresh_session_summary("sess1", repo, llm) is True
+    repo.get_session_turns.assert_called_once_with("sess1", offset=2, limit=2)
+    prompt = llm.get_llm_response.call_args[0][0]
+    assert "이전 요약" in prompt.dynamic_suffix and "Turn 3:" in prompt.dynamic_suffix
+    repo.upsert_session_summary.assert_called_once_with("sess1", "새 요약", 4)
+
+    # 요약할 턴이 없으면 LLM을 호출하지 않음
+    repo.get_session_summary.return_value = ("새 요약", 4)
+    llm.reset_mock()
+    assert refresh_session_summary("sess1", repo, llm) is True
+    llm.get_llm_response.assert_not_called()
+
+    # LLM 오류 응답이면 저장하지 않고 실패 처리 (다음 턴에 재시도)
+    repo.get_session_summary.return_value = ("이전 요약", 2)
+    repo.upsert_session_summary.reset_mock()
+    llm.get_llm_response.return_value = json.dumps({"answer": "오류 발생: 시스템 오류", "services": []})
+    assert refresh_session_summary("sess1", repo, llm) is False
+    repo.upsert_session_summary.assert_not_called()
+
+@patch("service.session_summary.get_client_registry")
+def test_summary_update_is_enqueued_only_after_window_overflows(mock_registry):
+    """
+    [Scenario] 최근 N턴 창을 넘은 뒤에만 SQS로 요약 갱신 메시지를 발행
+    """
+    sqs = mock_registry.return_value.get_sqs.return_value
+
+    assert request_summary_update("sess1", 3) is False
+    sqs.send_message.assert_not_called()
+
+    assert request_summary_update("sess1", 6) is True
+    body = json.loads(sqs.send_message.call_args.kwargs["MessageBody"])
+    assert body == {"source": "session-summary", "session_id": "sess1"}
@@ -0,0 +1,89 @@
+# chatbot/test/services/test_standin_server.py
+import base64
+import json
+import struct
+from unittest.mock import patch
+import pytest
+from fastapi.testclient import TestClient
+from loadtest import standin_server
+from schema.llm_output import ReframingOutput, SearchOutput
+from util.structured_output import gemini_response_schema, provider_json_schema
+
+@pytest.fixture
+def client():
+    with patch.object(standin_server.settings, "latency", {}), \
+            patch.object(standin_server.settings, "error_rate", 0.0):
+        yield TestClient(standin_server.app)
+
+def test_titan_embedding_is_deterministic_and_normalized(client):
+    """
+    [Scenario] 같은 텍스트는 같은 임베딩, 요청한 차원 수, L2 노름 1
+    """
+    first = client.post("/model/amazon.titan-embed-text-v2:0/invoke", json={"inputText": "월세 지원"}).json()
+    second = client.post("/model/amazon.titan-embed-text-v2:0/invoke", json={"inputText": "월세 지원"}).json()
+    other = client.post("/model/amazon.titan-embed-text-v2:0/invoke", json={"inputText": "노인 일자리", "dimensions": 256}).json()
+
+    assert first["embedding"] == second["embedding"]
+    assert len(first["embedding"]) == 1024 and len(other["embedding"]) == 256
+    assert abs(sum(v * v for v in first["embedding"]) - 1.0) < 1e-9
+
+def test_claude_tool_use_matches_schema(client):
+    """
+    [Scenario] Bedrock tool use 요청은 input_schema를 만족하는 tool_use 블록과 usage를 반환
+    """
+    body = {
+        "messages": [{"role": "user", "content": "상담 프롬프트"}],
+        "tools": [{"name": "ReframingOutput", "input_schema": provider_json_schema(ReframingOutput)}],
+        "tool_choice": {"type": "tool", "name": "ReframingOutput"}
+    }
+    message = client.post("/model/anthropic.claude-3-5-sonnet-20240620-v1:0/invoke", json=body).json()
+
+    [block] = message["content"]
+    assert block["type"] == "tool_use"
+    ReframingOutput.model_validate(block["input"])
+    assert message["usage"]["input_tokens"] > 0 and message["usage"]["output_tokens"] > 0
+
+def test_claude_stream_is_valid_event_stream(client):
+    """
+    [Scenario] 스트리밍 응답은 CRC가 맞는 event stream 메시지이며, partial_json을 이으면 원래 JSON
+    """
+    body = {"messages": [{"role": "user", "content": "p"}], "tools": [{"name": "SearchOutput", "input_schema": provider_json_schema(SearchOutput)}]}
+    raw = client.post("/model/claude/invoke-with-response-stream", json=body).content
+
+    events, offset = [], 0
+    while offset < len(raw):
+        total, headers_len = struct.unpack(">II", raw[offset:offset + 8])
+        payload = raw[offset + 12 + headers_len:offset + total - 4]
+        events.append(json.loads(base64.b64decode(json.loads(payload)["bytes"])))
+        offset += total
+
+    text = "".join(e["delta"]["partial_json"] for e in events if e["type"] == "content_block_delta")
+    SearchOutput.model_validate_json(text)
+    assert events[0]["type"] == "message_start" and events[-1]["type"] == "message_stop"
+
+def test_gemini_and_openai_follow_response_schema(client):
+    """
+    [Scenario] Vertex generateContent(response_schema, 정수 enum 포함)와 OpenAI response_format 모두 스키마를 만족
+    """
+    gemini_schema = json.loads(json.dumps(gemini_response_schema(ReframingOutput)).replace('"OBJECT"', "6"))
+    vertex = client.post(
+        "/v1/projects/standin/locations/us-central1/publishers/google/models/gemini-2.5-pro:generateContent",
+        json={"contents": [{"role": "user", "parts": [{"text": "p"}]}], "generationConfig": {"responseSchema": gemini_schema}}
+    ).json()
+    ReframingOutput.model_validate_json(vertex["candidates"][0]["content"]["parts"][0]["text"])
+    assert vertex["usageMetadata"]["candidatesTokenCount"] > 0
+
+    completion = client.post("/v1/chat/completions", json={
+        "model": "gemma", "messages": [{"role": "user", "content": "p"}],
+        "response_format": {"type": "json_schema", "json_schema": {"name": "R", "schema": provider_json_schema(ReframingOutput)}}
+    }).json()
+    ReframingOutput.model_validate_json(completion["choices"][0]["message"]["content"])
+
+def test_error_injection(client):
+    """
+    [Scenario] 오류 주입 비율이 1이면 프로바이더별 오류 형식(Bedrock ThrottlingException 헤더)으로 응답
+    """
+    with patch.object(standin_server.settings, "error_rate", 1.0):
+        response = client.post("/model/claude/invoke", json={"messages": []})
+    assert response.status_code == 429
+    assert response.headers["x-amzn-ErrorType"].startswith("ThrottlingException")
@@ -0,0 +1,80 @@
+import json
+import pytest
+from unittest.mock import patch, Mock
+from schema.llm_output import ReframingOutput, SearchOutput
+from service.llm_service import LLMService
+from util.structured_output import gemini_response_schema, parse_structured, provider_json_schema
+
+REFRAMING = {
+    "empathy": "많이 힘드셨군요.",
+    "detected_distortion": "흑백사고",
+    "analysis": "분석",
+    "socratic_question": "질문?",
+    "alternative_thought": "대안",
+    "top_emotion": "sad"
+}
+
+def test_provider_schemas_are_inlined_and_strict():
+    """
+    [Scenario] 프로바이더 스키마는 $ref 없이 인라인되고 모든 속성이 required, Gemini용은 Optional을 nullable로 변환
+    """
+    schema = provider_json_schema(SearchOutput)
+    item = schema["properties"]["services"]["items"]
+    assert "$defs" not in schema and "$ref" not in json.dumps(schema)
+    assert item["required"] == ["service_name", "summary", "target", "region", "url"]
+
+    gemini = gemini_response_schema(SearchOutput)
+    region = gemini["properties"]["services"]["items"]["properties"]["region"]
+    assert region == {"description": "지역", "type": "STRING", "nullable": True}
+    assert "additionalProperties" not in json.dumps(gemini) and "title" not in gemini
+
+    assert gemini_response_schema(ReframingOutput)["properties"]["top_emotion"]["enum"][0] == "happy"
+
+def test_parse_structured_validates_schema():
+    """
+    [Scenario] 스키마에 맞는 JSON만 통과 (코드 블록/설명 문장은 허용, 스키마 위반/JSON 없음은 ValueError)
+    """
+    assert parse_structured(json.dumps(REFRAMING), ReframingOutput) == REFRAMING
+    assert parse_structured("```json\n" + json.dumps(REFRAMING) + "\n```", ReframingOutput) == REFRAMING
+    assert parse_structured("답변입니다: " + json.dumps(REFRAMING) + " 참고하세요.", ReframingOutput) == REFRAMING
+
+    with pytest.raises(ValueError):
+        parse_structured("JSON 아님", ReframingOutput)
+    with pytest.raises(ValueError):
+        parse_structured(json.dumps({**REFRAMING, "top_emotion": "기쁨"}), ReframingOutput)
+
+@patch("boto3.client")
+def test_llm_service_requests_structured_output_per_provider(mock_boto_client):
+    """
+    [Scenario] schema 지정 시 Gemini는 response_schema, Bedrock은 강제 tool use, vLLM은 response_format(json_schema) 사용
+    """
+    service = LLMService()
+
+    # Gemini: JSON 모드 + response_schema
+    service.gemini_pro_model = Mock()
+    service.gemini_pro_model.generate_content.return_value = Mock(text=json.dumps(REFRAMING))
+    assert service._call_gemini("프롬프트", schema=ReframingOutput) == json.dumps(REFRAMING)
+    config = service.gemini_pro_model.generate_content.call_args.kwargs["generation_config"]
+    assert config["response_mime_type"] == "application/json"
+    assert config["response_schema"] == gemini_response_schema(ReframingOutput)
+
+    # Bedrock: tool_choice로 도구 강제 -> tool_use.input을 JSON 텍스트로 반환
+    mock_bedrock = mock_boto_client.return_value
+    mock_bedrock.invoke_model.return_value = {"body": Mock(read=lambda: json.dumps({
+        "content": [{"type": "tool_use", "name": "ReframingOutput", "input": REFRAMING}]
+    }))}
+    text = service.get_llm_response("프롬프트", use_bedrock=True, schema=ReframingOutput)
+    assert parse_structured(text, ReframingOutput) == REFRAMING
+    body = json.loads(mock_bedrock.invoke_model.call_args.kwargs["body"])
+    assert body["tool_choice"] == {"type": "tool", "name": "ReframingOutput"}
+    assert body["tools"][0]["input_schema"] == provider_json_schema(ReframingOutput)
+
+    # vLLM: guided decoding (OpenAI 호환 response_format)
+    service.hf_client = Mock()
+    service.hf_client.chat.completions.create.return_value = Mock(
+        choices=[Mock(message=Mock(content=json.dumps(REFRAMING)))]
+    )
+    service._call_gemma("프롬프트", schema=ReframingOutput)
+    response_format = service.hf_client.chat.completions.create.call_args.kwargs["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["schema"] == provider_json_schema(ReframingOutput)
@@ -0,0 +1,54 @@
+# chatbot/test/services/test_vector.py
+import json
+import struct
+from array import array
+from unittest.mock import MagicMock, patch
+from repository import vector
+from repository.embedding_cache_repository import EmbeddingCacheRepository
+
+def test_binary_dump_matches_pgvector_wire_format_and_round_trips():
+    values = [0.5, -1.25, 3.0e-3]
+    data = vector.VectorBinaryDumper(array).dump(vector.to_vector(values))
+
+    # int16 차원 + int16 예약 + big-endian float32
+    assert data == struct.pack("!HH3f", 3, 0, *values)
+    assert vector.VectorBinaryLoader(0).load(data) == [0.5, -1.25, struct.unpack("f", struct.pack("f", 3.0e-3))[0]]
+
+def test_binary_vector_is_several_times_smaller_than_json_text():
+    embedding = [0.0123456789 * (i % 7 - 3) for i in range(1024)]
+    binary = vector.VectorBinaryDumper(array).dump(vector.to_vector(embedding))
+    assert len(binary) == 4 + 4 * 1024
+    assert len(json.dumps(embedding)) > 3 * len(binary)
+
+def test_to_vector_accepts_float32_arrays_without_copy():
+    existing = array("f", [1.0, 2.0])
+    assert vector.to_vector(existing) is existing
+    assert vector.to_vector((1, 2)).tolist() == [1.0, 2.0]
+
+def test_register_vector_binds_dumper_to_vector_oid():
+    conn = MagicMock()
+    with patch.object(vector.TypeInfo, "fetch", return_value=MagicMock(oid=16400)):
+        assert vector.register_vector(conn)
+
+    dumper_cls = conn.adapters.register_dumper.call_args.args[1]
+    assert conn.adapters.register_dumper.call_args.args[0] is array
+    assert dumper_cls.oid == 16400
+    conn.adapters.register_loader.assert_called_once_with(16400, vector.VectorBinaryLoader)
+
+    with patch.object(vector.TypeInfo, "fetch", return_value=None):
+        assert not vector.register_vector(MagicMock())
+
+def test_embedding_cache_bulk_save_sends_binary_vectors_in_one_call():
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+
+    EmbeddingCacheRepository(conn).save_embeddings([
+        ("k1", "titan", 3, [0.1, 0.2, 0.3]),
+        ("k2", "titan", 3, [0.4, 0.5, 0.6]),
+    ])
+
+    cur.executemany.assert_called_once()
+    rows = cur.executemany.call_args.args[1]
+    assert [row[0] for row in rows] == ["k1", "k2"]
+    assert all(isinstance(row[3], array) for row in rows)
+    conn.commit.assert_called_once()
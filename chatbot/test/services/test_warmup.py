@@ -0,0 +1,53 @@
+# chatbot/test/services/test_warmup.py
+from contextlib import contextmanager
+from unittest.mock import MagicMock, Mock, patch
+import lambda_function
+from service import warmup
+
+@contextmanager
+def _fake_conn():
+    yield MagicMock()
+
+def test_warmup_event_detection():
+    assert lambda_function.is_warmup_event({"warmup": True})
+    assert lambda_function.is_warmup_event({"source": "serverless-plugin-warmup"})
+    # 상수 입력 없는 예약 이벤트는 다른 예약 작업일 수 있으므로 Warm-up이 아님
+    assert not lambda_function.is_warmup_event({"source": "aws.events", "detail-type": "Scheduled Event"})
+    assert not lambda_function.is_warmup_event({"Records": [{"eventSource": "aws:sqs"}]})
+    assert not lambda_function.is_warmup_event({"rawPath": "/chatbot/health", "source": "aws.events"})
+
+def test_scheduled_event_without_constant_input_is_ignored_not_warmed():
+    event = {"source": "aws.events", "detail-type": "Scheduled Event", "resources": ["arn:aws:events:rule/nightly"]}
+    with patch("service.warmup.run_warmup") as mock_warmup:
+        assert lambda_function.lambda_handler(event, None)["status"] == "ignored"
+    mock_warmup.assert_not_called()
+
+def test_run_warmup_reports_each_stage_and_tolerates_failures():
+    """
+    [Scenario] 모든 단계의 소요 시간을 보고하고, 한 프로바이더가 실패해도 나머지 단계는 완료
+    """
+    llm = Mock()
+    llm.embedding_cache.prime.return_value = 12
+    llm._invoke_embedding.side_effect = RuntimeError("Bedrock 연결 실패")
+    llm.registry.warm_up.return_value = {"https://vllm/v1": True}
+    preload = Mock(return_value=object())
+
+    with patch.object(warmup, "_init_db_pool") as mock_pool, \
+            patch.object(warmup, "borrow_db_conn", _fake_conn), \
+            patch("service.llm_service.get_llm_service", return_value=llm):
+        result = warmup.run_warmup(preload=preload)
+
+    stages = result["stages"]
+    assert set(stages) == {"app", "db_pool", "db_ping", "embedding_cache", "bedrock", "gemini", "gemma"}
+    assert all("ms" in stage for stage in stages.values())
+    assert stages["embedding_cache"] == {"ok": True, "primed": 12, "ms": stages["embedding_cache"]["ms"]}
+    assert stages["bedrock"]["ok"] is False and "Bedrock 연결 실패" in stages["bedrock"]["error"]
+    assert stages["gemini"]["ok"] and stages["gemma"]["endpoints"] == 1
+    mock_pool.assert_called_once()
+    preload.assert_called_once()
+    llm.gemini_pro_model.count_tokens.assert_called_once_with("warmup")
+
+def test_lambda_handler_routes_warmup_without_touching_http_app():
+    with patch("service.warmup.run_warmup", return_value={"warmup": True}) as mock_run:
+        assert lambda_function.lambda_handler({"warmup": True}, None) == {"warmup": True}
+    assert mock_run.call_args.kwargs["preload"] is lambda_function._get_http_handler
@@ -1,6 +1,7 @@
 import json
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+from service.embedding_batch import EmbeddingBatchResult
 from service.worker_service import process_sqs_batch
 
 # 공통 Mock 설정 헬퍼
@@ -29,7 +30,7 @@ def test_process_sqs_batch_success(mock_get_db_conn, mock_get_llm, MockChatRepo)
     """
     mock_llm_instance, mock_repo_instance = setup_mocks(mock_get_db_conn, mock_get_llm, MockChatRepo)
     # 임베딩 생성 결과 설정 (1024차원)
-    mock_llm_instance.get_embedding.return_value = [0.1] * 1024
+    mock_llm_instance.get_embeddings.return_value = EmbeddingBatchResult([[0.1] * 1024], {})
 
     # 테스트 데이터 준비 (일반 로그)
     records = [
@@ -51,8 +52,9 @@ def test_process_sqs_batch_success(mock_get_db_conn, mock_get_llm, MockChatRepo)
     assert result["success"] == 1
     assert result["failed"] == 0
 
-    # LLM 임베딩 생성이 호출되었는지
-    mock_llm_instance.get_embedding.assert_called_once()
+    # LLM 임베딩은 배치 API로 한 번만 호출되었는지
+    mock_llm_instance.get_embeddings.assert_called_once_with(["안녕하세요"])
+    mock_llm_instance.get_embedding.assert_not_called()
     # DB 저장 함수가 호출되었는지
     mock_repo_instance.log_cbt_session.assert_called_once()
 
@@ -129,6 +131,8 @@ def test_process_sqs_mind_diary_event(mock_get_db_conn, mock_get_llm, MockChatRe
     assert kwargs["user_input"] == "열심히 공부했는데 시험을 망쳐서 너무 슬퍼."
     # 봇 응답의 empathy가 LLM 결과와 일치하는지 확인
     assert kwargs["bot_response"]["empathy"] == "시험 때문에 많이 속상하셨겠어요."
+    # 임베딩은 0 벡터 대신 NULL로 저장 (백필 작업이 채움)
+    assert kwargs["embedding"] is None
 
 
 @patch("service.worker_service.ChatRepository")
@@ -2,5 +2,6 @@
 
 from . import response_builder
 from . import json_parser
+from . import sse
 
-__all__ = ['response_builder', 'json_parser']
+__all__ = ['response_builder', 'json_parser', 'sse']
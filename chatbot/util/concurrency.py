@@ -0,0 +1,18 @@
+# chatbot/util/concurrency.py
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# 블로킹 I/O(boto3, psycopg 등)를 이벤트 루프 밖으로 내보내기 위한 전용 스레드 풀
+# (FastAPI 기본 스레드풀과 분리하여 sync 엔드포인트와 자원을 나눠 쓰지 않도록 함)
+_BLOCKING_MAX_WORKERS = int(os.environ.get("ASYNC_BLOCKING_MAX_WORKERS", "32"))
+_blocking_executor = ThreadPoolExecutor(max_workers=_BLOCKING_MAX_WORKERS, thread_name_prefix="blocking-io")
+
+async def run_blocking(func, *args, **kwargs):
+    """동기 함수를 전용 스레드 풀에서 실행하고 결과를 await 합니다."""
+    loop = asyncio.get_running_loop()
+    # asyncio.to_thread처럼 contextvars를 함께 전달 (LLM 지표 등 호출 단위 컨텍스트 유지)
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(_blocking_executor, functools.partial(ctx.run, func, *args, **kwargs))
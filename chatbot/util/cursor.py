@@ -0,0 +1,23 @@
+# chatbot/util/cursor.py
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from exception import AppError
+
+def encode_cursor(timestamp: datetime, key) -> str:
+    """키셋 페이지네이션 커서 (마지막 행의 (시각, 식별자))를 URL에 안전한 불투명 문자열로 인코딩"""
+    raw = json.dumps([timestamp.isoformat(), key], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, object]]:
+    """encode_cursor의 역변환 (커서가 없으면 None, 형식이 잘못되면 400 AppError)"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(timestamp), key
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise AppError(status_code=400, message="잘못된 페이지 커서입니다.", detail=str(e))
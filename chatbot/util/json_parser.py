@@ -2,36 +2,194 @@
 import json
 import re
 import logging
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger()
 
+# 문자열 밖에서 의미 있는 문자 / 문자열 안에서 의미 있는 문자 (그 사이 구간은 C 레벨 검색으로 건너뜀)
+_STRUCTURAL = re.compile(r'[{}\[\]",:]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+class _Recorder:
+    """청크 경계를 넘어가는 구간의 텍스트를 조각 단위로 모읍니다. (문자 단위 복사 없음)"""
+    __slots__ = ("parts", "start")
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.start: Optional[int] = None
+
+    @property
+    def active(self) -> bool:
+        return self.start is not None
+
+    def begin(self, index: int):
+        self.parts = []
+        self.start = index
+
+    def flush(self, text: str):
+        """청크 끝: 현재 청크의 남은 부분을 보관하고 다음 청크 처음부터 이어서 기록"""
+        if self.start is not None:
+            self.parts.append(text[self.start:])
+            self.start = 0
+
+    def end(self, text: str, index: int) -> str:
+        self.parts.append(text[self.start:index])
+        self.start = None
+        return "".join(self.parts)
+
+class IncrementalJSONParser:
+    """
+    LLM 출력에서 첫 번째 균형 잡힌 JSON 객체를 한 번의 선형 스캔으로 찾는 증분 파서
+
+    - 청크 단위로 feed()하면 값이 닫힌 최상위 필드를 (key, value)로 즉시 반환합니다.
+    - 객체 앞의 코드 블록(```json)이나 설명 문장, 객체 뒤의 텍스트는 무시합니다.
+    - 균형은 맞지만 JSON이 아닌 중괄호 구간(예: 안내 문구의 {이름})은 건너뛰고 다음 객체를 찾습니다.
+    - 이미 본 텍스트를 다시 스캔하지 않으므로 전체 비용은 출력 길이에 비례합니다.
+    """
+
+    def __init__(self):
+        self.result: Optional[dict] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = None  # 최상위(depth 1)에서 다음에 올 항목: key / colon / value
+        self._key: Optional[str] = None
+        self._key_rec = _Recorder()
+        self._value_rec = _Recorder()
+        self._object_rec = _Recorder()
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """청크를 소비하고, 이번 청크에서 완성된 최상위 필드 목록을 반환합니다."""
+        fields = []
+        i, n = 0, len(text)
+
+        while i < n and self.result is None:
+            if self._depth == 0:
+                start = text.find("{", i)
+                if start < 0:
+                    return fields
+                self._open_object(start)
+                i = start + 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    i += 1
+                    continue
+                match = _STRING_SPECIAL.search(text, i)
+                if not match:
+                    break
+                k = match.start()
+                if match.group() == "\\":
+                    self._escape = True
+                    i = k + 1
+                    continue
+                self._in_string = False
+                i = k + 1
+                if self._key_rec.active:
+                    self._key = self._loads(self._key_rec.end(text, i))
+                    self._expect = "colon"
+                continue
+
+            match = _STRUCTURAL.search(text, i)
+            if not match:
+                break
+            char, k = match.group(), match.start()
+            i = k + 1
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == "key":
+                    self._key_rec.begin(k)
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._close_field(text, k, fields)
+                    self._close_object(text, i)
+            elif self._depth == 1:
+                if char == ":" and self._expect == "colon":
+                    self._expect = "value"
+                    self._value_rec.begin(i)
+                elif char == ",":
+                    self._close_field(text, k, fields)
+                    self._expect = "key"
+
+        for recorder in (self._key_rec, self._value_rec, self._object_rec):
+            recorder.flush(text)
+        return fields
+
+    def _open_object(self, index: int):
+        self._depth = 1
+        self._expect = "key"
+        self._key = None
+        self._object_rec.begin(index)
+
+    def _close_field(self, text: str, index: int, fields: list):
+        if not self._value_rec.active:
+            return
+        raw = self._value_rec.end(text, index)
+        try:
+            fields.append((self._key, json.loads(raw)))
+        except (json.JSONDecodeError, TypeError):
+            pass
+        self._key = None
+
+    def _close_object(self, text: str, end: int):
+        raw = self._object_rec.end(text, end)
+        try:
+            parsed = json.loads(raw)
+        except json.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, dict):
+            self.result = parsed
+        # JSON이 아닌 중괄호 구간이면 이어서 다음 '{'를 찾음
+
+    @staticmethod
+    def _loads(raw: str):
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return raw.strip('"')
+
 def parse_llm_json(text: str) -> dict:
     """
-    LLM 응답 텍스트에서 JSON을 추출하여 딕셔너리로 변환하는 헬퍼 함수
-    1. 마크다운 코드 블록(```json ... ```) 제거
-    2. 순수 JSON 파싱 시도
-    3. 실패 시 정규식으로 { ... } 구간 추출하여 재시도
+    LLM 응답 텍스트에서 첫 번째 JSON 객체를 추출하여 딕셔너리로 변환합니다.
+    (코드 블록 / 앞뒤 설명 문장 허용, IncrementalJSONParser로 한 번만 스캔)
     """
     if not text:
         raise ValueError("Empty LLM response")
 
-    # 1. 마크다운 코드 블록 제거 (```json ... ```)
-    cleaned_text = re.sub(r"```json\s*|\s*```", "", text, flags=re.IGNORECASE | re.DOTALL).strip()
-
-    try:
-        # 2. 순수 JSON 파싱 시도
-        return json.loads(cleaned_text)
-    except json.JSONDecodeError:
-        pass # 1차 실패 시 다음 단계로
-
-    # 3. 실패 시 기존 방식(정규식)으로 가장 바깥쪽 { } 구간 탐색 시도
-    try:
-        match = re.search(r'\{.*\}', text, re.DOTALL)
-        if match:
-            return json.loads(match.group(0))
-    except Exception:
-        pass
-
-    # 모든 시도 실패 시
-    logger.error(f"JSON 파싱 실패. Raw Text(first 100 chars): {text[:100]}...")
-    raise ValueError("LLM 응답에서 유효한 JSON 형식을 찾을 수 없습니다.")
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    if parser.result is None:
+        logger.error(f"JSON 파싱 실패. Raw Text(first 100 chars): {text[:100]}...")
+        raise ValueError("LLM 응답에서 유효한 JSON 형식을 찾을 수 없습니다.")
+    return parser.result
+
+def iter_completed_fields(chunks: Iterable[str]) -> Iterator[Tuple[str, Any]]:
+    """
+    스트리밍 LLM 응답 청크를 소비하면서, 값이 완성된 최상위 필드를 (key, value)로 즉시 반환합니다.
+    모든 청크를 소비한 뒤에는 누적된 전체 텍스트를 (None, full_text)로 한 번 반환합니다.
+    """
+    parser = IncrementalJSONParser()
+    parts = []
+    emitted = set()
+
+    for chunk in chunks:
+        parts.append(chunk)
+        if parser.done:
+            continue
+        for key, value in parser.feed(chunk):
+            if key in emitted:
+                continue
+            emitted.add(key)
+            yield key, value
+
+    yield None, "".join(parts)
@@ -0,0 +1,13 @@
+# chatbot/util/sse.py
+import json
+from typing import Any, Iterable, Iterator, Tuple
+
+def format_sse(event: str, data: Any) -> str:
+    """Server-Sent Events 한 건을 직렬화합니다."""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+def encode_events(events: Iterable[Tuple[str, Any]]) -> Iterator[str]:
+    """(event, data) 튜플 스트림을 SSE 문자열 스트림으로 변환합니다."""
+    for event, data in events:
+        yield format_sse(event, data)
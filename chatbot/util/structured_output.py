@@ -0,0 +1,83 @@
+# chatbot/util/structured_output.py
+import copy
+from functools import lru_cache
+from typing import Type
+from pydantic import BaseModel, ValidationError
+
+from util.json_parser import parse_llm_json
+
+# Gemini response_schema(OpenAPI 부분집합)가 지원하지 않는 JSON Schema 키워드
+_GEMINI_UNSUPPORTED_KEYS = ("title", "default", "additionalProperties", "$defs")
+
+def _resolve(node, defs: dict):
+    """$ref를 인라인하고 title/default를 제거하며, 모든 속성을 required로 지정합니다."""
+    if isinstance(node, list):
+        return [_resolve(item, defs) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    if "$ref" in node:
+        return _resolve(copy.deepcopy(defs[node["$ref"].split("/")[-1]]), defs)
+
+    resolved = {k: _resolve(v, defs) for k, v in node.items() if k not in ("title", "default", "$defs")}
+    if resolved.get("type") == "object" and "properties" in resolved:
+        # 선택 필드도 항상 출력하도록 강제 (값이 없으면 null)
+        resolved["required"] = list(resolved["properties"].keys())
+        resolved["additionalProperties"] = False
+    return resolved
+
+@lru_cache(maxsize=None)
+def provider_json_schema(schema: Type[BaseModel]) -> dict:
+    """Bedrock tool input_schema / vLLM guided decoding용 JSON Schema ($ref 없음)"""
+    raw = schema.model_json_schema()
+    return _resolve(raw, raw.get("$defs", {}))
+
+def _to_gemini(node):
+    if isinstance(node, list):
+        return [_to_gemini(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    # Optional[X] -> anyOf [X, null] 를 X + nullable 로 변환
+    any_of = node.get("anyOf")
+    if any_of and any(option.get("type") == "null" for option in any_of):
+        options = [option for option in any_of if option.get("type") != "null"]
+        if len(options) == 1:
+            merged = {k: v for k, v in node.items() if k != "anyOf"}
+            merged.update(options[0])
+            merged["nullable"] = True
+            return _to_gemini(merged)
+
+    converted = {k: _to_gemini(v) for k, v in node.items() if k not in _GEMINI_UNSUPPORTED_KEYS}
+    if isinstance(converted.get("type"), str):
+        # generation_config를 dict로 넘기면 proto Type enum 이름(STRING, OBJECT...)과 그대로 매칭됨
+        converted["type"] = converted["type"].upper()
+    return converted
+
+@lru_cache(maxsize=None)
+def gemini_response_schema(schema: Type[BaseModel]) -> dict:
+    """Vertex AI GenerationConfig.response_schema용 스키마"""
+    return _to_gemini(provider_json_schema(schema))
+
+def parse_structured(text: str, schema: Type[BaseModel]) -> dict:
+    """
+    구조화 출력 응답을 스키마로 검증하여 딕셔너리로 반환합니다.
+    응답 전체가 JSON이면 pydantic으로 바로 검증하고, 코드 블록/설명 문장이 섞인 경우에만
+    IncrementalJSONParser로 첫 번째 JSON 객체를 한 번 스캔하여 추출합니다.
+    Raises:
+        ValueError: JSON 객체가 없거나 스키마와 맞지 않는 응답 (pydantic ValidationError 포함)
+    """
+    if not text:
+        raise ValueError("Empty LLM response")
+
+    try:
+        return schema.model_validate_json(text).model_dump(exclude_unset=True)
+    except ValidationError as e:
+        if not any(error["type"] == "json_invalid" for error in e.errors()):
+            raise ValueError(f"LLM 응답이 {schema.__name__} 스키마와 맞지 않습니다: {e.error_count()}건") from e
+
+    data = parse_llm_json(text)
+    try:
+        return schema.model_validate(data).model_dump(exclude_unset=True)
+    except ValidationError as e:
+        raise ValueError(f"LLM 응답이 {schema.__name__} 스키마와 맞지 않습니다: {e.error_count()}건") from e
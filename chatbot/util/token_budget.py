@@ -0,0 +1,24 @@
+# chatbot/util/token_budget.py
+import math
+
+# 한국어 위주 텍스트 기준 보수적 추정치 (Gemini/Claude 토크나이저 모두 대략 1토큰 ≈ 1.5~2자)
+CHARS_PER_TOKEN = 1.5
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 문자 수로 토큰 수를 추정합니다. (예산 계산용 상한 추정)"""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def truncate_to_tokens(text: str, max_tokens: int, from_start: bool = False) -> str:
+    """
+    추정 토큰 수가 max_tokens 이하가 되도록 텍스트를 자릅니다.
+    Args:
+        from_start: True면 앞부분을 잘라내고 뒷부분(최신 내용)을 남김
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    max_chars = max(0, int(max_tokens * CHARS_PER_TOKEN) - 1)
+    if from_start:
+        return "…" + text[len(text) - max_chars:]
+    return text[:max_chars] + "…"
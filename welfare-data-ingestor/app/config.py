@@ -53,6 +53,12 @@ DB_CONFIG = {
 
 # ===== Bedrock용 변수 =====
 BEDROCK_MODEL_ID = get_env_variable("BEDROCK_MODEL_ID", "amazon.titan-embed-text-v2:0")
+EMBEDDING_DIMENSIONS = get_int_env_variable("EMBEDDING_DIMENSIONS", 1024)
+EMBEDDING_MAX_WORKERS = get_int_env_variable("EMBEDDING_MAX_WORKERS", 8) # 페이지 단위 임베딩 동시 호출 수
+
+# ===== 임베딩 캐시 변수 (chatbot과 embedding_cache 테이블 공유) =====
+EMBEDDING_CACHE_MAX_ENTRIES = get_int_env_variable("EMBEDDING_CACHE_MAX_ENTRIES", 4096)
+EMBEDDING_CACHE_DB_ENABLED = get_env_variable("EMBEDDING_CACHE_DB_ENABLED", "true").lower() == "true"
 
 # ===== SQS Queue URL 변수=====
 # 복지 정책 Ingestor에서 사용할 SQS
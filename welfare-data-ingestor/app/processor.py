@@ -2,7 +2,6 @@
 import logging
 import time
 from typing import List, Tuple
-from botocore.exceptions import ClientError
 
 # app 내부 모듈 임포트
 from app.fetcher.base_fetcher import BaseWelfareFetcher
@@ -119,23 +118,25 @@ class IngestProcessor:
         return total_inserted_count
 
     def _create_embeddings(self, dtos: List) -> List[Tuple]:
-        """[Helper] 임베딩 생성 로직 (DTO 타입을 특정하지 않음)"""
+        """[Helper] 임베딩 생성 로직 (DTO 타입을 특정하지 않음, 페이지 단위 병렬 생성)"""
+        batch = self.embedder.create_embeddings_for_services(dtos)
+
         data_to_insert = []
-        for dto in dtos:
-            try:
-                # DTO 객체가 스스로 임베딩 텍스트를 생성 (get_text_for_embedding 호출)
-                embedding = self.embedder.create_embedding_for_service(dto)
+        for idx, dto in enumerate(dtos):
+            embedding = batch.embeddings[idx]
+            if embedding is not None:
                 data_to_insert.append((dto, embedding))
-                time.sleep(0.1) # Bedrock 속도 조절
-            except ClientError as ce:
-                logger.error(f"Bedrock API 오류: {ce}")
-            except Exception as item_e:
-                # DTO의 ID 속성 확인 (service_id 또는 job_id)
-                item_id_str = getattr(dto, 'service_id', '알수없음')
-                if hasattr(dto, 'get_composite_key'):
-                    item_id_str = dto.get_composite_key() # Employment의 경우 복합 키 로깅
-
-                logger.error(f"개별 DTO 임베딩 오류 (ID: {item_id_str}): {item_e}")
+                continue
+
+            # DTO의 ID 속성 확인 (service_id 또는 job_id)
+            item_id_str = getattr(dto, 'service_id', '알수없음')
+            if hasattr(dto, 'get_composite_key'):
+                item_id_str = dto.get_composite_key() # Employment의 경우 복합 키 로깅
+
+            logger.error(f"개별 DTO 임베딩 오류 (ID: {item_id_str}): {batch.errors.get(idx)}")
+
+        if batch.failed_count:
+            logger.warning(f"임베딩 실패 {batch.failed_count}/{len(dtos)}건 (성공 건만 저장합니다)")
         return data_to_insert
 
     def _save_and_publish(self, data_list: List[Tuple]) -> int:
@@ -0,0 +1,79 @@
+# app/repository/embedding_cache_repository.py
+# -*- coding: utf-8 -*-
+import io
+import json
+import logging
+import psycopg2
+from typing import Dict, List, Tuple
+
+try:
+    from app.repository.base_repository import BaseRepository
+    from app.repository.pgvector_codec import encode_copy_binary, encode_int4, encode_text, encode_vector
+except ImportError:
+    from base_repository import BaseRepository
+    from pgvector_codec import encode_copy_binary, encode_int4, encode_text, encode_vector
+
+logger = logging.getLogger()
+
+class EmbeddingCacheRepository(BaseRepository):
+    """
+    'embedding_cache' 테이블 (chatbot과 공유하는 영속 임베딩 캐시) 관련 로직
+    (테이블 정의: chatbot/migrations/versions/0002_embedding_cache.sql)
+    """
+
+    SQL_FIND_EMBEDDINGS = """
+        SELECT cache_key, embedding::text FROM embedding_cache WHERE cache_key = ANY(%s);
+    """
+
+    # 바이너리 COPY로 임시 테이블에 적재한 뒤 중복을 건너뛰며 옮김 (COPY는 ON CONFLICT를 지원하지 않음)
+    SQL_CREATE_STAGING = """
+        CREATE TEMP TABLE IF NOT EXISTS embedding_cache_staging (
+            cache_key CHAR(64), model_id TEXT, dimensions INT, embedding VECTOR
+        ) ON COMMIT DELETE ROWS;
+    """
+
+    SQL_COPY_STAGING = """
+        COPY embedding_cache_staging (cache_key, model_id, dimensions, embedding) FROM STDIN WITH (FORMAT BINARY)
+    """
+
+    SQL_MERGE_STAGING = """
+        INSERT INTO embedding_cache (cache_key, model_id, dimensions, embedding)
+        SELECT cache_key, model_id, dimensions, embedding FROM embedding_cache_staging
+        ON CONFLICT (cache_key) DO NOTHING;
+    """
+
+    def __init__(self, db_config: dict):
+        super().__init__(db_config)
+
+    def find_embeddings(self, cache_keys: List[str]) -> Dict[str, List[float]]:
+        """캐시 키 리스트를 받아 {cache_key: embedding} 딕셔너리를 반환합니다."""
+        if not cache_keys:
+            return {}
+        try:
+            self.cur.execute(self.SQL_FIND_EMBEDDINGS, (cache_keys,))
+            # pgvector 텍스트 표현 '[0.1,0.2,...]'은 JSON 배열과 호환
+            return {row[0]: json.loads(row[1]) for row in self.cur.fetchall()}
+        except psycopg2.Error as e:
+            logger.error(f"임베딩 캐시 조회 중 DB 오류: {e}")
+            self.rollback()
+            return {}
+
+    def save_embeddings(self, rows: List[Tuple[str, str, int, List[float]]]) -> int:
+        """(cache_key, model_id, dimensions, embedding) 리스트를 일괄 저장하고 즉시 커밋합니다."""
+        if not rows:
+            return 0
+        try:
+            # 임베딩은 float32 바이너리로 전송 (JSON 텍스트 대비 3~4배 작고 서버 파싱 없음)
+            stream = encode_copy_binary(
+                (encode_text(key), encode_text(model_id), encode_int4(dims), encode_vector(emb))
+                for key, model_id, dims, emb in rows
+            )
+            self.cur.execute(self.SQL_CREATE_STAGING)
+            self.cur.copy_expert(self.SQL_COPY_STAGING, io.BytesIO(stream))
+            self.cur.execute(self.SQL_MERGE_STAGING)
+            self.commit()
+            return len(rows)
+        except psycopg2.Error as e:
+            logger.error(f"임베딩 캐시 저장 중 DB 오류: {e}")
+            self.rollback()
+            return 0
@@ -1,15 +1,17 @@
 # -*- coding: utf-8 -*-
+import io
 import logging
 import psycopg2
-from psycopg2.extras import execute_values
 from typing import List, Tuple, Set, Optional
 import datetime # 날짜 파싱을 위해 임포트
 
 try:
     from app.repository.base_repository import BaseRepository
+    from app.repository.pgvector_codec import encode_copy_binary, encode_date, encode_nullable_text, encode_text_array, encode_vector
     from app.dto.employment_dto import JobOpeningDTO
 except ImportError:
     from base_repository import BaseRepository
+    from pgvector_codec import encode_copy_binary, encode_date, encode_nullable_text, encode_text_array, encode_vector
     from ..employment_dto import JobOpeningDTO
 
 logger = logging.getLogger()
@@ -20,7 +22,26 @@ class EmploymentRepository(BaseRepository):
     """
 
     # [수정] id 컬럼 제거 (자동 생성), term_date_* 컬럼 추가
+    # 바이너리 COPY로 임시 테이블에 적재한 뒤 옮김 (임베딩을 float32 그대로 전송, 서버의 벡터 텍스트 파싱 없음)
+    # required_skills는 List[str]을 text[]로 받아 기존과 같이 text 컬럼에 '{a,b}' 형태로 저장
+    SQL_CREATE_STAGING = """
+        CREATE TEMP TABLE IF NOT EXISTS employment_jobs_staging (
+            company_name TEXT, job_title TEXT, job_description TEXT, embedding VECTOR,
+            job_type TEXT, salary TEXT, salary_type TEXT, location TEXT,
+            required_skills TEXT[], required_career TEXT, required_education TEXT,
+            last_modified_date TEXT, detail_link TEXT,
+            term_date_start DATE, term_date_end DATE,
+            term_date_str TEXT
+        ) ON COMMIT DELETE ROWS;
+    """
+
+    SQL_COPY_STAGING = """
+        COPY employment_jobs_staging FROM STDIN WITH (FORMAT BINARY)
+    """
+
+    # 커밋 전에 다시 호출되어도 같은 행을 두 번 옮기지 않도록 임시 테이블을 비우면서 옮김
     SQL_INSERT_JOBS_BATCH = """
+        WITH staged AS (DELETE FROM employment_jobs_staging RETURNING *)
         INSERT INTO employment_jobs (
             company_name, job_title, job_description, embedding,
             job_type, salary, salary_type, location, 
@@ -29,7 +50,14 @@ class EmploymentRepository(BaseRepository):
             term_date_start, term_date_end,
             term_date_str 
         )
-        VALUES %s;
+        SELECT
+            company_name, job_title, job_description, embedding,
+            job_type, salary, salary_type, location,
+            required_skills, required_career, required_education,
+            last_modified_date, detail_link,
+            term_date_start, term_date_end,
+            term_date_str
+        FROM staged;
     """
 
     SQL_DELETE_EXPIRED_JOBS = """
@@ -68,7 +96,7 @@ class EmploymentRepository(BaseRepository):
             return None, None
 
     def _build_params_list(self, data_list: List[Tuple[JobOpeningDTO, List[float]]]) -> List[tuple]:
-        """DTO를 DB 튜플 리스트로 변환 (termDate 파싱 포함)"""
+        """DTO를 COPY 바이너리 행 리스트로 변환 (termDate 파싱 포함, SQL_CREATE_STAGING 컬럼 순서)"""
         params_list = []
         for dto, embedding in data_list:
 
@@ -77,22 +105,22 @@ class EmploymentRepository(BaseRepository):
 
             params = (
                 # dto.job_id 제거됨
-                dto.company_name,
-                dto.job_title,
-                dto.job_description,
-                embedding,
-                dto.job_type,
-                dto.salary,
-                dto.salary_type,
-                dto.location,
-                dto.required_skills,
-                dto.required_career,
-                dto.required_education,
-                dto.last_modified_date,
-                dto.detail_link,
-                term_start,
-                term_end,
-                dto.term_date_str
+                encode_nullable_text(dto.company_name),
+                encode_nullable_text(dto.job_title),
+                encode_nullable_text(dto.job_description),
+                encode_vector(embedding),
+                encode_nullable_text(dto.job_type),
+                encode_nullable_text(dto.salary),
+                encode_nullable_text(dto.salary_type),
+                encode_nullable_text(dto.location),
+                encode_text_array(dto.required_skills),
+                encode_nullable_text(dto.required_career),
+                encode_nullable_text(dto.required_education),
+                encode_nullable_text(dto.last_modified_date),
+                encode_nullable_text(dto.detail_link),
+                encode_date(term_start),
+                encode_date(term_end),
+                encode_nullable_text(dto.term_date_str)
             )
             params_list.append(params)
         return params_list
@@ -145,12 +173,9 @@ class EmploymentRepository(BaseRepository):
             # 신규 데이터만 DB에 삽입
             params_list = self._build_params_list(new_data_list_with_embeddings)
 
-            execute_values(
-                self.cur,
-                self.SQL_INSERT_JOBS_BATCH,
-                params_list,
-                page_size=100
-            )
+            self.cur.execute(self.SQL_CREATE_STAGING)
+            self.cur.copy_expert(self.SQL_COPY_STAGING, io.BytesIO(encode_copy_binary(params_list)))
+            self.cur.execute(self.SQL_INSERT_JOBS_BATCH)
 
             inserted_count = len(params_list)
             logger.info(f"[Employment] {inserted_count}개의 신규 Job을 DB에 일괄 삽입했습니다.")
@@ -0,0 +1,78 @@
+# app/repository/pgvector_codec.py
+# -*- coding: utf-8 -*-
+import struct
+import sys
+from array import array
+from datetime import date
+from typing import Iterable, List, Optional, Sequence
+
+# pgvector 바이너리 표현: int16 차원 수 + int16 예약(0) + float32 x 차원 (network byte order)
+_VECTOR_HEADER = struct.Struct("!HH")
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# PostgreSQL 바이너리 COPY 헤더 (시그니처 + flags + 헤더 확장 길이) / 트레일러
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_COPY_TRAILER = struct.pack("!h", -1)
+
+# 1차원 배열 헤더: 차원 수, NULL 포함 여부, 원소 타입 OID / 차원 크기, 하한(1)
+_ARRAY_HEADER = struct.Struct("!iiI")
+_ARRAY_DIMENSION = struct.Struct("!ii")
+_TEXT_OID = 25
+_POSTGRES_EPOCH_ORDINAL = date(2000, 1, 1).toordinal()
+
+def encode_vector(values: Sequence[float]) -> bytes:
+    """임베딩 -> pgvector 바이너리 (COPY FORMAT BINARY의 vector 컬럼 값)"""
+    floats = array("f", values)
+    if _NATIVE_LITTLE_ENDIAN:
+        floats.byteswap()
+    return _VECTOR_HEADER.pack(len(floats), 0) + floats.tobytes()
+
+def encode_text(value: str) -> bytes:
+    return value.encode("utf-8")
+
+def encode_int4(value: int) -> bytes:
+    return struct.pack("!i", value)
+
+def encode_nullable_text(value) -> Optional[bytes]:
+    """API 응답 값(None / 숫자 포함) -> text 컬럼 값 (None은 NULL)"""
+    return None if value is None else str(value).encode("utf-8")
+
+def encode_date(value: Optional[date]) -> Optional[bytes]:
+    """date -> 2000-01-01 기준 일수 (int32)"""
+    return None if value is None else struct.pack("!i", value.toordinal() - _POSTGRES_EPOCH_ORDINAL)
+
+def encode_text_array(values: Optional[Sequence[str]]) -> Optional[bytes]:
+    """List[str] -> text[] (빈 리스트는 빈 배열 '{}')"""
+    if values is None:
+        return None
+    if not values:
+        return _ARRAY_HEADER.pack(0, 0, _TEXT_OID)
+    items = [encode_nullable_text(v) for v in values]
+    parts = [
+        _ARRAY_HEADER.pack(1, int(any(item is None for item in items)), _TEXT_OID),
+        _ARRAY_DIMENSION.pack(len(items), 1),
+    ]
+    for item in items:
+        if item is None:
+            parts.append(struct.pack("!i", -1))
+        else:
+            parts.append(struct.pack("!i", len(item)))
+            parts.append(item)
+    return b"".join(parts)
+
+def encode_copy_binary(rows: Iterable[Sequence[bytes]]) -> bytes:
+    """
+    이미 바이너리로 인코딩된 컬럼 값 행들을 COPY ... FROM STDIN (FORMAT BINARY) 스트림으로 만듭니다.
+    (None은 NULL)
+    """
+    parts: List[bytes] = [_COPY_SIGNATURE]
+    for row in rows:
+        parts.append(struct.pack("!h", len(row)))
+        for value in row:
+            if value is None:
+                parts.append(struct.pack("!i", -1))
+            else:
+                parts.append(struct.pack("!i", len(value)))
+                parts.append(value)
+    parts.append(_COPY_TRAILER)
+    return b"".join(parts)
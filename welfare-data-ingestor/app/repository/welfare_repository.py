@@ -1,17 +1,19 @@
 # app/repository/welfare_repository.py
 # -*- coding: utf-8 -*-
+import io
 import logging
 import psycopg2
-from psycopg2.extras import execute_values # 일괄 삽입(Batch)을 위해 임포트
 from typing import List, Tuple, Set
 
 # app 패키지 내부의 모듈을 임포트
 try:
     from app.repository.base_repository import BaseRepository
+    from app.repository.pgvector_codec import encode_copy_binary, encode_nullable_text, encode_text_array, encode_vector
     from app.dto.common_dto import CommonServiceDTO
 except ImportError:
     # 로컬 테스트 등을 위한 예외 처리
     from base_repository import BaseRepository
+    from pgvector_codec import encode_copy_binary, encode_nullable_text, encode_text_array, encode_vector
     from ..common_dto import CommonServiceDTO
 
 
@@ -28,7 +30,24 @@ class WelfareRepository(BaseRepository):
     """
 
     # 일괄 삽입(Batch Insert)용 SQL
+    # 바이너리 COPY로 임시 테이블에 적재한 뒤 옮김 (임베딩을 float32 그대로 전송, 서버의 벡터 텍스트 파싱 없음)
+    SQL_CREATE_STAGING = """
+        CREATE TEMP TABLE IF NOT EXISTS welfare_services_staging (
+            id TEXT, service_name TEXT, service_summary TEXT, embedding VECTOR,
+            province TEXT, city_district TEXT, department_name TEXT,
+            target_audience TEXT[], life_cycle TEXT[], interest_theme TEXT[],
+            support_cycle TEXT, support_type TEXT, application_method TEXT,
+            last_modified_date TEXT, detail_link TEXT
+        ) ON COMMIT DELETE ROWS;
+    """
+
+    SQL_COPY_STAGING = """
+        COPY welfare_services_staging FROM STDIN WITH (FORMAT BINARY)
+    """
+
+    # 커밋 전에 다시 호출되어도 같은 행을 두 번 옮기지 않도록 임시 테이블을 비우면서 옮김
     SQL_INSERT_SERVICE_BATCH = """
+        WITH staged AS (DELETE FROM welfare_services_staging RETURNING *)
         INSERT INTO welfare_services (
             id, service_name, service_summary, embedding,
             province, city_district, department_name,
@@ -36,8 +55,14 @@ class WelfareRepository(BaseRepository):
             support_cycle, support_type, application_method,
             last_modified_date, detail_link
         )
-        VALUES %s;
-    """ # execute_values가 %s를 값 리스트로 치환합니다.
+        SELECT
+            id, service_name, service_summary, embedding,
+            province, city_district, department_name,
+            target_audience, life_cycle, interest_theme,
+            support_cycle, support_type, application_method,
+            last_modified_date, detail_link
+        FROM staged;
+    """
 
     def __init__(self, db_config: dict):
         """
@@ -72,38 +97,33 @@ class WelfareRepository(BaseRepository):
             return 0
 
         try:
-            # DB에 삽입할 값(tuple) 리스트 생성
-            # DTO에서 직접 값을 꺼내 SQL 순서에 맞게 튜플 생성
-            params_list = [
+            # COPY 바이너리 행 생성 (SQL_CREATE_STAGING 컬럼 순서)
+            rows = [
                 (
-                    dto.service_id,
-                    dto.service_name,
-                    dto.service_summary,
-                    embedding, # 임베딩 (List[float])
-                    dto.province,
-                    dto.city_district,
-                    dto.department_name,
-                    dto.target_audience,    # List[str] (PostgreSQL의 text[] 타입과 호환됨)
-                    dto.life_cycle,         # List[str]
-                    dto.interest_theme,     # List[str]
-                    dto.support_cycle,
-                    dto.support_type,
-                    dto.application_method,
-                    dto.last_modified_date, # DTO 생성 시 'YYYY-MM-DD' 등으로 포맷팅됨
-                    dto.detail_link
+                    encode_nullable_text(dto.service_id),
+                    encode_nullable_text(dto.service_name),
+                    encode_nullable_text(dto.service_summary),
+                    encode_vector(embedding), # 임베딩 (pgvector 바이너리 float32)
+                    encode_nullable_text(dto.province),
+                    encode_nullable_text(dto.city_district),
+                    encode_nullable_text(dto.department_name),
+                    encode_text_array(dto.target_audience), # List[str] -> text[]
+                    encode_text_array(dto.life_cycle),
+                    encode_text_array(dto.interest_theme),
+                    encode_nullable_text(dto.support_cycle),
+                    encode_nullable_text(dto.support_type),
+                    encode_nullable_text(dto.application_method),
+                    encode_nullable_text(dto.last_modified_date), # DTO 생성 시 'YYYY-MM-DD' 등으로 포맷팅됨
+                    encode_nullable_text(dto.detail_link)
                 )
                 for dto, embedding in data_list # (dto, embedding) 튜플을 순회
             ]
 
-            # psycopg2.extras.execute_values를 사용하여 일괄 INSERT 실행
-            execute_values(
-                self.cur,
-                self.SQL_INSERT_SERVICE_BATCH,
-                params_list,
-                page_size=100 # 100개씩 나눠서 실행
-            )
+            self.cur.execute(self.SQL_CREATE_STAGING)
+            self.cur.copy_expert(self.SQL_COPY_STAGING, io.BytesIO(encode_copy_binary(rows)))
+            self.cur.execute(self.SQL_INSERT_SERVICE_BATCH)
 
-            inserted_count = len(params_list)
+            inserted_count = len(rows)
             logger.info(f"{inserted_count}개의 신규 서비스를 DB에 일괄 삽입했습니다.")
             return inserted_count
 
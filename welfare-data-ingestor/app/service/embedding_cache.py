@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import logging
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+logger = logging.getLogger()
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화: 유니코드 NFC + 공백 정리 (chatbot과 동일 규칙)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def make_cache_key(model_id: str, dimensions: int, text: str) -> str:
+    """(모델 ID, 차원, 정규화 텍스트) 기반 content-addressed 키 (chatbot과 동일 규칙)"""
+    raw = f"{model_id}|{dimensions}|{normalize_text(text)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class EmbeddingCache:
+    """
+    2단계 임베딩 캐시 (In-process LRU + Postgres embedding_cache 테이블)
+    영속 계층 Repository는 Lambda 실행마다 bind_repository()로 연결/해제합니다.
+    """
+
+    def __init__(self, model_id: str, dimensions: int, max_entries: int = 4096):
+        self.model_id = model_id
+        self.dimensions = dimensions
+        self.max_entries = max_entries
+        self.repository = None
+        self._lru = OrderedDict()
+
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def bind_repository(self, repository):
+        """영속 계층(EmbeddingCacheRepository)을 연결합니다. None이면 LRU만 사용."""
+        self.repository = repository
+
+    def key_for(self, text: str) -> str:
+        return make_cache_key(self.model_id, self.dimensions, text)
+
+    def get(self, text: str) -> Optional[List[float]]:
+        key = self.key_for(text)
+
+        cached = self._lru.get(key)
+        if cached is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return list(cached)
+
+        if self.repository:
+            found = self.repository.find_embeddings([key]).get(key)
+            if found is not None:
+                self._lru_put(key, found)
+                self.db_hits += 1
+                return found
+
+        self.misses += 1
+        return None
+
+    def get_many(self, texts: List[str]) -> Dict[int, List[float]]:
+        """
+        여러 텍스트를 한 번에 조회합니다. LRU 미스분은 DB에서 한 번의 쿼리로 조회합니다.
+        Returns:
+            {texts 인덱스: 임베딩} (적중한 항목만)
+        """
+        found: Dict[int, List[float]] = {}
+        pending: Dict[str, List[int]] = {}
+
+        for idx, text in enumerate(texts):
+            key = self.key_for(text)
+            cached = self._lru.get(key)
+            if cached is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                found[idx] = list(cached)
+            else:
+                pending.setdefault(key, []).append(idx)
+
+        if pending and self.repository:
+            for key, embedding in self.repository.find_embeddings(list(pending)).items():
+                self._lru_put(key, embedding)
+                for idx in pending.pop(key):
+                    self.db_hits += 1
+                    found[idx] = list(embedding)
+
+        self.misses += sum(len(idxs) for idxs in pending.values())
+        return found
+
+    def put_many(self, items: List[tuple]):
+        """(text, embedding) 리스트를 LRU에 넣고 DB에는 한 번에 저장합니다."""
+        rows = {}
+        for text, embedding in items:
+            key = self.key_for(text)
+            self._lru_put(key, embedding)
+            rows[key] = (key, self.model_id, self.dimensions, embedding)
+        if rows and self.repository:
+            self.repository.save_embeddings(list(rows.values()))
+
+    def put(self, text: str, embedding: List[float]):
+        key = self.key_for(text)
+        self._lru_put(key, embedding)
+        if self.repository:
+            self.repository.save_embeddings([(key, self.model_id, self.dimensions, embedding)])
+
+    def _lru_put(self, key: str, embedding: List[float]):
+        self._lru[key] = tuple(embedding)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def log_stats(self):
+        logger.info(f"임베딩 캐시 통계 - LRU 적중: {self.hits}, DB 적중: {self.db_hits}, 미스: {self.misses}")
@@ -2,22 +2,28 @@
 import json
 import logging
 from botocore.exceptions import ClientError
-from typing import TYPE_CHECKING, List, Any
+from typing import TYPE_CHECKING, List, Any, Optional
+
+from app.service.embedding_batch import EmbeddingBatchResult, embed_concurrently
 
 # [수정] DTO 임포트 로직 제거 (타입에 의존하지 않음)
 
 # 타입 힌트를 위한 설정
 if TYPE_CHECKING:
     from mypy_boto3_bedrock_runtime.client import BedrockRuntimeClient
+    from app.service.embedding_cache import EmbeddingCache
 
 logger = logging.getLogger()
 
 class EmbeddingService:
     """Amazon Bedrock을 이용한 텍스트 임베딩 생성을 담당하는 클래스"""
 
-    def __init__(self, bedrock_runtime: 'BedrockRuntimeClient', model_id: str):
+    def __init__(self, bedrock_runtime: 'BedrockRuntimeClient', model_id: str,
+                 cache: Optional['EmbeddingCache'] = None, max_workers: int = 8):
         self.bedrock_runtime = bedrock_runtime
         self.model_id = model_id
+        self.cache = cache # 선택: 임베딩 캐시 (변경 없는 데이터 재수집 시 Bedrock 호출 생략)
+        self.max_workers = max_workers # get_embeddings 동시 호출 수
         if not self.model_id:
             raise ValueError("Bedrock 모델 ID가 설정되지 않았습니다.")
 
@@ -32,7 +38,56 @@ class EmbeddingService:
         return service_dto.get_text_for_embedding()
 
     def get_embedding(self, text: str) -> List[float]:
-        # ... (기존 로직과 동일) ...
+        """캐시가 있으면 먼저 조회하고, 없을 때만 Bedrock을 호출합니다."""
+        if self.cache:
+            cached = self.cache.get(text)
+            if cached is not None:
+                return cached
+
+        embedding = self._invoke_embedding(text)
+        if self.cache:
+            self.cache.put(text, embedding)
+        return embedding
+
+    def get_embeddings(self, texts: List[str]) -> EmbeddingBatchResult:
+        """
+        여러 텍스트를 한 번에 임베딩합니다. (입력 순서 보존, 항목별 오류 분리)
+        캐시는 일괄 조회/저장하고, 미스된 고유 텍스트만 제한된 동시성으로 Bedrock에 요청합니다.
+        """
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        errors = {}
+
+        if self.cache:
+            for idx, embedding in self.cache.get_many(texts).items():
+                embeddings[idx] = embedding
+
+        # 캐시 미스 텍스트 중복 제거
+        pending = {}
+        for idx, text in enumerate(texts):
+            if embeddings[idx] is None:
+                pending.setdefault(text, []).append(idx)
+
+        if pending:
+            unique_texts = list(pending)
+            batch = embed_concurrently(unique_texts, self._invoke_embedding, max_workers=self.max_workers)
+
+            succeeded = []
+            for u_idx, text in enumerate(unique_texts):
+                embedding = batch.embeddings[u_idx]
+                for idx in pending[text]:
+                    if embedding is None:
+                        errors[idx] = batch.errors.get(u_idx, "임베딩 생성 실패")
+                    else:
+                        embeddings[idx] = embedding
+                if embedding is not None:
+                    succeeded.append((text, embedding))
+
+            if self.cache and succeeded:
+                self.cache.put_many(succeeded)
+
+        return EmbeddingBatchResult(embeddings, errors)
+
+    def _invoke_embedding(self, text: str) -> List[float]:
         body = json.dumps({"inputText": text})
         try:
             response = self.bedrock_runtime.invoke_model(
@@ -62,3 +117,25 @@ class EmbeddingService:
         """
         text_to_embed = self._build_embedding_text(service_dto)
         return self.get_embedding(text_to_embed)
+
+    def create_embeddings_for_services(self, service_dtos: List[Any]) -> EmbeddingBatchResult:
+        """
+        create_embedding_for_service의 일괄 버전. (결과 순서 = service_dtos 순서)
+        텍스트 생성에 실패한 DTO는 Bedrock을 호출하지 않고 해당 인덱스에 오류로 기록합니다.
+        """
+        texts, positions, errors = [], [], {}
+        for idx, dto in enumerate(service_dtos):
+            try:
+                texts.append(self._build_embedding_text(dto))
+                positions.append(idx)
+            except TypeError as e:
+                errors[idx] = str(e)
+
+        batch = self.get_embeddings(texts)
+
+        embeddings: List[Optional[List[float]]] = [None] * len(service_dtos)
+        for t_idx, idx in enumerate(positions):
+            embeddings[idx] = batch.embeddings[t_idx]
+            if t_idx in batch.errors:
+                errors[idx] = batch.errors[t_idx]
+        return EmbeddingBatchResult(embeddings, errors)
@@ -7,6 +7,8 @@ from app import config
 from app.factory import get_dependencies, get_sources_to_run
 from app.processor import IngestProcessor
 from app.service.embedding_service import EmbeddingService
+from app.service.embedding_cache import EmbeddingCache
+from app.repository.embedding_cache_repository import EmbeddingCacheRepository
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -17,9 +19,16 @@ try:
     sqs_client = boto3.client(service_name='sqs')
 
     # 공통 서비스 (모든 Processor가 공유)
+    embedding_cache = EmbeddingCache(
+        model_id=config.BEDROCK_MODEL_ID,
+        dimensions=config.EMBEDDING_DIMENSIONS,
+        max_entries=config.EMBEDDING_CACHE_MAX_ENTRIES
+    )
     embedder = EmbeddingService(
         bedrock_runtime=bedrock_runtime_client,
-        model_id=config.BEDROCK_MODEL_ID
+        model_id=config.BEDROCK_MODEL_ID,
+        cache=embedding_cache,
+        max_workers=config.EMBEDDING_MAX_WORKERS
     )
 
     logger.info("공통 서비스 (Embedder, Boto3 Clients) 초기화 완료.")
@@ -43,6 +52,15 @@ def handler(event, context):
 
     total_inserted_count = 0
 
+    # 영속 임베딩 캐시 연결 (실패해도 수집은 계속 진행)
+    cache_repo = None
+    if config.EMBEDDING_CACHE_DB_ENABLED:
+        try:
+            cache_repo = EmbeddingCacheRepository(config.DB_CONFIG)
+        except Exception as e:
+            logger.warning(f"임베딩 캐시 DB 연결 실패 (LRU만 사용): {e}")
+    embedding_cache.bind_repository(cache_repo)
+
     for source in sources:
         repo = None
         try:
@@ -76,6 +94,10 @@ def handler(event, context):
             if repo: repo.close()
             logger.info(f"Source '{source}' 작업 완료. DB 연결 종료.")
 
+    embedding_cache.log_stats()
+    embedding_cache.bind_repository(None)
+    if cache_repo: cache_repo.close()
+
     logger.info(f"## Lambda 실행 종료 (총 {total_inserted_count}개 추가) ##")
     return {
         'statusCode': 200,